@@ -0,0 +1,36 @@
+"""add_exchange_intent_to_position
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9c0d1e2f3a4'
+down_revision: Union[str, Sequence[str], None] = 'a8b9c0d1e2f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Link positions placed on the exchange to their entry order intent."""
+    op.add_column(
+        'positions',
+        sa.Column('exchange_intent_id', postgresql.UUID(as_uuid=True), nullable=True),
+    )
+    op.create_unique_constraint(
+        'uq_positions_exchange_intent_id', 'positions', ['exchange_intent_id']
+    )
+
+
+def downgrade() -> None:
+    """Remove the exchange intent link from positions."""
+    op.drop_constraint('uq_positions_exchange_intent_id', 'positions', type_='unique')
+    op.drop_column('positions', 'exchange_intent_id')
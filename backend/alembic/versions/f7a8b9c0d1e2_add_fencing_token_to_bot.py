@@ -0,0 +1,31 @@
+"""add_fencing_token_to_bot
+
+Revision ID: f7a8b9c0d1e2
+Revises: e1f2g3h4i5j6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, Sequence[str], None] = 'e1f2g3h4i5j6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the scheduler fencing token column."""
+    op.add_column(
+        'bots',
+        sa.Column('fencing_token', sa.BigInteger(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    """Remove the scheduler fencing token column."""
+    op.drop_column('bots', 'fencing_token')
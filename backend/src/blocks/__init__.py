@@ -5,6 +5,7 @@ Each block is responsible for a single concern:
 - block_portfolio: Portfolio state and equity
 - block_indicator_decision: Indicator-based trading signals (replaces LLM)
 - block_llm_decision: LLM calls and decision parsing (deprecated)
+- block_tiered_decision: Trinity screen, then LLM on the top-K shortlist
 - block_risk: Risk validation
 - block_execution: Trade execution
 """
@@ -15,6 +16,7 @@ from .block_llm_decision import LLMDecisionBlock
 from .block_market_data import MarketDataBlock
 from .block_portfolio import PortfolioBlock
 from .block_risk import RiskBlock
+from .block_tiered_decision import TieredDecisionBlock
 from .orchestrator import TradingOrchestrator
 
 __all__ = [
@@ -22,6 +24,7 @@ __all__ = [
     "PortfolioBlock",
     "IndicatorDecisionBlock",  # NEW: Indicator-based (replaces LLM)
     "LLMDecisionBlock",  # Kept for backwards compatibility
+    "TieredDecisionBlock",
     "RiskBlock",
     "ExecutionBlock",
     "TradingOrchestrator",
@@ -1,22 +1,32 @@
-"""Block: Execution - Handles trade execution."""
+"""Block: Execution - Handles trade execution.
+
+Capital and position writes are safe to run concurrently for the same bot:
+capital only changes through atomic ``capital = capital +/- x`` updates, and a
+position is only closed if it still has the version that was read. Sizing
+reads capital up front; the debit itself re-checks that enough is left.
+"""
 
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
-from sqlalchemy import select
+import numpy as np
+from sqlalchemy import select, update
 
 from ..core.config import config
 from ..core.database import AsyncSessionLocal
 from ..core.exchange_client import get_exchange_client
+from ..core.leader_election import StaleFencingTokenError, claim_fence
 from ..core.logger import get_logger
 from ..core.memory.memory_manager import MemoryManager
+from ..core.paper_matching import BUY, LIMIT, MARKET, SELL, STOP, Candles, OrderBatch, PaperMatchingEngine
 from ..models.bot import Bot
 from ..models.position import Position, PositionSide, PositionStatus
 from ..models.trade import Trade, TradeSide
 from ..services.trading_memory_service import TradingMemoryService
+from .cycle_unit_of_work import CycleUnitOfWork
 
 logger = get_logger(__name__)
 
@@ -36,10 +46,14 @@ class ExecutionResult:
 class ExecutionBlock:
     """Handles trade execution with memory integration for learning."""
 
-    def __init__(self, bot_id: uuid.UUID, paper_trading: bool = True):
+    def __init__(self, bot_id: uuid.UUID, paper_trading: bool = True, fencing_token: Optional[int] = None):
         self.bot_id = bot_id
+        self.fencing_token = fencing_token
+        self.paper_trading = paper_trading
         self.exchange = get_exchange_client(paper_trading=paper_trading)
         self.memory = TradingMemoryService(bot_id)
+        # Paper orders fill through the matching engine when candles are passed in
+        self.matching = PaperMatchingEngine() if paper_trading and config.PAPER_MATCHING_ENABLED else None
 
     async def open_position(
         self,
@@ -50,111 +64,238 @@ class ExecutionBlock:
         stop_loss: Decimal,
         take_profit: Decimal,
         leverage: int = int(config.DEFAULT_LEVERAGE),
+        uow: Optional[CycleUnitOfWork] = None,
+        candles: Optional[Sequence[Any]] = None,
     ) -> ExecutionResult:
-        """Open a new position."""
+        """Open a new position (buffered in ``uow`` when given, else committed now).
+
+        ``candles`` (recent OHLCV rows) let paper orders fill with slippage and
+        partial fills; without them they fill at ``entry_price``.
+        """
+        if uow is not None:
+            try:
+                position, trade, debit = self._build_entry(
+                    uow.cash, symbol, side, size_pct, entry_price, stop_loss, take_profit, leverage, candles
+                )
+            except ValueError as e:
+                return ExecutionResult(success=False, error=str(e))
+            uow.add_open(position, trade, debit)
+            logger.info(f"Entry executed: Capital: ${float(uow.cash):,.2f}")
+            return ExecutionResult(success=True, position=position, trade=trade)
+
         async with AsyncSessionLocal() as db:
             try:
                 bot = await self._get_bot(db)
+                await db.commit()  # End the read; the debit below is checked atomically
 
-                margin = bot.capital * Decimal(str(size_pct))
-                notional = margin * Decimal(str(leverage))
-                quantity = notional / entry_price
-                fees = notional * FEE_RATE
-
-                logger.info(f"PAPER: {side} {quantity:.6f} {symbol} @ {entry_price:,.2f}")
-
-                position = Position(
-                    bot_id=self.bot_id,
-                    symbol=symbol,
-                    side=PositionSide.LONG if side == "long" else PositionSide.SHORT,
-                    quantity=quantity,
-                    entry_price=entry_price,
-                    current_price=entry_price,
-                    stop_loss=stop_loss,
-                    take_profit=take_profit,
-                    leverage=Decimal(str(leverage)),
-                    status=PositionStatus.OPEN,
-                    opened_at=datetime.utcnow(),
+                position, trade, debit = self._build_entry(
+                    bot.capital, symbol, side, size_pct, entry_price, stop_loss, take_profit, leverage, candles
                 )
+                capital = await self._apply_capital(db, -debit)
+                if capital is None:
+                    await db.rollback()
+                    return ExecutionResult(success=False, error="Insufficient capital")
+
                 db.add(position)
                 await db.flush()
-
-                trade = Trade(
-                    bot_id=self.bot_id,
-                    position_id=position.id,
-                    symbol=symbol,
-                    side=TradeSide.BUY if side == "long" else TradeSide.SELL,
-                    quantity=quantity,
-                    price=entry_price,
-                    fees=fees,
-                    realized_pnl=Decimal("0"),
-                    executed_at=datetime.utcnow(),
-                )
                 db.add(trade)
-
-                bot.capital = bot.capital - margin - fees
+                await self._claim_fence(db)
                 await db.commit()
 
-                logger.info(f"Entry executed: Capital: ${float(bot.capital):,.2f}")
+                logger.info(f"Entry executed: Capital: ${float(capital):,.2f}")
 
                 return ExecutionResult(success=True, position=position, trade=trade)
 
+            except StaleFencingTokenError:
+                raise  # A newer leader runs this bot: stop the cycle, not just this order
             except Exception as e:
                 logger.error(f"Error opening position: {e}")
                 return ExecutionResult(success=False, error=str(e))
 
+    def _build_entry(
+        self,
+        capital: Decimal,
+        symbol: str,
+        side: str,
+        size_pct: float,
+        entry_price: Decimal,
+        stop_loss: Decimal,
+        take_profit: Decimal,
+        leverage: int,
+        candles: Optional[Sequence[Any]] = None,
+    ) -> tuple[Position, Trade, Decimal]:
+        """Position and entry trade for an order; returns them with the cash debit."""
+        margin = capital * Decimal(str(size_pct))
+        notional = margin * Decimal(str(leverage))
+        quantity = notional / entry_price
+        fees = notional * FEE_RATE
+
+        fill = self._paper_fill(BUY if side == "long" else SELL, quantity, entry_price, candles)
+        if fill is not None:
+            filled, entry_price, fees = fill
+            if filled <= 0:
+                raise ValueError(f"No liquidity to fill {symbol}")
+            if filled < quantity:
+                logger.info(f"PAPER: partial fill {filled:.6f} of {quantity:.6f} {symbol}")
+            quantity = filled
+            margin = quantity * entry_price / Decimal(str(leverage))
+
+        logger.info(f"PAPER: {side} {quantity:.6f} {symbol} @ {entry_price:,.2f}")
+
+        position = Position(
+            id=uuid.uuid4(),
+            bot_id=self.bot_id,
+            symbol=symbol,
+            side=PositionSide.LONG if side == "long" else PositionSide.SHORT,
+            quantity=quantity,
+            entry_price=entry_price,
+            current_price=entry_price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            leverage=Decimal(str(leverage)),
+            status=PositionStatus.OPEN,
+            opened_at=datetime.utcnow(),
+            version=0,
+        )
+        trade = Trade(
+            bot_id=self.bot_id,
+            position_id=position.id,
+            symbol=symbol,
+            side=TradeSide.BUY if side == "long" else TradeSide.SELL,
+            quantity=quantity,
+            price=entry_price,
+            fees=fees,
+            realized_pnl=Decimal("0"),
+            executed_at=datetime.utcnow(),
+        )
+        return position, trade, margin + fees
+
     async def close_position(
         self,
         position: Position,
         current_price: Decimal,
         reason: str = "manual",
+        uow: Optional[CycleUnitOfWork] = None,
+        candles: Optional[Sequence[Any]] = None,
     ) -> ExecutionResult:
-        """Close an existing position."""
+        """Close an existing position (buffered in ``uow`` when given, else committed now).
+
+        With ``candles``, paper exits fill through the matching engine: stop
+        losses as stop orders, take profits as limit orders at their price.
+        """
+        if uow is not None:
+            if not uow.is_open(position.id):
+                return ExecutionResult(success=False, error="Position already closed")
+            trade, pnl, credit = self._build_exit(position, current_price, reason, candles)
+            uow.add_close(
+                position, trade, credit, after_commit=lambda: self._after_exit(position, current_price, pnl, reason)
+            )
+            return ExecutionResult(success=True, position=position, trade=trade)
+
         async with AsyncSessionLocal() as db:
             try:
                 position = await self._refresh_position(db, position.id)
+                await db.commit()
                 if position.status != PositionStatus.OPEN:
                     return ExecutionResult(success=False, error="Position already closed")
 
-                bot = await self._get_bot(db)
-
-                pnl = self._calculate_pnl(position, current_price)
-                margin = position.entry_price * position.quantity / position.leverage
-                fees = current_price * position.quantity * FEE_RATE
+                trade, pnl, credit = self._build_exit(position, current_price, reason, candles)
+                if not await self._mark_closed(db, position):
+                    # Closed (or changed) by the exit monitor or another cycle since we read it
+                    await db.rollback()
+                    return ExecutionResult(success=False, error="Position already closed")
 
-                trade = Trade(
-                    bot_id=self.bot_id,
-                    position_id=position.id,
-                    symbol=position.symbol,
-                    side=TradeSide.SELL if position.side == PositionSide.LONG else TradeSide.BUY,
-                    quantity=position.quantity,
-                    price=current_price,
-                    fees=fees,
-                    realized_pnl=pnl,
-                    executed_at=datetime.utcnow(),
-                )
                 db.add(trade)
-
-                position.status = PositionStatus.CLOSED
-                position.current_price = current_price
-                position.closed_at = datetime.utcnow()
-
-                bot.capital = bot.capital + margin + pnl - fees
+                await self._apply_capital(db, credit)
+                await self._claim_fence(db)
                 await db.commit()
 
-                pnl_str = f"+${float(pnl):,.2f}" if pnl >= 0 else f"-${abs(float(pnl)):,.2f}"
-                logger.info(f"EXIT {position.symbol} @ ${current_price:,.2f} | PnL: {pnl_str} | Reason: {reason}")
-
-                # Record outcome in memory for learning
-                if MemoryManager.is_enabled():
-                    await self._record_trade_outcome(position, pnl, reason)
-
+                await self._after_exit(position, current_price, pnl, reason)
                 return ExecutionResult(success=True, position=position, trade=trade)
 
+            except StaleFencingTokenError:
+                raise
             except Exception as e:
                 logger.error(f"Error closing position: {e}")
                 return ExecutionResult(success=False, error=str(e))
 
+    def _build_exit(
+        self,
+        position: Position,
+        current_price: Decimal,
+        reason: str = "manual",
+        candles: Optional[Sequence[Any]] = None,
+    ) -> tuple[Trade, Decimal, Decimal]:
+        """Mark the position closed and build its exit trade; returns it with PnL and cash credit."""
+        fees = current_price * position.quantity * FEE_RATE
+        if reason == "take_profit" and position.take_profit:
+            kind, trigger = LIMIT, position.take_profit
+        elif reason == "stop_loss" and position.stop_loss:
+            kind, trigger = STOP, position.stop_loss
+        else:
+            kind, trigger = MARKET, None
+        side = SELL if position.side == PositionSide.LONG else BUY
+        fill = self._paper_fill(side, position.quantity, current_price, candles, kind, trigger, allow_partial=False)
+        if fill is not None:
+            _, current_price, fees = fill
+
+        pnl = self._calculate_pnl(position, current_price)
+        margin = position.entry_price * position.quantity / position.leverage
+
+        trade = Trade(
+            bot_id=self.bot_id,
+            position_id=position.id,
+            symbol=position.symbol,
+            side=TradeSide.SELL if position.side == PositionSide.LONG else TradeSide.BUY,
+            quantity=position.quantity,
+            price=current_price,
+            fees=fees,
+            realized_pnl=pnl,
+            executed_at=datetime.utcnow(),
+        )
+
+        position.status = PositionStatus.CLOSED
+        position.current_price = current_price
+        position.closed_at = datetime.utcnow()
+        return trade, pnl, margin + pnl - fees
+
+    def _paper_fill(
+        self,
+        side: int,
+        quantity: Decimal,
+        price: Decimal,
+        candles: Optional[Sequence[Any]],
+        kind: int = MARKET,
+        trigger: Optional[Decimal] = None,
+        allow_partial: bool = True,
+    ) -> Optional[tuple[Decimal, Decimal, Decimal]]:
+        """Filled quantity, price and fees from the matching engine; None to fill at ``price``."""
+        if self.matching is None or not candles:
+            return None
+        orders = OrderBatch.build(
+            side=[side],
+            quantity=[float(quantity)],
+            kind=[kind],
+            trigger=[float(trigger) if trigger else np.nan],
+        )
+        fills = self.matching.fill_now(orders, np.array(float(price)), Candles.from_ohlcv(candles), allow_partial)
+        filled = quantity if not allow_partial else min(quantity, Decimal(f"{fills.filled[0]:.8f}"))
+        fill_price = Decimal(f"{fills.price[0]:.8f}")
+        return filled, fill_price, Decimal(f"{fills.fees[0]:.8f}")
+
+    async def _after_exit(self, position: Position, current_price: Decimal, pnl: Decimal, reason: str) -> None:
+        pnl_str = f"+${float(pnl):,.2f}" if pnl >= 0 else f"-${abs(float(pnl)):,.2f}"
+        logger.info(f"EXIT {position.symbol} @ ${current_price:,.2f} | PnL: {pnl_str} | Reason: {reason}")
+
+        # Record outcome in memory for learning
+        if MemoryManager.is_enabled():
+            await self._record_trade_outcome(position, pnl, reason)
+
+    async def _claim_fence(self, db: Any) -> None:
+        """Reject the write if a newer scheduler leader has written for this bot."""
+        if self.fencing_token is not None:
+            await claim_fence(db, self.bot_id, self.fencing_token)
+
     async def _get_bot(self, db: Any) -> Bot:
         """Get bot from database."""
         result = await db.execute(select(Bot).where(Bot.id == self.bot_id))
@@ -163,14 +304,58 @@ class ExecutionBlock:
             raise ValueError(f"Bot {self.bot_id} not found in database")
         return bot  # type: ignore[no-any-return]
 
+    async def _apply_capital(self, db: Any, delta: Decimal) -> Optional[Decimal]:
+        """Add ``delta`` to the bot's capital in one statement; returns the new capital.
+
+        A debit only applies if it leaves capital non-negative, otherwise nothing
+        changes and None is returned.
+        """
+        stmt = update(Bot).where(Bot.id == self.bot_id)
+        if delta < 0:
+            stmt = stmt.where(Bot.capital >= -delta)
+        result = await db.execute(
+            stmt.values(capital=Bot.capital + delta)
+            .returning(Bot.capital)
+            .execution_options(synchronize_session=False)
+        )
+        capital = result.scalar_one_or_none()
+        return None if capital is None else Decimal(str(capital))
+
     async def _refresh_position(self, db: Any, position_id: uuid.UUID) -> Position:
-        """Refresh position from database."""
+        """Current position from the database, detached so changes are never flushed implicitly."""
         result = await db.execute(select(Position).where(Position.id == position_id))
         position = result.scalar_one_or_none()
         if not position:
             raise ValueError(f"Position {position_id} not found in database")
+        db.expunge(position)
         return position  # type: ignore[no-any-return]
 
+    async def _mark_closed(self, db: Any, position: Position) -> bool:
+        """Write the close if the position is still open at the version read; False otherwise.
+
+        Two concurrent closes (decision cycle and exit monitor) both read the same
+        version, and only the first to write wins.
+        """
+        result = await db.execute(
+            update(Position)
+            .where(
+                Position.id == position.id,
+                Position.status == PositionStatus.OPEN,
+                Position.version == position.version,
+            )
+            .values(
+                status=PositionStatus.CLOSED,
+                current_price=position.current_price,
+                closed_at=position.closed_at,
+                version=Position.version + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+        position.version += 1
+        return True
+
     def _calculate_pnl(self, position: Position, current_price: Decimal) -> Decimal:
         """Calculate PnL for a position."""
         if position.side == PositionSide.LONG:
@@ -3,13 +3,15 @@
 import os
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 
 from ..core.config import config
 from ..core.llm_client import LLMClient
 from ..core.logger import get_logger
 from ..core.memory.memory_manager import MemoryManager
+from ..services.llm_decision_cache import LLMDecisionCache
+from ..services.llm_decision_schema import DecisionValidation, validate_with_repair
 from ..services.multi_coin_prompt_service import MultiCoinPromptService
 from ..services.trading_memory_service import TradingMemoryService
 
@@ -40,6 +42,7 @@ class LLMDecisionBlock:
     def __init__(self, llm_client: Optional[LLMClient] = None, bot_id: Optional[UUID] = None):
         self.llm_client = llm_client or LLMClient()
         self.prompt_service = MultiCoinPromptService()
+        self.decision_cache = LLMDecisionCache()
         self.bot_id = bot_id
         self.memory = TradingMemoryService(bot_id) if bot_id else None
 
@@ -54,35 +57,21 @@ class LLMDecisionBlock:
             all_coins_data = self._build_coins_data(market_data)
             positions = portfolio_context.get("positions", [])
 
-            prompt_result = self.prompt_service.get_multi_coin_decision(
-                bot=None,
-                all_coins_data=all_coins_data,
-                all_positions=positions,
-                portfolio_state=portfolio_context,
-            )
-
-            logger.info(f"Calling LLM for {len(market_data)} symbols...")
-            response = await self.llm_client.analyze_market(
-                model=FORCED_MODEL,
-                prompt=prompt_result.get("prompt", ""),
-                max_tokens=2048,
-                temperature=0.7,
-            )
-
-            raw_decisions = self._parse_response(response)
+            fingerprint = self.decision_cache.fingerprint(all_coins_data, positions)
+            raw_decisions = self.decision_cache.get(fingerprint)
+            if raw_decisions is None:
+                validation = await self._request_decisions(
+                    all_coins_data, positions, portfolio_context
+                )
+                raw_decisions = validation.decisions
+                if validation.cacheable:
+                    self.decision_cache.put(fingerprint, raw_decisions)
 
             decisions = {}
             for symbol, raw in raw_decisions.items():
-                decision = self._validate_and_fix(symbol, raw, market_data)
+                decision = await self._finalize_decision(symbol, raw, market_data)
                 if decision:
-                    # Adjust confidence based on memory (if enabled)
-                    if self.memory and MemoryManager.is_enabled():
-                        adjusted_decision = await self._apply_memory_adjustment(symbol, decision)
-                        decisions[symbol] = adjusted_decision
-                    else:
-                        decisions[symbol] = decision
-
-                    logger.info(f"{symbol}: {decision.signal} ({decision.confidence*100:.0f}%)")
+                    decisions[symbol] = decision
 
             return decisions
 
@@ -90,6 +79,127 @@ class LLMDecisionBlock:
             logger.error(f"Error getting LLM decisions: {e}")
             return {}
 
+    async def stream_decisions(
+        self,
+        market_data: Dict[str, Any],
+        portfolio_context: Dict[str, Any],
+    ) -> AsyncIterator[TradingDecision]:
+        """Yield validated decisions one symbol at a time as the LLM streams them.
+
+        Symbols the stream did not deliver (provider failure, deadline, malformed
+        output) are requested through the dispatched call with schema repair.
+        """
+        all_coins_data = self._build_coins_data(market_data)
+        positions = portfolio_context.get("positions", [])
+
+        fingerprint = self.decision_cache.fingerprint(all_coins_data, positions)
+        cached = self.decision_cache.get(fingerprint)
+        if cached is not None:
+            for symbol, raw in cached.items():
+                decision = await self._finalize_decision(symbol, raw, market_data)
+                if decision:
+                    yield decision
+            return
+
+        prompt_result = self.prompt_service.get_multi_coin_decision(
+            bot=None,
+            all_coins_data=all_coins_data,
+            all_positions=positions,
+            portfolio_state=portfolio_context,
+        )
+
+        logger.info(f"Streaming LLM decisions for {len(market_data)} symbols...")
+        prompt = prompt_result.get("prompt", "")
+        cache_prefix = prompt_result.get("static_prefix")
+        raw_decisions: Dict[str, Dict[str, Any]] = {}
+        try:
+            async for symbol, raw in self.llm_client.stream_decisions(
+                model=FORCED_MODEL,
+                prompt=prompt,
+                max_tokens=2048,
+                temperature=0.7,
+                symbols=list(market_data.keys()),
+                cache_prefix=cache_prefix,
+            ):
+                raw_decisions[symbol] = raw
+                decision = await self._finalize_decision(symbol, raw, market_data)
+                if decision:
+                    yield decision
+        except Exception as e:
+            logger.warning(f"LLM stream failed after {len(raw_decisions)} decisions: {e}")
+
+        missing = [symbol for symbol in market_data if symbol not in raw_decisions]
+        if missing:
+            try:
+                response = await self.llm_client.analyze_market(
+                    FORCED_MODEL, prompt, 2048, 0.7, cache_prefix,
+                    json_mode=config.LLM_STRUCTURED_OUTPUT_ENABLED,
+                )
+                validation = await validate_with_repair(
+                    self.llm_client, FORCED_MODEL, response.get("response", ""), missing
+                )
+            except Exception as e:
+                logger.error(f"Error requesting {len(missing)} missing LLM decisions: {e}")
+                return
+            for symbol in missing:
+                raw = validation.decisions.get(symbol)
+                if raw is None:
+                    continue
+                raw_decisions[symbol] = raw
+                decision = await self._finalize_decision(symbol, raw, market_data)
+                if decision:
+                    yield decision
+            if not validation.cacheable:
+                return  # Partial or repaired answers are not reused
+
+        self.decision_cache.put(fingerprint, raw_decisions)
+
+    async def _finalize_decision(
+        self, symbol: str, raw: Dict[str, Any], market_data: Dict[str, Any]
+    ) -> Optional[TradingDecision]:
+        """Validate a raw decision and apply memory adjustment (if enabled)."""
+        decision = self._validate_and_fix(symbol, raw, market_data)
+        if not decision:
+            return None
+
+        if self.memory and MemoryManager.is_enabled():
+            decision = await self._apply_memory_adjustment(symbol, decision)
+
+        logger.info(f"{symbol}: {decision.signal} ({decision.confidence*100:.0f}%)")
+        return decision
+
+    async def _request_decisions(
+        self,
+        all_coins_data: Dict[str, Dict[str, Any]],
+        positions: List[Any],
+        portfolio_context: Dict[str, Any],
+    ) -> DecisionValidation:
+        """Build the prompt, call the LLM and parse raw decisions."""
+        prompt_result = self.prompt_service.get_multi_coin_decision(
+            bot=None,
+            all_coins_data=all_coins_data,
+            all_positions=positions,
+            portfolio_state=portfolio_context,
+        )
+
+        logger.info(f"Calling LLM for {len(all_coins_data)} symbols...")
+        response = await self.llm_client.analyze_batched(
+            model=FORCED_MODEL,
+            static_prefix=prompt_result.get("static_prefix", ""),
+            market_section=prompt_result.get("market_section", ""),
+            portfolio_section=prompt_result.get("portfolio_section", ""),
+            member_id=str(self.bot_id or id(self)),
+            max_tokens=2048,
+            temperature=0.7,
+        )
+
+        return await validate_with_repair(
+            self.llm_client,
+            FORCED_MODEL,
+            response.get("response", ""),
+            list(all_coins_data),
+        )
+
     def _build_coins_data(self, market_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Convert market snapshots to format expected by prompt service."""
         result = {}
@@ -117,25 +227,6 @@ class LLMDecisionBlock:
             }
         return result
 
-    def _parse_response(self, response: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-        """Parse LLM response into raw decisions."""
-        content = response.get("response", "")
-        if not content:
-            return {}
-
-        parsed = self.prompt_service.parse_multi_coin_response(content)
-        if not parsed:
-            return {}
-
-        if "decisions" in parsed:
-            return cast(Dict[str, Dict[str, Any]], parsed["decisions"])
-
-        first_key = next(iter(parsed.keys()), "")
-        if "/" in first_key or "USDT" in first_key:
-            return cast(Dict[str, Dict[str, Any]], parsed)
-
-        return {}
-
     def _validate_and_fix(
         self,
         symbol: str,
@@ -1,12 +1,14 @@
 """Block: Market Data - Fetches prices and calculates indicators."""
 
+import asyncio
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 from ..core.config import config
 from ..core.exchange_client import get_exchange_client
 from ..core.logger import get_logger
+from ..core.tracing import span
 from ..services.indicator_service import IndicatorService
 from ..services.market_data_service import MarketDataService
 from .block_indicators import IndicatorBlock
@@ -15,6 +17,9 @@ logger = get_logger(__name__)
 
 MIN_CANDLES_FOR_INDICATORS = 14
 
+# (paper_trading, symbol, candle close) -> fetch shared by every bot cycling on that candle
+_tick_fetches: Dict[Tuple[bool, str, float], "asyncio.Future[Optional[RawMarketData]]"] = {}
+
 
 @dataclass
 class MarketSnapshot:
@@ -53,10 +58,28 @@ class MarketSnapshot:
     signals: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class RawMarketData:
+    """Ticker and candles for one symbol, before indicators are calculated."""
+
+    symbol: str
+    ticker: Any
+    ohlcv_1h: Optional[list[Any]] = None
+    ohlcv_4h: Optional[list[Any]] = None
+
+
+def _forget_failed_fetch(key: Tuple[bool, str, float], fetch: "asyncio.Future[Optional[RawMarketData]]") -> None:
+    """Let the next bot on this tick retry instead of reusing a failure."""
+    if fetch.cancelled() or fetch.exception() is not None or fetch.result() is None:
+        if _tick_fetches.get(key) is fetch:
+            del _tick_fetches[key]
+
+
 class MarketDataBlock:
     """Fetches and processes market data for all trading symbols."""
 
     def __init__(self, paper_trading: bool = True):
+        self.paper_trading = paper_trading
         self.exchange = get_exchange_client(paper_trading=paper_trading)
         self.market_data_service = MarketDataService(self.exchange)
         self.indicator_service = IndicatorService()
@@ -65,14 +88,38 @@ class MarketDataBlock:
 
     async def fetch_all(self) -> dict[str, MarketSnapshot]:
         """Fetch market data for all configured symbols."""
-        snapshots: dict[str, MarketSnapshot] = {}
-        for symbol in self.symbols:
+        return self.build_snapshots(await self.fetch_all_raw())
+
+    async def fetch_all_raw(
+        self,
+        into: Optional[dict[str, RawMarketData]] = None,
+        tick: Optional[float] = None,
+        symbols: Optional[list[str]] = None,
+    ) -> dict[str, RawMarketData]:
+        """Fetch ticker and candles for all symbols, or only ``symbols`` (exchange I/O only).
+
+        Results are added to ``into`` as they arrive, so a caller that times the
+        fetch out still keeps the symbols fetched so far. With ``tick`` (the
+        candle close a cycle runs for) every bot on that tick shares one fetch.
+        """
+        raw: dict[str, RawMarketData] = {} if into is None else into
+        for symbol in self.symbols if symbols is None else symbols:
             try:
-                snapshot = await self._fetch_symbol(symbol)
-                if snapshot:
-                    snapshots[symbol] = snapshot
+                with span("market.fetch", symbol=symbol, shared=tick is not None):
+                    data = await self.fetch_raw(symbol, tick)
+                if data:
+                    raw[symbol] = data
             except Exception as e:
                 logger.error(f"Error fetching {symbol}: {e}")
+        return raw
+
+    def build_snapshots(self, raw: dict[str, RawMarketData]) -> dict[str, MarketSnapshot]:
+        """Calculate indicators on fetched data (CPU only)."""
+        snapshots: dict[str, MarketSnapshot] = {}
+        for symbol, data in raw.items():
+            snapshot = self.build_snapshot(data)
+            if snapshot is not None:
+                snapshots[symbol] = snapshot
 
         # Check if we have ANY market data
         if not snapshots:
@@ -82,14 +129,53 @@ class MarketDataBlock:
         logger.info(f"Fetched market data for {len(snapshots)} symbols")
         return snapshots
 
+    def build_snapshot(self, data: RawMarketData) -> Optional[MarketSnapshot]:
+        """Calculate indicators for one symbol (CPU only); None if that fails."""
+        try:
+            with span("indicators.compute", symbol=data.symbol):
+                return self._build_snapshot(data)
+        except Exception as e:
+            logger.error(f"Error calculating indicators for {data.symbol}: {e}")
+            return None
+
+    async def fetch_raw(self, symbol: str, tick: Optional[float] = None) -> Optional[RawMarketData]:
+        """Fetch one symbol; shared with the other bots on the same ``tick`` when given."""
+        if tick is None:
+            return await self._fetch_raw(symbol)
+        return await self._fetch_for_tick(symbol, tick)
+
     async def _fetch_symbol(self, symbol: str) -> Optional[MarketSnapshot]:
         """Fetch market data for a single symbol with Trinity indicators."""
+        data = await self._fetch_raw(symbol)
+        return self._build_snapshot(data) if data else None
+
+    async def _fetch_for_tick(self, symbol: str, tick: float) -> Optional[RawMarketData]:
+        """Join the fetch another bot started for this candle, or start it."""
+        key = (self.paper_trading, symbol, tick)
+        fetch = _tick_fetches.get(key)
+        if fetch is None:
+            for old in [k for k, f in _tick_fetches.items() if k[2] < tick and f.done()]:
+                del _tick_fetches[old]
+            fetch = asyncio.ensure_future(self._fetch_raw(symbol))
+            fetch.add_done_callback(lambda f: _forget_failed_fetch(key, f))
+            _tick_fetches[key] = fetch
+        # One bot's fetch deadline must not cancel the fetch for the others
+        return await asyncio.shield(fetch)
+
+    async def _fetch_raw(self, symbol: str) -> Optional[RawMarketData]:
+        """Fetch ticker plus 1h and 4h candles for one symbol."""
         ticker = await self.market_data_service.fetch_ticker(symbol)
         if not ticker:
             return None
 
         ohlcv_1h = await self.market_data_service.fetch_ohlcv(symbol, timeframe="1h", limit=250)
         ohlcv_4h = await self.market_data_service.fetch_ohlcv(symbol, timeframe="4h", limit=20)
+        return RawMarketData(symbol=symbol, ticker=ticker, ohlcv_1h=ohlcv_1h, ohlcv_4h=ohlcv_4h)
+
+    def _build_snapshot(self, data: RawMarketData) -> MarketSnapshot:
+        """Calculate legacy, Trinity and 4h indicators for one symbol."""
+        symbol, ticker = data.symbol, data.ticker
+        ohlcv_1h, ohlcv_4h = data.ohlcv_1h, data.ohlcv_4h
 
         # Calculate legacy indicators
         legacy_indicators = self._calculate_indicators(ohlcv_1h)
@@ -45,28 +45,33 @@ class PortfolioBlock:
         try:
             bot = await self._get_bot(db)  # type: ignore[arg-type]
             positions = await self._get_open_positions(db)  # type: ignore[arg-type]
-
-            cash = Decimal(str(bot.capital))
-            initial = Decimal(str(bot.initial_capital))
-
-            invested = sum((self._calculate_margin(p) for p in positions), Decimal(0))
-            unrealized_pnl = sum((p.unrealized_pnl for p in positions), Decimal(0))
-            equity = cash + invested + unrealized_pnl
-            return_pct = float((equity - initial) / initial * 100) if initial > 0 else 0
-
-            return PortfolioState(
-                cash=cash,
-                equity=equity,
-                initial_capital=initial,
-                unrealized_pnl=unrealized_pnl,
-                invested=invested,
-                return_pct=return_pct,
-                open_positions=positions,
-            )
+            return self.build_state(bot.capital, bot.initial_capital, positions)
         finally:
             if should_close and db is not None:
                 await db.close()
 
+    def build_state(
+        self, capital: Decimal, initial_capital: Decimal, positions: List[Position]
+    ) -> PortfolioState:
+        """Portfolio state from cash and open positions, without touching the database."""
+        cash = Decimal(str(capital))
+        initial = Decimal(str(initial_capital))
+
+        invested = sum((self._calculate_margin(p) for p in positions), Decimal(0))
+        unrealized_pnl = sum((p.unrealized_pnl for p in positions), Decimal(0))
+        equity = cash + invested + unrealized_pnl
+        return_pct = float((equity - initial) / initial * 100) if initial > 0 else 0
+
+        return PortfolioState(
+            cash=cash,
+            equity=equity,
+            initial_capital=initial,
+            unrealized_pnl=unrealized_pnl,
+            invested=invested,
+            return_pct=return_pct,
+            open_positions=positions,
+        )
+
     async def record_snapshot(self) -> None:
         """Record equity snapshot for dashboard chart."""
         try:
@@ -0,0 +1,95 @@
+"""Block: Tiered Decision - Trinity confluence screen, then LLM analysis of the shortlist."""
+
+from typing import Any, Dict, List, Optional
+
+from ..core.config import config
+from ..core.logger import get_logger
+from .block_llm_decision import LLMDecisionBlock, TradingDecision
+from .block_market_data import MarketSnapshot
+from .block_trinity_decision import TrinityDecisionBlock
+
+logger = get_logger(__name__)
+
+
+class TieredDecisionBlock:
+    """Screens every symbol with the cheap Trinity confluence score and sends only
+    the shortlist to the LLM.
+
+    Shortlist:
+    - Symbols with an open position (the LLM decides hold/close)
+    - Top-K symbols by weighted confluence with score >= min_score; the minimum sits
+      below Trinity's 0.5 entry threshold so near-misses get a second opinion
+
+    Trinity only scores longs, so each symbol is ranked by the stronger of its
+    long confluence and a mirrored bearish score; the LLM may go short.
+    """
+
+    def __init__(
+        self,
+        trinity: TrinityDecisionBlock,
+        llm: LLMDecisionBlock,
+        shortlist_size: Optional[int] = None,
+        min_score: Optional[float] = None,
+    ) -> None:
+        self.trinity = trinity
+        self.llm = llm
+        self.shortlist_size = shortlist_size or config.LLM_TIERED_SHORTLIST_SIZE
+        self.min_score = config.LLM_TIERED_MIN_SCORE if min_score is None else min_score
+
+    async def get_decisions(
+        self,
+        market_data: Dict[str, MarketSnapshot],
+        portfolio_context: Dict[str, Any],
+    ) -> Dict[str, TradingDecision]:
+        """Screen all symbols, then ask the LLM about the shortlist only."""
+        held = {getattr(p, "symbol", None) for p in portfolio_context.get("positions", [])}
+        shortlist = self.screen(market_data, held)
+        if not shortlist:
+            logger.info(f"[TIERED] No candidates among {len(market_data)} symbols, skipping LLM")
+            return {}
+
+        logger.info(f"[TIERED] {len(shortlist)}/{len(market_data)} symbols to LLM: {', '.join(shortlist)}")
+        return await self.llm.get_decisions(
+            market_data={symbol: market_data[symbol] for symbol in shortlist},
+            portfolio_context=portfolio_context,
+        )
+
+    def screen(self, market_data: Dict[str, MarketSnapshot], held: set[Any]) -> List[str]:
+        """Held symbols plus the best-scoring candidates, in market_data order."""
+        scores: Dict[str, float] = {}
+        for symbol, snapshot in market_data.items():
+            if not snapshot.signals:  # No Trinity indicators calculated
+                continue
+            long_score = self.trinity._analyze_confluence(symbol, snapshot).confidence
+            scores[symbol] = max(long_score, self.short_score(snapshot))
+
+        ranked = sorted(
+            (s for s, score in scores.items() if score >= self.min_score and s not in held),
+            key=lambda s: scores[s],
+            reverse=True,
+        )
+        selected = set(ranked[: self.shortlist_size]) | (held & set(market_data))
+        return [symbol for symbol in market_data if symbol in selected]
+
+    @staticmethod
+    def short_score(snapshot: MarketSnapshot) -> float:
+        """Bearish counterpart of Trinity's weighted confluence (0-1), same category weights."""
+        signals = snapshot.signals or {}
+        price = float(snapshot.price)
+        bearish = snapshot.trend == "bearish" or snapshot.supertrend_signal == "sell"
+
+        regime = bool(snapshot.sma_200) and price < snapshot.sma_200  # Below the 200 SMA
+        trend = bool(signals.get("trend_strength")) and bearish  # ADX > 25, pointing down
+        entry = bool(snapshot.ema_20) and price < snapshot.ema_20  # Rally rejected at the EMA zone
+        momentum = (snapshot.rsi or 50) >= 60 or snapshot.supertrend_signal == "sell"
+        volume = bool(signals.get("volume_confirmed"))
+        volatility = bool(signals.get("bollinger_expansion"))
+
+        return (
+            0.25 * regime
+            + 0.20 * trend
+            + 0.20 * entry
+            + 0.20 * momentum
+            + 0.10 * volume
+            + 0.05 * volatility
+        )
@@ -0,0 +1,210 @@
+"""Cycle-scoped unit of work: one session, one load, one write transaction."""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.database import AsyncSessionLocal
+from ..core.leader_election import StaleFencingTokenError, claim_fence
+from ..core.logger import get_logger
+from ..models.bot import Bot, BotStatus
+from ..models.equity_snapshot import EquitySnapshot
+from ..models.position import Position, PositionStatus
+from ..models.trade import Trade
+from ..services.position_service import PositionService
+from .block_portfolio import PortfolioBlock, PortfolioState
+
+logger = get_logger(__name__)
+
+# Run once a close is committed (memory, notifications); never before
+AfterCommit = Callable[[], Awaitable[None]]
+
+
+class CycleUnitOfWork:
+    """Loads the bot and its open positions once per cycle and buffers all writes.
+
+    Blocks read portfolio state from memory, kept current as positions are marked,
+    opened and closed, and ``commit`` writes everything (price marks, new
+    positions, closes, trades, the capital change and the equity snapshot) in one
+    transaction. Nothing is locked between load and commit: capital is applied as
+    an increment and closes only apply to positions still open at the version
+    loaded, so a close by the exit monitor in the meantime is neither overwritten
+    nor counted twice.
+
+    A failed commit keeps the buffer, so the commit on exit retries it; if that
+    fails too the cycle fails with the error.
+    """
+
+    def __init__(
+        self,
+        bot_id: uuid.UUID,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+        fencing_token: Optional[int] = None,
+    ) -> None:
+        self.bot_id = bot_id
+        self.fencing_token = fencing_token
+        self._session_factory = session_factory or AsyncSessionLocal
+        self.db: Optional[AsyncSession] = None
+        self.bot: Optional[Bot] = None
+        self.cash = Decimal(0)
+        self.positions: List[Position] = []
+        self._portfolio = PortfolioBlock(bot_id)
+        self._reset()
+
+    def _reset(self) -> None:
+        self._price_marks: Dict[uuid.UUID, Decimal] = {}
+        self._opened: List[Tuple[Position, Trade, Decimal]] = []
+        self._closed: List[Tuple[Position, Trade, Decimal, Optional[AfterCommit]]] = []
+        self._snapshot: Optional[EquitySnapshot] = None
+
+    async def __aenter__(self) -> "CycleUnitOfWork":
+        self.db = self._session_factory()
+        await self.load()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Optional[BaseException], tb: Any) -> None:
+        # Executions already happened even if a later stage failed: persist them,
+        # retrying a commit that failed during the cycle (unless a newer leader took over)
+        try:
+            if not isinstance(exc, StaleFencingTokenError):
+                await self.commit()
+        finally:
+            if self.db is not None:
+                await self.db.close()
+
+    async def load(self) -> None:
+        """Read the bot and its open positions, then end the read transaction."""
+        assert self.db is not None
+        result = await self.db.execute(select(Bot).where(Bot.id == self.bot_id))
+        self.bot = result.scalar_one_or_none()
+        result = await self.db.execute(
+            select(Position).where(
+                Position.bot_id == self.bot_id,
+                Position.status == PositionStatus.OPEN,
+            )
+        )
+        self.positions = list(result.scalars().all())
+        self.cash = Decimal(str(self.bot.capital)) if self.bot else Decimal(0)
+        await self.db.commit()
+        # Detach so in-memory changes are never flushed implicitly
+        self.db.expunge_all()
+
+    @property
+    def is_active(self) -> bool:
+        return self.bot is not None and self.bot.status == BotStatus.ACTIVE.value
+
+    @property
+    def has_pending_writes(self) -> bool:
+        return bool(self._price_marks or self._opened or self._closed or self._snapshot)
+
+    def state(self) -> PortfolioState:
+        """Current portfolio state, including this cycle's executions."""
+        initial = self.bot.initial_capital if self.bot else Decimal(0)
+        return self._portfolio.build_state(self.cash, initial, list(self.positions))
+
+    def mark_prices(self, prices: Mapping[str, Decimal]) -> None:
+        """Update open positions' prices; only changed prices are written."""
+        changes = PositionService.changed_prices(self.positions, prices)
+        for position in self.positions:
+            if position.id in changes:
+                position.current_price = changes[position.id]
+        self._price_marks.update(changes)
+
+    def add_open(self, position: Position, trade: Trade, debit: Decimal) -> None:
+        """Record a new position and its entry trade; ``debit`` is margin plus fees."""
+        self.positions.append(position)
+        self.cash -= debit
+        self._opened.append((position, trade, debit))
+
+    def add_close(
+        self, position: Position, trade: Trade, credit: Decimal, after_commit: Optional[AfterCommit] = None
+    ) -> None:
+        """Record a close and its exit trade; ``credit`` is margin plus PnL minus fees.
+
+        ``after_commit`` runs only once the close is written.
+        """
+        self.positions = [p for p in self.positions if p.id != position.id]
+        self._price_marks.pop(position.id, None)
+        self.cash += credit
+        self._closed.append((position, trade, credit, after_commit))
+
+    def is_open(self, position_id: uuid.UUID) -> bool:
+        return any(p.id == position_id for p in self.positions)
+
+    def add_snapshot(self) -> PortfolioState:
+        """Record an equity snapshot of the current state."""
+        state = self.state()
+        self._snapshot = EquitySnapshot(
+            bot_id=self.bot_id,
+            equity=state.equity,
+            cash=state.cash,
+            unrealized_pnl=state.unrealized_pnl,
+        )
+        return state
+
+    async def commit(self) -> None:
+        """Write all buffered changes in one transaction; on failure the buffer is kept."""
+        if self.db is None or not self.has_pending_writes:
+            return
+
+        db = self.db
+        capital_delta = Decimal(0)
+        committed: List[AfterCommit] = []
+        try:
+            if self.fencing_token is not None:
+                await claim_fence(db, self.bot_id, self.fencing_token)
+
+            if self._price_marks:
+                await PositionService(db).bulk_update_prices(self._price_marks, commit=False)
+
+            for position, trade, credit, after_commit in self._closed:
+                result = await db.execute(
+                    update(Position)
+                    .where(
+                        Position.id == position.id,
+                        Position.status == PositionStatus.OPEN,
+                        Position.version == position.version,
+                    )
+                    .values(
+                        status=PositionStatus.CLOSED,
+                        current_price=position.current_price,
+                        closed_at=position.closed_at,
+                        version=Position.version + 1,
+                    )
+                )
+                if result.rowcount == 0:
+                    logger.warning(f"{position.symbol} was closed elsewhere, dropping this cycle's close")
+                    continue
+                db.add(trade)
+                capital_delta += credit
+                if after_commit is not None:
+                    committed.append(after_commit)
+
+            for position, trade, debit in self._opened:
+                db.add(position)
+                capital_delta -= debit
+            await db.flush()
+            db.add_all(trade for _, trade, _ in self._opened)
+
+            if capital_delta:
+                await db.execute(
+                    update(Bot).where(Bot.id == self.bot_id).values(capital=Bot.capital + capital_delta)
+                )
+            if self._snapshot is not None:
+                db.add(self._snapshot)
+
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        self._reset()
+
+        for after_commit in committed:
+            try:
+                await after_commit()
+            except Exception as e:
+                logger.warning(f"Post-commit hook failed: {e}")
@@ -4,23 +4,32 @@ import asyncio
 import uuid
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Optional, Union
+from time import monotonic, time
+from typing import Any, Iterable, Optional, Union
 
-from sqlalchemy import select, text
+from sqlalchemy import select
 
 from ..core.activity_logger import ActivityLogger
+from ..core.config import config
+from ..core.cycle_budget import CycleBudget
+from ..core.cycle_clock import CycleClock
 from ..core.database import AsyncSessionLocal
+from ..core.leader_election import StaleFencingTokenError
 from ..core.llm_client import LLMClient
 from ..core.logger import get_logger
+from ..core.tracing import get_cycle_tracer, span
 from ..models.bot import Bot, BotStatus
 from ..models.signal import SignalType
+from ..services.position_service import PositionService
 from .block_execution import ExecutionBlock
 from .block_indicator_decision import IndicatorDecisionBlock
 from .block_llm_decision import LLMDecisionBlock
-from .block_market_data import MarketDataBlock
-from .block_portfolio import PortfolioBlock
+from .block_market_data import MarketDataBlock, MarketSnapshot, RawMarketData
+from .block_portfolio import PortfolioBlock, PortfolioState
 from .block_risk import RiskBlock
+from .block_tiered_decision import TieredDecisionBlock
 from .block_trinity_decision import TrinityDecisionBlock
+from .cycle_unit_of_work import CycleUnitOfWork
 
 logger = get_logger(__name__)
 
@@ -35,10 +44,15 @@ class TradingOrchestrator:
         bot_id: uuid.UUID,
         cycle_interval: int = 180,
         llm_client: Optional[LLMClient] = None,
-        decision_mode: str = "trinity",  # "indicator", "llm", or "trinity"
+        decision_mode: str = "trinity",  # "indicator", "llm", "trinity" or "tiered"
         paper_trading: bool = True,  # Connect to OKX live or paper trading
+        fencing_token: Optional[int] = None,  # Scheduler leader's term, checked on every write
+        clock: Optional[CycleClock] = None,  # Shared candle-aligned clock; None = sleep per bot
     ):
         self.bot_id = bot_id
+        self.fencing_token = fencing_token
+        self.clock = clock
+        self._tick: Optional[float] = None  # Candle close the current cycle runs for
         self.cycle_interval = cycle_interval
         self.decision_mode = decision_mode.lower()
         self.paper_trading = paper_trading
@@ -54,10 +68,15 @@ class TradingOrchestrator:
         self.llm_decision = LLMDecisionBlock(llm_client=llm_client, bot_id=bot_id) if llm_client else None
 
         # Set active decision block
-        self.decision: Union[LLMDecisionBlock, TrinityDecisionBlock, IndicatorDecisionBlock]
+        self.decision: Union[
+            LLMDecisionBlock, TieredDecisionBlock, TrinityDecisionBlock, IndicatorDecisionBlock
+        ]
         if self.decision_mode == "llm" and self.llm_decision:
             self.decision = self.llm_decision
             logger.info(f"🧠 Using LLM-based decision mode + Trade Filter + Memory")
+        elif self.decision_mode == "tiered" and self.llm_decision:
+            self.decision = TieredDecisionBlock(self.trinity_decision, self.llm_decision)
+            logger.info(f"🔀 Using tiered mode (Trinity screen -> LLM on shortlist)")
         elif self.decision_mode == "trinity":
             self.decision = self.trinity_decision
             logger.info(f"📈 Using Trinity indicator framework (confluence scoring)")
@@ -66,7 +85,22 @@ class TradingOrchestrator:
             logger.info(f"📊 Using legacy indicator-based decision mode")
 
         self.risk = RiskBlock()
-        self.execution = ExecutionBlock(bot_id, paper_trading=paper_trading)
+        self.execution = ExecutionBlock(bot_id, paper_trading=paper_trading, fencing_token=fencing_token)
+
+        # Last-known market data (with fetch time) for degraded cycles
+        self._last_market_data: dict[str, tuple[MarketSnapshot, float]] = {}
+        # Held from entry sizing to execution so concurrent symbol pipelines see each other's entries
+        self._capital_lock = asyncio.Lock()
+        self._cycle_started: Optional[float] = None
+        self._first_order_seconds: Optional[float] = None
+        self._data_ready_seconds: Optional[float] = None
+        # Market data fetched ahead of the next cycle: (task -> (snapshots, fetched at), tick)
+        self._prefetch_task: Optional[asyncio.Task[tuple[dict[str, MarketSnapshot], float]]] = None
+        self._prefetch_tick: Optional[float] = None
+        self._prefetched_symbols = 0
+        self.last_cycle_report: Optional[dict[str, Any]] = None
+        self.tracer = get_cycle_tracer(bot_id)
+        self._uow: Optional[CycleUnitOfWork] = None
 
     async def start(self) -> None:
         """Start the trading loop."""
@@ -75,29 +109,42 @@ class TradingOrchestrator:
 
         while self._running:
             try:
-                if not await self._is_bot_active():
+                cycle_start = datetime.utcnow()
+                if not await self._run_cycle():
                     logger.warning("Bot is not active, stopping orchestrator")
                     break
-
-                cycle_start = datetime.utcnow()
-                await self._run_cycle()
                 cycle_time = (datetime.utcnow() - cycle_start).total_seconds()
                 logger.info(f"Cycle completed in {cycle_time:.1f}s")
 
+                if self.clock is not None:
+                    fire_at, candle_close = self.clock.next_fire(self.bot_id, self.cycle_interval, time())
+                    # The candle must have closed before its data is worth fetching
+                    start_at = max(fire_at - config.PREFETCH_LEAD_SECONDS, candle_close + self.clock.close_offset)
+                    self._schedule_prefetch(start_at - time(), candle_close)
+                    self._tick = await self.clock.wait(self.bot_id, self.cycle_interval)
+                    continue
+
                 sleep_time = max(0, self.cycle_interval - cycle_time)
+                self._schedule_prefetch(sleep_time - config.PREFETCH_LEAD_SECONDS, None)
                 if sleep_time > 0:
                     await asyncio.sleep(sleep_time)
 
             except asyncio.CancelledError:
                 logger.info("Trading orchestrator cancelled")
                 break
+            except StaleFencingTokenError as e:
+                logger.error(f"{e}: another scheduler runs this bot now, stopping orchestrator")
+                break
             except Exception as e:
                 logger.error(f"Error in trading cycle: {e}")
+                self._cancel_prefetch()
+                self._tick = None  # The retry runs off-clock with its own fetch
                 await asyncio.sleep(RETRY_DELAY)
 
     async def stop(self) -> None:
         """Stop the trading loop."""
         self._running = False
+        self._cancel_prefetch()
         if self._task:
             self._task.cancel()
             try:
@@ -115,21 +162,75 @@ class TradingOrchestrator:
                 return False
             return bot.status == BotStatus.ACTIVE.value
 
-    async def _run_cycle(self) -> None:
-        """Execute one complete trading cycle."""
-        market_data = await self.market_data.fetch_all()
+    async def _run_cycle(self) -> bool:
+        """Execute one complete trading cycle within the cycle budget.
+
+        Returns False if the bot is no longer active. With the cycle unit of work,
+        the bot and its positions are read once and all writes land in one transaction.
+        """
+        budget = CycleBudget.for_interval(self.cycle_interval)
+        self._cycle_started = budget.started_at
+        self._first_order_seconds = None
+        self._data_ready_seconds = None
+        self._prefetched_symbols = 0
+        with self.tracer.cycle(decision_mode=self.decision_mode, pipelined=self.pipelined) as root:
+            try:
+                if not config.CYCLE_UNIT_OF_WORK_ENABLED:
+                    if not await self._is_bot_active():
+                        return False
+                    await self._run_stages(budget)
+                    return True
+
+                async with CycleUnitOfWork(self.bot_id, fencing_token=self.fencing_token) as uow:
+                    if not uow.is_active:
+                        return False
+                    self._uow = uow
+                    await self._run_stages(budget)
+                return True
+            finally:
+                self._uow = None
+                self.last_cycle_report = budget.report()
+                self.last_cycle_report["first_order_seconds"] = self._first_order_seconds
+                self.last_cycle_report["data_ready_seconds"] = self._data_ready_seconds
+                self.last_cycle_report["prefetched_symbols"] = self._prefetched_symbols
+                if root is not None:
+                    root.attributes["overruns"] = ",".join(budget.overruns)
+                    root.attributes["prefetched_symbols"] = self._prefetched_symbols
+                    if self._data_ready_seconds is not None:
+                        root.attributes["data_ready_seconds"] = round(self._data_ready_seconds, 3)
+                    if self._first_order_seconds is not None:
+                        root.attributes["first_order_seconds"] = round(self._first_order_seconds, 3)
+
+    @property
+    def pipelined(self) -> bool:
+        """Per-symbol pipelines need a decision that looks at one symbol at a time."""
+        return config.PIPELINED_CYCLES_ENABLED and self.decision_mode in ("trinity", "indicator")
+
+    async def _run_stages(self, budget: CycleBudget) -> None:
+        """Fetch, exits, decide, execute, snapshot; each stage under its deadline."""
+        if self.pipelined:
+            await self._run_pipelined(budget)
+            return
+
+        market_data = await self._fetch_market_data(budget)
         if not market_data:
             logger.warning("No market data available, skipping cycle")
             return
 
-        portfolio_state = await self.portfolio.get_state()
+        portfolio_state = await self._portfolio_state()
         logger.info(
             f"Portfolio: Cash ${float(portfolio_state.cash):,.2f} | "
             f"Equity ${float(portfolio_state.equity):,.2f} | "
             f"Positions: {len(portfolio_state.open_positions)}"
         )
 
-        await self._check_exits(portfolio_state.open_positions, market_data)
+        # Exits protect capital: timed and reported, never cut short
+        exits_start = monotonic()
+        exits_deadline = budget.deadline_for("exits")
+        with span("exits", positions=len(portfolio_state.open_positions)):
+            await self._check_exits(portfolio_state.open_positions, market_data)
+        exits_seconds = monotonic() - exits_start
+        budget.record("exits", exits_seconds, exits_deadline, timed_out=exits_seconds > exits_deadline)
 
         portfolio_context = {
             "cash": float(portfolio_state.cash),
@@ -138,43 +239,320 @@ class TradingOrchestrator:
             "positions": portfolio_state.open_positions,
         }
 
-        decisions = await self.decision.get_decisions(
-            market_data=market_data,
-            portfolio_context=portfolio_context,
-        )
+        if config.LLM_STREAMING_ENABLED and isinstance(self.decision, LLMDecisionBlock):
+            await self._run_streamed_decisions(self.decision, market_data, portfolio_context, budget)
+        else:
+            decisions = await budget.run(
+                "decision",
+                self.decision.get_decisions(market_data=market_data, portfolio_context=portfolio_context),
+            )
+            if budget.timed_out("decision") and self.decision is not self.trinity_decision:
+                logger.warning("Decision stage timed out, falling back to Trinity signals")
+                decisions = await self.trinity_decision.get_decisions(market_data, portfolio_context)
+
+            if decisions:
+                portfolio_state = await self._portfolio_state()
+                await self._execute_decisions(decisions.values(), market_data, portfolio_state, budget)
+
+        await self._record_snapshot(budget)
+
+    async def _run_pipelined(self, budget: CycleBudget) -> None:
+        """Run every symbol through fetch, indicators, exits, decision, risk and execution
+        concurrently, so a slow symbol no longer holds back the others' orders."""
+        prefetched = await self._take_prefetched(budget)
+        portfolio_state = await self._portfolio_state()
+        data_deadline = budget.deadline_for("fetch") + budget.deadline_for("indicators")
+        start = monotonic()
+        with span("pipeline", symbols=len(self.market_data.symbols)):
+            await asyncio.gather(*(
+                self._run_symbol(symbol, portfolio_state, budget, data_deadline, prefetched.get(symbol))
+                for symbol in self.market_data.symbols
+            ))
+        budget.record("pipeline", monotonic() - start, budget.total_seconds)
+        await self._record_snapshot(budget)
+
+    async def _run_symbol(
+        self,
+        symbol: str,
+        portfolio_state: PortfolioState,
+        budget: CycleBudget,
+        data_deadline: float,
+        prefetched: Optional[MarketSnapshot] = None,
+    ) -> None:
+        """One symbol's pipeline; errors stay with the symbol."""
+        try:
+            snapshot = prefetched or await self._symbol_snapshot(symbol, budget, data_deadline)
+            self._data_ready_seconds = max(self._data_ready_seconds or 0.0, budget.elapsed)
+            if snapshot is None:
+                return
+            market_data = {symbol: snapshot}
+
+            positions = [p for p in portfolio_state.open_positions if p.symbol == symbol]
+            if self._uow is not None:
+                positions = [p for p in positions if self._uow.is_open(p.id)]
+            with span("exits", symbol=symbol, positions=len(positions)):
+                await self._check_exits(positions, market_data)
+
+            state = await self._portfolio_state() if self._uow is not None else portfolio_state
+            portfolio_context = {
+                "cash": float(state.cash),
+                "equity": float(state.equity),
+                "return_pct": state.return_pct,
+                "positions": state.open_positions,
+            }
+            decisions = await budget.run(
+                "decision",
+                self.decision.get_decisions(market_data=market_data, portfolio_context=portfolio_context),
+            )
+            for decision in (decisions or {}).values():
+                await self._execute_decision(decision, market_data, state)
+        except StaleFencingTokenError:
+            raise
+        except Exception as e:
+            logger.error(f"Pipeline error for {symbol}: {e}")
+
+    async def _symbol_snapshot(
+        self, symbol: str, budget: CycleBudget, data_deadline: float
+    ) -> Optional[MarketSnapshot]:
+        """Fetch and compute one symbol within the data deadline, else its recent last-known snapshot."""
+        start = monotonic()
+        snapshot: Optional[MarketSnapshot] = None
+        try:
+            with span("market.fetch", symbol=symbol, shared=self._tick is not None):
+                raw = await asyncio.wait_for(self.market_data.fetch_raw(symbol, self._tick), timeout=data_deadline)
+            if raw is not None:
+                remaining = max(0.0, data_deadline - (monotonic() - start))
+                snapshot = await asyncio.wait_for(
+                    asyncio.to_thread(self.market_data.build_snapshot, raw), timeout=remaining
+                )
+        except asyncio.TimeoutError:
+            budget.record("fetch", monotonic() - start, data_deadline, timed_out=True)
+
+        now = monotonic()
+        if snapshot is not None:
+            self._last_market_data[symbol] = (snapshot, now)
+            return snapshot
+
+        last = self._last_market_data.get(symbol)
+        if last and now - last[1] <= config.STALE_MARKET_DATA_MAX_AGE_SECONDS:
+            logger.warning(f"Using last-known market data for {symbol}")
+            return last[0]
+        return None
+
+    def _schedule_prefetch(self, delay: float, tick: Optional[float]) -> None:
+        """Start fetching the next cycle's market data ``delay`` seconds from now."""
+        self._cancel_prefetch()
+        if config.PREFETCH_ENABLED:
+            self._prefetch_tick = tick
+            self._prefetch_task = asyncio.create_task(self._prefetch(max(0.0, delay), tick))
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+            self._prefetch_task = None
+
+    async def _prefetch(self, delay: float, tick: Optional[float]) -> tuple[dict[str, MarketSnapshot], float]:
+        """Fetch tickers and candles and compute indicators; returns snapshots and when they were ready.
+
+        Symbols still fetching at the timeout are left to the cycle.
+        """
+        await asyncio.sleep(delay)
+        raw: dict[str, RawMarketData] = {}
+        try:
+            await asyncio.wait_for(
+                self.market_data.fetch_all_raw(into=raw, tick=tick), timeout=config.PREFETCH_MAX_AGE_SECONDS
+            )
+        except asyncio.TimeoutError:
+            logger.info(f"Prefetch timed out with {len(raw)}/{len(self.market_data.symbols)} symbols")
+        snapshots = await asyncio.to_thread(self.market_data.build_snapshots, raw)
+        return snapshots, monotonic()
 
-        if decisions:
-            portfolio_state = await self.portfolio.get_state()
-            for decision in decisions.values():
+    async def _take_prefetched(self, budget: CycleBudget) -> dict[str, MarketSnapshot]:
+        """Snapshots prefetched for this cycle if still fresh; empty means fetch as usual.
+
+        A prefetch still in flight is awaited under the fetch deadline rather than
+        started over.
+        """
+        task, self._prefetch_task = self._prefetch_task, None
+        if task is None:
+            return {}
+        if self._prefetch_tick != self._tick:
+            task.cancel()  # Prefetched for a different candle
+            return {}
+        try:
+            result = await budget.run("fetch", task) if not task.done() else task.result()
+        except Exception as e:
+            logger.warning(f"Prefetch failed, fetching at cycle start: {e}")
+            return {}
+        if result is None:
+            return {}
+
+        snapshots, fetched_at = result
+        age = monotonic() - fetched_at
+        if age > config.PREFETCH_MAX_AGE_SECONDS:
+            logger.info(f"Prefetched market data is {age:.0f}s old, refetching")
+            return {}
+
+        for symbol, snapshot in snapshots.items():
+            self._last_market_data[symbol] = (snapshot, fetched_at)
+        self._prefetched_symbols = len(snapshots)
+        return dict(snapshots)
+
+    async def _portfolio_state(self) -> PortfolioState:
+        """Current state from the cycle's unit of work, or read from the database without one."""
+        if self._uow is not None:
+            return self._uow.state()
+        return await self.portfolio.get_state()
+
+    async def _record_snapshot(self, budget: CycleBudget) -> None:
+        """Record the equity snapshot; with a unit of work, also write the cycle's changes."""
+        # Writes must not be cancelled halfway: the stage is timed, never cut short
+        start = monotonic()
+        deadline = budget.deadline_for("snapshot")
+        with span("snapshot", deadline_seconds=round(deadline, 3)):
+            if self._uow is None:
+                await self.portfolio.record_snapshot()
+            else:
+                state = self._uow.add_snapshot()
+                try:
+                    await self._uow.commit()
+                    logger.info(
+                        f"Equity: ${float(state.equity):,.2f} "
+                        f"(cash: ${float(state.cash):,.2f}, unrealized: ${float(state.unrealized_pnl):,.2f})"
+                    )
+                except StaleFencingTokenError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Error writing cycle changes: {e}")
+        seconds = monotonic() - start
+        budget.record("snapshot", seconds, deadline, timed_out=seconds > deadline)
+
+    async def _fetch_market_data(self, budget: CycleBudget) -> dict[str, MarketSnapshot]:
+        """Fetch and compute snapshots; fill timed-out symbols with recent last-known data.
+
+        Only symbols the prefetch did not deliver are fetched at cycle start.
+        """
+        market_data = await self._take_prefetched(budget)
+        missing = [symbol for symbol in self.market_data.symbols if symbol not in market_data]
+        if missing:
+            raw: dict[str, RawMarketData] = {}
+            await budget.run("fetch", self.market_data.fetch_all_raw(into=raw, tick=self._tick, symbols=missing))
+            fetched = await budget.run(
+                "indicators", asyncio.to_thread(self.market_data.build_snapshots, dict(raw)), fallback={}
+            ) or {}
+            market_data.update(fetched)
+        self._data_ready_seconds = budget.elapsed
+
+        now = monotonic()
+        for symbol, snapshot in market_data.items():
+            self._last_market_data[symbol] = (snapshot, now)
+
+        stale = [
+            symbol for symbol, (_, fetched_at) in self._last_market_data.items()
+            if symbol not in market_data and now - fetched_at <= config.STALE_MARKET_DATA_MAX_AGE_SECONDS
+        ]
+        if stale:
+            logger.warning(f"Using last-known market data for {', '.join(stale)}")
+            for symbol in stale:
+                market_data[symbol] = self._last_market_data[symbol][0]
+        return market_data
+
+    async def _execute_decisions(
+        self,
+        decisions: Iterable[Any],
+        market_data: dict[str, Any],
+        portfolio_state: Any,
+        budget: CycleBudget,
+    ) -> None:
+        """Execute decisions in order; stop starting new ones once the stage deadline passes.
+
+        Orders in flight are never cancelled, only the remaining ones are skipped.
+        """
+        start = monotonic()
+        deadline = budget.deadline_for("execution")
+        pending = list(decisions)
+        with span("execution", decisions=len(pending)):
+            for index, decision in enumerate(pending):
+                if monotonic() - start >= deadline:
+                    skipped = [getattr(d, "symbol", "?") for d in pending[index:]]
+                    logger.warning(f"Execution budget spent, skipping {', '.join(skipped)}")
+                    budget.record("execution", monotonic() - start, deadline, timed_out=True)
+                    return
                 await self._execute_decision(decision, market_data, portfolio_state)
+        budget.record("execution", monotonic() - start, deadline)
 
-        await self.portfolio.record_snapshot()
+    async def _run_streamed_decisions(
+        self,
+        llm_decision: LLMDecisionBlock,
+        market_data: dict[str, Any],
+        portfolio_context: dict[str, Any],
+        budget: CycleBudget,
+    ) -> None:
+        """Execute each LLM decision as soon as it streams in.
+
+        The decision deadline bounds only the wait for the next decision: once
+        it is spent the stream is dropped, but an order already being placed
+        is never cancelled.
+        """
+        portfolio_state = await self._portfolio_state()
+        deadline = budget.deadline_for("decision")
+        waited = 0.0
+        stream = llm_decision.stream_decisions(market_data=market_data, portfolio_context=portfolio_context)
+        try:
+            with span("decision", deadline_seconds=round(deadline, 3), streamed=True):
+                while True:
+                    start = monotonic()
+                    try:
+                        decision = await asyncio.wait_for(anext(stream), timeout=max(0.0, deadline - waited))
+                    except StopAsyncIteration:
+                        break
+                    except asyncio.TimeoutError:
+                        budget.record("decision", deadline, deadline, timed_out=True)
+                        return
+                    finally:
+                        waited += monotonic() - start
+                    await self._execute_decision(decision, market_data, portfolio_state)
+        finally:
+            await stream.aclose()
+        budget.record("decision", waited, deadline)
 
     async def _check_exits(self, positions: list[Any], market_data: dict[str, Any]) -> None:
         """Check if any positions should be closed and update current prices."""
+        await self._update_position_prices(positions, market_data)
+
         for position in positions:
             if position.symbol not in market_data:
                 continue
 
             current_price = market_data[position.symbol].price
-            await self._update_position_price(position, current_price)
-
             should_exit, reason = self.risk.check_exit_conditions(position, current_price)
             if should_exit:
                 logger.info(f"Exit triggered for {position.symbol}: {reason}")
-                await self.execution.close_position(position, current_price, reason)
+                with span("execution.close", symbol=position.symbol, reason=reason):
+                    await self.execution.close_position(
+                        position, current_price, reason, uow=self._uow,
+                        candles=getattr(market_data[position.symbol], "ohlcv_1h", None),
+                    )
+
+    async def _update_position_prices(self, positions: list[Any], market_data: dict[str, Any]) -> None:
+        """Mark changed positions to market in a single session and bulk UPDATE."""
+        if self._uow is not None:
+            self._uow.mark_prices({symbol: snapshot.price for symbol, snapshot in market_data.items()})
+            return
 
-    async def _update_position_price(self, position: Any, current_price: Decimal) -> None:
-        """Update position with current market price."""
+        changes = PositionService.changed_prices(
+            positions, {symbol: snapshot.price for symbol, snapshot in market_data.items()}
+        )
+        if not changes:
+            return
         try:
             async with AsyncSessionLocal() as db:
-                await db.execute(
-                    text("UPDATE positions SET current_price = :price WHERE id = :id"),
-                    {"price": float(current_price), "id": str(position.id)},
-                )
-                await db.commit()
+                await PositionService(db).bulk_update_prices(changes)
+            for position in positions:
+                if position.id in changes:
+                    position.current_price = changes[position.id]
         except Exception as e:
-            logger.warning(f"Failed to update position: {e}")
+            logger.warning(f"Failed to update position prices: {e}")
 
     async def _execute_decision(self, decision: Any, market_data: dict[str, Any], portfolio_state: Any) -> None:
         """Validate and execute a single decision."""
@@ -189,10 +567,18 @@ class TradingOrchestrator:
         if signal_str not in ["buy_to_enter", SignalType.BUY_TO_ENTER.value, "sell_to_enter", SignalType.SELL_TO_ENTER.value]:
             return
 
-        if self._has_position(decision.symbol, portfolio_state.open_positions):
+        if decision.symbol not in market_data:
             return
 
-        if decision.symbol not in market_data:
+        # Sizing reads cash and positions that another symbol's entry may be changing
+        async with self._capital_lock:
+            if self._uow is not None or self.pipelined:
+                portfolio_state = await self._portfolio_state()
+            await self._open_entry(decision, market_data, portfolio_state)
+
+    async def _open_entry(self, decision: Any, market_data: dict[str, Any], portfolio_state: Any) -> None:
+        """Size, validate and open an entry; called with the capital lock held."""
+        if self._has_position(decision.symbol, portfolio_state.open_positions):
             return
 
         current_price = market_data[decision.symbol].price
@@ -210,32 +596,38 @@ class TradingOrchestrator:
         if not isinstance(take_profit, Decimal):
             take_profit = Decimal(str(take_profit)) if take_profit else Decimal("0")
 
-        validation = self.risk.validate_entry(
-            symbol=decision.symbol,
-            side=side,
-            size_pct=decision.size_pct,
-            entry_price=current_price,
-            stop_loss=stop_loss,
-            take_profit=take_profit,
-            capital=portfolio_state.equity,
-            current_positions=portfolio_state.open_positions,
-        )
+        with span("risk.validate", symbol=decision.symbol):
+            validation = self.risk.validate_entry(
+                symbol=decision.symbol,
+                side=side,
+                size_pct=decision.size_pct,
+                entry_price=current_price,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                capital=portfolio_state.equity,
+                current_positions=portfolio_state.open_positions,
+            )
 
         if not validation.is_valid:
             logger.info(f"{decision.symbol}: {validation.reason}")
             return
 
-        result = await self.execution.open_position(
-            symbol=decision.symbol,
-            side=side,
-            size_pct=decision.size_pct,
-            entry_price=current_price,
-            stop_loss=stop_loss if stop_loss and stop_loss > 0 else Decimal("0"),
-            take_profit=take_profit if take_profit and take_profit > 0 else Decimal("0"),
-            leverage=getattr(decision, 'leverage', 1),
-        )
+        with span("execution.open", symbol=decision.symbol, side=side):
+            result = await self.execution.open_position(
+                symbol=decision.symbol,
+                side=side,
+                size_pct=decision.size_pct,
+                entry_price=current_price,
+                stop_loss=stop_loss if stop_loss and stop_loss > 0 else Decimal("0"),
+                take_profit=take_profit if take_profit and take_profit > 0 else Decimal("0"),
+                leverage=getattr(decision, 'leverage', 1),
+                uow=self._uow,
+                candles=getattr(market_data[decision.symbol], "ohlcv_1h", None),
+            )
 
         if result.success and result.position:
+            if self._first_order_seconds is None and self._cycle_started is not None:
+                self._first_order_seconds = monotonic() - self._cycle_started
             logger.info(f"{side.upper()} {decision.symbol} @ ${current_price:,.2f}")
             sl_float = float(stop_loss) if stop_loss else 0
             tp_float = float(take_profit) if take_profit else 0
@@ -263,7 +655,11 @@ class TradingOrchestrator:
             return
 
         logger.info(f"LLM EXIT {decision.symbol}: {decision.reasoning[:50]}...")
-        await self.execution.close_position(position, price_data.price, "llm_decision")
+        with span("execution.close", symbol=decision.symbol, reason="llm_decision"):
+            await self.execution.close_position(
+                position, price_data.price, "llm_decision", uow=self._uow,
+                candles=getattr(price_data, "ohlcv_1h", None),
+            )
 
     def _has_position(self, symbol: str, positions: list[Any]) -> bool:
         """Check if there's an open position for the symbol."""
@@ -274,10 +670,10 @@ class TradingOrchestrator:
         return next((p for p in positions if p.symbol == symbol), None)
 
     def switch_decision_mode(self, mode: str) -> bool:
-        """Switch between decision modes (indicator, trinity, or llm).
+        """Switch between decision modes (indicator, trinity, llm, or tiered).
 
         Args:
-            mode: "indicator", "trinity", or "llm"
+            mode: "indicator", "trinity", "llm", or "tiered"
 
         Returns:
             True if switch successful, False otherwise
@@ -294,6 +690,15 @@ class TradingOrchestrator:
             logger.info("🧠 Switched to LLM-based decision mode")
             return True
 
+        elif mode == "tiered":
+            if not self.llm_decision:
+                logger.error("LLM decision block not available (no LLM client provided)")
+                return False
+            self.decision = TieredDecisionBlock(self.trinity_decision, self.llm_decision)
+            self.decision_mode = "tiered"
+            logger.info("🔀 Switched to tiered mode (Trinity screen -> LLM on shortlist)")
+            return True
+
         elif mode == "trinity":
             trinity_dec = self.trinity_decision
             self.decision = trinity_dec
@@ -309,7 +714,7 @@ class TradingOrchestrator:
             return True
 
         else:
-            logger.error(f"Unknown decision mode: {mode}. Use 'indicator', 'trinity', or 'llm'")
+            logger.error(f"Unknown decision mode: {mode}. Use 'indicator', 'trinity', 'llm', or 'tiered'")
             return False
 
     def get_decision_mode(self) -> str:
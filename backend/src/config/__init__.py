@@ -24,6 +24,10 @@ from .constants import (
     LIMITS_CONFIG,
     VALIDATION_CONFIG,
     DATABASE_CONFIG,
+    REDIS_CONFIG,
+    LLM_CONFIG,
+    TRACING_CONFIG,
+    WORKER_CONFIG,
     API_CONFIG,
     INDICATOR_CONFIG,
     KELLY_CONFIG,
@@ -45,6 +49,10 @@ from .environment import (
     load_limits_config_from_env,
     load_validation_config_from_env,
     load_database_config_from_env,
+    load_redis_config_from_env,
+    load_llm_config_from_env,
+    load_tracing_config_from_env,
+    load_worker_config_from_env,
     load_api_config_from_env,
     load_all_config_from_env,
     get_config_summary,
@@ -57,6 +65,10 @@ __all__ = [
     "LIMITS_CONFIG",
     "VALIDATION_CONFIG",
     "DATABASE_CONFIG",
+    "REDIS_CONFIG",
+    "LLM_CONFIG",
+    "TRACING_CONFIG",
+    "WORKER_CONFIG",
     "API_CONFIG",
     "INDICATOR_CONFIG",
     "KELLY_CONFIG",
@@ -76,6 +88,10 @@ __all__ = [
     "load_limits_config_from_env",
     "load_validation_config_from_env",
     "load_database_config_from_env",
+    "load_redis_config_from_env",
+    "load_llm_config_from_env",
+    "load_tracing_config_from_env",
+    "load_worker_config_from_env",
     "load_api_config_from_env",
     "load_all_config_from_env",
     "get_config_summary",
@@ -11,6 +11,9 @@ Categories:
 - VALIDATION_CONFIG: Confidence thresholds, indicator parameters
 - API_CONFIG: Rate limiting, fees, pricing
 - DATABASE_CONFIG: Connection pool, timeouts
+- REDIS_CONFIG: Redis connection pools per workload
+- LLM_CONFIG: LLM decision cache and call behaviour
+- WORKER_CONFIG: Bot sharding across worker processes
 - INDICATOR_CONFIG: Technical indicator parameters
 """
 
@@ -49,6 +52,24 @@ TRADING_CONFIG: Dict[str, Any] = {
     # Trading fees
     "PAPER_TRADING_FEE_PCT": 0.0005,  # 0.05% for paper trading
     "ROUND_TRIP_FEE_PCT": 0.0010,  # 0.10% total (0.05% entry + 0.05% exit)
+
+    # Paper matching engine: slippage, latency and partial fills against candles
+    "PAPER_MATCHING_ENABLED": True,
+    "PAPER_TAKER_FEE_PCT": 0.001,  # Market and stop fills
+    "PAPER_MAKER_FEE_PCT": 0.0005,  # Limit (take profit) fills
+    "PAPER_SLIPPAGE_BASE_BPS": 2.0,  # Half spread
+    "PAPER_SLIPPAGE_RANGE_SHARE": 0.05,  # Share of the candle range paid on market fills
+    "PAPER_SLIPPAGE_IMPACT_COEF": 1.0,  # Square-root impact on the share of candle volume
+    "PAPER_MAX_SLIPPAGE_BPS": 100.0,
+    "PAPER_ORDER_LATENCY_MS": 150,
+    "PAPER_MAX_PARTICIPATION": 0.1,  # Max share of a candle's volume one order can fill
+    "PAPER_VOLUME_WINDOW": 20,  # Closed candles averaged for the volume of immediate fills
+
+    # Live order pipeline
+    "ORDER_ATTACHED_PROTECTION": True,  # Attach SL/TP to the entry (OKX attachAlgoOrds)
+    "ORDER_SUBMIT_TIMEOUT_SECONDS": 10.0,  # Per attempt; a timed-out order is looked up before retrying
+    "ORDER_SUBMIT_RETRIES": 3,
+    "ORDER_RECONCILE_INTERVAL_SECONDS": 30,  # Working and unconfirmed live orders are refreshed this often
 }
 
 # ============================================================================
@@ -64,11 +85,47 @@ TIMING_CONFIG: Dict[str, Any] = {
     # Monitoring intervals
     "BOT_MONITOR_CHECK_INTERVAL_SECONDS": 30,  # Check every 30s
     "MONITOR_RETRY_INTERVAL_SECONDS": 30,  # Retry after 30s
+    "BOT_EVENTS_ENABLED": True,  # React to published bot status changes
+    "BOT_RECONCILE_INTERVAL_SECONDS": 300,  # Safety-net DB sweep while events flow
 
     # Orchestrator intervals
     "ORCHESTRATOR_RETRY_DELAY_SECONDS": 30,  # Retry delay: 30 seconds
     "ORCHESTRATOR_CYCLE_INTERVAL_SECONDS": 180,  # Cycle: 3 minutes
 
+    # Cycle budget: a cycle must finish within this fraction of its interval
+    "CYCLE_BUDGET_FRACTION": 0.8,
+    "CYCLE_STAGE_BUDGETS": {  # Share of the cycle budget per stage
+        "fetch": 0.30,
+        "indicators": 0.10,
+        "exits": 0.10,
+        "decision": 0.35,
+        "execution": 0.10,
+        "snapshot": 0.05,
+    },
+    "STALE_MARKET_DATA_MAX_AGE_SECONDS": 600,  # Last-known snapshots usable after a fetch timeout
+    # Per-symbol pipelines (fetch -> indicators -> decision -> risk -> execute) in non-LLM modes
+    "PIPELINED_CYCLES_ENABLED": True,
+    # Prefetch market data and indicators ahead of each scheduled cycle
+    "PREFETCH_ENABLED": True,
+    "PREFETCH_LEAD_SECONDS": 5,  # Start fetching this long before the cycle fires
+    "PREFETCH_MAX_AGE_SECONDS": 15,  # Older prefetched data is refetched at cycle start
+
+    # Exit monitor: stop-loss/take-profit checks between decision cycles
+    "EXIT_MONITOR_ENABLED": True,
+    "EXIT_MONITOR_INTERVAL_SECONDS": 5,  # One shared ticker fetch per interval
+
+    # Account reconciler: cached exchange positions/balance synced to DB positions placed on the exchange
+    "ACCOUNT_RECONCILE_ENABLED": False,  # Opt in when live bots trade on the exchange account
+    "ACCOUNT_RECONCILE_INTERVAL_SECONDS": 30,  # One positions + one balance fetch per interval
+    "ACCOUNT_STREAM_ENABLED": True,  # Private WebSocket updates where ccxt.pro is installed
+    "ACCOUNT_QUANTITY_TOLERANCE": 0.01,  # Relative size drift tolerated before a resize
+
+    # Cycle clock: one timing wheel fires every bot's cycle after each candle close
+    "CYCLE_CLOCK_ENABLED": True,
+    "CYCLE_CLOCK_TICK_SECONDS": 0.5,  # Wheel resolution
+    "CYCLE_CLOSE_OFFSET_SECONDS": 2,  # Wait for the exchange to publish the closed candle
+    "CYCLE_JITTER_WINDOW_SECONDS": 20,  # Bots are spread evenly over this window after the offset
+
     # API timeouts
     "API_TIMEOUT_SECONDS": 5,  # General API timeout: 5 seconds
     "NEWS_SERVICE_TIMEOUT_SECONDS": 5,  # News API timeout: 5 seconds
@@ -172,6 +229,117 @@ DATABASE_CONFIG: Dict[str, Any] = {
     "POOL_SIZE": 20,  # Concurrent connections in pool
     "MAX_OVERFLOW": 80,  # Additional connections before blocking
     "ECHO_SQL": False,  # Set to True for SQL logging in dev
+    "BULK_UPDATE_BATCH_SIZE": 500,  # Rows per executemany in bulk mark-to-market
+    "CYCLE_UNIT_OF_WORK_ENABLED": True,  # One load and one write transaction per trading cycle
+}
+
+# ============================================================================
+# REDIS CONFIG - Connection Pools per Workload
+# ============================================================================
+
+REDIS_CONFIG: Dict[str, Any] = {
+    "MAX_CONNECTIONS": 50,  # Shared pool size (all workloads)
+    "POOL_TIMEOUT_SECONDS": 5,  # Max wait for a free connection before erroring
+    "SOCKET_TIMEOUT_SECONDS": 5,  # Per-command socket timeout
+    "HEALTH_CHECK_INTERVAL_SECONDS": 30,  # PING idle connections before reuse
+    "SATURATION_WARNING_PCT": 0.80,  # Warn when 80% of the pool is checked out
+
+    # Separate pools per workload (cache, locks, pubsub) instead of one shared pool
+    "SEPARATE_POOLS": False,
+    "WORKLOAD_MAX_CONNECTIONS": {
+        "cache": 30,
+        "locks": 10,
+        "pubsub": 10,
+    },
+
+    # Bot lifecycle events (start/pause/stop) published by the API
+    "BOT_EVENTS_CHANNEL": "0xbot:bot-status",
+}
+
+# ============================================================================
+# LLM CONFIG - Decision Cache & Call Behaviour
+# ============================================================================
+
+LLM_CONFIG: Dict[str, Any] = {
+    # Reuse the previous decisions while the quantized market state is unchanged
+    "DECISION_CACHE_ENABLED": True,
+    "DECISION_CACHE_PRICE_TOLERANCE_PCT": 0.003,  # Price bucket width: 0.3%
+    "DECISION_CACHE_RSI_BUCKET": 10,  # RSI regime width: 10 points
+    "DECISION_CACHE_MAX_AGE_SECONDS": 900,  # Never reuse decisions older than 15 min
+    "DECISION_CACHE_MAX_ENTRIES": 32,  # Fingerprints kept per bot
+
+    # Stream completions and act on each symbol's decision as soon as it parses
+    "STREAMING_ENABLED": False,
+
+    # Dispatch: deadlines, retries, hedging and failover across providers
+    "CALL_TIMEOUT_SECONDS": 45,  # Deadline per attempt
+    "TOTAL_DEADLINE_SECONDS": 90,  # Deadline for all attempts of one call
+    "MAX_RETRIES": 2,  # Retries after the first attempt
+    "RETRY_BASE_DELAY_SECONDS": 1.0,  # Full-jitter backoff base
+    "RETRY_MAX_DELAY_SECONDS": 8.0,  # Backoff cap
+    "HEDGE_ENABLED": True,  # Race a second provider once the first exceeds its p95
+    "HEDGE_PERCENTILE": 0.95,
+    "HEDGE_MIN_SAMPLES": 20,  # Latency samples needed before hedging
+    "CIRCUIT_FAILURE_THRESHOLD": 5,  # Consecutive failures before a provider is skipped
+    "CIRCUIT_RESET_SECONDS": 60,  # Cool-down before a probe call
+    "FALLBACK_PROVIDERS": ["deepseek", "qwen", "gpt", "claude"],  # Only those with API keys are used
+
+    # Batch concurrent bots sharing a prompt prefix into one call (in-process)
+    "BATCHING_ENABLED": False,
+    "BATCH_WINDOW_SECONDS": 2.0,  # How long the first request waits for others
+    "BATCH_MAX_MEMBERS": 8,  # Flush early once this many bots joined
+    "BATCH_MAX_TOKENS": 8000,  # Output token cap for a merged call
+
+    # Rough prompt size estimate for TPM reservations and prompt budgets
+    "CHARS_PER_TOKEN": 4,
+
+    # Price history in prompts: LTTB sketch + stats, rounded, within a token budget.
+    # Adds context (and tokens) the dashboard does not have; off unless wanted.
+    "PROMPT_COMPRESSION_ENABLED": False,
+    "PROMPT_TOKEN_BUDGET_PER_SYMBOL": 120,  # History tokens per symbol (stats + sketch)
+    "PROMPT_SIGNIFICANT_DIGITS": 5,  # 64213.57 -> 64214
+
+    # Tiered mode: Trinity screens all symbols, the LLM sees only the shortlist
+    "TIERED_SHORTLIST_SIZE": 5,  # Top-K candidates (held symbols are always added)
+    "TIERED_MIN_SCORE": 0.35,  # Weighted confluence floor; below Trinity's 0.5 entry bar
+
+    # Structured output: provider JSON mode + schema validation with one repair request
+    "STRUCTURED_OUTPUT_ENABLED": True,
+    "REPAIR_ON_INVALID": True,
+}
+
+# ============================================================================
+# TRACING CONFIG - Cycle Spans, Histograms & Export
+# ============================================================================
+
+TRACING_CONFIG: Dict[str, Any] = {
+    "ENABLED": True,
+    "RECENT_CYCLES": 20,  # Cycle waterfalls kept in memory per bot
+    "HISTOGRAM_BUCKETS_SECONDS": [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120],
+    "EXPORT_FILE": "",  # OTLP/JSON lines file; empty disables file export
+    "OTEL_ENABLED": False,  # Mirror spans to the OpenTelemetry API (needs opentelemetry installed)
+    "SERVICE_NAME": "0xbot",
+}
+
+# ============================================================================
+# WORKER CONFIG - Bot Sharding, Leases & Leader Election
+# ============================================================================
+
+WORKER_CONFIG: Dict[str, Any] = {
+    # "embedded": the API process runs every bot; "worker": the API runs none and
+    # any number of `python -m src.worker` processes claim bots through leases
+    "SCHEDULER_MODE": "embedded",
+    "ID": "",  # Worker identity; empty = hostname:pid
+    "LEASE_TTL_SECONDS": 30,  # A dead worker's bots are reclaimed after this
+    "LEASE_RENEW_SECONDS": 10,  # Must be well under the TTL
+    "HEARTBEAT_KEY": "0xbot:workers",  # Sorted set of live workers by last heartbeat
+    "LEASE_KEY_PREFIX": "0xbot:lease:bot:",
+
+    # Embedded mode: replicas elect one leader to run the bots
+    "LEADER_ELECTION_ENABLED": True,
+    "LEADER_TTL_SECONDS": 10,  # Takeover time if the leader dies
+    "LEADER_RENEW_SECONDS": 2,  # Takeover time if the leader shuts down cleanly
+    "LEADER_KEY": "0xbot:leader:scheduler",
 }
 
 # ============================================================================
@@ -200,6 +368,15 @@ API_CONFIG: Dict[str, Any] = {
         "deepseek": 50,
         "gemini": 50,
     },
+    # Shared sliding-window limits per provider, enforced across all processes
+    # via Redis (rpm = requests/min, tpm = prompt + completion tokens/min)
+    "LLM_RATE_WINDOW_SECONDS": 60,
+    "LLM_PROVIDER_LIMITS": {
+        "claude": {"rpm": 50, "tpm": 400_000},
+        "gpt": {"rpm": 50, "tpm": 300_000},
+        "deepseek": {"rpm": 50, "tpm": 1_000_000},
+        "qwen": {"rpm": 50, "tpm": 500_000},
+    },
 }
 
 # ============================================================================
@@ -301,6 +478,10 @@ def get_config(category: str) -> Dict[str, Any]:
         "limits": LIMITS_CONFIG,
         "validation": VALIDATION_CONFIG,
         "database": DATABASE_CONFIG,
+        "redis": REDIS_CONFIG,
+        "llm": LLM_CONFIG,
+        "tracing": TRACING_CONFIG,
+        "worker": WORKER_CONFIG,
         "api": API_CONFIG,
         "indicator": INDICATOR_CONFIG,
         "kelly": KELLY_CONFIG,
@@ -107,6 +107,12 @@ def load_trading_config_from_env() -> Dict[str, Any]:
     - BOT_STOP_LOSS_PCT: Default stop loss (0-1)
     - BOT_TAKE_PROFIT_PCT: Default take profit (0-1)
     - BOT_TRADING_FEE_PCT: Trading fee percentage (0-1)
+    - PAPER_MATCHING_ENABLED: Simulate slippage and partial fills for paper orders (true/false)
+    - PAPER_ORDER_LATENCY_MS: Simulated order latency in milliseconds (default 150)
+    - PAPER_MAX_PARTICIPATION: Max share of a candle's volume one paper order fills (0-1)
+    - ORDER_ATTACHED_PROTECTION: Attach SL/TP to live entry orders (true/false)
+    - ORDER_SUBMIT_TIMEOUT_SECONDS: Timeout per live order attempt (default 10)
+    - ORDER_RECONCILE_INTERVAL_SECONDS: Live order reconciliation interval in seconds (default 30)
     """
     from .constants import TRADING_CONFIG
 
@@ -133,6 +139,26 @@ def load_trading_config_from_env() -> Dict[str, Any]:
     if fee := get_env_float("BOT_TRADING_FEE_PCT"):
         overrides["PAPER_TRADING_FEE_PCT"] = fee
 
+    # Paper matching engine
+    if "PAPER_MATCHING_ENABLED" in os.environ:
+        overrides["PAPER_MATCHING_ENABLED"] = get_env_bool("PAPER_MATCHING_ENABLED")
+
+    if (latency := get_env_float("PAPER_ORDER_LATENCY_MS")) is not None:
+        overrides["PAPER_ORDER_LATENCY_MS"] = latency
+
+    if participation := get_env_float("PAPER_MAX_PARTICIPATION"):
+        overrides["PAPER_MAX_PARTICIPATION"] = participation
+
+    # Live order pipeline
+    if "ORDER_ATTACHED_PROTECTION" in os.environ:
+        overrides["ORDER_ATTACHED_PROTECTION"] = get_env_bool("ORDER_ATTACHED_PROTECTION")
+
+    if order_timeout := get_env_float("ORDER_SUBMIT_TIMEOUT_SECONDS"):
+        overrides["ORDER_SUBMIT_TIMEOUT_SECONDS"] = order_timeout
+
+    if order_interval := get_env_float("ORDER_RECONCILE_INTERVAL_SECONDS"):
+        overrides["ORDER_RECONCILE_INTERVAL_SECONDS"] = order_interval
+
     return {**TRADING_CONFIG, **overrides}
 
 
@@ -148,6 +174,20 @@ def load_timing_config_from_env() -> Dict[str, Any]:
     - BOT_CYCLE_INTERVAL: Cycle interval in seconds (default 300)
     - BOT_NEWS_FETCH_INTERVAL: News fetch interval in seconds (default 300)
     - BOT_API_TIMEOUT: API timeout in seconds (default 5)
+    - EXIT_MONITOR_ENABLED: Check exits between decision cycles (true/false)
+    - EXIT_MONITOR_INTERVAL_SECONDS: Exit check interval in seconds (default 5)
+    - ACCOUNT_RECONCILE_ENABLED: Sync live bots' positions with the exchange (true/false, default false)
+    - ACCOUNT_RECONCILE_INTERVAL_SECONDS: Exchange account poll interval in seconds (default 30)
+    - ACCOUNT_STREAM_ENABLED: Use private WebSocket account updates where available (true/false)
+    - BOT_EVENTS_ENABLED: React to bot status events over Redis pub/sub (true/false)
+    - BOT_RECONCILE_INTERVAL_SECONDS: DB sweep interval while events flow (default 300)
+    - CYCLE_CLOCK_ENABLED: Align cycles to candle closes on a shared clock (true/false)
+    - PIPELINED_CYCLES_ENABLED: Run each symbol through its own pipeline in non-LLM modes (true/false)
+    - CYCLE_CLOSE_OFFSET_SECONDS: Delay after each candle close (default 2)
+    - CYCLE_JITTER_WINDOW_SECONDS: Window bot cycles are spread over (default 20)
+    - PREFETCH_ENABLED: Prefetch market data ahead of each cycle (true/false)
+    - PREFETCH_LEAD_SECONDS: How long before a cycle the prefetch starts (default 5)
+    - PREFETCH_MAX_AGE_SECONDS: Prefetched data older than this is refetched (default 15)
     """
     from .constants import TIMING_CONFIG
 
@@ -162,6 +202,48 @@ def load_timing_config_from_env() -> Dict[str, Any]:
     if timeout := get_env_int("BOT_API_TIMEOUT"):
         overrides["API_TIMEOUT_SECONDS"] = timeout
 
+    if "EXIT_MONITOR_ENABLED" in os.environ:
+        overrides["EXIT_MONITOR_ENABLED"] = get_env_bool("EXIT_MONITOR_ENABLED")
+
+    if exit_interval := get_env_float("EXIT_MONITOR_INTERVAL_SECONDS"):
+        overrides["EXIT_MONITOR_INTERVAL_SECONDS"] = exit_interval
+
+    if "ACCOUNT_RECONCILE_ENABLED" in os.environ:
+        overrides["ACCOUNT_RECONCILE_ENABLED"] = get_env_bool("ACCOUNT_RECONCILE_ENABLED")
+
+    if account_interval := get_env_float("ACCOUNT_RECONCILE_INTERVAL_SECONDS"):
+        overrides["ACCOUNT_RECONCILE_INTERVAL_SECONDS"] = account_interval
+
+    if "ACCOUNT_STREAM_ENABLED" in os.environ:
+        overrides["ACCOUNT_STREAM_ENABLED"] = get_env_bool("ACCOUNT_STREAM_ENABLED")
+
+    if "BOT_EVENTS_ENABLED" in os.environ:
+        overrides["BOT_EVENTS_ENABLED"] = get_env_bool("BOT_EVENTS_ENABLED")
+
+    if reconcile := get_env_int("BOT_RECONCILE_INTERVAL_SECONDS"):
+        overrides["BOT_RECONCILE_INTERVAL_SECONDS"] = reconcile
+
+    if "CYCLE_CLOCK_ENABLED" in os.environ:
+        overrides["CYCLE_CLOCK_ENABLED"] = get_env_bool("CYCLE_CLOCK_ENABLED")
+
+    if "PIPELINED_CYCLES_ENABLED" in os.environ:
+        overrides["PIPELINED_CYCLES_ENABLED"] = get_env_bool("PIPELINED_CYCLES_ENABLED")
+
+    if (close_offset := get_env_float("CYCLE_CLOSE_OFFSET_SECONDS")) is not None:
+        overrides["CYCLE_CLOSE_OFFSET_SECONDS"] = close_offset
+
+    if (jitter := get_env_float("CYCLE_JITTER_WINDOW_SECONDS")) is not None:
+        overrides["CYCLE_JITTER_WINDOW_SECONDS"] = jitter
+
+    if "PREFETCH_ENABLED" in os.environ:
+        overrides["PREFETCH_ENABLED"] = get_env_bool("PREFETCH_ENABLED")
+
+    if (lead := get_env_float("PREFETCH_LEAD_SECONDS")) is not None:
+        overrides["PREFETCH_LEAD_SECONDS"] = lead
+
+    if max_age := get_env_float("PREFETCH_MAX_AGE_SECONDS"):
+        overrides["PREFETCH_MAX_AGE_SECONDS"] = max_age
+
     return {**TIMING_CONFIG, **overrides}
 
 
@@ -239,6 +321,8 @@ def load_database_config_from_env() -> Dict[str, Any]:
     - BOT_DB_POOL_SIZE: Connection pool size (default 20)
     - BOT_DB_MAX_OVERFLOW: Max overflow connections (default 80)
     - BOT_DB_ECHO: Echo SQL queries (default False)
+    - BOT_DB_BULK_UPDATE_BATCH_SIZE: Rows per bulk price UPDATE (default 500)
+    - BOT_DB_CYCLE_UNIT_OF_WORK: Batch each cycle's reads and writes (default True)
     """
     from .constants import DATABASE_CONFIG
 
@@ -253,9 +337,224 @@ def load_database_config_from_env() -> Dict[str, Any]:
     if echo := get_env_bool("BOT_DB_ECHO"):
         overrides["ECHO_SQL"] = echo
 
+    if batch := get_env_int("BOT_DB_BULK_UPDATE_BATCH_SIZE"):
+        overrides["BULK_UPDATE_BATCH_SIZE"] = batch
+
+    if "BOT_DB_CYCLE_UNIT_OF_WORK" in os.environ:
+        overrides["CYCLE_UNIT_OF_WORK_ENABLED"] = get_env_bool("BOT_DB_CYCLE_UNIT_OF_WORK")
+
     return {**DATABASE_CONFIG, **overrides}
 
 
+# ============================================================================
+# Redis Configuration from Environment
+# ============================================================================
+
+def load_redis_config_from_env() -> Dict[str, Any]:
+    """
+    Load Redis pool configuration from environment variables.
+
+    Environment variables (all optional):
+    - REDIS_MAX_CONNECTIONS: Shared pool size (default 50)
+    - REDIS_POOL_TIMEOUT: Seconds to wait for a free connection (default 5)
+    - REDIS_SOCKET_TIMEOUT: Per-command socket timeout in seconds (default 5)
+    - REDIS_SEPARATE_POOLS: Use one pool per workload (default False)
+    - REDIS_CACHE_MAX_CONNECTIONS: Cache pool size when pools are separate
+    - REDIS_LOCKS_MAX_CONNECTIONS: Locks/rate-limit pool size when pools are separate
+    - REDIS_PUBSUB_MAX_CONNECTIONS: Pub/sub pool size when pools are separate
+    - REDIS_BOT_EVENTS_CHANNEL: Channel for bot status events
+    """
+    from .constants import REDIS_CONFIG
+
+    overrides: Dict[str, Any] = {}
+
+    if max_conn := get_env_int("REDIS_MAX_CONNECTIONS"):
+        overrides["MAX_CONNECTIONS"] = max_conn
+
+    if timeout := get_env_float("REDIS_POOL_TIMEOUT"):
+        overrides["POOL_TIMEOUT_SECONDS"] = timeout
+
+    if socket_timeout := get_env_float("REDIS_SOCKET_TIMEOUT"):
+        overrides["SOCKET_TIMEOUT_SECONDS"] = socket_timeout
+
+    if "REDIS_SEPARATE_POOLS" in os.environ:
+        overrides["SEPARATE_POOLS"] = get_env_bool("REDIS_SEPARATE_POOLS")
+
+    workloads = dict(REDIS_CONFIG["WORKLOAD_MAX_CONNECTIONS"])
+    for workload in workloads:
+        if size := get_env_int(f"REDIS_{workload.upper()}_MAX_CONNECTIONS"):
+            workloads[workload] = size
+    overrides["WORKLOAD_MAX_CONNECTIONS"] = workloads
+
+    if channel := get_env_str("REDIS_BOT_EVENTS_CHANNEL"):
+        overrides["BOT_EVENTS_CHANNEL"] = channel
+
+    return {**REDIS_CONFIG, **overrides}
+
+
+# ============================================================================
+# LLM Configuration from Environment
+# ============================================================================
+
+def load_llm_config_from_env() -> Dict[str, Any]:
+    """
+    Load LLM configuration from environment variables.
+
+    Environment variables (all optional):
+    - LLM_DECISION_CACHE_ENABLED: Reuse decisions for unchanged market state (default True)
+    - LLM_DECISION_CACHE_TOLERANCE_PCT: Price bucket width as a fraction (default 0.003)
+    - LLM_DECISION_CACHE_MAX_AGE: Max age of reused decisions in seconds (default 900)
+    - LLM_STREAMING_ENABLED: Execute decisions while the response streams (default False)
+    - LLM_CALL_TIMEOUT: Deadline per attempt in seconds (default 45)
+    - LLM_TOTAL_DEADLINE: Deadline across retries in seconds (default 90)
+    - LLM_MAX_RETRIES: Retries after the first attempt (default 2)
+    - LLM_HEDGE_ENABLED: Hedge slow calls on a second provider (default True)
+    - LLM_FALLBACK_PROVIDERS: Comma-separated failover order (e.g. "deepseek,qwen")
+    - LLM_BATCHING_ENABLED: Merge concurrent bots' calls into one request (default False)
+    - LLM_BATCH_WINDOW: Seconds a batch stays open for more bots (default 2.0)
+    - LLM_BATCH_MAX_MEMBERS: Bots per merged request (default 8)
+    - LLM_PROMPT_COMPRESSION_ENABLED: Add a compact price-history sketch to prompts (default False)
+    - LLM_PROMPT_TOKEN_BUDGET: Price-history tokens per symbol (default 120)
+    - LLM_TIERED_SHORTLIST_SIZE: Symbols sent to the LLM in tiered mode (default 5)
+    - LLM_STRUCTURED_OUTPUT_ENABLED: Request JSON-only responses from providers (default True)
+    - LLM_REPAIR_ON_INVALID: Send one repair request for invalid decisions (default True)
+    """
+    from .constants import LLM_CONFIG
+
+    overrides: Dict[str, Any] = {}
+
+    if "LLM_DECISION_CACHE_ENABLED" in os.environ:
+        overrides["DECISION_CACHE_ENABLED"] = get_env_bool("LLM_DECISION_CACHE_ENABLED")
+
+    if tolerance := get_env_float("LLM_DECISION_CACHE_TOLERANCE_PCT"):
+        overrides["DECISION_CACHE_PRICE_TOLERANCE_PCT"] = tolerance
+
+    if max_age := get_env_int("LLM_DECISION_CACHE_MAX_AGE"):
+        overrides["DECISION_CACHE_MAX_AGE_SECONDS"] = max_age
+
+    if "LLM_STREAMING_ENABLED" in os.environ:
+        overrides["STREAMING_ENABLED"] = get_env_bool("LLM_STREAMING_ENABLED")
+
+    if call_timeout := get_env_float("LLM_CALL_TIMEOUT"):
+        overrides["CALL_TIMEOUT_SECONDS"] = call_timeout
+
+    if total_deadline := get_env_float("LLM_TOTAL_DEADLINE"):
+        overrides["TOTAL_DEADLINE_SECONDS"] = total_deadline
+
+    if (max_retries := get_env_int("LLM_MAX_RETRIES")) is not None:
+        overrides["MAX_RETRIES"] = max_retries
+
+    if "LLM_HEDGE_ENABLED" in os.environ:
+        overrides["HEDGE_ENABLED"] = get_env_bool("LLM_HEDGE_ENABLED")
+
+    if providers := get_env_str("LLM_FALLBACK_PROVIDERS"):
+        overrides["FALLBACK_PROVIDERS"] = [p.strip().lower() for p in providers.split(",") if p.strip()]
+
+    if "LLM_BATCHING_ENABLED" in os.environ:
+        overrides["BATCHING_ENABLED"] = get_env_bool("LLM_BATCHING_ENABLED")
+
+    if (batch_window := get_env_float("LLM_BATCH_WINDOW")) is not None:
+        overrides["BATCH_WINDOW_SECONDS"] = batch_window
+
+    if batch_members := get_env_int("LLM_BATCH_MAX_MEMBERS"):
+        overrides["BATCH_MAX_MEMBERS"] = batch_members
+
+    if "LLM_PROMPT_COMPRESSION_ENABLED" in os.environ:
+        overrides["PROMPT_COMPRESSION_ENABLED"] = get_env_bool("LLM_PROMPT_COMPRESSION_ENABLED")
+
+    if token_budget := get_env_int("LLM_PROMPT_TOKEN_BUDGET"):
+        overrides["PROMPT_TOKEN_BUDGET_PER_SYMBOL"] = token_budget
+
+    if shortlist_size := get_env_int("LLM_TIERED_SHORTLIST_SIZE"):
+        overrides["TIERED_SHORTLIST_SIZE"] = shortlist_size
+
+    if "LLM_STRUCTURED_OUTPUT_ENABLED" in os.environ:
+        overrides["STRUCTURED_OUTPUT_ENABLED"] = get_env_bool("LLM_STRUCTURED_OUTPUT_ENABLED")
+
+    if "LLM_REPAIR_ON_INVALID" in os.environ:
+        overrides["REPAIR_ON_INVALID"] = get_env_bool("LLM_REPAIR_ON_INVALID")
+
+    return {**LLM_CONFIG, **overrides}
+
+
+# ============================================================================
+# Tracing Configuration from Environment
+# ============================================================================
+
+def load_tracing_config_from_env() -> Dict[str, Any]:
+    """
+    Load cycle tracing configuration from environment variables.
+
+    Environment variables (all optional):
+    - TRACING_ENABLED: Record per-cycle spans (default True)
+    - TRACING_RECENT_CYCLES: Cycle waterfalls kept per bot (default 20)
+    - TRACING_EXPORT_FILE: Append finished cycles as OTLP/JSON lines to this file
+    - TRACING_OTEL_ENABLED: Mirror spans to the OpenTelemetry API (default False)
+    - OTEL_SERVICE_NAME: Service name on exported spans (default "0xbot")
+    """
+    from .constants import TRACING_CONFIG
+
+    overrides: Dict[str, Any] = {}
+
+    if "TRACING_ENABLED" in os.environ:
+        overrides["ENABLED"] = get_env_bool("TRACING_ENABLED")
+
+    if recent := get_env_int("TRACING_RECENT_CYCLES"):
+        overrides["RECENT_CYCLES"] = recent
+
+    if export_file := get_env_str("TRACING_EXPORT_FILE"):
+        overrides["EXPORT_FILE"] = export_file
+
+    if "TRACING_OTEL_ENABLED" in os.environ:
+        overrides["OTEL_ENABLED"] = get_env_bool("TRACING_OTEL_ENABLED")
+
+    if service_name := get_env_str("OTEL_SERVICE_NAME"):
+        overrides["SERVICE_NAME"] = service_name
+
+    return {**TRACING_CONFIG, **overrides}
+
+
+def load_worker_config_from_env() -> Dict[str, Any]:
+    """
+    Load worker sharding configuration from environment variables.
+
+    Environment variables (all optional):
+    - SCHEDULER_MODE: "embedded" or "worker" (default "embedded")
+    - WORKER_ID: Worker identity (default hostname:pid)
+    - WORKER_LEASE_TTL_SECONDS: Bot lease lifetime (default 30)
+    - WORKER_LEASE_RENEW_SECONDS: Lease renewal interval (default 10)
+    - LEADER_ELECTION_ENABLED: Elect one API replica to run the bots (default True)
+    - LEADER_TTL_SECONDS: Leader term lifetime (default 10)
+    - LEADER_RENEW_SECONDS: Leader renewal and standby poll interval (default 2)
+    """
+    from .constants import WORKER_CONFIG
+
+    overrides: Dict[str, Any] = {}
+
+    if mode := get_env_str("SCHEDULER_MODE"):
+        overrides["SCHEDULER_MODE"] = mode.lower()
+
+    if worker_id := get_env_str("WORKER_ID"):
+        overrides["ID"] = worker_id
+
+    if ttl := get_env_int("WORKER_LEASE_TTL_SECONDS"):
+        overrides["LEASE_TTL_SECONDS"] = ttl
+
+    if renew := get_env_float("WORKER_LEASE_RENEW_SECONDS"):
+        overrides["LEASE_RENEW_SECONDS"] = renew
+
+    if "LEADER_ELECTION_ENABLED" in os.environ:
+        overrides["LEADER_ELECTION_ENABLED"] = get_env_bool("LEADER_ELECTION_ENABLED")
+
+    if leader_ttl := get_env_int("LEADER_TTL_SECONDS"):
+        overrides["LEADER_TTL_SECONDS"] = leader_ttl
+
+    if leader_renew := get_env_float("LEADER_RENEW_SECONDS"):
+        overrides["LEADER_RENEW_SECONDS"] = leader_renew
+
+    return {**WORKER_CONFIG, **overrides}
+
+
 # ============================================================================
 # API Configuration from Environment
 # ============================================================================
@@ -266,14 +565,24 @@ def load_api_config_from_env() -> Dict[str, Any]:
 
     Environment variables (all optional):
     - BOT_API_RATE_LIMIT: API rate limit (requests per minute)
+    - LLM_<PROVIDER>_RPM: Shared requests/min for a provider (e.g. LLM_DEEPSEEK_RPM)
+    - LLM_<PROVIDER>_TPM: Shared tokens/min for a provider (e.g. LLM_DEEPSEEK_TPM)
     """
     from .constants import API_CONFIG
 
-    overrides = {}
+    overrides: Dict[str, Any] = {}
 
     if limit := get_env_int("BOT_API_RATE_LIMIT"):
         overrides["DEFAULT_RATE_LIMIT_RPM"] = limit
 
+    provider_limits = {p: dict(l) for p, l in API_CONFIG["LLM_PROVIDER_LIMITS"].items()}
+    for provider, limits in provider_limits.items():
+        if rpm := get_env_int(f"LLM_{provider.upper()}_RPM"):
+            limits["rpm"] = rpm
+        if tpm := get_env_int(f"LLM_{provider.upper()}_TPM"):
+            limits["tpm"] = tpm
+    overrides["LLM_PROVIDER_LIMITS"] = provider_limits
+
     return {**API_CONFIG, **overrides}
 
 
@@ -294,6 +603,10 @@ def load_all_config_from_env() -> Dict[str, Dict[str, Any]]:
         "limits": load_limits_config_from_env(),
         "validation": load_validation_config_from_env(),
         "database": load_database_config_from_env(),
+        "redis": load_redis_config_from_env(),
+        "llm": load_llm_config_from_env(),
+        "tracing": load_tracing_config_from_env(),
+        "worker": load_worker_config_from_env(),
         "api": load_api_config_from_env(),
     }
 
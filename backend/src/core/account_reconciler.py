@@ -0,0 +1,348 @@
+"""Cached exchange account state, reconciled against the positions of live bots.
+
+Live positions change on the exchange without the bot acting: attached
+stop-loss and take-profit orders fire, orders fill partially, positions get
+liquidated. One reconciler per process keeps a cached view of the account
+(open positions and balance) and corrects the database from it in one
+transaction per pass. Only the positions of live (non-paper) bots are
+reconciled, whichever engine runs them; paper positions have nothing on the
+exchange to compare against.
+
+- positions still open in the database but gone on the exchange are closed at
+  their last marked price, with their exit trades and capital credits, under
+  the scheduler leader's fencing token;
+- a position whose size drifted from the exchange's is resized;
+- open positions are marked to the exchange's mark price.
+
+The view is refreshed with one positions and one balance request per interval
+for the whole account, or kept current from private WebSocket updates where
+ccxt.pro is available. Other components read it through ``get_account_view``
+instead of calling the exchange.
+"""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import bindparam, select, update
+
+from ..core.config import config
+from ..core.database import AsyncSessionLocal
+from ..core.exchange_client import ExchangeClient
+from ..core.leader_election import claim_fence
+from ..core.logger import get_logger
+from ..models.bot import Bot
+from ..models.position import Position, PositionSide, PositionStatus
+from ..models.trade import Trade, TradeSide
+from ..services.position_service import PositionService
+
+logger = get_logger(__name__)
+
+PositionKey = Tuple[str, str]  # (symbol as stored on positions, "long" / "short")
+
+# While streaming, a full snapshot is still fetched every this many intervals
+STREAM_RESYNC_INTERVALS = 10
+
+
+def position_key(position: Mapping[str, Any]) -> PositionKey:
+    """Key of an exchange position (BTC/USDT:USDT -> BTC/USDT)."""
+    return str(position["symbol"]).split(":")[0], str(position.get("side") or "long").lower()
+
+
+def exchange_quantity(position: Mapping[str, Any]) -> Decimal:
+    """Position size in base currency."""
+    contracts = Decimal(str(position.get("contracts") or 0))
+    return contracts * Decimal(str(position.get("contractSize") or 1))
+
+
+@dataclass
+class AccountView:
+    """Open exchange positions and balance as of ``as_of`` (UTC)."""
+
+    positions: Dict[PositionKey, Dict[str, Any]] = field(default_factory=dict)
+    balance: Dict[str, Any] = field(default_factory=dict)
+    as_of: Optional[datetime] = None
+
+    @property
+    def age_seconds(self) -> float:
+        if self.as_of is None:
+            return float("inf")
+        return (datetime.utcnow() - self.as_of).total_seconds()
+
+    def position(self, symbol: str, side: str) -> Optional[Dict[str, Any]]:
+        return self.positions.get((symbol, side))
+
+    def free(self, currency: str = "USDT") -> Decimal:
+        return Decimal(str((self.balance.get("free") or {}).get(currency) or 0))
+
+    def apply_positions(self, positions: Iterable[Mapping[str, Any]], snapshot: bool = False) -> None:
+        """Merge position updates (zero contracts means closed); a snapshot replaces everything."""
+        merged = {} if snapshot else dict(self.positions)
+        for position in positions:
+            key = position_key(position)
+            if exchange_quantity(position) > 0:
+                merged[key] = dict(position)
+            else:
+                merged.pop(key, None)
+        self.positions = merged
+        self.as_of = datetime.utcnow()
+
+
+@dataclass
+class Corrections:
+    """Database changes needed to match the exchange."""
+
+    closed: List[Position] = field(default_factory=list)  # Open in the database, gone on the exchange
+    resized: Dict[uuid.UUID, Decimal] = field(default_factory=dict)
+    prices: Dict[uuid.UUID, Decimal] = field(default_factory=dict)
+    untracked: List[PositionKey] = field(default_factory=list)  # On the exchange, not in the database
+
+    def __bool__(self) -> bool:
+        return bool(self.closed or self.resized or self.prices)
+
+
+def diff_positions(
+    positions: Iterable[Position],
+    view: AccountView,
+    tolerance: float = 0.0,
+) -> Corrections:
+    """Corrections that bring ``positions`` in line with ``view``.
+
+    Positions opened after the view was taken are left alone: the exchange
+    state predates them.
+    """
+    corrections = Corrections()
+    groups: Dict[PositionKey, List[Position]] = defaultdict(list)
+    for position in positions:
+        groups[(position.symbol, position.side)].append(position)
+
+    for key, rows in groups.items():
+        rows = [p for p in rows if view.as_of is None or p.opened_at <= view.as_of]
+        live = view.positions.get(key)
+        if not rows:
+            continue
+        if live is None:
+            corrections.closed.extend(rows)
+            continue
+
+        quantity = exchange_quantity(live)
+        held = sum((p.quantity for p in rows), Decimal("0"))
+        if abs(quantity - held) > held * Decimal(str(tolerance)):
+            if len(rows) == 1:
+                corrections.resized[rows[0].id] = quantity
+            else:
+                # Several bots share the exchange position: the split between them is unknown
+                logger.warning(f"{key[0]} {key[1]}: exchange holds {quantity}, {len(rows)} positions hold {held}")
+
+        mark = live.get("markPrice")
+        if mark:
+            price = Decimal(str(mark))
+            corrections.prices.update({p.id: price for p in rows if p.current_price != price})
+
+    corrections.untracked = [key for key in view.positions if key not in groups]
+    return corrections
+
+
+_current: Optional["AccountReconciler"] = None
+
+
+def get_account_view() -> Optional[AccountView]:
+    """Cached account view of the running reconciler, or None if none runs in this process."""
+    return _current.view if _current is not None else None
+
+
+class AccountReconciler:
+    """Keeps the account view current and the running live bots' positions in sync with it."""
+
+    def __init__(
+        self,
+        bot_ids: Callable[[], Iterable[uuid.UUID]],
+        exchange: Optional[ExchangeClient] = None,
+        interval_seconds: Optional[float] = None,
+        fencing_token: Callable[[], Optional[int]] = lambda: None,
+    ) -> None:
+        self._bot_ids = bot_ids
+        self._fencing_token = fencing_token
+        self.exchange = exchange
+        self.interval_seconds = interval_seconds or config.ACCOUNT_RECONCILE_INTERVAL_SECONDS
+        self.view = AccountView()
+        self.is_running = False
+        self._task: Optional[asyncio.Task[Any]] = None
+        self._streams: List[asyncio.Task[Any]] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def is_streaming(self) -> bool:
+        return any(not task.done() for task in self._streams)
+
+    async def start(self) -> None:
+        """Start the reconciliation loop."""
+        global _current
+        if self.is_running:
+            return
+        self.is_running = True
+        _current = self
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Account reconciler started (every {self.interval_seconds:g}s)")
+
+    async def stop(self) -> None:
+        """Stop the loop and any account streams."""
+        global _current
+        self.is_running = False
+        if _current is self:
+            _current = None
+        for task in [self._task, *self._streams]:
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass  # Failed streams were already logged
+        self._task = None
+        self._streams = []
+        logger.info("Account reconciler stopped")
+
+    async def _run(self) -> None:
+        while self.is_running:
+            try:
+                await self.reconcile_once()
+            except Exception as e:
+                logger.error(f"Account reconciler error: {e}", exc_info=True)
+            # Streamed updates wake the loop early; otherwise poll once per interval
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._changed.clear()
+
+    async def reconcile_once(self) -> Corrections:
+        """Refresh the view if needed and apply the corrections it implies."""
+        bot_ids = list(self._bot_ids())
+        if not bot_ids:
+            return Corrections()
+
+        if self.exchange is None:
+            self.exchange = ExchangeClient(paper_trading=False)
+        exchange = self.exchange
+        if config.ACCOUNT_STREAM_ENABLED and not self.is_streaming and exchange.supports_account_stream:
+            self._start_streams(exchange)
+        resync_after = self.interval_seconds * (STREAM_RESYNC_INTERVALS if self.is_streaming else 0.5)
+        if self.view.age_seconds >= resync_after:
+            await self.refresh(exchange)
+
+        positions = await self._load_open_positions(bot_ids)
+        corrections = diff_positions(positions, self.view, config.ACCOUNT_QUANTITY_TOLERANCE)
+        if corrections:
+            await self._apply(corrections)
+        if corrections.untracked:
+            logger.warning(f"Exchange positions without a bot position: {corrections.untracked}")
+        return corrections
+
+    async def refresh(self, exchange: ExchangeClient) -> AccountView:
+        """Full snapshot: one positions and one balance request for the whole account."""
+        positions, balance = await asyncio.gather(exchange.fetch_positions(), exchange.fetch_balance())
+        self.view.apply_positions(positions, snapshot=True)
+        self.view.balance = balance
+        return self.view
+
+    def _start_streams(self, exchange: ExchangeClient) -> None:
+        async def watch_positions() -> None:
+            while True:
+                self.view.apply_positions(await exchange.watch_positions())
+                self._changed.set()
+
+        async def watch_balance() -> None:
+            while True:
+                self.view.balance = await exchange.watch_balance()
+
+        self._streams = [asyncio.create_task(watch_positions()), asyncio.create_task(watch_balance())]
+        for task in self._streams:
+            task.add_done_callback(self._on_stream_done)
+        logger.info("Account reconciler streaming private position and balance updates")
+
+    def _on_stream_done(self, task: "asyncio.Task[Any]") -> None:
+        if not task.cancelled() and task.exception() is not None:
+            # Polling takes over; the next pass restarts the streams
+            logger.warning(f"Account stream failed, falling back to polling: {task.exception()}")
+            for other in self._streams:
+                other.cancel()
+            self.view.as_of = None
+
+    async def _load_open_positions(self, bot_ids: List[uuid.UUID]) -> List[Position]:
+        """Open positions of ``bot_ids``."""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Position).where(Position.bot_id.in_(bot_ids), Position.status == PositionStatus.OPEN)
+            )
+            return list(result.scalars().all())
+
+    async def _apply(self, corrections: Corrections) -> None:
+        async with AsyncSessionLocal() as db:
+            closed = await self._close_missing(db, corrections.closed) if corrections.closed else []
+            if corrections.resized:
+                table = Position.__table__
+                await db.execute(
+                    update(table)
+                    .where(table.c.id == bindparam("position_id"), table.c.status == PositionStatus.OPEN)
+                    .values(quantity=bindparam("quantity")),
+                    [{"position_id": pid, "quantity": qty} for pid, qty in corrections.resized.items()],
+                )
+            await PositionService(db).bulk_update_prices(corrections.prices, commit=False)
+            await db.commit()
+
+        logger.info(
+            f"Account reconciled: {len(closed)} closed on exchange, "
+            f"{len(corrections.resized)} resized, {len(corrections.prices)} marked"
+        )
+
+    async def _close_missing(self, db: Any, positions: List[Position]) -> List[Position]:
+        """Close positions the exchange no longer holds; returns those this pass closed."""
+        token = self._fencing_token()
+        if token is not None:
+            # A demoted leader must not credit capital the new leader already owns
+            for bot_id in {p.bot_id for p in positions}:
+                await claim_fence(db, bot_id, token)
+
+        by_id = {p.id: p for p in positions}
+        result = await db.execute(
+            update(Position)
+            .where(Position.id.in_(list(by_id)), Position.status == PositionStatus.OPEN)
+            .values(status=PositionStatus.CLOSED, closed_at=datetime.utcnow(), version=Position.version + 1)
+            .returning(Position.id)
+            .execution_options(synchronize_session=False)
+        )
+        # Positions closed concurrently by their bot are not credited twice
+        closed = [by_id[pid] for pid in result.scalars().all()]
+        if not closed:
+            return []
+
+        credits: Dict[uuid.UUID, Decimal] = defaultdict(Decimal)
+        for position in closed:
+            price = position.current_price
+            pnl = position.calculate_realized_pnl(price, position.quantity)
+            credits[position.bot_id] += position.entry_price * position.quantity / position.leverage + pnl
+            db.add(Trade(
+                bot_id=position.bot_id,
+                position_id=position.id,
+                symbol=position.symbol,
+                side=TradeSide.SELL if position.side == PositionSide.LONG else TradeSide.BUY,
+                quantity=position.quantity,
+                price=price,
+                fees=Decimal("0"),
+                realized_pnl=pnl,
+                executed_at=datetime.utcnow(),
+            ))
+            logger.info(f"{position.symbol} {position.side} closed on the exchange @ ${price:,.2f}")
+
+        table = Bot.__table__
+        await db.execute(
+            update(table)
+            .where(table.c.id == bindparam("bot"))
+            .values(capital=table.c.capital + bindparam("credit")),
+            [{"bot": bot_id, "credit": credit} for bot_id, credit in credits.items()],
+        )
+        return closed
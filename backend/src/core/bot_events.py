@@ -0,0 +1,123 @@
+"""Bot lifecycle events over Redis pub/sub.
+
+The API publishes a ``BotEvent`` whenever a bot's status changes; the scheduler
+subscribes and starts or stops engines immediately. Pub/sub is fire-and-forget,
+so the scheduler keeps a slow database sweep as a safety net and runs one
+whenever the subscription (re)connects.
+"""
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from ..core.config import config
+from ..core.logger import get_logger
+from ..core.redis_client import WORKLOAD_PUBSUB, get_redis_for
+
+logger = get_logger(__name__)
+
+RECONNECT_DELAY_SECONDS = 5
+POLL_TIMEOUT_SECONDS = 1.0
+
+
+@dataclass
+class BotEvent:
+    """A bot status change."""
+
+    bot_id: str
+    status: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, data: Any) -> Optional["BotEvent"]:
+        try:
+            payload = json.loads(data)
+            return cls(bot_id=str(payload["bot_id"]), status=str(payload["status"]))
+        except (TypeError, ValueError, KeyError):
+            logger.warning(f"Ignoring malformed bot event: {data!r}")
+            return None
+
+
+async def publish_bot_event(bot_id: Any, status: Any) -> bool:
+    """Publish a status change; failures are logged and left to the reconciliation sweep."""
+    if not config.BOT_EVENTS_ENABLED:
+        return False
+    event = BotEvent(bot_id=str(bot_id), status=str(getattr(status, "value", status)))
+    try:
+        redis = await get_redis_for(WORKLOAD_PUBSUB)
+        await redis.publish(config.REDIS_BOT_EVENTS_CHANNEL, event.to_json())
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to publish bot event {event}: {e}")
+        return False
+
+
+class BotEventListener:
+    """Subscribes to bot events and hands each one to ``on_event``.
+
+    ``on_connect`` runs after every (re)subscription so the caller can reconcile
+    anything published while the subscription was down.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[BotEvent], Awaitable[None]],
+        on_connect: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._on_event = on_event
+        self._on_connect = on_connect
+        self.connected = False
+        self._task: Optional[asyncio.Task[Any]] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Bot event subscription lost: {e}")
+            self.connected = False
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _listen(self) -> None:
+        redis = await get_redis_for(WORKLOAD_PUBSUB)
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(config.REDIS_BOT_EVENTS_CHANNEL)
+            self.connected = True
+            logger.info(f"Subscribed to bot events on {config.REDIS_BOT_EVENTS_CHANNEL}")
+            if self._on_connect:
+                self._on_connect()
+
+            while True:
+                # Short polls instead of a blocking read, which would trip the socket timeout
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=POLL_TIMEOUT_SECONDS)
+                if not message or message.get("type") != "message":
+                    continue
+                event = BotEvent.from_json(message["data"])
+                if event is None:
+                    continue
+                try:
+                    await self._on_event(event)
+                except Exception as e:
+                    logger.error(f"Error handling bot event {event}: {e}", exc_info=True)
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,148 @@
+"""Lease-based bot ownership for sharding bots across worker processes.
+
+A worker may only run a bot while it holds the bot's lease: a Redis key whose
+value is the worker id and which expires after WORKER_LEASE_TTL_SECONDS unless
+renewed. Renewal and release are compare-and-set scripts, so a worker can never
+extend or drop a lease another worker has since claimed. Workers also heartbeat
+into a sorted set, which gives every worker the live worker count it needs to
+take its fair share of bots and hand back the excess when workers join.
+"""
+
+import math
+import os
+import socket
+import uuid
+from typing import Any, Iterable, Optional, Set
+
+from ..core.config import config
+from ..core.logger import get_logger
+from ..core.redis_client import WORKLOAD_LOCKS, get_redis_for
+
+logger = get_logger(__name__)
+
+# KEYS = lease keys, ARGV = worker_id, ttl_ms
+# Returns the 1-based indexes of the keys that are still ours (now extended)
+RENEW_LEASES_SCRIPT = """
+local renewed = {}
+for i, key in ipairs(KEYS) do
+    if redis.call('GET', key) == ARGV[1] then
+        redis.call('PEXPIRE', key, ARGV[2])
+        table.insert(renewed, i)
+    end
+end
+return renewed
+"""
+
+# KEYS[1] = lease key, ARGV[1] = worker_id
+RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# KEYS[1] = heartbeat set, ARGV = worker_id, ttl_ms
+# Records the heartbeat, drops workers silent for a full TTL, returns the live count.
+# Scores use the Redis server clock, so clock skew between worker hosts cannot
+# expire live workers or keep dead ones counted.
+HEARTBEAT_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+redis.call('ZADD', KEYS[1], now, ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[2]))
+return redis.call('ZCARD', KEYS[1])
+"""
+
+
+def default_worker_id() -> str:
+    """Identity unique per process across hosts."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def fair_share(bot_count: int, worker_count: int) -> int:
+    """Most bots one worker should run so that every bot has a worker."""
+    return math.ceil(bot_count / max(worker_count, 1))
+
+
+class BotLeaseManager:
+    """Claims, renews and releases bot leases for one worker."""
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        ttl_seconds: Optional[float] = None,
+        redis: Optional[Any] = None,
+    ) -> None:
+        self.worker_id = worker_id or config.WORKER_ID or default_worker_id()
+        self.ttl_ms = int((ttl_seconds or config.WORKER_LEASE_TTL_SECONDS) * 1000)
+        self._redis = redis
+        self._renew_script: Any = None
+        self._release_script: Any = None
+        self._heartbeat_script: Any = None
+
+    async def _get_redis(self) -> Any:
+        if self._redis is None:
+            self._redis = await get_redis_for(WORKLOAD_LOCKS)
+        return self._redis
+
+    @staticmethod
+    def _key(bot_id: uuid.UUID) -> str:
+        return f"{config.WORKER_LEASE_KEY_PREFIX}{bot_id}"
+
+    async def acquire(self, bot_id: uuid.UUID) -> bool:
+        """Claim a bot's lease; True if it is now (or already was) ours."""
+        redis = await self._get_redis()
+        if await redis.set(self._key(bot_id), self.worker_id, nx=True, px=self.ttl_ms):
+            return True
+        # A restarted worker with a fixed WORKER_ID may still hold the lease
+        return bot_id in await self.renew([bot_id])
+
+    async def renew(self, bot_ids: Iterable[uuid.UUID]) -> Set[uuid.UUID]:
+        """Extend the leases still held on ``bot_ids``; returns those renewed."""
+        bot_ids = list(bot_ids)
+        if not bot_ids:
+            return set()
+        redis = await self._get_redis()
+        if self._renew_script is None:
+            self._renew_script = redis.register_script(RENEW_LEASES_SCRIPT)
+        renewed = await self._renew_script(
+            keys=[self._key(bot_id) for bot_id in bot_ids],
+            args=[self.worker_id, self.ttl_ms],
+        )
+        return {bot_ids[int(index) - 1] for index in renewed}
+
+    async def release(self, bot_id: uuid.UUID) -> bool:
+        """Give up a bot's lease if we still hold it."""
+        try:
+            redis = await self._get_redis()
+            if self._release_script is None:
+                self._release_script = redis.register_script(RELEASE_LEASE_SCRIPT)
+            return bool(await self._release_script(keys=[self._key(bot_id)], args=[self.worker_id]))
+        except Exception as e:
+            # The lease simply expires after its TTL
+            logger.warning(f"Failed to release lease on bot {bot_id}: {e}")
+            return False
+
+    async def owner(self, bot_id: uuid.UUID) -> Optional[str]:
+        """Worker currently holding a bot's lease, if any."""
+        redis = await self._get_redis()
+        owner = await redis.get(self._key(bot_id))
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+    async def heartbeat(self) -> int:
+        """Mark this worker alive; returns the number of live workers."""
+        redis = await self._get_redis()
+        if self._heartbeat_script is None:
+            self._heartbeat_script = redis.register_script(HEARTBEAT_SCRIPT)
+        return int(await self._heartbeat_script(
+            keys=[config.WORKER_HEARTBEAT_KEY],
+            args=[self.worker_id, self.ttl_ms],
+        ))
+
+    async def leave(self) -> None:
+        """Remove this worker from the live set so others rebalance right away."""
+        try:
+            redis = await self._get_redis()
+            await redis.zrem(config.WORKER_HEARTBEAT_KEY, self.worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to deregister worker {self.worker_id}: {e}")
@@ -8,7 +8,7 @@ while centralizing all constants in config.constants module.
 import os
 from decimal import Decimal
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from dotenv import load_dotenv
 
@@ -21,6 +21,12 @@ from ..config import (
     DATABASE_CONFIG,
     API_CONFIG,
     get_constant,
+    load_llm_config_from_env,
+    load_redis_config_from_env,
+    load_timing_config_from_env,
+    load_tracing_config_from_env,
+    load_trading_config_from_env,
+    load_worker_config_from_env,
 )
 
 env_path = Path(__file__).resolve().parents[3] / ".env"
@@ -62,6 +68,26 @@ class TradingConfig:
     # Trading Fees - loaded from config package
     PAPER_TRADING_FEE_PCT: float = TRADING_CONFIG["PAPER_TRADING_FEE_PCT"]
 
+    # Paper matching engine - loaded from config package with env overrides
+    _trading = load_trading_config_from_env()
+    PAPER_MATCHING_ENABLED: bool = bool(_trading["PAPER_MATCHING_ENABLED"])
+    PAPER_TAKER_FEE_PCT: float = _trading["PAPER_TAKER_FEE_PCT"]
+    PAPER_MAKER_FEE_PCT: float = _trading["PAPER_MAKER_FEE_PCT"]
+    PAPER_SLIPPAGE_BASE_BPS: float = _trading["PAPER_SLIPPAGE_BASE_BPS"]
+    PAPER_SLIPPAGE_RANGE_SHARE: float = _trading["PAPER_SLIPPAGE_RANGE_SHARE"]
+    PAPER_SLIPPAGE_IMPACT_COEF: float = _trading["PAPER_SLIPPAGE_IMPACT_COEF"]
+    PAPER_MAX_SLIPPAGE_BPS: float = _trading["PAPER_MAX_SLIPPAGE_BPS"]
+    PAPER_ORDER_LATENCY_MS: float = _trading["PAPER_ORDER_LATENCY_MS"]
+    PAPER_MAX_PARTICIPATION: float = _trading["PAPER_MAX_PARTICIPATION"]
+    PAPER_VOLUME_WINDOW: int = _trading["PAPER_VOLUME_WINDOW"]
+
+    # Live order pipeline - loaded from config package with env overrides
+    ORDER_ATTACHED_PROTECTION: bool = bool(_trading["ORDER_ATTACHED_PROTECTION"])
+    ORDER_SUBMIT_TIMEOUT_SECONDS: float = float(_trading["ORDER_SUBMIT_TIMEOUT_SECONDS"])
+    ORDER_SUBMIT_RETRIES: int = int(_trading["ORDER_SUBMIT_RETRIES"])
+    ORDER_RECONCILE_INTERVAL_SECONDS: float = float(_trading["ORDER_RECONCILE_INTERVAL_SECONDS"])
+    del _trading
+
     # Allowed symbols whitelist
     ALLOWED_SYMBOLS: List[str] = [
         "BTC/USDT",
@@ -74,14 +100,119 @@ class TradingConfig:
     # Rate Limiting - loaded from config package
     LLM_CALLS_PER_MINUTE: int = API_CONFIG["LLM_CALLS_PER_MINUTE"]
 
+    # LLM decision cache, streaming & dispatch - loaded from config package with env overrides
+    _llm = load_llm_config_from_env()
+    LLM_DECISION_CACHE_ENABLED: bool = bool(_llm["DECISION_CACHE_ENABLED"])
+    LLM_DECISION_CACHE_PRICE_TOLERANCE_PCT: float = float(_llm["DECISION_CACHE_PRICE_TOLERANCE_PCT"])
+    LLM_DECISION_CACHE_RSI_BUCKET: int = int(_llm["DECISION_CACHE_RSI_BUCKET"])
+    LLM_DECISION_CACHE_MAX_AGE_SECONDS: int = int(_llm["DECISION_CACHE_MAX_AGE_SECONDS"])
+    LLM_DECISION_CACHE_MAX_ENTRIES: int = int(_llm["DECISION_CACHE_MAX_ENTRIES"])
+    LLM_STREAMING_ENABLED: bool = bool(_llm["STREAMING_ENABLED"])
+    LLM_CALL_TIMEOUT_SECONDS: float = float(_llm["CALL_TIMEOUT_SECONDS"])
+    LLM_TOTAL_DEADLINE_SECONDS: float = float(_llm["TOTAL_DEADLINE_SECONDS"])
+    LLM_MAX_RETRIES: int = int(_llm["MAX_RETRIES"])
+    LLM_RETRY_BASE_DELAY_SECONDS: float = float(_llm["RETRY_BASE_DELAY_SECONDS"])
+    LLM_RETRY_MAX_DELAY_SECONDS: float = float(_llm["RETRY_MAX_DELAY_SECONDS"])
+    LLM_HEDGE_ENABLED: bool = bool(_llm["HEDGE_ENABLED"])
+    LLM_HEDGE_PERCENTILE: float = float(_llm["HEDGE_PERCENTILE"])
+    LLM_HEDGE_MIN_SAMPLES: int = int(_llm["HEDGE_MIN_SAMPLES"])
+    LLM_CIRCUIT_FAILURE_THRESHOLD: int = int(_llm["CIRCUIT_FAILURE_THRESHOLD"])
+    LLM_CIRCUIT_RESET_SECONDS: float = float(_llm["CIRCUIT_RESET_SECONDS"])
+    LLM_FALLBACK_PROVIDERS: List[str] = list(_llm["FALLBACK_PROVIDERS"])
+    LLM_BATCHING_ENABLED: bool = bool(_llm["BATCHING_ENABLED"])
+    LLM_BATCH_WINDOW_SECONDS: float = float(_llm["BATCH_WINDOW_SECONDS"])
+    LLM_BATCH_MAX_MEMBERS: int = int(_llm["BATCH_MAX_MEMBERS"])
+    LLM_BATCH_MAX_TOKENS: int = int(_llm["BATCH_MAX_TOKENS"])
+    LLM_CHARS_PER_TOKEN: int = int(_llm["CHARS_PER_TOKEN"])
+    PROMPT_COMPRESSION_ENABLED: bool = bool(_llm["PROMPT_COMPRESSION_ENABLED"])
+    PROMPT_TOKEN_BUDGET_PER_SYMBOL: int = int(_llm["PROMPT_TOKEN_BUDGET_PER_SYMBOL"])
+    PROMPT_SIGNIFICANT_DIGITS: int = int(_llm["PROMPT_SIGNIFICANT_DIGITS"])
+    LLM_TIERED_SHORTLIST_SIZE: int = int(_llm["TIERED_SHORTLIST_SIZE"])
+    LLM_TIERED_MIN_SCORE: float = float(_llm["TIERED_MIN_SCORE"])
+    LLM_STRUCTURED_OUTPUT_ENABLED: bool = bool(_llm["STRUCTURED_OUTPUT_ENABLED"])
+    LLM_REPAIR_ON_INVALID: bool = bool(_llm["REPAIR_ON_INVALID"])
+    del _llm
+
     # Performance - loaded from config package
     CYCLE_INTERVAL_SECONDS: int = TIMING_CONFIG["CYCLE_INTERVAL_SECONDS"]
+    CYCLE_BUDGET_FRACTION: float = TIMING_CONFIG["CYCLE_BUDGET_FRACTION"]
+    CYCLE_STAGE_BUDGETS: Dict[str, float] = dict(TIMING_CONFIG["CYCLE_STAGE_BUDGETS"])
+    STALE_MARKET_DATA_MAX_AGE_SECONDS: int = TIMING_CONFIG["STALE_MARKET_DATA_MAX_AGE_SECONDS"]
+
+    # Exit monitor - loaded from config package with env overrides
+    _timing = load_timing_config_from_env()
+    EXIT_MONITOR_ENABLED: bool = bool(_timing["EXIT_MONITOR_ENABLED"])
+    EXIT_MONITOR_INTERVAL_SECONDS: float = float(_timing["EXIT_MONITOR_INTERVAL_SECONDS"])
+
+    # Account reconciler - exchange state for live bots
+    ACCOUNT_RECONCILE_ENABLED: bool = bool(_timing["ACCOUNT_RECONCILE_ENABLED"])
+    ACCOUNT_RECONCILE_INTERVAL_SECONDS: float = float(_timing["ACCOUNT_RECONCILE_INTERVAL_SECONDS"])
+    ACCOUNT_STREAM_ENABLED: bool = bool(_timing["ACCOUNT_STREAM_ENABLED"])
+    ACCOUNT_QUANTITY_TOLERANCE: float = float(_timing["ACCOUNT_QUANTITY_TOLERANCE"])
+
+    # Bot lifecycle - status events with a slow reconciliation sweep
+    BOT_EVENTS_ENABLED: bool = bool(_timing["BOT_EVENTS_ENABLED"])
+    BOT_MONITOR_CHECK_INTERVAL_SECONDS: int = int(_timing["BOT_MONITOR_CHECK_INTERVAL_SECONDS"])
+    BOT_RECONCILE_INTERVAL_SECONDS: int = int(_timing["BOT_RECONCILE_INTERVAL_SECONDS"])
+
+    # Cycle clock - candle-aligned, jittered cycle triggers
+    CYCLE_CLOCK_ENABLED: bool = bool(_timing["CYCLE_CLOCK_ENABLED"])
+    CYCLE_CLOCK_TICK_SECONDS: float = float(_timing["CYCLE_CLOCK_TICK_SECONDS"])
+    CYCLE_CLOSE_OFFSET_SECONDS: float = float(_timing["CYCLE_CLOSE_OFFSET_SECONDS"])
+    CYCLE_JITTER_WINDOW_SECONDS: float = float(_timing["CYCLE_JITTER_WINDOW_SECONDS"])
+    PIPELINED_CYCLES_ENABLED: bool = bool(_timing["PIPELINED_CYCLES_ENABLED"])
+    PREFETCH_ENABLED: bool = bool(_timing["PREFETCH_ENABLED"])
+    PREFETCH_LEAD_SECONDS: float = float(_timing["PREFETCH_LEAD_SECONDS"])
+    PREFETCH_MAX_AGE_SECONDS: float = float(_timing["PREFETCH_MAX_AGE_SECONDS"])
+    del _timing
 
     # Database Connection Pool - loaded from config package with env overrides
     DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", str(DATABASE_CONFIG["POOL_SIZE"])))
     DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", str(DATABASE_CONFIG["MAX_OVERFLOW"])))
     DB_POOL_RECYCLE: int = TIMING_CONFIG["DB_POOL_RECYCLE_SECONDS"]
     DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_BULK_UPDATE_BATCH_SIZE: int = int(
+        os.getenv("BOT_DB_BULK_UPDATE_BATCH_SIZE", str(DATABASE_CONFIG["BULK_UPDATE_BATCH_SIZE"]))
+    )
+    CYCLE_UNIT_OF_WORK_ENABLED: bool = os.getenv(
+        "BOT_DB_CYCLE_UNIT_OF_WORK", str(DATABASE_CONFIG["CYCLE_UNIT_OF_WORK_ENABLED"])
+    ).lower() == "true"
+
+    # Redis Connection Pools - loaded from config package with env overrides
+    _redis = load_redis_config_from_env()
+    REDIS_MAX_CONNECTIONS: int = int(_redis["MAX_CONNECTIONS"])
+    REDIS_POOL_TIMEOUT: float = float(_redis["POOL_TIMEOUT_SECONDS"])
+    REDIS_SOCKET_TIMEOUT: float = float(_redis["SOCKET_TIMEOUT_SECONDS"])
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(_redis["HEALTH_CHECK_INTERVAL_SECONDS"])
+    REDIS_SATURATION_WARNING_PCT: float = float(_redis["SATURATION_WARNING_PCT"])
+    REDIS_SEPARATE_POOLS: bool = bool(_redis["SEPARATE_POOLS"])
+    REDIS_WORKLOAD_MAX_CONNECTIONS: Dict[str, int] = dict(_redis["WORKLOAD_MAX_CONNECTIONS"])
+    REDIS_BOT_EVENTS_CHANNEL: str = str(_redis["BOT_EVENTS_CHANNEL"])
+    del _redis
+
+    # Cycle tracing - loaded from config package with env overrides
+    _tracing = load_tracing_config_from_env()
+    TRACING_ENABLED: bool = bool(_tracing["ENABLED"])
+    TRACING_RECENT_CYCLES: int = int(_tracing["RECENT_CYCLES"])
+    TRACING_HISTOGRAM_BUCKETS: List[float] = [float(b) for b in _tracing["HISTOGRAM_BUCKETS_SECONDS"]]
+    TRACING_EXPORT_FILE: str = str(_tracing["EXPORT_FILE"])
+    TRACING_OTEL_ENABLED: bool = bool(_tracing["OTEL_ENABLED"])
+    TRACING_SERVICE_NAME: str = str(_tracing["SERVICE_NAME"])
+    del _tracing
+
+    # Worker sharding - loaded from config package with env overrides
+    _worker = load_worker_config_from_env()
+    SCHEDULER_MODE: str = str(_worker["SCHEDULER_MODE"])
+    WORKER_ID: str = str(_worker["ID"])
+    WORKER_LEASE_TTL_SECONDS: int = int(_worker["LEASE_TTL_SECONDS"])
+    WORKER_LEASE_RENEW_SECONDS: float = float(_worker["LEASE_RENEW_SECONDS"])
+    WORKER_HEARTBEAT_KEY: str = str(_worker["HEARTBEAT_KEY"])
+    WORKER_LEASE_KEY_PREFIX: str = str(_worker["LEASE_KEY_PREFIX"])
+    LEADER_ELECTION_ENABLED: bool = bool(_worker["LEADER_ELECTION_ENABLED"])
+    LEADER_TTL_SECONDS: int = int(_worker["LEADER_TTL_SECONDS"])
+    LEADER_RENEW_SECONDS: float = float(_worker["LEADER_RENEW_SECONDS"])
+    LEADER_KEY: str = str(_worker["LEADER_KEY"])
+    del _worker
 
     @classmethod
     def validate_config(cls) -> tuple[bool, List[str]]:
@@ -97,6 +228,27 @@ class TradingConfig:
         if not 0 < cls.DEFAULT_TAKE_PROFIT_PCT < 1:
             errors.append("DEFAULT_TAKE_PROFIT_PCT must be between 0 and 1")
 
+        if cls.SCHEDULER_MODE not in ("embedded", "worker"):
+            errors.append("SCHEDULER_MODE must be embedded or worker")
+
+        if not 0 < cls.WORKER_LEASE_RENEW_SECONDS < cls.WORKER_LEASE_TTL_SECONDS:
+            errors.append("WORKER_LEASE_RENEW_SECONDS must be positive and below WORKER_LEASE_TTL_SECONDS")
+
+        if not 0 < cls.LEADER_RENEW_SECONDS < cls.LEADER_TTL_SECONDS:
+            errors.append("LEADER_RENEW_SECONDS must be positive and below LEADER_TTL_SECONDS")
+
+        if cls.PREFETCH_LEAD_SECONDS < 0 or cls.PREFETCH_MAX_AGE_SECONDS <= cls.PREFETCH_LEAD_SECONDS:
+            errors.append("PREFETCH_MAX_AGE_SECONDS must exceed PREFETCH_LEAD_SECONDS (both non-negative)")
+
+        if cls.ORDER_SUBMIT_TIMEOUT_SECONDS <= 0 or cls.ORDER_SUBMIT_RETRIES < 1:
+            errors.append("ORDER_SUBMIT_TIMEOUT_SECONDS must be positive and ORDER_SUBMIT_RETRIES at least 1")
+
+        if cls.ORDER_RECONCILE_INTERVAL_SECONDS <= 0:
+            errors.append("ORDER_RECONCILE_INTERVAL_SECONDS must be positive")
+
+        if cls.ACCOUNT_RECONCILE_INTERVAL_SECONDS <= 0 or not 0 <= cls.ACCOUNT_QUANTITY_TOLERANCE < 1:
+            errors.append("ACCOUNT_RECONCILE_INTERVAL_SECONDS must be positive, ACCOUNT_QUANTITY_TOLERANCE in [0, 1)")
+
         return len(errors) == 0, errors
 
     @classmethod
@@ -0,0 +1,104 @@
+"""Time budget for one trading cycle, split into per-stage deadlines."""
+
+import asyncio
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Dict, List, Mapping, Optional, TypeVar
+
+from ..core.config import config
+from ..core.logger import get_logger
+from ..core.tracing import span
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage: how long it took and whether it hit its deadline."""
+
+    name: str
+    seconds: float
+    deadline: float
+    timed_out: bool = False
+
+
+@dataclass
+class CycleBudget:
+    """Per-stage deadlines carved out of a cycle-wide budget.
+
+    Each stage gets ``share * total`` seconds, capped by what is left of the
+    cycle. A stage that times out returns its fallback so the cycle can degrade
+    (stale data, no LLM) instead of running into the next one.
+    """
+
+    total_seconds: float
+    shares: Mapping[str, float]
+    started_at: float = field(default_factory=monotonic)
+    stages: List[StageResult] = field(default_factory=list)
+
+    @classmethod
+    def for_interval(cls, cycle_interval: float) -> "CycleBudget":
+        """Budget for a cycle that must finish within ``cycle_interval``."""
+        return cls(
+            total_seconds=cycle_interval * config.CYCLE_BUDGET_FRACTION,
+            shares=config.CYCLE_STAGE_BUDGETS,
+        )
+
+    @property
+    def elapsed(self) -> float:
+        return monotonic() - self.started_at
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.total_seconds - self.elapsed)
+
+    def deadline_for(self, stage: str) -> float:
+        """Seconds available to a stage right now."""
+        share = self.shares.get(stage, 0.0) * self.total_seconds
+        return min(share, self.remaining) if share else self.remaining
+
+    async def run(self, stage: str, awaitable: Awaitable[T], fallback: Optional[T] = None) -> Optional[T]:
+        """Await ``awaitable`` within the stage deadline; ``fallback`` on timeout."""
+        deadline = self.deadline_for(stage)
+        start = monotonic()
+        try:
+            with span(stage, deadline_seconds=round(deadline, 3)):
+                result = await asyncio.wait_for(awaitable, timeout=deadline)
+        except asyncio.TimeoutError:
+            self.record(stage, monotonic() - start, deadline, timed_out=True)
+            return fallback
+        self.record(stage, monotonic() - start, deadline)
+        return result
+
+    def record(self, stage: str, seconds: float, deadline: float, timed_out: bool = False) -> None:
+        """Record a stage timed by the caller (for stages that must not be cancelled)."""
+        self.stages.append(StageResult(stage, seconds, deadline, timed_out))
+        if timed_out:
+            logger.warning(f"Cycle stage '{stage}' exceeded {deadline:.1f}s, degrading")
+
+    def timed_out(self, stage: str) -> bool:
+        return any(s.name == stage and s.timed_out for s in self.stages)
+
+    @property
+    def overruns(self) -> List[str]:
+        return [s.name for s in self.stages if s.timed_out]
+
+    def report(self) -> Dict[str, Any]:
+        """Stage timings and overruns; logged as a warning when anything overran."""
+        report = {
+            "total_seconds": round(self.elapsed, 3),
+            "budget_seconds": round(self.total_seconds, 3),
+            "stages": {
+                s.name: {"seconds": round(s.seconds, 3), "deadline": round(s.deadline, 3), "timed_out": s.timed_out}
+                for s in self.stages
+            },
+            "overruns": self.overruns,
+        }
+        if self.overruns or self.elapsed > self.total_seconds:
+            logger.warning(
+                f"Cycle over budget: {self.elapsed:.1f}s of {self.total_seconds:.1f}s, "
+                f"timed out: {', '.join(self.overruns) or 'none'}"
+            )
+        return report
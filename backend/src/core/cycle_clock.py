@@ -0,0 +1,159 @@
+"""Central, candle-aligned clock for trading cycles.
+
+Instead of every orchestrator sleeping ``cycle_interval`` from whenever it last
+finished, which drifts and bunches cycles together, one clock per process fires
+each bot's cycle at a fixed offset after every candle close (epoch multiples of
+the interval). Each bot gets a stable slot inside a jitter window after that
+offset, so exchange and LLM load is spread evenly across the window while every
+cycle still sees the candle that just closed. Bots firing for the same candle
+share one market data fetch per symbol (see ``MarketDataBlock``).
+
+Pending cycles live in a hashed timing wheel: scheduling and cancelling are
+O(1), and each tick only touches the entries in one slot.
+"""
+
+import asyncio
+import math
+import uuid
+from time import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..core.config import config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+WHEEL_SLOTS = 512
+
+
+class TimingWheel:
+    """Hashed timing wheel keyed by absolute tick number."""
+
+    def __init__(self, tick_seconds: float, slots: int = WHEEL_SLOTS, now: Optional[float] = None) -> None:
+        self.tick_seconds = tick_seconds
+        self._slots: List[Dict[Hashable, int]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}  # key -> tick it is scheduled for
+        self._current = self._tick_of(time() if now is None else now)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def _tick_of(self, at: float) -> int:
+        return math.floor(at / self.tick_seconds)
+
+    def schedule(self, key: Hashable, at: float) -> None:
+        """Fire ``key`` on the first tick at or after ``at`` (replacing any earlier schedule)."""
+        self.cancel(key)
+        tick = max(math.ceil(at / self.tick_seconds), self._current + 1)
+        self._slots[tick % len(self._slots)][key] = tick
+        self._where[key] = tick
+
+    def cancel(self, key: Hashable) -> None:
+        tick = self._where.pop(key, None)
+        if tick is not None:
+            self._slots[tick % len(self._slots)].pop(key, None)
+
+    def advance(self, now: float) -> List[Hashable]:
+        """Move the wheel to ``now`` and return the keys that became due."""
+        target = self._tick_of(now)
+        if target <= self._current:
+            return []
+
+        due: List[Hashable] = []
+        # After a long stall every slot is visited once instead of once per missed tick
+        span = min(target - self._current, len(self._slots))
+        for offset in range(1, span + 1):
+            slot = self._slots[(self._current + offset) % len(self._slots)]
+            for key, tick in list(slot.items()):
+                if tick <= target:
+                    del slot[key]
+                    del self._where[key]
+                    due.append(key)
+        self._current = target
+        return due
+
+
+class CycleClock:
+    """Wakes each bot once per interval, a fixed offset plus its jitter slot after candle close."""
+
+    def __init__(
+        self,
+        tick_seconds: Optional[float] = None,
+        close_offset_seconds: Optional[float] = None,
+        jitter_window_seconds: Optional[float] = None,
+    ) -> None:
+        self.tick_seconds = tick_seconds or config.CYCLE_CLOCK_TICK_SECONDS
+        self.close_offset = (
+            config.CYCLE_CLOSE_OFFSET_SECONDS if close_offset_seconds is None else close_offset_seconds
+        )
+        self.jitter_window = (
+            config.CYCLE_JITTER_WINDOW_SECONDS if jitter_window_seconds is None else jitter_window_seconds
+        )
+        self.wheel = TimingWheel(self.tick_seconds)
+        self._waiters: Dict[uuid.UUID, Tuple["asyncio.Future[float]", float]] = {}
+        self._task: Optional[asyncio.Task[Any]] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"Cycle clock started (candle close +{self.close_offset:g}s, "
+                f"jitter window {self.jitter_window:g}s)"
+            )
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for future, _ in self._waiters.values():
+            future.cancel()
+        self._waiters.clear()
+
+    def jitter(self, bot_id: uuid.UUID, interval: float) -> float:
+        """Stable offset of this bot inside the jitter window (uniform over bot ids)."""
+        window = max(0.0, min(self.jitter_window, interval - self.close_offset - self.tick_seconds))
+        return (bot_id.int % 10_000) / 10_000 * window
+
+    def next_fire(self, bot_id: uuid.UUID, interval: float, now: float) -> Tuple[float, float]:
+        """Next (fire time, candle close) strictly after ``now`` for this bot."""
+        delay = self.close_offset + self.jitter(bot_id, interval)
+        candle_close = (math.floor((now - delay) / interval) + 1) * interval
+        return candle_close + delay, candle_close
+
+    async def wait(self, bot_id: uuid.UUID, interval: float) -> float:
+        """Sleep until this bot's next slot; returns the candle close it fires for."""
+        fire_at, candle_close = self.next_fire(bot_id, interval, time())
+        future: "asyncio.Future[float]" = asyncio.get_running_loop().create_future()
+        self._waiters[bot_id] = (future, candle_close)
+        self.wheel.schedule(bot_id, fire_at)
+        try:
+            return await future
+        finally:
+            if self._waiters.get(bot_id, (None,))[0] is future:
+                del self._waiters[bot_id]
+                self.wheel.cancel(bot_id)
+
+    def fire_due(self, now: float) -> int:
+        """Release every bot whose slot has passed; returns how many fired."""
+        fired = 0
+        for bot_id in self.wheel.advance(now):
+            waiter = self._waiters.pop(bot_id, None)  # type: ignore[arg-type]
+            if waiter and not waiter[0].done():
+                waiter[0].set_result(waiter[1])
+                fired += 1
+        return fired
+
+    async def _run(self) -> None:
+        while True:
+            now = time()
+            self.fire_due(now)
+            # Sleep to the next tick boundary rather than a fixed period, so ticks don't drift
+            await asyncio.sleep(self.tick_seconds - (now % self.tick_seconds))
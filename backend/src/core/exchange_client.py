@@ -30,6 +30,8 @@ class ExchangeClient:
             cast(Dict[str, Any], exchange_options["options"])["sandboxMode"] = True
 
         self.exchange = ccxt.okx(exchange_options)
+        self._exchange_options = exchange_options
+        self._stream: Any = None  # ccxt.pro client for private streams, created on first use
 
         mode = "PAPER TRADING (Local)" if paper_trading else "LIVE TRADING (OKX Sandbox Demo)"
         logger.info(f"Exchange client initialized in {mode} mode")
@@ -64,6 +66,16 @@ class ExchangeClient:
             logger.error(f"Error fetching ticker for {symbol}: {e}")
             raise
 
+    async def fetch_tickers(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch tickers for several symbols in one request, keyed by the given symbols."""
+        try:
+            normalized = {self._normalize_symbol(symbol): symbol for symbol in symbols}
+            tickers = cast(Dict[str, Any], await self.exchange.fetch_tickers(list(normalized)))
+            return {normalized[key]: ticker for key, ticker in tickers.items() if key in normalized}
+        except Exception as e:
+            logger.error(f"Error fetching tickers for {len(symbols)} symbols: {e}")
+            raise
+
     async def create_order(
         self,
         symbol: str,
@@ -71,15 +83,28 @@ class ExchangeClient:
         amount: float,
         price: Optional[float] = None,
         order_type: str = "market",
+        client_order_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
-        """Create a market or limit order."""
+        """Create a market or limit order.
+
+        ``client_order_id`` makes the order idempotent: the exchange rejects a
+        second order with the same id, and the order can be looked up by it.
+        ``params`` carries exchange-specific options such as attached stop-loss
+        and take-profit orders.
+        """
+        params = dict(params or {})
+        if client_order_id:
+            params["clientOrderId"] = client_order_id
         try:
             if order_type == "market":
-                order = cast(Dict[str, Any], await self.exchange.create_market_order(symbol, side, amount))
+                order = cast(Dict[str, Any], await self.exchange.create_market_order(symbol, side, amount, params=params))
             else:
                 if price is None:
                     raise ValueError("Price required for limit orders")
-                order = cast(Dict[str, Any], await self.exchange.create_limit_order(symbol, side, amount, price))
+                order = cast(
+                    Dict[str, Any], await self.exchange.create_limit_order(symbol, side, amount, price, params=params)
+                )
 
             logger.info(f"Created {order_type} {side} order: {symbol} {amount} @ {price or 'market'}")
             return order
@@ -88,15 +113,23 @@ class ExchangeClient:
             raise
 
     async def _create_trigger_order(
-        self, symbol: str, side: str, amount: float, trigger_price: float, order_name: str
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        trigger_price: float,
+        order_name: str,
+        client_order_id: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Create a trigger order (stop-loss or take-profit)."""
         try:
-            params = {
+            params: Dict[str, Any] = {
                 "triggerPrice": trigger_price,
                 "orderType": "market",
                 "triggerType": "last",
             }
+            if client_order_id:
+                params["clientOrderId"] = client_order_id
             order = cast(Dict[str, Any], await self.exchange.create_order(symbol, "trigger", side, amount, params=params))
             logger.info(f"Created {order_name} order: {symbol} {amount} @ {trigger_price}")
             return order
@@ -105,16 +138,53 @@ class ExchangeClient:
             raise
 
     async def create_stop_loss_order(
-        self, symbol: str, side: str, amount: float, stop_price: float
+        self, symbol: str, side: str, amount: float, stop_price: float, client_order_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a stop-loss order."""
-        return await self._create_trigger_order(symbol, side, amount, stop_price, "stop-loss")
+        return await self._create_trigger_order(symbol, side, amount, stop_price, "stop-loss", client_order_id)
 
     async def create_take_profit_order(
-        self, symbol: str, side: str, amount: float, take_profit_price: float
+        self, symbol: str, side: str, amount: float, take_profit_price: float, client_order_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a take-profit order."""
-        return await self._create_trigger_order(symbol, side, amount, take_profit_price, "take-profit")
+        return await self._create_trigger_order(
+            symbol, side, amount, take_profit_price, "take-profit", client_order_id
+        )
+
+    async def fetch_order_by_client_id(
+        self, symbol: str, client_order_id: str, trigger: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Look an order up by its client order id; None if the exchange never got it."""
+        params: Dict[str, Any] = {"clientOrderId": client_order_id}
+        if trigger:
+            params["trigger"] = True
+        try:
+            return cast(Dict[str, Any], await self.exchange.fetch_order(None, symbol, params=params))
+        except ccxt.OrderNotFound:
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching order {client_order_id}: {e}")
+            raise
+
+    async def cancel_order_by_client_id(
+        self, symbol: str, client_order_id: str, trigger: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """Cancel an order by its client order id; None if the exchange does not have it open."""
+        order_id: Optional[str] = None
+        params: Dict[str, Any] = {"clientOrderId": client_order_id}
+        if trigger:
+            # OKX cancels algo orders by algo id only: resolve it from the client id first
+            order = await self.fetch_order_by_client_id(symbol, client_order_id, trigger=True)
+            if order is None or order.get("status") != "open":
+                return None
+            order_id, params = order["id"], {"trigger": True}
+        try:
+            return cast(Dict[str, Any], await self.exchange.cancel_order(order_id, symbol, params=params))
+        except ccxt.OrderNotFound:
+            return None
+        except Exception as e:
+            logger.error(f"Error cancelling order {client_order_id}: {e}")
+            raise
 
     async def fetch_balance(self) -> Dict[str, Any]:
         """Fetch account balance."""
@@ -137,6 +207,32 @@ class ExchangeClient:
             logger.error(f"Error fetching positions: {e}")
             raise
 
+    @property
+    def supports_account_stream(self) -> bool:
+        """Whether private position/balance WebSocket streams are available (ccxt.pro, live keys)."""
+        if self.paper_trading:
+            return False
+        try:
+            import ccxt.pro  # type: ignore[import-untyped]  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def _stream_client(self) -> Any:
+        if self._stream is None:
+            import ccxt.pro as ccxtpro  # type: ignore[import-untyped]
+
+            self._stream = ccxtpro.okx(self._exchange_options)
+        return self._stream
+
+    async def watch_positions(self) -> List[Dict[str, Any]]:
+        """Wait for the next private position update; closed positions come back with zero contracts."""
+        return cast(List[Dict[str, Any]], await self._stream_client().watch_positions())
+
+    async def watch_balance(self) -> Dict[str, Any]:
+        """Wait for the next private balance update."""
+        return cast(Dict[str, Any], await self._stream_client().watch_balance())
+
     async def get_funding_rate(self, symbol: str) -> float:
         """Get current funding rate for perpetual swaps."""
         normalized_symbol = self._normalize_symbol(symbol)
@@ -156,6 +252,8 @@ class ExchangeClient:
     async def close(self) -> None:
         """Close exchange connection."""
         await self.exchange.close()
+        if self._stream is not None:
+            await self._stream.close()
         logger.info("Exchange connection closed")
 
 
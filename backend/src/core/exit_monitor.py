@@ -0,0 +1,163 @@
+"""Process-wide exit monitor: stop-loss and take-profit checks between decision cycles."""
+
+import asyncio
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set
+
+from sqlalchemy import select
+
+from ..blocks.block_execution import ExecutionBlock
+from ..blocks.block_risk import RiskBlock
+from ..core.config import config
+from ..core.database import AsyncSessionLocal
+from ..core.exchange_client import ExchangeClient
+from ..core.logger import get_logger
+from ..models.position import Position, PositionStatus
+from ..services.position_service import PositionService
+
+logger = get_logger(__name__)
+
+
+class ExitMonitor:
+    """Checks every open position of the running bots against the latest price.
+
+    One loop per process instead of one per bot: each pass loads the open
+    positions of all monitored bots in a single query, fetches one ticker per
+    distinct symbol in a single request and closes triggered positions through
+    the owning bot's ExecutionBlock. Positions left open are then marked to
+    market in one bulk UPDATE, skipping unchanged prices. Streamed prices can
+    be pushed through ``on_tick`` to check a symbol as soon as a price arrives.
+    """
+
+    def __init__(
+        self,
+        executions: Callable[[], Mapping[uuid.UUID, ExecutionBlock]],
+        exchange: Optional[ExchangeClient] = None,
+        interval_seconds: Optional[float] = None,
+    ) -> None:
+        self._executions = executions
+        self.exchange = exchange
+        self.interval_seconds = interval_seconds or config.EXIT_MONITOR_INTERVAL_SECONDS
+        self.risk = RiskBlock()
+        self.positions: Dict[str, List[Position]] = {}
+        self.prices: Dict[str, Decimal] = {}
+        self.is_running = False
+        self._task: Optional[asyncio.Task[Any]] = None
+        self._closing: Set[uuid.UUID] = set()
+
+    async def start(self) -> None:
+        """Start the monitoring loop."""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Exit monitor started (checks every {self.interval_seconds:g}s)")
+
+    async def stop(self) -> None:
+        """Stop the monitoring loop."""
+        self.is_running = False
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        logger.info("Exit monitor stopped")
+
+    async def _run(self) -> None:
+        while self.is_running:
+            try:
+                await self.check_once()
+            except Exception as e:
+                logger.error(f"Exit monitor error: {e}", exc_info=True)
+            await asyncio.sleep(self.interval_seconds)
+
+    async def check_once(self) -> int:
+        """One pass over all open positions; returns the number closed."""
+        executions = self._executions()
+        if not executions:
+            self.positions = {}
+            return 0
+
+        by_symbol: Dict[str, List[Position]] = defaultdict(list)
+        for position in await self._load_open_positions(list(executions)):
+            by_symbol[position.symbol].append(position)
+        self.positions = dict(by_symbol)
+        if not self.positions:
+            return 0
+
+        self.prices.update(await self._fetch_prices(list(self.positions), executions))
+        closed = 0
+        for symbol in self.positions:
+            if symbol in self.prices:
+                closed += await self._check_symbol(symbol, self.prices[symbol], executions)
+
+        still_open = [p for positions in self.positions.values() for p in positions]
+        changes = PositionService.changed_prices(still_open, self.prices)
+        if changes:
+            await self._mark_to_market(changes)
+            for position in still_open:
+                position.current_price = changes.get(position.id, position.current_price)
+        return closed
+
+    async def on_tick(self, symbol: str, price: Any) -> int:
+        """Check a symbol's positions against a streamed price; returns the number closed."""
+        self.prices[symbol] = Decimal(str(price))
+        if symbol not in self.positions:
+            return 0
+        return await self._check_symbol(symbol, self.prices[symbol], self._executions())
+
+    async def _check_symbol(
+        self, symbol: str, price: Decimal, executions: Mapping[uuid.UUID, ExecutionBlock]
+    ) -> int:
+        closed = 0
+        for position in list(self.positions.get(symbol, [])):
+            should_exit, reason = self.risk.check_exit_conditions(position, price)
+            execution = executions.get(position.bot_id)
+            if not should_exit or execution is None or position.id in self._closing:
+                continue
+
+            logger.info(f"[EXIT MONITOR] {symbol} {reason} @ ${price:,.2f}")
+            self._closing.add(position.id)
+            try:
+                result = await execution.close_position(position, price, reason)
+            finally:
+                self._closing.discard(position.id)
+
+            # Closed here or already closed by the decision cycle: stop watching it
+            if result.success or result.error == "Position already closed":
+                self.positions[symbol].remove(position)
+                closed += int(result.success)
+        return closed
+
+    async def _load_open_positions(self, bot_ids: List[uuid.UUID]) -> List[Position]:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Position).where(
+                    Position.bot_id.in_(bot_ids),
+                    Position.status == PositionStatus.OPEN,
+                )
+            )
+            return list(result.scalars().all())
+
+    async def _mark_to_market(self, changes: Dict[uuid.UUID, Decimal]) -> None:
+        try:
+            async with AsyncSessionLocal() as db:
+                await PositionService(db).bulk_update_prices(changes)
+        except Exception as e:
+            logger.warning(f"Exit monitor failed to update position prices: {e}")
+
+    async def _fetch_prices(
+        self, symbols: List[str], executions: Mapping[uuid.UUID, ExecutionBlock]
+    ) -> Dict[str, Decimal]:
+        # Tickers are public market data, so any bot's exchange client will do
+        exchange = self.exchange or next(iter(executions.values())).exchange
+        tickers = await exchange.fetch_tickers(symbols)
+        return {
+            symbol: Decimal(str(ticker["last"]))
+            for symbol, ticker in tickers.items()
+            if ticker.get("last") is not None
+        }
@@ -0,0 +1,182 @@
+"""Leader election for the scheduler role across API replicas.
+
+Every replica campaigns for one Redis key; the holder runs the bots, the others
+stand by and take over within a renewal interval of the key being released, or
+within the TTL if the leader dies. Each new term gets a fencing token from a
+Redis counter, so tokens only ever increase. Execution writes claim the token on
+the bot row in the same transaction (``claim_fence``): once a newer leader has
+written for a bot, anything a deposed leader still tries to write is rejected.
+"""
+
+import asyncio
+import uuid
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.bot_leases import default_worker_id
+from ..core.config import config
+from ..core.logger import get_logger
+from ..core.redis_client import WORKLOAD_LOCKS, get_redis_for
+from ..models.bot import Bot
+
+logger = get_logger(__name__)
+
+# KEYS[1] = leader key, KEYS[2] = term counter, ARGV = holder, ttl_ms
+# Returns the holder's fencing token (renewing its term), or 0 if someone else leads
+CAMPAIGN_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local holder, token = string.match(current, '^(.*)|(%d+)$')
+    if holder == ARGV[1] then
+        redis.call('PEXPIRE', KEYS[1], ARGV[2])
+        return tonumber(token)
+    end
+    return 0
+end
+local token = redis.call('INCR', KEYS[2])
+redis.call('SET', KEYS[1], ARGV[1] .. '|' .. token, 'PX', ARGV[2])
+return token
+"""
+
+# KEYS[1] = leader key, ARGV[1] = "holder|token"
+RESIGN_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class StaleFencingTokenError(RuntimeError):
+    """A write was attempted under a fencing token older than one already used."""
+
+
+async def claim_fence(db: AsyncSession, bot_id: uuid.UUID, token: int) -> None:
+    """Record ``token`` on the bot in the current transaction, or raise if a newer one is there."""
+    result = await db.execute(
+        update(Bot)
+        .where(Bot.id == bot_id, Bot.fencing_token <= token)
+        .values(fencing_token=token)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise StaleFencingTokenError(f"Fencing token {token} is stale for bot {bot_id}")
+
+
+class LeaderElection:
+    """Campaigns for the scheduler role and reports elections and demotions."""
+
+    def __init__(
+        self,
+        on_elected: Callable[[int], Awaitable[None]],
+        on_demoted: Callable[[], Awaitable[None]],
+        holder_id: Optional[str] = None,
+        redis: Optional[Any] = None,
+    ) -> None:
+        self.holder_id = holder_id or config.WORKER_ID or default_worker_id()
+        self.ttl_ms = int(config.LEADER_TTL_SECONDS * 1000)
+        self.token: Optional[int] = None
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        self._redis = redis
+        self._campaign_script: Any = None
+        self._resign_script: Any = None
+        self._renewed_at = 0.0
+        self._task: Optional[asyncio.Task[Any]] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.token is not None
+
+    async def _get_redis(self) -> Any:
+        if self._redis is None:
+            self._redis = await get_redis_for(WORKLOAD_LOCKS)
+        return self._redis
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand the role over right away."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.resign()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.campaign()
+            except Exception as e:
+                logger.error(f"Leader election campaign error: {e}", exc_info=True)
+            await asyncio.sleep(config.LEADER_RENEW_SECONDS)
+
+    async def campaign(self) -> None:
+        """Acquire or renew the role once, firing the callbacks on any change."""
+        try:
+            redis = await self._get_redis()
+            if self._campaign_script is None:
+                self._campaign_script = redis.register_script(CAMPAIGN_SCRIPT)
+            token = int(await self._campaign_script(
+                keys=[config.LEADER_KEY, f"{config.LEADER_KEY}:term"],
+                args=[self.holder_id, self.ttl_ms],
+            ))
+        except Exception as e:
+            logger.error(f"Leader election error: {e}")
+            # Step down before our term can lapse unnoticed and a new leader take over
+            expires_in = self._renewed_at + config.LEADER_TTL_SECONDS - monotonic()
+            if self.is_leader and expires_in <= config.LEADER_RENEW_SECONDS:
+                await self._demote()
+            return
+
+        if token and token == self.token:
+            self._renewed_at = monotonic()
+        elif token:
+            if self.is_leader:
+                await self._demote()
+            self.token = token
+            self._renewed_at = monotonic()
+            logger.info(f"Elected scheduler leader as {self.holder_id} (fencing token {token})")
+            try:
+                await self._on_elected(token)
+            except Exception as e:
+                # Hand the term back rather than hold a role nothing is serving
+                logger.error(f"Failed to take over as scheduler leader: {e}", exc_info=True)
+                await self._stopped()
+                await self.resign()
+        elif self.is_leader:
+            await self._demote()
+
+    async def _demote(self) -> None:
+        logger.warning(f"Lost scheduler leadership (fencing token {self.token})")
+        self.token = None
+        await self._stopped()
+
+    async def _stopped(self) -> None:
+        """Run the demotion callback; its failure must not stop the campaign."""
+        try:
+            await self._on_demoted()
+        except Exception as e:
+            logger.error(f"Error stopping after losing scheduler leadership: {e}", exc_info=True)
+
+    async def resign(self) -> None:
+        """Release the role if we hold it."""
+        if not self.is_leader:
+            return
+        try:
+            redis = await self._get_redis()
+            if self._resign_script is None:
+                self._resign_script = redis.register_script(RESIGN_SCRIPT)
+            await self._resign_script(keys=[config.LEADER_KEY], args=[f"{self.holder_id}|{self.token}"])
+        except Exception as e:
+            # The term simply expires after its TTL
+            logger.warning(f"Failed to resign scheduler leadership: {e}")
+        self.token = None
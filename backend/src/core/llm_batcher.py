@@ -0,0 +1,205 @@
+"""Cross-bot batching: bots sharing a prompt prefix and market snapshot get one LLM call."""
+
+import asyncio
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..core.config import config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (model, prompt, max_tokens, temperature, cache_prefix) -> analyze_market result
+ModelCall = Callable[[str, str, int, float, Optional[str]], Awaitable[Dict[str, Any]]]
+
+BATCH_RESPONSE_FORMAT = """## BATCH RESPONSE FORMAT
+
+The market data above is shared by {count} independent portfolios (P1..P{count}).
+Decide for each portfolio separately, using its own cash and positions.
+Respond with ONE JSON object keyed by portfolio id, each value being the
+per-symbol decision object described in RESPONSE FORMAT:
+
+{{"P1": {{"BTC/USDT": {{...}}, ...}}, "P2": {{...}}}}
+"""
+
+
+@dataclass
+class _Member:
+    member_id: str
+    market_section: str
+    portfolio_section: str
+    max_tokens: int
+    future: "asyncio.Future[Dict[str, Any]]"
+
+
+@dataclass
+class _Batch:
+    model: str
+    static_prefix: str
+    temperature: float
+    members: List[_Member] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+# (model, static prefix, temperature, market snapshot digest)
+BatchKey = Tuple[str, str, float, str]
+
+# The market section's clock line ("It is 2024-01-01 12:00 UTC.") is not market data
+_CLOCK_LINE = re.compile(r"^It is \d{4}-\d{2}-\d{2} \d{2}:\d{2} UTC\.$", re.MULTILINE)
+
+
+def market_digest(market_section: str) -> str:
+    """Digest of a market section ignoring its timestamp, so only identical snapshots batch."""
+    return hashlib.sha256(_CLOCK_LINE.sub("", market_section).encode()).hexdigest()
+
+
+class LLMBatcher:
+    """Collects decision requests for a short window and merges them.
+
+    Requests are grouped by (model, static prefix, temperature, market snapshot):
+    members of a batch see the same market data, so the first member's market
+    section is sent once, followed by one portfolio section per member; the
+    response is split back per member. A lone request is sent as a normal call.
+    """
+
+    def __init__(
+        self,
+        call: ModelCall,
+        window_seconds: Optional[float] = None,
+        max_members: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> None:
+        self._call = call
+        self.window_seconds = (
+            config.LLM_BATCH_WINDOW_SECONDS if window_seconds is None else window_seconds
+        )
+        self.max_members = max_members or config.LLM_BATCH_MAX_MEMBERS
+        self.max_tokens = max_tokens or config.LLM_BATCH_MAX_TOKENS
+        self._open: Dict[BatchKey, _Batch] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()  # Strong references until each batch is sent
+        self.calls = 0
+        self.requests = 0
+
+    async def submit(
+        self,
+        model: str,
+        static_prefix: str,
+        market_section: str,
+        portfolio_section: str,
+        member_id: str,
+        max_tokens: int = 2048,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """Queue one bot's request and wait for its share of the batched response."""
+        self.requests += 1
+        key: BatchKey = (model, static_prefix, temperature, market_digest(market_section))
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        member = _Member(member_id, market_section, portfolio_section, max_tokens, future)
+
+        batch = self._open.get(key)
+        if batch is None:
+            batch = _Batch(model=model, static_prefix=static_prefix, temperature=temperature)
+            self._open[key] = batch
+            batch.members.append(member)
+            task = asyncio.create_task(self._run(key, batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            batch.members.append(member)
+            if len(batch.members) >= self.max_members:
+                batch.full.set()
+
+        return await future
+
+    async def _run(self, key: BatchKey, batch: _Batch) -> None:
+        """Wait out the window (or until full), then send the batch."""
+        try:
+            await asyncio.wait_for(batch.full.wait(), timeout=self.window_seconds)
+        except asyncio.TimeoutError:
+            pass
+        if self._open.get(key) is batch:
+            del self._open[key]
+
+        try:
+            if len(batch.members) == 1:
+                await self._send_single(batch, batch.members[0])
+            else:
+                await self._send_merged(batch)
+        except Exception as e:
+            for member in batch.members:
+                if not member.future.done():
+                    member.future.set_exception(e)
+
+    async def _send_single(self, batch: _Batch, member: _Member) -> None:
+        self.calls += 1
+        result = await self._call(
+            batch.model,
+            batch.static_prefix + member.market_section + member.portfolio_section,
+            member.max_tokens,
+            batch.temperature,
+            batch.static_prefix,
+        )
+        if not member.future.done():
+            member.future.set_result(result)
+
+    async def _send_merged(self, batch: _Batch) -> None:
+        members = batch.members
+        count = len(members)
+        sections = [
+            f"=== PORTFOLIO P{i} ===\n{m.portfolio_section}" for i, m in enumerate(members, 1)
+        ]
+        prompt = "\n".join(
+            [
+                batch.static_prefix + members[0].market_section,
+                *sections,
+                BATCH_RESPONSE_FORMAT.format(count=count),
+            ]
+        )
+        max_tokens = min(sum(m.max_tokens for m in members), self.max_tokens)
+
+        logger.info(f"LLM batch: {count} bots in one {batch.model} call")
+        self.calls += 1
+        result = await self._call(
+            batch.model, prompt, max_tokens, batch.temperature, batch.static_prefix
+        )
+
+        parsed = result.get("parsed_decisions") or {}
+        missing: List[_Member] = []
+        for i, member in enumerate(members, 1):
+            decisions = parsed.get(f"P{i}")
+            if not isinstance(decisions, dict):
+                missing.append(member)
+                continue
+            if not member.future.done():
+                member.future.set_result(self._member_result(result, decisions, count))
+
+        # Anything the merged answer dropped is asked for individually
+        if missing:
+            logger.warning(f"LLM batch missing {len(missing)}/{count} portfolios, retrying singly")
+            await asyncio.gather(*(self._send_single(batch, m) for m in missing))
+
+    @staticmethod
+    def _member_result(
+        result: Dict[str, Any], decisions: Dict[str, Any], count: int
+    ) -> Dict[str, Any]:
+        """One member's share of a merged response: its decisions, an even cost split."""
+        return {
+            **result,
+            "response": json.dumps(decisions),
+            "parsed_decisions": decisions,
+            "tokens_used": result.get("tokens_used", 0) // count,
+            "cached_tokens": result.get("cached_tokens", 0) // count,
+            "cost": result.get("cost", 0.0) / count,
+            "batch_size": count,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Requests received vs provider calls made."""
+        return {
+            "requests": self.requests,
+            "calls": self.calls,
+            "calls_saved": max(0, self.requests - self.calls),
+        }
@@ -3,30 +3,53 @@
 import asyncio
 import json
 import os
-from time import time
-from typing import Any, Dict, Optional, cast
+from time import monotonic, time
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, Optional, Tuple, cast
 
 from anthropic import AsyncAnthropic
 from anthropic.types import TextBlock
 from openai import AsyncOpenAI
 
 from ..core.config import config
+from ..core.llm_batcher import LLMBatcher
+from ..core.llm_dispatch import LLMDispatcher, ProviderUnavailableError
 from ..core.logger import get_logger
+from ..core.rate_limiter import RateLimiter as SharedRateLimiter
+from ..core.rate_limiter import RateLimitReservation
+from ..core.streaming_parser import IncrementalDecisionParser
+from ..core.tracing import span
 
 logger = get_logger(__name__)
 
 
 # Cost per million tokens for each provider
+# (cached_input = prompt-cache reads, cache_write = Anthropic cache creation)
 MODEL_COSTS = {
-    "claude": {"input": 3.0, "output": 15.0},
-    "gpt": {"input": 10.0, "output": 30.0},
-    "deepseek": {"input": 0.14, "output": 0.28},
+    "claude": {"input": 3.0, "output": 15.0, "cached_input": 0.30, "cache_write": 3.75},
+    "gpt": {"input": 10.0, "output": 30.0, "cached_input": 5.0},
+    "deepseek": {"input": 0.14, "output": 0.28, "cached_input": 0.014},
     "qwen": {"input": 0.20, "output": 0.60},
 }
 
+# Concrete model called for each provider
+PROVIDER_MODELS = {
+    "claude": "claude-sonnet-4-20250514",
+    "gpt": "gpt-4-turbo-preview",
+    "deepseek": "deepseek-chat",
+    "qwen": "qwen-max",
+}
+
+# Environment variable holding each provider's API key
+PROVIDER_API_KEYS = {
+    "claude": "CLAUDE_API_KEY",
+    "gpt": "OPENAI_API_KEY",
+    "deepseek": "DEEPSEEK_API_KEY",
+    "qwen": "QWEN_API_KEY",
+}
+
 
 class RateLimiter:
-    """Simple rate limiter for API calls."""
+    """Simple in-process rate limiter, used when the shared Redis limiter is unavailable."""
 
     def __init__(self, calls_per_minute: int = 10) -> None:
         self.calls_per_minute = calls_per_minute
@@ -54,6 +77,18 @@ class LLMClient:
         self._deepseek_client: Optional[AsyncOpenAI] = None
         self._qwen_client: Optional[AsyncOpenAI] = None
         self._rate_limiter = RateLimiter(config.LLM_CALLS_PER_MINUTE)
+        self._shared_rate_limiter = SharedRateLimiter()
+        self._dispatcher = LLMDispatcher(
+            fallback_providers=[
+                p for p in config.LLM_FALLBACK_PROVIDERS if os.getenv(PROVIDER_API_KEYS.get(p, ""))
+            ]
+        )
+        self._batcher = LLMBatcher(
+            lambda model, prompt, max_tokens, temperature, cache_prefix: self.analyze_market(
+                model, prompt, max_tokens, temperature, cache_prefix,
+                json_mode=config.LLM_STRUCTURED_OUTPUT_ENABLED,
+            )
+        )
 
     @property
     def anthropic_client(self) -> AsyncAnthropic:
@@ -90,51 +125,254 @@ class LLMClient:
         return self._qwen_client
 
     async def analyze_market(
-        self, model: str, prompt: str, max_tokens: int = 1024, temperature: float = 0.7
+        self,
+        model: str,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        cache_prefix: Optional[str] = None,
+        json_mode: bool = False,
     ) -> Dict[str, Any]:
-        """Analyze market using specified LLM model."""
-        model_lower = model.lower()
-        await self._rate_limiter.acquire()
-
-        if "claude" in model_lower:
-            return await self._call_claude(prompt, max_tokens, temperature)
-        elif "gpt" in model_lower:
-            return await self._call_openai(prompt, max_tokens, temperature, "gpt")
-        elif "deepseek" in model_lower:
-            return await self._call_openai(prompt, max_tokens, temperature, "deepseek")
-        elif "qwen" in model_lower:
-            return await self._call_openai(prompt, max_tokens, temperature, "qwen")
+        """Analyze market using specified LLM model.
+
+        The call runs under a deadline with jittered retries; slow or failing
+        providers are hedged or failed over to other configured providers.
+
+        ``cache_prefix`` is the byte-stable start of ``prompt``; it is marked for
+        provider-side prompt caching where supported (Anthropic cache_control;
+        OpenAI and DeepSeek cache matching prefixes automatically).
+
+        ``json_mode`` asks the provider for a bare JSON object: ``response_format``
+        json_object on OpenAI-compatible APIs, an assistant ``{`` prefill on Claude.
+
+        Rate-limit slots are reserved before each attempt is timed, so waiting
+        for capacity never trips a deadline, a hedge or a circuit breaker.
+        """
+        reservations: Dict[str, Optional[RateLimitReservation]] = {}
+
+        async def reserve(provider: str) -> None:
+            reservations[provider] = await self._acquire_rate_limit(provider, prompt, max_tokens)
+
+        return await self._dispatcher.dispatch(
+            self._resolve_provider(model),
+            lambda provider: self._call_provider(
+                provider, prompt, max_tokens, temperature, cache_prefix, json_mode,
+                reservations.pop(provider, None),
+            ),
+            reserve,
+        )
+
+    async def analyze_batched(
+        self,
+        model: str,
+        static_prefix: str,
+        market_section: str,
+        portfolio_section: str,
+        member_id: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+    ) -> Dict[str, Any]:
+        """Analyze market for one bot, sharing the call with concurrent bots.
+
+        With batching enabled, bots whose prompts share the static prefix within
+        the batch window are answered by a single merged call; otherwise this is
+        ``analyze_market`` on the joined prompt. Structured output follows
+        ``LLM_STRUCTURED_OUTPUT_ENABLED`` either way.
+        """
+        if not config.LLM_BATCHING_ENABLED:
+            return await self.analyze_market(
+                model,
+                static_prefix + market_section + portfolio_section,
+                max_tokens,
+                temperature,
+                cache_prefix=static_prefix,
+                json_mode=config.LLM_STRUCTURED_OUTPUT_ENABLED,
+            )
+        return await self._batcher.submit(
+            model,
+            static_prefix,
+            market_section,
+            portfolio_section,
+            member_id,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+
+    async def _call_provider(
+        self,
+        provider: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        cache_prefix: Optional[str] = None,
+        json_mode: bool = False,
+        reservation: Optional[RateLimitReservation] = None,
+    ) -> Dict[str, Any]:
+        """Single call to one provider, settling its rate-limit ``reservation``."""
+        with span("llm.call", provider=provider) as call_span:
+            if provider == "claude":
+                result = await self._call_claude(prompt, max_tokens, temperature, cache_prefix, json_mode)
+            else:
+                result = await self._call_openai(prompt, max_tokens, temperature, provider, json_mode)
+            if call_span is not None:
+                call_span.attributes["tokens"] = result.get("tokens_used", 0)
+
+        await self._reconcile_rate_limit(reservation, result.get("tokens_used", 0))
+        return result
+
+    async def stream_decisions(
+        self,
+        model: str,
+        prompt: str,
+        max_tokens: int = 1024,
+        temperature: float = 0.7,
+        symbols: Optional[Iterable[str]] = None,
+        cache_prefix: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Stream a multi-coin analysis, yielding (symbol, decision) as each completes.
+
+        Decisions are emitted in the order the model finishes them, so callers
+        can validate and execute early symbols while later ones still stream.
+
+        The stream goes to the first provider whose circuit is closed. Each chunk
+        must arrive within the per-call timeout and all of them within the total
+        deadline; time the caller spends between decisions is not counted. A
+        failure feeds the provider's breaker and is raised, so the caller can
+        request the decisions not yet yielded through ``analyze_market``.
+        """
+        providers = self._dispatcher.candidates(self._resolve_provider(model))
+        if not providers:
+            raise ProviderUnavailableError(f"All LLM provider circuits open (primary {model})")
+        provider = providers[0]
+        breaker = self._dispatcher.breaker(provider)
+        reservation = await self._acquire_rate_limit(provider, prompt, max_tokens)
+        parser = IncrementalDecisionParser(symbols)
+        usage = self._empty_usage()
+        budget = self._dispatcher.total_deadline
+        start = time()
+
+        if provider == "claude":
+            chunks = self._stream_claude(prompt, max_tokens, temperature, usage, cache_prefix)
         else:
-            raise ValueError(
-                f"Unsupported model: {model}. Supported: claude-4.5-sonnet, gpt-4, deepseek-v3, qwen-max"
+            chunks = self._stream_openai(prompt, max_tokens, temperature, provider, usage)
+
+        try:
+            while True:
+                waited = monotonic()
+                try:
+                    chunk = await asyncio.wait_for(
+                        anext(chunks), timeout=max(0.0, min(self._dispatcher.call_timeout, budget))
+                    )
+                except StopAsyncIteration:
+                    break
+                budget -= monotonic() - waited
+                for symbol, decision in parser.feed(chunk):
+                    logger.debug(f"Streamed decision for {symbol} after {time() - start:.1f}s")
+                    yield symbol, decision
+        except ValueError:
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        else:
+            breaker.record_success()
+        finally:
+            await chunks.aclose()
+            tokens_used = self._total_tokens(usage)
+            total_cost = self._calculate_cost(provider, usage)
+            logger.info(
+                f"{provider.upper()} stream: {len(parser.emitted_symbols)} decisions, "
+                f"{tokens_used} tokens ({usage['cached']} cached), ${total_cost:.6f}, "
+                f"{time() - start:.1f}s"
             )
+            await self._reconcile_rate_limit(reservation, tokens_used)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-provider dispatch health and batching savings."""
+        return {"providers": self._dispatcher.stats(), "batching": self._batcher.stats()}
+
+    def _resolve_provider(self, model: str) -> str:
+        """Map a requested model name to its provider."""
+        model_lower = model.lower()
+        for provider in ("claude", "gpt", "deepseek", "qwen"):
+            if provider in model_lower:
+                return provider
+        raise ValueError(
+            f"Unsupported model: {model}. Supported: claude-4.5-sonnet, gpt-4, deepseek-v3, qwen-max"
+        )
+
+    async def _acquire_rate_limit(
+        self, provider: str, prompt: str, max_tokens: int
+    ) -> Optional[RateLimitReservation]:
+        """Reserve a slot in the provider's shared window (all processes).
+
+        Reserves the estimated prompt size plus max_tokens; the estimate is
+        replaced by real usage once the call returns. Falls back to the
+        in-process limiter if Redis is unreachable.
+        """
+        estimated_tokens = len(prompt) // config.LLM_CHARS_PER_TOKEN + max_tokens
+        try:
+            return await self._shared_rate_limiter.acquire(
+                provider, PROVIDER_MODELS[provider], tokens=estimated_tokens
+            )
+        except Exception as e:
+            logger.warning(f"Shared rate limiter unavailable ({e}), using local limiter")
+            await self._rate_limiter.acquire()
+            return None
+
+    async def _reconcile_rate_limit(
+        self, reservation: Optional[RateLimitReservation], tokens_used: int
+    ) -> None:
+        """Charge the shared window with the tokens actually used."""
+        if reservation is None or not tokens_used:
+            return
+        try:
+            await self._shared_rate_limiter.reconcile_tokens(reservation, tokens_used)
+        except Exception as e:
+            logger.debug(f"Could not reconcile token usage: {e}")
 
     async def _call_claude(
-        self, prompt: str, max_tokens: int, temperature: float
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        cache_prefix: Optional[str] = None,
+        json_mode: bool = False,
     ) -> Dict[str, Any]:
         """Call Claude API."""
         try:
+            messages: list[Dict[str, Any]] = [
+                {"role": "user", "content": self._claude_content(prompt, cache_prefix)}
+            ]
+            if json_mode:
+                # No JSON mode on Claude: prefilling "{" forces a bare object
+                messages.append({"role": "assistant", "content": "{"})
+
             response = await self.anthropic_client.messages.create(
-                model="claude-sonnet-4-20250514",
+                model=PROVIDER_MODELS["claude"],
                 max_tokens=max_tokens,
                 temperature=temperature,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,  # type: ignore[arg-type]
             )
 
             raw_response = cast(TextBlock, response.content[0]).text
-            input_tokens = response.usage.input_tokens
-            output_tokens = response.usage.output_tokens
-            tokens_used = input_tokens + output_tokens
+            if json_mode:
+                raw_response = "{" + raw_response
+            usage = self._claude_usage(response.usage)
+            tokens_used = self._total_tokens(usage)
 
             parsed_decisions = self._parse_json_response(raw_response)
-            total_cost = self._calculate_cost("claude", input_tokens, output_tokens)
+            total_cost = self._calculate_cost("claude", usage)
 
-            logger.info(f"Claude response: {tokens_used} tokens, ${total_cost:.6f}")
+            logger.info(
+                f"Claude response: {tokens_used} tokens ({usage['cached']} cached), ${total_cost:.6f}"
+            )
 
             return {
                 "response": raw_response,
                 "parsed_decisions": parsed_decisions,
                 "tokens_used": tokens_used,
+                "cached_tokens": usage["cached"],
                 "cost": total_cost,
             }
         except Exception as e:
@@ -142,60 +380,158 @@ class LLMClient:
             raise
 
     async def _call_openai(
-        self, prompt: str, max_tokens: int, temperature: float, provider: str
+        self, prompt: str, max_tokens: int, temperature: float, provider: str, json_mode: bool = False
     ) -> Dict[str, Any]:
         """Call OpenAI-compatible API (GPT, DeepSeek, Qwen)."""
         try:
-            client_map = {
-                "gpt": (self.openai_client, "gpt-4-turbo-preview"),
-                "deepseek": (self.deepseek_client, "deepseek-chat"),
-                "qwen": (self.qwen_client, "qwen-max"),
-            }
-            client, model_name = client_map[provider]
-
-            messages = [{"role": "user", "content": prompt}]
-            if provider == "qwen":
-                messages.insert(0, {
-                    "role": "system",
-                    "content": "You are a trading assistant. Respond with valid JSON only."
-                })
+            client, model_name = self._openai_client_for(provider), PROVIDER_MODELS[provider]
+            extra: Dict[str, Any] = {"response_format": {"type": "json_object"}} if json_mode else {}
 
             response = await client.chat.completions.create(
                 model=model_name,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                messages=messages,  # type: ignore[arg-type]
+                messages=self._openai_messages(prompt, provider),  # type: ignore[arg-type]
+                **extra,
             )
 
             raw_response = response.choices[0].message.content or ""
-            usage = response.usage
-            tokens_used = usage.total_tokens if usage else 0
+            usage = self._openai_usage(response.usage)
+            tokens_used = self._total_tokens(usage)
 
             parsed_decisions = self._parse_json_response(raw_response)
+            total_cost = self._calculate_cost(provider, usage)
 
-            if usage:
-                total_cost = self._calculate_cost(provider, usage.prompt_tokens, usage.completion_tokens)
-            else:
-                total_cost = 0.0
-
-            logger.info(f"{provider.upper()} response: {tokens_used} tokens, ${total_cost:.6f}")
+            logger.info(
+                f"{provider.upper()} response: {tokens_used} tokens ({usage['cached']} cached), "
+                f"${total_cost:.6f}"
+            )
 
             return {
                 "response": raw_response,
                 "parsed_decisions": parsed_decisions,
                 "tokens_used": tokens_used,
+                "cached_tokens": usage["cached"],
                 "cost": total_cost,
             }
         except Exception as e:
             logger.error(f"Error calling {provider.upper()} API: {e}")
             raise
 
-    def _calculate_cost(self, provider: str, input_tokens: int, output_tokens: int) -> float:
-        """Calculate cost based on token usage."""
+    async def _stream_claude(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        usage: Dict[str, int],
+        cache_prefix: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        """Stream Claude text deltas, filling usage once the message completes."""
+        try:
+            async with self.anthropic_client.messages.stream(
+                model=PROVIDER_MODELS["claude"],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=[{"role": "user", "content": self._claude_content(prompt, cache_prefix)}],  # type: ignore[typeddict-item]
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+                final_message = await stream.get_final_message()
+                usage.update(self._claude_usage(final_message.usage))
+        except Exception as e:
+            logger.error(f"Error streaming Claude API: {e}")
+            raise
+
+    async def _stream_openai(
+        self, prompt: str, max_tokens: int, temperature: float, provider: str, usage: Dict[str, int]
+    ) -> AsyncGenerator[str, None]:
+        """Stream OpenAI-compatible text deltas, filling usage from the final chunk."""
+        try:
+            stream = await self._openai_client_for(provider).chat.completions.create(
+                model=PROVIDER_MODELS[provider],
+                max_tokens=max_tokens,
+                temperature=temperature,
+                messages=self._openai_messages(prompt, provider),  # type: ignore[arg-type]
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                if chunk.usage:
+                    usage.update(self._openai_usage(chunk.usage))
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            logger.error(f"Error streaming {provider.upper()} API: {e}")
+            raise
+
+    def _openai_client_for(self, provider: str) -> AsyncOpenAI:
+        """Get the OpenAI-compatible client for a provider."""
+        if provider == "deepseek":
+            return self.deepseek_client
+        if provider == "qwen":
+            return self.qwen_client
+        return self.openai_client
+
+    def _openai_messages(self, prompt: str, provider: str) -> list[Dict[str, str]]:
+        """Chat messages for an OpenAI-compatible provider."""
+        messages = [{"role": "user", "content": prompt}]
+        if provider == "qwen":
+            messages.insert(0, {
+                "role": "system",
+                "content": "You are a trading assistant. Respond with valid JSON only."
+            })
+        return messages
+
+    def _claude_content(self, prompt: str, cache_prefix: Optional[str]) -> Any:
+        """User message content, with the static prefix marked as a cache breakpoint."""
+        if not cache_prefix or not prompt.startswith(cache_prefix):
+            return prompt
+        return [
+            {"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": prompt[len(cache_prefix):]},
+        ]
+
+    @staticmethod
+    def _empty_usage() -> Dict[str, int]:
+        """Token counters: uncached input, cache reads, cache writes, output."""
+        return {"input": 0, "cached": 0, "cache_write": 0, "output": 0}
+
+    def _claude_usage(self, usage: Any) -> Dict[str, int]:
+        """Normalize Anthropic usage (input_tokens excludes cache reads/writes)."""
+        result = self._empty_usage()
+        result["input"] = usage.input_tokens or 0
+        result["cached"] = getattr(usage, "cache_read_input_tokens", None) or 0
+        result["cache_write"] = getattr(usage, "cache_creation_input_tokens", None) or 0
+        result["output"] = usage.output_tokens or 0
+        return result
+
+    def _openai_usage(self, usage: Any) -> Dict[str, int]:
+        """Normalize OpenAI-compatible usage (prompt_tokens includes cache hits)."""
+        result = self._empty_usage()
+        if usage is None:
+            return result
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else None
+        if cached is None:
+            cached = getattr(usage, "prompt_cache_hit_tokens", None)  # DeepSeek context caching
+        result["cached"] = cached or 0
+        result["input"] = max(0, (usage.prompt_tokens or 0) - result["cached"])
+        result["output"] = usage.completion_tokens or 0
+        return result
+
+    @staticmethod
+    def _total_tokens(usage: Dict[str, int]) -> int:
+        """All prompt and completion tokens, cached or not."""
+        return sum(usage.values())
+
+    def _calculate_cost(self, provider: str, usage: Dict[str, int]) -> float:
+        """Calculate cost based on token usage, pricing cache reads/writes separately."""
         costs = MODEL_COSTS.get(provider, MODEL_COSTS["gpt"])
-        input_cost = (input_tokens / 1_000_000) * costs["input"]
-        output_cost = (output_tokens / 1_000_000) * costs["output"]
-        return input_cost + output_cost
+        input_cost = (usage.get("input", 0) / 1_000_000) * costs["input"]
+        cached_cost = (usage.get("cached", 0) / 1_000_000) * costs.get("cached_input", costs["input"])
+        write_cost = (usage.get("cache_write", 0) / 1_000_000) * costs.get("cache_write", costs["input"])
+        output_cost = (usage.get("output", 0) / 1_000_000) * costs["output"]
+        return input_cost + cached_cost + write_cost + output_cost
 
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """Parse JSON from LLM response."""
@@ -0,0 +1,260 @@
+"""Latency-aware dispatch for LLM calls: deadlines, retries, hedging, circuit breakers."""
+
+import asyncio
+import random
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+from ..core.config import config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ProviderCall = Callable[[str], Awaitable[Dict[str, Any]]]
+# Waits for capacity on a provider (e.g. a rate-limit reservation) before its call
+ProviderReserve = Callable[[str], Awaitable[Any]]
+
+
+class ProviderUnavailableError(Exception):
+    """Raised when no provider can serve a call (all circuits open or deadline spent)."""
+
+
+@dataclass
+class CircuitBreaker:
+    """Per-provider breaker: opens after consecutive failures, probes after a cool-down."""
+
+    failure_threshold: int
+    reset_seconds: float
+    failures: int = 0
+    opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """closed, open, or half_open (cool-down elapsed, next call is a probe)."""
+        if self.opened_at is None:
+            return "closed"
+        if monotonic() - self.opened_at >= self.reset_seconds:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a call may be sent to this provider."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = monotonic()
+
+
+@dataclass
+class LatencyTracker:
+    """Rolling window of successful call latencies for one provider."""
+
+    window: int = 100
+    samples: Deque[float] = field(default_factory=deque)
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        while len(self.samples) > self.window:
+            self.samples.popleft()
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile (0-1), None without samples."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(pct * len(ordered)))
+        return ordered[index]
+
+
+class LLMDispatcher:
+    """Sends a call to a primary provider within a deadline, with jittered retries,
+    failover to other providers, an optional hedged request once the primary is
+    slower than its p95, and a circuit breaker per provider."""
+
+    def __init__(
+        self,
+        fallback_providers: Optional[Sequence[str]] = None,
+        call_timeout: Optional[float] = None,
+        total_deadline: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        hedge_enabled: Optional[bool] = None,
+    ) -> None:
+        self.fallback_providers = list(
+            config.LLM_FALLBACK_PROVIDERS if fallback_providers is None else fallback_providers
+        )
+        self.call_timeout = call_timeout or config.LLM_CALL_TIMEOUT_SECONDS
+        self.total_deadline = total_deadline or config.LLM_TOTAL_DEADLINE_SECONDS
+        self.max_retries = config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        self.hedge_enabled = config.LLM_HEDGE_ENABLED if hedge_enabled is None else hedge_enabled
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[str, LatencyTracker] = {}
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        if provider not in self.breakers:
+            self.breakers[provider] = CircuitBreaker(
+                failure_threshold=config.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                reset_seconds=config.LLM_CIRCUIT_RESET_SECONDS,
+            )
+        return self.breakers[provider]
+
+    def latency(self, provider: str) -> LatencyTracker:
+        if provider not in self.latencies:
+            self.latencies[provider] = LatencyTracker()
+        return self.latencies[provider]
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        """Seconds to wait on a provider before hedging; None until enough samples."""
+        tracker = self.latency(provider)
+        if len(tracker.samples) < config.LLM_HEDGE_MIN_SAMPLES:
+            return None
+        return tracker.percentile(config.LLM_HEDGE_PERCENTILE)
+
+    def candidates(self, primary: str) -> List[str]:
+        """Primary first, then fallbacks, skipping providers whose circuit is open."""
+        ordered = [primary] + [p for p in self.fallback_providers if p != primary]
+        return [p for p in ordered if self.breaker(p).allow()]
+
+    async def dispatch(
+        self, primary: str, call: ProviderCall, reserve: Optional[ProviderReserve] = None
+    ) -> Dict[str, Any]:
+        """Run ``call(provider)`` until one succeeds or the total deadline is spent.
+
+        ``reserve(provider)`` is awaited before each call. Time spent waiting
+        there is queueing, not provider latency: it is excluded from the
+        deadlines, the latency window and the circuit breaker.
+        """
+        deadline = monotonic() + self.total_deadline
+        last_error: Optional[BaseException] = None
+
+        for attempt in range(self.max_retries + 1):
+            providers = self.candidates(primary)
+            if not providers:
+                raise ProviderUnavailableError(f"All LLM provider circuits open (primary {primary})")
+
+            # First attempt goes to the primary, retries rotate through healthy fallbacks
+            index = attempt % len(providers)
+            provider = providers[index]
+            hedge = providers[(index + 1) % len(providers)] if len(providers) > 1 else None
+            if deadline - monotonic() <= 0:
+                break
+            if reserve is not None:
+                queued = monotonic()
+                await reserve(provider)
+                deadline += monotonic() - queued
+
+            try:
+                return await self._hedged_call(
+                    provider, hedge, call, min(self.call_timeout, deadline - monotonic()), reserve
+                )
+            except ValueError:
+                raise
+            except Exception as e:
+                last_error = e
+                logger.warning(f"LLM call via {provider} failed (attempt {attempt + 1}): {e!r}")
+
+            if attempt < self.max_retries:
+                backoff = self._backoff(attempt)
+                if monotonic() + backoff >= deadline:
+                    break
+                await asyncio.sleep(backoff)
+
+        raise ProviderUnavailableError(
+            f"LLM call failed within {self.total_deadline:.0f}s deadline: {last_error!r}"
+        ) from last_error
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff."""
+        cap = min(config.LLM_RETRY_MAX_DELAY_SECONDS, config.LLM_RETRY_BASE_DELAY_SECONDS * 2**attempt)
+        return random.uniform(0, cap)
+
+    async def _timed_call(
+        self, provider: str, call: ProviderCall, reserve: Optional[ProviderReserve] = None
+    ) -> Dict[str, Any]:
+        """Call one provider, feeding its latency tracker and circuit breaker."""
+        if reserve is not None:
+            await reserve(provider)
+        start = monotonic()
+        try:
+            result = await call(provider)
+        except asyncio.CancelledError:
+            raise
+        except ValueError:
+            raise
+        except Exception:
+            self.breaker(provider).record_failure()
+            raise
+        self.latency(provider).record(monotonic() - start)
+        self.breaker(provider).record_success()
+        result.setdefault("provider", provider)
+        return result
+
+    async def _hedged_call(
+        self,
+        provider: str,
+        hedge: Optional[str],
+        call: ProviderCall,
+        timeout: float,
+        reserve: Optional[ProviderReserve] = None,
+    ) -> Dict[str, Any]:
+        """Call provider; if it exceeds its p95, race a second request on ``hedge``.
+
+        ``provider`` has already been reserved; the hedge reserves its own slot.
+        """
+        tasks = [asyncio.create_task(self._timed_call(provider, call))]
+        hedge_delay = self.hedge_delay(provider) if self.hedge_enabled and hedge else None
+        start = monotonic()
+
+        try:
+            if hedge is not None and hedge_delay is not None and hedge_delay < timeout:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done:
+                    logger.info(
+                        f"{provider} slower than p95 ({hedge_delay:.1f}s), hedging with {hedge}"
+                    )
+                    tasks.append(asyncio.create_task(self._timed_call(hedge, call, reserve)))
+
+            pending = set(tasks)
+            last_error: Optional[BaseException] = None
+            while pending:
+                remaining = timeout - (monotonic() - start)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(
+                    pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    last_error = task.exception()
+
+            if last_error is not None and not pending:
+                raise last_error
+            # Deadline hit: the provider we waited on counts as failed
+            self.breaker(provider).record_failure()
+            raise asyncio.TimeoutError(f"{provider} exceeded {timeout:.1f}s deadline")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Breaker state and latency percentiles per provider."""
+        providers = set(self.breakers) | set(self.latencies)
+        return {
+            provider: {
+                "circuit": self.breaker(provider).state,
+                "failures": self.breaker(provider).failures,
+                "p50": self.latency(provider).percentile(0.5),
+                "p95": self.latency(provider).percentile(0.95),
+                "samples": len(self.latency(provider).samples),
+            }
+            for provider in sorted(providers)
+        }
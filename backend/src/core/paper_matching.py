@@ -0,0 +1,401 @@
+"""Paper-trading matching engine: fills simulated orders against candle data.
+
+Instead of filling every paper order instantly at the ticker price with a flat
+fee, orders are matched the way an exchange would fill them:
+
+- Market and stop orders pay slippage: a base spread cost, a share of the
+  candle's range, and a square-root market impact on the order's share of
+  candle volume. Stops also fill at the open when the market gaps through
+  the trigger.
+- Limit orders (take profits) fill at their price or better, with the
+  maker fee.
+- An order can take at most ``max_participation`` of a candle's volume. The
+  rest stays unfilled. Immediate fills size against the trailing average
+  volume of closed candles, since the latest candle is usually still forming.
+- Replayed orders only become active after the order latency, so they fill
+  on the first candle that opens after that point.
+
+Everything is computed on numpy arrays for a whole batch of orders at once, so
+the same engine fills the live paper bot's single orders, replays recorded
+candles for backtests, and (through ``PaperExchange``) stands in for the
+exchange in load tests.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from ..core.config import config
+
+MARKET, STOP, LIMIT = 0, 1, 2
+BUY, SELL = 1, -1
+
+
+@dataclass(frozen=True)
+class MatchingParams:
+    """Fee, slippage, latency and liquidity assumptions of the simulated exchange."""
+
+    taker_fee: float = 0.001
+    maker_fee: float = 0.0005
+    base_slippage_bps: float = 2.0
+    range_slippage: float = 0.05  # Share of the candle range paid on market fills
+    impact_coef: float = 1.0  # Square-root impact, in candle ranges at 100% participation
+    max_slippage_bps: float = 100.0
+    latency_seconds: float = 0.15
+    max_participation: float = 0.1  # Max share of a candle's volume one order can take
+    volume_window: int = 20  # Closed candles averaged for the volume of immediate fills
+
+    @classmethod
+    def from_config(cls) -> "MatchingParams":
+        return cls(
+            taker_fee=config.PAPER_TAKER_FEE_PCT,
+            maker_fee=config.PAPER_MAKER_FEE_PCT,
+            base_slippage_bps=config.PAPER_SLIPPAGE_BASE_BPS,
+            range_slippage=config.PAPER_SLIPPAGE_RANGE_SHARE,
+            impact_coef=config.PAPER_SLIPPAGE_IMPACT_COEF,
+            max_slippage_bps=config.PAPER_MAX_SLIPPAGE_BPS,
+            latency_seconds=config.PAPER_ORDER_LATENCY_MS / 1000,
+            max_participation=config.PAPER_MAX_PARTICIPATION,
+            volume_window=config.PAPER_VOLUME_WINDOW,
+        )
+
+
+@dataclass
+class Candles:
+    """OHLCV columns; ``ts`` is each candle's open time in seconds."""
+
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_ohlcv(cls, rows: Sequence[Sequence[Any]]) -> "Candles":
+        """From exchange OHLCV rows: ``[timestamp_ms, open, high, low, close, volume]``."""
+        data = np.asarray(rows, dtype=float).reshape(-1, 6)
+        return cls(data[:, 0] / 1000, data[:, 1], data[:, 2], data[:, 3], data[:, 4], data[:, 5])
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def timeframe_seconds(self) -> float:
+        return float(np.median(np.diff(self.ts))) if len(self) > 1 else 3600.0
+
+
+@dataclass
+class OrderBatch:
+    """Orders as columns: side is BUY/SELL, kind MARKET/STOP/LIMIT, trigger NaN for market orders."""
+
+    side: np.ndarray
+    quantity: np.ndarray
+    kind: np.ndarray
+    trigger: np.ndarray
+    submitted_at: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        side: Sequence[int],
+        quantity: Sequence[float],
+        kind: Optional[Sequence[int]] = None,
+        trigger: Optional[Sequence[float]] = None,
+        submitted_at: Optional[Sequence[float]] = None,
+    ) -> "OrderBatch":
+        n = len(side)
+        return cls(
+            side=np.asarray(side, dtype=np.int8),
+            quantity=np.asarray(quantity, dtype=float),
+            kind=np.full(n, MARKET, dtype=np.int8) if kind is None else np.asarray(kind, dtype=np.int8),
+            trigger=np.full(n, np.nan) if trigger is None else np.asarray(trigger, dtype=float),
+            submitted_at=np.zeros(n) if submitted_at is None else np.asarray(submitted_at, dtype=float),
+        )
+
+    def __len__(self) -> int:
+        return len(self.side)
+
+
+@dataclass
+class Fills:
+    """Per-order results; ``candle`` is the index filled on, -1 if the order did not fill."""
+
+    filled: np.ndarray
+    price: np.ndarray
+    fees: np.ndarray
+    slippage_bps: np.ndarray
+    candle: np.ndarray
+
+    @property
+    def unfilled(self) -> np.ndarray:
+        return self.candle < 0
+
+
+class PaperMatchingEngine:
+    """Vectorized fill simulator for market, stop and limit orders."""
+
+    def __init__(self, params: Optional[MatchingParams] = None) -> None:
+        self.params = params or MatchingParams.from_config()
+
+    def slippage_bps(
+        self,
+        quantity: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        latency_seconds: float = 0.0,
+        timeframe_seconds: float = 3600.0,
+    ) -> np.ndarray:
+        """Adverse slippage in basis points for taker fills on the given candles.
+
+        ``latency_seconds`` adds half the expected move over that time (range
+        scaled by the square root of its share of the candle), for fills priced
+        off a quote that is already that old.
+        """
+        p = self.params
+        range_bps = np.where(close > 0, (high - low) / close * 1e4, 0.0)
+        participation = np.divide(quantity, volume, out=np.ones_like(quantity), where=volume > 0)
+        bps = (
+            p.base_slippage_bps
+            + p.range_slippage * range_bps
+            + p.impact_coef * range_bps * np.sqrt(np.minimum(participation, 1.0))
+            + 0.5 * range_bps * np.sqrt(latency_seconds / timeframe_seconds)
+        )
+        return np.minimum(bps, p.max_slippage_bps)
+
+    def fill_now(
+        self,
+        orders: OrderBatch,
+        price: np.ndarray,
+        candles: Candles,
+        allow_partial: bool = True,
+    ) -> Fills:
+        """Fill orders right now at ``price`` (the current quote).
+
+        The last candle is taken to be still forming, with only part of its
+        range and volume, so slippage uses the last closed candle's range and
+        participation the average volume of up to ``volume_window`` closed
+        candles. A single candle is used as is. Market and stop orders fill at
+        the quote plus slippage (a stop at the worse of trigger and quote),
+        limit orders at their limit. Exits pass ``allow_partial=False`` and
+        always fill in full.
+        """
+        p = self.params
+        n = len(orders)
+        last = max(len(candles) - 2, 0)  # Last closed candle
+        window = candles.volume[max(last + 1 - p.volume_window, 0):last + 1]
+        high, low, close = (np.full(n, col[last]) for col in (candles.high, candles.low, candles.close))
+        volume = np.full(n, window.mean())
+        price = np.broadcast_to(np.asarray(price, dtype=float), (n,))
+
+        is_limit = orders.kind == LIMIT
+        is_stop = orders.kind == STOP
+        # A stop that has triggered fills no better than its trigger
+        base = np.where(
+            is_stop,
+            np.where(orders.side == BUY, np.fmax(price, orders.trigger), np.fmin(price, orders.trigger)),
+            price,
+        )
+        base = np.where(is_limit, orders.trigger, base)
+
+        slippage = np.where(
+            is_limit,
+            0.0,
+            self.slippage_bps(orders.quantity, high, low, close, volume, p.latency_seconds, candles.timeframe_seconds),
+        )
+        fill_price = base * (1 + orders.side * slippage / 1e4)
+        filled = orders.quantity
+        if allow_partial:
+            filled = np.minimum(orders.quantity, p.max_participation * volume)
+        fees = filled * fill_price * np.where(is_limit, p.maker_fee, p.taker_fee)
+        return Fills(filled, fill_price, fees, slippage, np.where(filled > 0, len(candles) - 1, -1))
+
+    def match(self, orders: OrderBatch, candles: Candles) -> Fills:
+        """Replay orders against recorded candles.
+
+        Each order becomes active ``latency_seconds`` after submission and can
+        fill from the first candle opening at or after that time. Market orders
+        fill at that candle's open. Stops and limits fill on the first candle
+        whose range reaches the trigger. A gap through the trigger fills at the
+        open, which is worse for stops and better for limits.
+        """
+        p = self.params
+        n, m = len(orders), len(candles)
+        start = np.searchsorted(candles.ts, orders.submitted_at + p.latency_seconds, side="left")
+
+        # (orders x candles) mask of candles each order could fill on
+        j = np.arange(m)
+        buy = (orders.side == BUY)[:, None]
+        trig = orders.trigger[:, None]
+        kind = orders.kind[:, None]
+        reached = np.where(
+            kind == MARKET,
+            True,
+            np.where(
+                (kind == STOP) == buy,  # Buy stop / sell limit trigger on highs, the others on lows
+                candles.high[None, :] >= trig,
+                candles.low[None, :] <= trig,
+            ),
+        )
+        eligible = reached & (j[None, :] >= start[:, None])
+        hit = eligible.any(axis=1)
+        idx = np.where(hit, eligible.argmax(axis=1), 0)
+
+        open_, high, low, close, volume = (
+            col[idx] for col in (candles.open, candles.high, candles.low, candles.close, candles.volume)
+        )
+        is_buy = orders.side == BUY
+        stop_price = np.where(is_buy, np.fmax(orders.trigger, open_), np.fmin(orders.trigger, open_))
+        limit_price = np.where(is_buy, np.fmin(orders.trigger, open_), np.fmax(orders.trigger, open_))
+        base = np.select([orders.kind == STOP, orders.kind == LIMIT], [stop_price, limit_price], open_)
+
+        is_limit = orders.kind == LIMIT
+        slippage = np.where(is_limit, 0.0, self.slippage_bps(orders.quantity, high, low, close, volume))
+        fill_price = base * (1 + orders.side * slippage / 1e4)
+        filled = np.where(hit, np.minimum(orders.quantity, p.max_participation * volume), 0.0)
+        fees = filled * fill_price * np.where(is_limit, p.maker_fee, p.taker_fee)
+        return Fills(filled, np.where(hit, fill_price, np.nan), fees, slippage, np.where(hit, idx, -1))
+
+
+class PaperExchange:
+    """In-process exchange stand-in with the order methods of ``ExchangeClient``.
+
+    Market and limit orders fill immediately against the symbol's latest candle.
+    Stop-loss and take-profit orders rest until ``add_candle`` brings a candle
+    that reaches them. Load tests can drive many bots against it without network
+    I/O, with the same fills the paper bot gets.
+    """
+
+    def __init__(self, engine: Optional[PaperMatchingEngine] = None, simulate_latency: bool = False) -> None:
+        self.engine = engine or PaperMatchingEngine()
+        self.simulate_latency = simulate_latency
+        self.candles: dict[str, list[list[float]]] = {}
+        self.orders: dict[str, dict[str, Any]] = {}
+        self._resting: list[str] = []
+        self._next_id = 0
+
+    def add_candle(self, symbol: str, row: Sequence[float]) -> list[dict[str, Any]]:
+        """Append a ``[ts_ms, open, high, low, close, volume]`` candle; returns orders it filled."""
+        self.candles.setdefault(symbol, []).append(list(row))
+        resting = [oid for oid in self._resting if self.orders[oid]["symbol"] == symbol]
+        if not resting:
+            return []
+
+        orders = [self.orders[oid] for oid in resting]
+        batch = OrderBatch.build(
+            side=[BUY if o["side"] == "buy" else SELL for o in orders],
+            quantity=[o["remaining"] for o in orders],
+            kind=[STOP if o["type"] == "stop" else LIMIT for o in orders],
+            trigger=[o["triggerPrice"] for o in orders],
+            submitted_at=[row[0] / 1000 - self.engine.params.latency_seconds] * len(orders),
+        )
+        fills = self.engine.match(batch, Candles.from_ohlcv([row]))
+        filled = []
+        for i, order in enumerate(orders):
+            if not fills.unfilled[i]:
+                self._apply_fill(order, fills.filled[i], fills.price[i], fills.fees[i])
+                filled.append(order)
+        self._resting = [oid for oid in self._resting if self.orders[oid]["status"] == "open"]
+        return filled
+
+    async def fetch_ticker(self, symbol: str) -> dict[str, Any]:
+        last = self._last_candle(symbol)
+        return {"symbol": symbol, "last": last[4], "high": last[2], "low": last[3], "baseVolume": last[5]}
+
+    async def create_order(
+        self,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        order_type: str = "market",
+    ) -> dict[str, Any]:
+        if order_type != "market" and price is None:
+            raise ValueError("Price required for limit orders")
+        await self._latency()
+        order = self._new_order(symbol, side, amount, order_type, price)
+        last = self._last_candle(symbol)
+        kind = MARKET if order_type == "market" else LIMIT
+        batch = OrderBatch.build(
+            side=[BUY if side == "buy" else SELL], quantity=[amount], kind=[kind], trigger=[price or np.nan]
+        )
+        # A limit order only fills now if it is marketable
+        if kind == MARKET or (price >= last[4] if side == "buy" else price <= last[4]):  # type: ignore[operator]
+            fills = self.engine.fill_now(batch, np.array(last[4]), Candles.from_ohlcv([last]))
+            self._apply_fill(order, fills.filled[0], fills.price[0], fills.fees[0])
+        return dict(order)
+
+    async def create_stop_loss_order(self, symbol: str, side: str, amount: float, stop_price: float) -> dict[str, Any]:
+        return await self._create_resting(symbol, side, amount, stop_price, "stop")
+
+    async def create_take_profit_order(
+        self, symbol: str, side: str, amount: float, take_profit_price: float
+    ) -> dict[str, Any]:
+        return await self._create_resting(symbol, side, amount, take_profit_price, "take_profit")
+
+    async def fetch_open_orders(self, symbol: Optional[str] = None) -> list[dict[str, Any]]:
+        return [
+            dict(o) for o in self.orders.values()
+            if o["status"] == "open" and (symbol is None or o["symbol"] == symbol)
+        ]
+
+    async def cancel_order(self, order_id: str, symbol: Optional[str] = None) -> dict[str, Any]:
+        order = self.orders[order_id]
+        if order["status"] == "open":
+            order["status"] = "canceled"
+            self._resting = [oid for oid in self._resting if oid != order_id]
+        return dict(order)
+
+    async def _create_resting(
+        self, symbol: str, side: str, amount: float, trigger_price: float, order_type: str
+    ) -> dict[str, Any]:
+        await self._latency()
+        order = self._new_order(symbol, side, amount, order_type, None)
+        order["triggerPrice"] = trigger_price
+        self._resting.append(order["id"])
+        return dict(order)
+
+    def _new_order(
+        self, symbol: str, side: str, amount: float, order_type: str, price: Optional[float]
+    ) -> dict[str, Any]:
+        self._next_id += 1
+        order = {
+            "id": str(self._next_id),
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "price": price,
+            "amount": amount,
+            "filled": 0.0,
+            "remaining": amount,
+            "average": None,
+            "fee": {"cost": 0.0},
+            "status": "open",
+        }
+        self.orders[order["id"]] = order
+        return order
+
+    def _apply_fill(self, order: dict[str, Any], filled: float, price: float, fee: float) -> None:
+        if filled <= 0:
+            return
+        total = order["filled"] + filled
+        previous = (order["average"] or 0.0) * order["filled"]
+        order["average"] = (previous + price * filled) / total
+        order["filled"] = total
+        order["remaining"] = max(0.0, order["amount"] - total)
+        order["fee"]["cost"] += fee
+        if order["remaining"] <= 1e-12:
+            order["status"] = "closed"
+
+    def _last_candle(self, symbol: str) -> list[float]:
+        if not self.candles.get(symbol):
+            raise ValueError(f"No candles loaded for {symbol}")
+        return self.candles[symbol][-1]
+
+    async def _latency(self) -> None:
+        if self.simulate_latency:
+            await asyncio.sleep(self.engine.params.latency_seconds)
@@ -1,17 +1,30 @@
-"""Rate limiting for LLM API calls using Redis."""
+"""Rate limiting for LLM API calls using Redis.
 
-from typing import Optional
+Limits are enforced with a sliding window kept in Redis sorted sets and
+updated by a server-side Lua script, so every API and worker process shares
+one request (RPM) and token (TPM) budget per provider and model. Window
+timestamps come from the Redis server clock, so clock skew between hosts
+cannot widen or shrink the window.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from time import time
+from typing import Any, Dict, Optional
 
 from redis.asyncio import Redis
 
+from ..config import load_api_config_from_env
 from ..core.logger import get_logger
-from ..core.redis_client import get_redis
+from ..core.redis_client import WORKLOAD_LOCKS, get_redis_for
 
 logger = get_logger(__name__)
 
 
 # Rate limits per model (requests per minute)
 DEFAULT_RATE_LIMIT = 50
+DEFAULT_TOKEN_LIMIT = 0  # 0 = no TPM limit
 MODEL_RATE_LIMITS = {
     "claude-4.5-sonnet": 50,
     "gpt-4": 50,
@@ -19,18 +32,118 @@ MODEL_RATE_LIMITS = {
     "gemini-2.5-pro": 50,
 }
 
+# Atomically trims the window, checks both budgets and either records the
+# request or returns how long until enough capacity frees up.
+#
+# KEYS[1] = request log (member = request id, score = server timestamp ms)
+# KEYS[2] = token log   (member = "request id:tokens", score = server timestamp ms)
+# ARGV    = window_ms, max_requests, max_tokens, tokens, request_id
+# Returns {allowed, wait_ms, requests_in_window, tokens_in_window}
+#
+# TIME before a write needs effects replication, the default since Redis 5.
+SLIDING_WINDOW_SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local window = tonumber(ARGV[1])
+local max_requests = tonumber(ARGV[2])
+local max_tokens = tonumber(ARGV[3])
+local tokens = tonumber(ARGV[4])
+local request_id = ARGV[5]
+
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now - window)
+
+local request_count = redis.call('ZCARD', KEYS[1])
+local token_entries = redis.call('ZRANGE', KEYS[2], 0, -1, 'WITHSCORES')
+local used_tokens = 0
+for i = 1, #token_entries, 2 do
+    local member = token_entries[i]
+    used_tokens = used_tokens + tonumber(string.sub(member, string.find(member, ':[^:]*$') + 1))
+end
+
+local wait = 0
+if max_requests > 0 and request_count >= max_requests then
+    local idx = request_count - max_requests
+    local oldest = redis.call('ZRANGE', KEYS[1], idx, idx, 'WITHSCORES')
+    wait = math.max(wait, tonumber(oldest[2]) + window - now)
+end
+
+if max_tokens > 0 and used_tokens > 0 and used_tokens + tokens > max_tokens then
+    local freed = 0
+    for i = 1, #token_entries, 2 do
+        local member = token_entries[i]
+        freed = freed + tonumber(string.sub(member, string.find(member, ':[^:]*$') + 1))
+        if used_tokens - freed + tokens <= max_tokens or freed == used_tokens then
+            wait = math.max(wait, tonumber(token_entries[i + 1]) + window - now)
+            break
+        end
+    end
+end
+
+if wait > 0 then
+    return {0, wait, request_count, used_tokens}
+end
+
+redis.call('ZADD', KEYS[1], now, request_id)
+redis.call('ZADD', KEYS[2], now, request_id .. ':' .. tokens)
+redis.call('PEXPIRE', KEYS[1], window)
+redis.call('PEXPIRE', KEYS[2], window)
+return {1, 0, request_count + 1, used_tokens + tokens}
+"""
+
+# Replaces a reservation's estimated token count with the actual usage,
+# keeping its original timestamp.
+#
+# KEYS[1] = token log, ARGV = request_id, estimated_tokens, actual_tokens
+RECONCILE_TOKENS_SCRIPT = """
+local old_member = ARGV[1] .. ':' .. ARGV[2]
+local score = redis.call('ZSCORE', KEYS[1], old_member)
+if not score then
+    return 0
+end
+redis.call('ZREM', KEYS[1], old_member)
+redis.call('ZADD', KEYS[1], score, ARGV[1] .. ':' .. ARGV[3])
+return 1
+"""
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    wait_seconds: float
+    retry_at: float  # Epoch seconds when capacity is expected to be available
+    requests_in_window: int
+    tokens_in_window: int
+
+
+@dataclass
+class RateLimitReservation:
+    """A granted slot in a provider/model window, reconciled after the call."""
+
+    provider: str
+    model: str
+    request_id: str
+    tokens: int
+
 
 class RateLimiter:
     """Rate limiter for LLM API calls using Redis."""
 
-    def __init__(self, redis_client: Optional[Redis] = None):
+    def __init__(self, redis_client: Optional[Redis] = None, window_seconds: Optional[int] = None):
         """Initialize rate limiter."""
+        api_config = load_api_config_from_env()
         self.redis_client = redis_client
+        self.window_seconds = window_seconds or int(api_config["LLM_RATE_WINDOW_SECONDS"])
+        self.provider_limits: Dict[str, Dict[str, int]] = api_config["LLM_PROVIDER_LIMITS"]
+        self._acquire_script: Any = None
+        self._reconcile_script: Any = None
 
     async def _get_redis(self) -> Redis:
         """Get or create Redis client."""
         if self.redis_client is None:
-            self.redis_client = await get_redis()
+            self.redis_client = await get_redis_for(WORKLOAD_LOCKS)
         return self.redis_client
 
     def _get_rate_limit(self, model: str) -> int:
@@ -41,31 +154,105 @@ class RateLimiter:
                 return limit
         return DEFAULT_RATE_LIMIT
 
-    async def check_rate_limit(self, model: str) -> bool:
-        """Check if model has remaining API calls within rate limit."""
+    def get_limits(self, provider: str, model: str) -> Dict[str, int]:
+        """Get RPM/TPM limits for a provider, falling back to per-model RPM."""
+        provider_limits = self.provider_limits.get(provider.lower(), {})
+        return {
+            "rpm": int(provider_limits.get("rpm", self._get_rate_limit(model))),
+            "tpm": int(provider_limits.get("tpm", DEFAULT_TOKEN_LIMIT)),
+        }
+
+    def _window_keys(self, provider: str, model: str) -> tuple[str, str]:
+        """Redis keys for the request and token logs of a provider/model."""
+        base = f"rate_limit:{provider.lower()}:{model}"
+        return f"{base}:requests", f"{base}:tokens"
+
+    async def try_acquire(
+        self, provider: str, model: str, tokens: int = 0, request_id: Optional[str] = None
+    ) -> RateLimitDecision:
+        """Atomically reserve one request and ``tokens`` tokens if both budgets allow."""
         redis = await self._get_redis()
-        key = f"rate_limit:{model}:count"
-        limit = self._get_rate_limit(model)
+        if self._acquire_script is None:
+            self._acquire_script = redis.register_script(SLIDING_WINDOW_SCRIPT)
 
-        count = await redis.get(key)
-        current_count = int(count) if count else 0
+        limits = self.get_limits(provider, model)
+        allowed, wait_ms, request_count, used_tokens = await self._acquire_script(
+            keys=list(self._window_keys(provider, model)),
+            args=[
+                self.window_seconds * 1000,
+                limits["rpm"],
+                limits["tpm"],
+                max(0, int(tokens)),
+                request_id or uuid.uuid4().hex,
+            ],
+        )
 
-        if current_count >= limit:
-            logger.warning(f"Rate limit exceeded for {model}: {current_count}/{limit} RPM")
-            return False
-        return True
+        wait_seconds = max(0, int(wait_ms)) / 1000
+        return RateLimitDecision(
+            allowed=bool(int(allowed)),
+            wait_seconds=wait_seconds,
+            retry_at=time() + wait_seconds,
+            requests_in_window=int(request_count),
+            tokens_in_window=int(used_tokens),
+        )
 
-    async def increment_counter(self, model: str) -> int:
-        """Increment rate limit counter for model."""
+    async def acquire(
+        self, provider: str, model: str, tokens: int = 0, max_wait: Optional[float] = None
+    ) -> RateLimitReservation:
+        """Wait until the shared window admits this request, then reserve it.
+
+        Raises:
+            TimeoutError: If the required wait would exceed ``max_wait`` seconds
+        """
+        request_id = uuid.uuid4().hex
+        waited = 0.0
+        while True:
+            decision = await self.try_acquire(provider, model, tokens, request_id)
+            if decision.allowed:
+                return RateLimitReservation(provider, model, request_id, max(0, int(tokens)))
+
+            if max_wait is not None and waited + decision.wait_seconds > max_wait:
+                raise TimeoutError(
+                    f"Rate limit for {provider}/{model} needs {decision.wait_seconds:.1f}s wait "
+                    f"(max {max_wait:.1f}s)"
+                )
+
+            logger.warning(
+                f"Rate limit reached for {provider}/{model} "
+                f"({decision.requests_in_window} req, {decision.tokens_in_window} tokens), "
+                f"waiting {decision.wait_seconds:.2f}s"
+            )
+            await asyncio.sleep(decision.wait_seconds)
+            waited += decision.wait_seconds
+
+    async def reconcile_tokens(self, reservation: RateLimitReservation, actual_tokens: int) -> None:
+        """Replace a reservation's estimated tokens with what the provider reported."""
+        if actual_tokens == reservation.tokens:
+            return
         redis = await self._get_redis()
-        key = f"rate_limit:{model}:count"
+        if self._reconcile_script is None:
+            self._reconcile_script = redis.register_script(RECONCILE_TOKENS_SCRIPT)
+
+        _, token_key = self._window_keys(reservation.provider, reservation.model)
+        await self._reconcile_script(
+            keys=[token_key],
+            args=[reservation.request_id, reservation.tokens, max(0, int(actual_tokens))],
+        )
+        reservation.tokens = max(0, int(actual_tokens))
 
-        count = await redis.incr(key)
-        if count == 1:
-            await redis.expire(key, 60)
+    async def check_rate_limit(self, model: str, provider: Optional[str] = None) -> bool:
+        """Atomically reserve a slot for model; False if the window is full.
 
-        logger.debug(f"Rate limit counter for {model}: {count}")
-        return int(count) if count is not None else 0
+        This is not a read-only check: when it returns True the request is
+        already counted in the window, so make the call without acquiring again.
+        """
+        decision = await self.try_acquire(provider or model, model)
+        if not decision.allowed:
+            logger.warning(
+                f"Rate limit exceeded for {model}: {decision.requests_in_window} RPM, "
+                f"retry in {decision.wait_seconds:.1f}s"
+            )
+        return decision.allowed
 
     async def track_token_usage(self, model: str, tokens: int, cost: float) -> None:
         """Track token usage and cost for analytics."""
@@ -76,19 +263,25 @@ class RateLimiter:
 
         logger.info(f"Tracked {tokens} tokens, ${cost:.6f} for {model}")
 
-    async def get_usage_stats(self, model: str) -> dict[str, object]:
+    async def get_usage_stats(self, model: str, provider: Optional[str] = None) -> dict[str, object]:
         """Get usage statistics for model."""
         redis = await self._get_redis()
 
         tokens = await redis.get(f"tokens:{model}:total")
         cost_cents = await redis.get(f"cost:{model}:total")
-        count = await redis.get(f"rate_limit:{model}:count")
+
+        request_key, _ = self._window_keys(provider or model, model)
+        seconds, microseconds = await redis.time()  # Same clock as the window scores
+        window_start = seconds * 1000 + microseconds // 1000 - self.window_seconds * 1000
+        current_rpm = await redis.zcount(request_key, window_start, "+inf")
+        limits = self.get_limits(provider or model, model)
 
         return {
             "tokens_used": int(tokens) if tokens else 0,
             "total_cost": (int(cost_cents) / 100) if cost_cents else 0.0,
-            "current_rpm": int(count) if count else 0,
-            "rate_limit": self._get_rate_limit(model),
+            "current_rpm": int(current_rpm) if current_rpm else 0,
+            "rate_limit": limits["rpm"],
+            "token_limit": limits["tpm"],
         }
 
     async def reset_usage_stats(self, model: str) -> None:
@@ -106,6 +299,6 @@ async def get_rate_limiter() -> RateLimiter:
     """Get or create rate limiter instance."""
     global _rate_limiter
     if _rate_limiter is None:
-        redis = await get_redis()
+        redis = await get_redis_for(WORKLOAD_LOCKS)
         _rate_limiter = RateLimiter(redis)
     return _rate_limiter
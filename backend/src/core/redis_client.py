@@ -1,35 +1,167 @@
 """Redis connection manager for caching and rate limiting."""
 
 import os
-from typing import Any, Optional
+from dataclasses import dataclass
+from time import monotonic, perf_counter
+from typing import Any, Dict, Optional
 
-import redis.asyncio as redis
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from ..core.config import config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Workloads that may get their own pool when REDIS_SEPARATE_POOLS is enabled
+WORKLOAD_DEFAULT = "default"
+WORKLOAD_CACHE = "cache"
+WORKLOAD_LOCKS = "locks"
+WORKLOAD_PUBSUB = "pubsub"
+
+SATURATION_LOG_INTERVAL = 60  # Seconds between repeated saturation warnings
+
+
+@dataclass
+class PoolStats:
+    """Cumulative acquisition metrics for a Redis connection pool."""
+
+    acquisitions: int = 0
+    timeouts: int = 0
+    waits: int = 0  # Acquisitions that had to block for a free connection
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    peak_in_use: int = 0
+
+    @property
+    def avg_wait_ms(self) -> float:
+        """Average time spent waiting for a connection, in milliseconds."""
+        return (self.total_wait_seconds / self.acquisitions * 1000) if self.acquisitions else 0.0
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Blocking connection pool that records wait time and saturation.
+
+    Callers block up to ``timeout`` seconds for a free connection instead of
+    failing immediately, and every acquisition feeds ``stats`` so pool
+    pressure is visible from the health endpoint.
+    """
+
+    def __init__(self, name: str = WORKLOAD_DEFAULT, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.name = name
+        self.stats = PoolStats()
+        self._last_saturation_log = 0.0
+
+    async def get_connection(self, command_name: Any, *keys: Any, **options: Any) -> Any:
+        """Get a connection, recording how long the caller waited."""
+        had_to_wait = not self.can_get_connection()
+        start = perf_counter()
+        try:
+            connection = await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError:
+            if had_to_wait:
+                self.stats.timeouts += 1
+                logger.error(
+                    f"Redis pool '{self.name}' exhausted: no connection within {self.timeout}s "
+                    f"({self.max_connections} max). Raise REDIS_MAX_CONNECTIONS or enable "
+                    f"REDIS_SEPARATE_POOLS."
+                )
+            raise
+
+        waited = perf_counter() - start
+        self.stats.acquisitions += 1
+        self.stats.total_wait_seconds += waited
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, waited)
+        if had_to_wait:
+            self.stats.waits += 1
+
+        in_use = self.in_use_count
+        self.stats.peak_in_use = max(self.stats.peak_in_use, in_use)
+        self._check_saturation(in_use)
+        return connection
+
+    @property
+    def in_use_count(self) -> int:
+        """Connections currently checked out."""
+        return len(self._in_use_connections)
+
+    @property
+    def available_count(self) -> int:
+        """Idle connections ready for reuse."""
+        return len(self._available_connections)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current pool utilization and cumulative wait metrics."""
+        in_use = self.in_use_count
+        return {
+            "pool": self.name,
+            "max_connections": self.max_connections,
+            "in_use": in_use,
+            "available": self.available_count,
+            "utilization": round(in_use / self.max_connections, 3) if self.max_connections else 0.0,
+            "peak_in_use": self.stats.peak_in_use,
+            "acquisitions": self.stats.acquisitions,
+            "waits": self.stats.waits,
+            "timeouts": self.stats.timeouts,
+            "avg_wait_ms": round(self.stats.avg_wait_ms, 3),
+            "max_wait_ms": round(self.stats.max_wait_seconds * 1000, 3),
+        }
+
+    def _check_saturation(self, in_use: int) -> None:
+        """Log a throttled warning when the pool nears its limit."""
+        if not self.max_connections:
+            return
+        if in_use / self.max_connections < config.REDIS_SATURATION_WARNING_PCT:
+            return
+        now = monotonic()
+        if now - self._last_saturation_log < SATURATION_LOG_INTERVAL:
+            return
+        self._last_saturation_log = now
+        logger.warning(
+            f"Redis pool '{self.name}' saturated: {in_use}/{self.max_connections} in use "
+            f"({self.stats.waits} waits, max wait {self.stats.max_wait_seconds * 1000:.1f}ms)"
+        )
 
 
 class RedisClient:
     """Redis client wrapper with connection pooling."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        workload: str = WORKLOAD_DEFAULT,
+        max_connections: Optional[int] = None,
+    ) -> None:
         """Initialize Redis client."""
         self._redis: Optional[Redis] = None
+        self._pool: Optional[InstrumentedConnectionPool] = None
         self._url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+        self.workload = workload
+        self.max_connections = max_connections or config.REDIS_MAX_CONNECTIONS
 
     async def connect(self) -> None:
         """Establish Redis connection."""
         if self._redis is None:
-            self._redis = await redis.from_url(  # type: ignore[no-untyped-call]
+            self._pool = InstrumentedConnectionPool.from_url(
                 self._url,
+                name=self.workload,
+                max_connections=self.max_connections,
+                timeout=config.REDIS_POOL_TIMEOUT,
+                socket_timeout=config.REDIS_SOCKET_TIMEOUT,
+                health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
                 encoding="utf-8",
                 decode_responses=True,
-                max_connections=10
             )
+            self._redis = Redis(connection_pool=self._pool)
 
     async def disconnect(self) -> None:
         """Close Redis connection."""
         if self._redis:
-            await self._redis.close()
+            await self._redis.aclose()
             self._redis = None
+        if self._pool:
+            await self._pool.disconnect()
+            self._pool = None
 
     @property
     def client(self) -> Redis:
@@ -38,6 +170,20 @@ class RedisClient:
             raise RuntimeError("Redis not connected. Call connect() first.")
         return self._redis
 
+    def pool_stats(self) -> Dict[str, Any]:
+        """Get utilization and wait metrics for this client's pool."""
+        if self._pool is None:
+            return {"pool": self.workload, "connected": False}
+        return {"connected": True, **self._pool.snapshot()}
+
+    async def ping(self) -> bool:
+        """Check that Redis answers within the socket timeout."""
+        try:
+            return bool(await self.client.ping())
+        except Exception as e:
+            logger.warning(f"Redis ping failed for pool '{self.workload}': {e}")
+            return False
+
     async def get(self, key: str) -> Optional[str]:
         """Get value by key."""
         return await self.client.get(key)  # type: ignore[no-any-return]
@@ -73,6 +219,7 @@ class RedisClient:
 
 
 _redis_client: Optional[RedisClient] = None
+_workload_clients: Dict[str, RedisClient] = {}
 
 
 async def get_redis() -> Redis:
@@ -84,6 +231,33 @@ async def get_redis() -> Redis:
     return _redis_client.client
 
 
+async def get_redis_for(workload: str) -> Redis:
+    """Get the Redis client for a workload (cache, locks, pubsub).
+
+    Returns the shared client unless REDIS_SEPARATE_POOLS is enabled, in which
+    case each workload gets its own pool sized by REDIS_<WORKLOAD>_MAX_CONNECTIONS
+    so a burst in one workload cannot starve the others.
+    """
+    if not config.REDIS_SEPARATE_POOLS or workload == WORKLOAD_DEFAULT:
+        return await get_redis()
+
+    client = _workload_clients.get(workload)
+    if client is None:
+        client = RedisClient(
+            workload=workload,
+            max_connections=config.REDIS_WORKLOAD_MAX_CONNECTIONS.get(workload),
+        )
+        await client.connect()
+        _workload_clients[workload] = client
+    return client.client
+
+
+def get_redis_pool_stats() -> list[Dict[str, Any]]:
+    """Get pool metrics for every Redis client created in this process."""
+    clients = ([_redis_client] if _redis_client else []) + list(_workload_clients.values())
+    return [client.pool_stats() for client in clients]
+
+
 async def init_redis() -> None:
     """Initialize Redis connection on startup."""
     global _redis_client
@@ -96,6 +270,9 @@ async def init_redis() -> None:
 async def close_redis() -> None:
     """Close Redis connection on shutdown."""
     global _redis_client
+    for client in list(_workload_clients.values()):
+        await client.disconnect()
+    _workload_clients.clear()
     if _redis_client:
         await _redis_client.disconnect()
         _redis_client = None
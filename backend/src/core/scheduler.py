@@ -2,16 +2,25 @@
 
 import asyncio
 import uuid
-from typing import Any, Dict, Optional, cast
+from time import monotonic
+from typing import Any, Dict, List, Optional, Set, cast
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.account_reconciler import AccountReconciler
+from ..core.bot_events import BotEvent, BotEventListener, publish_bot_event
+from ..core.bot_leases import BotLeaseManager, fair_share
+from ..core.config import config
+from ..core.cycle_clock import CycleClock
 from ..core.database import get_db
+from ..core.exit_monitor import ExitMonitor
+from ..core.leader_election import LeaderElection
 from ..core.llm_client import LLMClient, get_llm_client
 from ..core.logger import get_logger
 from ..core.memory.initialization import initialize_memory_system
-from ..models.bot import BotStatus
+from ..models.bot import Bot, BotStatus
 from ..services.bot_service import BotService
+from ..services.order_pipeline import reconcile_pipelines
 
 USE_BLOCKS = True
 
@@ -24,14 +33,35 @@ logger = get_logger(__name__)
 
 
 class BotScheduler:
-    """Scheduler for managing multiple trading bot engines."""
+    """Scheduler for managing multiple trading bot engines.
 
-    def __init__(self) -> None:
+    Without ``leases`` the scheduler runs every active bot. With them it runs as
+    one of several workers: it only runs bots whose lease it holds, claims up to
+    its fair share of the active bots and stops any bot whose lease it loses.
+    With ``elect`` it only runs bots while it is the elected leader among API
+    replicas, and its engines write under the leader's fencing token.
+    """
+
+    def __init__(self, leases: Optional[BotLeaseManager] = None, elect: bool = False) -> None:
         """Initialize the bot scheduler."""
         self.active_engines: Dict[uuid.UUID, Any] = {}
         self.engine_tasks: Dict[uuid.UUID, asyncio.Task[Any]] = {}
         self.is_running = False
         self.monitor_task: Optional[asyncio.Task[Any]] = None
+        self.leases = leases
+        self.lease_task: Optional[asyncio.Task[Any]] = None
+        self.order_task: Optional[asyncio.Task[Any]] = None
+        self.worker_count: Optional[int] = None
+        self._lease_renewed_at: Dict[uuid.UUID, float] = {}
+        self.election = LeaderElection(self._on_elected, self._on_demoted) if elect else None
+        self.fencing_token: Optional[int] = None
+        self.exit_monitor = ExitMonitor(self._executions)
+        self.live_bots: Set[uuid.UUID] = set()
+        self.account = AccountReconciler(lambda: self.live_bots, fencing_token=lambda: self.fencing_token)
+        self.clock = CycleClock()
+        self.events = BotEventListener(self._on_bot_event, on_connect=self.request_sweep)
+        self._sweep_requested = asyncio.Event()
+        self._lifecycle_lock = asyncio.Lock()
         logger.info("Bot scheduler initialized")
 
     async def start(self) -> None:
@@ -49,38 +79,147 @@ class BotScheduler:
 
         self.is_running = True
         logger.info("Starting bot scheduler")
-        self.monitor_task = asyncio.create_task(self._monitor_bots())
+        if self.election is not None:
+            logger.info(f"Campaigning for scheduler leadership as {self.election.holder_id}")
+            await self.election.start()
+        else:
+            await self._activate()
 
     async def stop(self) -> None:
         """Stop the scheduler and all engines."""
         logger.info("Stopping bot scheduler")
         self.is_running = False
+        await self._deactivate()
+        # Resign only once our engines are down, so the next leader never overlaps them
+        if self.election is not None:
+            await self.election.stop()
+        logger.info("Bot scheduler stopped")
 
-        if self.monitor_task:
-            self.monitor_task.cancel()
-            try:
-                await self.monitor_task
-            except asyncio.CancelledError:
-                pass
+    async def _activate(self) -> None:
+        """Start running bots: sweep, status events, exit monitor, order and lease upkeep."""
+        if self.leases is not None:
+            logger.info(f"Running as worker {self.leases.worker_id}")
+            self.lease_task = asyncio.create_task(self._maintain_leases())
+        if config.CYCLE_CLOCK_ENABLED:
+            await self.clock.start()
+        self.monitor_task = asyncio.create_task(self._monitor_bots())
+        self.order_task = asyncio.create_task(self._reconcile_orders())
+        if config.BOT_EVENTS_ENABLED:
+            await self.events.start()
+        if config.EXIT_MONITOR_ENABLED:
+            await self.exit_monitor.start()
+        if config.ACCOUNT_RECONCILE_ENABLED:
+            await self.account.start()
+
+    async def _deactivate(self) -> None:
+        """Stop every engine and the background tasks that drive them."""
+        await self.events.stop()
+
+        for task in (self.monitor_task, self.lease_task, self.order_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self.monitor_task = self.lease_task = self.order_task = None
+
+        await self.exit_monitor.stop()
+        await self.account.stop()
 
         for bot_id in list(self.active_engines.keys()):
             await self.stop_bot(bot_id)
+        await self.clock.stop()
 
-        logger.info("Bot scheduler stopped")
+        if self.leases is not None:
+            await self.leases.leave()
+
+    @property
+    def is_leader(self) -> bool:
+        """Whether this process may run bots (always, unless electing a leader)."""
+        return self.election is None or self.election.is_leader
+
+    async def _on_elected(self, token: int) -> None:
+        self.fencing_token = token
+        await self._activate()
+
+    async def _on_demoted(self) -> None:
+        logger.warning("No longer the scheduler leader, stopping all engines")
+        self.fencing_token = None
+        await self._deactivate()
+
+    def _executions(self) -> Dict[uuid.UUID, Any]:
+        """Execution blocks of the running engines, for the exit monitor."""
+        return {
+            bot_id: engine.execution
+            for bot_id, engine in self.active_engines.items()
+            if getattr(engine, "execution", None) is not None
+        }
 
     async def _monitor_bots(self) -> None:
-        """Monitor bots and manage their engines."""
-        logger.info("Bot monitor started (checks every 30s)")
+        """Reconcile engines with bot statuses in the database.
+
+        Status events normally start and stop engines immediately; while the event
+        subscription is up this sweep only runs every BOT_RECONCILE_INTERVAL_SECONDS
+        as a safety net, otherwise every BOT_MONITOR_CHECK_INTERVAL_SECONDS.
+        """
+        logger.info("Bot monitor started")
 
         while self.is_running:
             try:
                 async for db in get_db():
                     await self._check_and_update_engines(db)
                     break
-                await asyncio.sleep(30)
             except Exception as e:
                 logger.error(f"Monitor error: {e}", exc_info=True)
-                await asyncio.sleep(30)
+            await self._wait_for_sweep()
+
+    @property
+    def sweep_interval(self) -> int:
+        """Seconds between sweeps: slow while status events are flowing.
+
+        Workers sweep at least once per lease TTL, since the sweep is what picks up
+        bots whose worker died.
+        """
+        interval = (
+            config.BOT_RECONCILE_INTERVAL_SECONDS
+            if self.events.connected
+            else config.BOT_MONITOR_CHECK_INTERVAL_SECONDS
+        )
+        if self.leases is not None:
+            interval = min(interval, config.WORKER_LEASE_TTL_SECONDS)
+        return interval
+
+    async def _wait_for_sweep(self) -> None:
+        """Sleep until the next sweep is due or one is requested."""
+        try:
+            await asyncio.wait_for(self._sweep_requested.wait(), timeout=self.sweep_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._sweep_requested.clear()
+
+    def request_sweep(self) -> None:
+        """Run the reconciliation sweep now (e.g. after events may have been missed)."""
+        self._sweep_requested.set()
+
+    async def _on_bot_event(self, event: BotEvent) -> None:
+        """Start or stop a bot's engine as soon as its status changes."""
+        try:
+            bot_id = uuid.UUID(event.bot_id)
+        except ValueError:
+            logger.warning(f"Ignoring bot event with invalid id: {event.bot_id}")
+            return
+
+        if event.status == BotStatus.ACTIVE.value:
+            if self.leases is not None:
+                # Whether to claim it depends on this worker's share: let the sweep decide
+                self.request_sweep()
+            elif bot_id not in self.active_engines:
+                logger.info(f"Bot {bot_id} activated, starting engine")
+                await self.start_bot(bot_id)
+        elif bot_id in self.active_engines:
+            logger.info(f"Bot {bot_id} is now {event.status}, stopping engine")
+            await self.stop_bot(bot_id)
 
     async def _check_and_update_engines(self, db: AsyncSession) -> None:
         """Check bot statuses and start/stop engines as needed."""
@@ -93,28 +232,130 @@ class BotScheduler:
                 logger.warning("No active bots")
                 return
 
-            # Start engines for new active bots
-            for bot in active_bots:
-                if bot.id not in self.active_engines:
-                    logger.info(f"Starting {bot.name}")
-                    await self.start_bot(bot.id, db)
-
             # Stop engines for bots that are no longer active
             for bot_id in list(self.active_engines.keys()):
                 if bot_id not in active_bot_ids:
                     logger.info(f"Stopping bot {bot_id}")
                     await self.stop_bot(bot_id)
 
+            if self.leases is not None:
+                await self._rebalance(active_bots, db)
+                return
+
+            # Start engines for new active bots
+            for bot in active_bots:
+                if bot.id not in self.active_engines:
+                    logger.info(f"Starting {bot.name}")
+                    await self.start_bot(bot.id, db)
+
         except Exception as e:
             logger.error(f"Engine check error: {e}", exc_info=True)
 
+    async def _rebalance(self, active_bots: List[Bot], db: AsyncSession) -> None:
+        """Claim unowned bots up to this worker's fair share and hand back any excess."""
+        assert self.leases is not None
+        self.worker_count = await self.leases.heartbeat()
+        share = fair_share(len(active_bots), self.worker_count)
+
+        for bot in active_bots:
+            if len(self.active_engines) >= share:
+                break
+            if bot.id not in self.active_engines:
+                await self.start_bot(bot.id, db)
+
+        # Newest first, so long-running bots stay where they are
+        excess = list(self.active_engines)[share:]
+        for bot_id in reversed(excess):
+            logger.info(f"Handing bot {bot_id} over ({len(self.active_engines)} running, share {share})")
+            await self.stop_bot(bot_id)
+            # Wakes the other workers' sweeps so the bot is picked up right away
+            await publish_bot_event(bot_id, BotStatus.ACTIVE)
+
+    async def _reconcile_orders(self) -> None:
+        """Refresh working and unconfirmed live orders every ORDER_RECONCILE_INTERVAL_SECONDS."""
+        while self.is_running:
+            await asyncio.sleep(config.ORDER_RECONCILE_INTERVAL_SECONDS)
+            try:
+                await reconcile_pipelines()
+            except Exception as e:
+                logger.error(f"Order reconciliation error: {e}")
+
+    async def _maintain_leases(self) -> None:
+        """Heartbeat and renew leases every WORKER_LEASE_RENEW_SECONDS."""
+        while self.is_running:
+            await self.renew_leases()
+            await asyncio.sleep(config.WORKER_LEASE_RENEW_SECONDS)
+
+    async def renew_leases(self) -> None:
+        """Heartbeat and renew this worker's leases; stop bots whose lease is gone.
+
+        A bot is also stopped when its lease could not be renewed for long enough
+        that it may have expired (e.g. Redis unreachable), because another worker
+        may already have claimed it.
+        """
+        assert self.leases is not None
+        try:
+            workers = await self.leases.heartbeat()
+            if workers != self.worker_count:
+                logger.info(f"{workers} live worker(s), rebalancing")
+                self.worker_count = workers
+                self.request_sweep()
+
+            owned = list(self.active_engines)
+            renewed = await self.leases.renew(owned)
+            now = monotonic()
+            for bot_id in owned:
+                if bot_id in renewed:
+                    self._lease_renewed_at[bot_id] = now
+                else:
+                    logger.warning(f"Lease on bot {bot_id} was lost, stopping its engine")
+                    await self.stop_bot(bot_id)
+        except Exception as e:
+            logger.error(f"Lease renewal error: {e}")
+            await self._stop_expiring_bots()
+
+    async def _stop_expiring_bots(self) -> None:
+        """Stop bots whose lease may expire before the next renewal attempt."""
+        deadline = monotonic() + config.WORKER_LEASE_RENEW_SECONDS - config.WORKER_LEASE_TTL_SECONDS
+        for bot_id in list(self.active_engines):
+            if self._lease_renewed_at.get(bot_id, 0.0) <= deadline:
+                logger.warning(f"Could not renew lease on bot {bot_id} in time, stopping its engine")
+                await self.stop_bot(bot_id)
+
     async def start_bot(self, bot_id: uuid.UUID, db: Optional[AsyncSession] = None) -> bool:
         """Start a trading engine for a bot."""
+        # Routes, events and the sweep can race to start the same bot
+        async with self._lifecycle_lock:
+            return await self._start_bot(bot_id, db)
+
+    async def _start_bot(self, bot_id: uuid.UUID, db: Optional[AsyncSession] = None) -> bool:
         try:
             if bot_id in self.active_engines:
                 logger.warning(f"Engine for bot {bot_id} is already running")
                 return False
 
+            if not self.is_leader:
+                logger.warning(f"Not the scheduler leader, leaving bot {bot_id} to the leader")
+                return False
+
+            if self.leases is not None:
+                if not await self.leases.acquire(bot_id):
+                    logger.debug(f"Bot {bot_id} is owned by another worker")
+                    return False
+                self._lease_renewed_at[bot_id] = monotonic()
+                if not await self._launch_engine(bot_id, db):
+                    await self._release_lease(bot_id)
+                    return False
+                return True
+
+            return await self._launch_engine(bot_id, db)
+
+        except Exception as e:
+            logger.error(f"Error starting engine for bot {bot_id}: {e}", exc_info=True)
+            return False
+
+    async def _launch_engine(self, bot_id: uuid.UUID, db: Optional[AsyncSession] = None) -> bool:
+        try:
             if db is None:
                 async for session in get_db():
                     db = session
@@ -140,7 +381,9 @@ class BotScheduler:
                     cycle_interval=cycle_interval,
                     llm_client=llm_client,
                     decision_mode="trinity",  # ← Trinity indicator framework
-                    paper_trading=bot.paper_trading  # ← Pass OKX live/paper trading setting
+                    paper_trading=bot.paper_trading,  # ← Pass OKX live/paper trading setting
+                    fencing_token=self.fencing_token,
+                    clock=self.clock if config.CYCLE_CLOCK_ENABLED else None,
                 )
                 logger.info(f"[DECISION] Using Trinity indicator framework (confluence scoring)")
             else:
@@ -149,6 +392,9 @@ class BotScheduler:
             task = asyncio.create_task(engine.start())
             self.active_engines[bot_id] = engine
             self.engine_tasks[bot_id] = task
+            if not bot.paper_trading:
+                # Reconciled against the exchange account, in either engine mode
+                self.live_bots.add(bot_id)
 
             logger.info(
                 f"{bot.name} | {bot.model_name} | ${bot.capital:,.2f} | {cycle_interval // 60}min cycles"
@@ -161,6 +407,10 @@ class BotScheduler:
 
     async def stop_bot(self, bot_id: uuid.UUID) -> bool:
         """Stop a trading engine for a bot."""
+        async with self._lifecycle_lock:
+            return await self._stop_bot(bot_id)
+
+    async def _stop_bot(self, bot_id: uuid.UUID) -> bool:
         try:
             if bot_id not in self.active_engines:
                 logger.warning(f"No engine running for bot {bot_id}")
@@ -180,6 +430,8 @@ class BotScheduler:
 
             del self.active_engines[bot_id]
             self.engine_tasks.pop(bot_id, None)
+            self.live_bots.discard(bot_id)
+            await self._release_lease(bot_id)
 
             logger.info(f"Trading engine stopped for bot {bot_id}")
             return True
@@ -188,6 +440,11 @@ class BotScheduler:
             logger.error(f"Error stopping engine for bot {bot_id}: {e}", exc_info=True)
             return False
 
+    async def _release_lease(self, bot_id: uuid.UUID) -> None:
+        self._lease_renewed_at.pop(bot_id, None)
+        if self.leases is not None:
+            await self.leases.release(bot_id)
+
     async def restart_bot(self, bot_id: uuid.UUID) -> bool:
         """Restart a trading engine for a bot."""
         await self.stop_bot(bot_id)
@@ -225,7 +482,7 @@ def get_scheduler() -> BotScheduler:
     """Get or create the global scheduler instance."""
     global _scheduler
     if _scheduler is None:
-        _scheduler = BotScheduler()
+        _scheduler = BotScheduler(elect=config.LEADER_ELECTION_ENABLED)
     return _scheduler
 
 
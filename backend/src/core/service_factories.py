@@ -55,8 +55,7 @@ def create_logger(name: str) -> Any:
 
 def create_rate_limiter() -> RateLimiter:
     """Factory for rate limiter singleton."""
-    calls_per_minute = getattr(config, "LLM_CALLS_PER_MINUTE", 10)
-    return RateLimiter(calls_per_minute=calls_per_minute)  # type: ignore[call-arg]
+    return RateLimiter()
 
 
 def create_query_profiler() -> QueryProfiler:
@@ -0,0 +1,92 @@
+"""Incremental JSON parser for streamed multi-coin LLM responses."""
+
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class IncrementalDecisionParser:
+    """Emit each symbol's decision object as soon as its closing brace arrives.
+
+    The LLM answers with ``{"BTC/USDT": {...}, "ETH/USDT": {...}}`` (optionally
+    wrapped in ``{"decisions": {...}}`` or markdown fences). Text is fed chunk by
+    chunk; the scanner tracks string/escape state and nesting so a decision is
+    decoded the moment its object is complete, without waiting for the rest.
+    """
+
+    def __init__(self, symbols: Optional[Iterable[str]] = None) -> None:
+        self.symbols = set(symbols) if symbols else None
+        self.buffer = ""
+        self._pos = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._stack: List[Tuple[int, Optional[str]]] = []  # (start offset, key) of open containers
+        self._emitted: set[str] = set()
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Consume a chunk of text and return decisions completed by it."""
+        self.buffer += chunk
+        completed: List[Tuple[str, Dict[str, Any]]] = []
+        buffer = self.buffer
+
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._last_string = buffer[self._string_start + 1 : self._pos]
+            elif char == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._string_start = self._pos
+            elif char == ":":
+                self._pending_key = self._last_string
+            elif char == ",":
+                self._pending_key = None
+            elif char in "{[":
+                key = self._pending_key if self._stack and buffer[self._stack[-1][0]] == "{" else None
+                self._stack.append((self._pos, key))
+                self._pending_key = None
+            elif char in "}]" and self._stack:
+                start, key = self._stack.pop()
+                if char == "}" and key is not None and self._is_symbol(key):
+                    decision = self._decode(buffer[start : self._pos + 1], key)
+                    if decision is not None and key not in self._emitted:
+                        self._emitted.add(key)
+                        completed.append((key, decision))
+                self._pending_key = None
+
+            self._pos += 1
+
+        return completed
+
+    def _is_symbol(self, key: str) -> bool:
+        """Whether an object key names a trading symbol."""
+        if self.symbols is not None:
+            return key in self.symbols
+        return "/" in key or key.upper().endswith("USDT")
+
+    def _decode(self, text: str, symbol: str) -> Optional[Dict[str, Any]]:
+        """Decode one completed decision object."""
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Streamed decision for {symbol} is not valid JSON: {e}")
+            return None
+        return value if isinstance(value, dict) else None
+
+    @property
+    def emitted_symbols(self) -> set[str]:
+        """Symbols whose decisions have already been emitted."""
+        return set(self._emitted)
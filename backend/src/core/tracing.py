@@ -0,0 +1,278 @@
+"""Per-cycle tracing: nested spans, in-memory stage histograms and OTLP-compatible export.
+
+Spans are recorded with ``span(name, **attributes)`` anywhere below an active
+``CycleTracer.cycle()``; outside a cycle they are no-ops. Finished cycles are kept
+as waterfalls for the cycle-profile endpoint, appended as OTLP/JSON lines to
+``TRACING_EXPORT_FILE`` and, if enabled, mirrored to the OpenTelemetry API so an
+installed SDK can ship them to a collector.
+"""
+
+import json
+import os
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from time import time_ns
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence
+
+from ..core.config import config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Span:
+    """One timed operation inside a cycle."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time_ns()
+        return (end - self.start_ns) / 1e6
+
+
+@dataclass
+class CycleTrace:
+    """All spans recorded during one trading cycle."""
+
+    trace_id: str
+    bot_id: str
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def root(self) -> Span:
+        return self.spans[0]
+
+    def waterfall(self) -> Dict[str, Any]:
+        """Spans as offsets from the cycle start, in start order."""
+        root = self.root
+        depth: Dict[Optional[str], int] = {None: -1}
+        rows = []
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            depth[span.span_id] = depth.get(span.parent_id, -1) + 1
+            rows.append({
+                "name": span.name,
+                "depth": depth[span.span_id],
+                "offset_ms": round((span.start_ns - root.start_ns) / 1e6, 2),
+                "duration_ms": round(span.duration_ms, 2),
+                "attributes": span.attributes,
+                "error": span.error,
+            })
+        return {
+            "trace_id": self.trace_id,
+            "started_at": datetime.fromtimestamp(root.start_ns / 1e9, tz=timezone.utc).isoformat(),
+            "duration_ms": round(root.duration_ms, 2),
+            "attributes": root.attributes,
+            "spans": rows,
+        }
+
+
+class StageHistogram:
+    """Fixed-bucket latency histogram (seconds)."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the percentile (inf for the overflow bucket)."""
+        if not self.count:
+            return None
+        target, seen = pct * self.count, 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.buckets[index] if index < len(self.buckets) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_seconds": round(self.total / self.count, 4) if self.count else None,
+            "p50_seconds": self.percentile(0.5),
+            "p95_seconds": self.percentile(0.95),
+            "buckets": dict(zip([*map(str, self.buckets), "+inf"], self.counts)),
+        }
+
+
+_current_trace: ContextVar[Optional[CycleTrace]] = ContextVar("cycle_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("cycle_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a child span of the current one; no-op outside a traced cycle."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    current = Span(
+        name=name,
+        trace_id=trace.trace_id,
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent else None,
+        start_ns=time_ns(),
+        attributes=attributes,
+    )
+    trace.spans.append(current)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        raise
+    finally:
+        current.end_ns = time_ns()
+        _current_span.reset(token)
+
+
+class CycleTracer:
+    """Traces one bot's cycles and keeps recent waterfalls and per-span histograms."""
+
+    def __init__(self, bot_id: str) -> None:
+        self.bot_id = bot_id
+        self.recent: Deque[CycleTrace] = deque(maxlen=config.TRACING_RECENT_CYCLES)
+        self.histograms: Dict[str, StageHistogram] = {}
+
+    @contextmanager
+    def cycle(self, **attributes: Any) -> Iterator[Optional[Span]]:
+        """Root span for one cycle; spans opened inside it are attached to it."""
+        if not config.TRACING_ENABLED:
+            yield None
+            return
+
+        trace = CycleTrace(trace_id=_new_id(16), bot_id=self.bot_id)
+        trace_token = _current_trace.set(trace)
+        try:
+            with span("cycle", bot_id=self.bot_id, **attributes) as root:
+                yield root
+        finally:
+            _current_trace.reset(trace_token)
+            self._finish(trace)
+
+    def _finish(self, trace: CycleTrace) -> None:
+        for finished in trace.spans:
+            if finished.end_ns is None:
+                continue
+            if finished.name not in self.histograms:
+                self.histograms[finished.name] = StageHistogram(config.TRACING_HISTOGRAM_BUCKETS)
+            self.histograms[finished.name].observe(finished.duration_ms / 1000)
+        self.recent.append(trace)
+
+        try:
+            if config.TRACING_EXPORT_FILE:
+                export_otlp_file(trace, config.TRACING_EXPORT_FILE)
+            if config.TRACING_OTEL_ENABLED:
+                export_otel(trace)
+        except Exception as e:
+            logger.warning(f"Trace export failed: {e}")
+
+    def profile(self, limit: int = 10) -> Dict[str, Any]:
+        """Recent cycle waterfalls (newest first) and per-span latency histograms."""
+        cycles = list(self.recent)[-limit:][::-1]
+        return {
+            "cycles": [trace.waterfall() for trace in cycles],
+            "histograms": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+        }
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(trace: CycleTrace) -> Dict[str, Any]:
+    """A cycle as an OTLP/JSON ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": config.TRACING_SERVICE_NAME}},
+                {"key": "bot.id", "value": {"stringValue": trace.bot_id}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "0xbot.cycle"},
+                "spans": [
+                    {
+                        "traceId": s.trace_id,
+                        "spanId": s.span_id,
+                        "parentSpanId": s.parent_id or "",
+                        "name": s.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(s.start_ns),
+                        "endTimeUnixNano": str(s.end_ns or s.start_ns),
+                        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                        "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+                    }
+                    for s in trace.spans
+                ],
+            }],
+        }]
+    }
+
+
+def export_otlp_file(trace: CycleTrace, path: str) -> None:
+    """Append one OTLP/JSON line (readable by the collector's otlpjsonfile receiver)."""
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(json.dumps(to_otlp(trace)) + "\n")
+
+
+def export_otel(trace: CycleTrace) -> None:
+    """Replay the cycle's spans through the OpenTelemetry API, if installed."""
+    try:
+        from opentelemetry import trace as otel_trace
+    except ImportError:
+        return
+
+    tracer = otel_trace.get_tracer("0xbot.cycle")
+    otel_spans: Dict[str, Any] = {}
+    for s in sorted(trace.spans, key=lambda s: s.start_ns):
+        parent = otel_spans.get(s.parent_id) if s.parent_id else None
+        context = otel_trace.set_span_in_context(parent) if parent is not None else None
+        otel_span = tracer.start_span(
+            s.name, context=context, start_time=s.start_ns,
+            attributes={k: v if isinstance(v, (bool, int, float)) else str(v) for k, v in s.attributes.items()},
+        )
+        otel_spans[s.span_id] = otel_span
+    for s in trace.spans:
+        otel_spans[s.span_id].end(end_time=s.end_ns or s.start_ns)
+
+
+_tracers: Dict[str, CycleTracer] = {}
+
+
+def get_cycle_tracer(bot_id: Any) -> CycleTracer:
+    """Tracer for a bot, created on first use."""
+    key = str(bot_id)
+    if key not in _tracers:
+        _tracers[key] = CycleTracer(key)
+    return _tracers[key]
@@ -2,7 +2,7 @@
 
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -11,14 +11,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from .core.config import config
 from .core.database import close_db
 from .core.di_container import get_container
+from .core.llm_client import get_llm_client
 from .core.logging_config import configure_structured_logging
-from .core.redis_client import close_redis, init_redis
+from .core.redis_client import close_redis, get_redis_pool_stats, init_redis
 from .core.scheduler import start_scheduler, stop_scheduler
 from .middleware.error_handler import ErrorHandlerMiddleware
 from .middleware.query_profiling import QueryProfilingMiddleware
 from .middleware.security import RequestIDMiddleware, SecurityHeadersMiddleware
 from .routes import auth_router, bots_router
 from .routes.dashboard import router as dashboard_router
+from .services.llm_decision_schema import get_parse_metrics
 
 # Load environment variables from .env file
 load_dotenv()
@@ -61,9 +63,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await container.startup()
     print("✅ DI container services started")
 
-    # Start bot scheduler
-    await start_scheduler()
-    print("✅ Bot scheduler started")
+    # Start bot scheduler (in worker mode bots run in `python -m src.worker` processes)
+    if config.SCHEDULER_MODE == "embedded":
+        await start_scheduler()
+        print("✅ Bot scheduler started")
+    else:
+        print("✅ Bot scheduler delegated to workers")
 
     print("✅ Application ready")
     print("📊 Access API docs at http://localhost:8020/docs")
@@ -137,6 +142,33 @@ async def health_check() -> dict[str, str]:
     return {"status": "healthy", "service": "AI Trading Agent API", "version": "1.0.0"}
 
 
+@app.get("/health/redis", tags=["Health"])
+async def redis_health() -> dict[str, Any]:
+    """
+    Redis connection pool health.
+
+    Returns:
+        Per-pool utilization, wait-time and timeout counters
+    """
+    pools = get_redis_pool_stats()
+    saturated = [
+        p["pool"] for p in pools
+        if p.get("utilization", 0) >= config.REDIS_SATURATION_WARNING_PCT or p.get("timeouts", 0) > 0
+    ]
+    return {"status": "saturated" if saturated else "healthy", "saturated_pools": saturated, "pools": pools}
+
+
+@app.get("/health/llm", tags=["Health"])
+async def llm_health() -> dict[str, Any]:
+    """
+    LLM call health.
+
+    Returns:
+        Provider circuits and latency, batching savings and decision parse-failure rate
+    """
+    return {**get_llm_client().stats(), "parsing": get_parse_metrics().stats()}
+
+
 # Root endpoint
 @app.get("/", tags=["Root"])
 async def root() -> dict[str, str]:
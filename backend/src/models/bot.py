@@ -4,7 +4,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import JSON, Boolean, DateTime
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime
 from sqlalchemy import Enum as SQLEnum
 from sqlalchemy import ForeignKey, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
@@ -64,6 +64,8 @@ class Bot(Base):
         default=BotStatus.INACTIVE,
     )
     paper_trading: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    # Highest scheduler fencing token that has written for this bot
+    fencing_token: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
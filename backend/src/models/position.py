@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, Optional
 
 from sqlalchemy import DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Numeric, String
+from sqlalchemy import ForeignKey, Integer, Numeric, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -55,6 +55,12 @@ class Position(Base):
     )
     opened_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     closed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    # Bumped on every status change; writers only apply changes to the version they read
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Set only for positions placed on the exchange: the entry's order intent (see order_pipeline)
+    exchange_intent_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        UUID(as_uuid=True), nullable=True, unique=True
+    )
 
     bot: Mapped["Bot"] = relationship("Bot", back_populates="positions")
     trades: Mapped[list["Trade"]] = relationship("Trade", back_populates="position")
@@ -8,8 +8,11 @@ from pydantic import BaseModel, Field
 from sqlalchemy import desc, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..core.bot_events import publish_bot_event
+from ..core.config import config
 from ..core.database import get_db
 from ..core.scheduler import get_scheduler
+from ..core.tracing import get_cycle_tracer
 from ..middleware.auth import get_current_user
 from ..models.bot import Bot, BotStatus
 from ..models.equity_snapshot import EquitySnapshot
@@ -136,6 +139,13 @@ class EquityHistoryResponse(BaseModel):
     total_return_pct: float
 
 
+class CycleProfileResponse(BaseModel):
+    bot_id: str
+    cycles: list[dict[str, Any]]
+    histograms: dict[str, Any]
+    in_process: bool = True  # False when another process runs the bots
+
+
 async def get_bot_with_ownership(
     bot_id: str,
     user: User,
@@ -300,6 +310,8 @@ async def update_bot(
     updated_bot = await bot_service.update_bot(bot.id, update_data)
     if updated_bot is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to update bot")
+    if request.status is not None:
+        await publish_bot_event(bot.id, updated_bot.status)
     return bot_to_response(updated_bot)
 
 
@@ -312,6 +324,7 @@ async def delete_bot(
     bot = await get_bot_with_ownership(bot_id, current_user, db)
     bot_service = BotService(db)
     await bot_service.delete_bot(bot.id)
+    await publish_bot_event(bot.id, BotStatus.STOPPED)
     return MessageResponse(message="Bot deleted successfully")
 
 
@@ -328,8 +341,16 @@ async def start_bot(
 
     bot_service = BotService(db)
     await bot_service.update_bot(bot.id, BotUpdate(status=BotStatus.ACTIVE.value))
+    await publish_bot_event(bot.id, BotStatus.ACTIVE)
 
     scheduler = get_scheduler()
+    if config.SCHEDULER_MODE == "worker" or not scheduler.is_leader:
+        # Another process runs the bots: it starts this one on the event or its next sweep
+        return MessageResponse(
+            message="Bot activated - the scheduler will start its trading engine",
+            details={"bot_id": bot_id, "status": "active", "engine_running": False},
+        )
+
     success = await scheduler.start_bot(bot.id, db)
 
     if not success:
@@ -353,6 +374,7 @@ async def pause_bot(
     bot = await get_bot_with_ownership(bot_id, current_user, db)
     bot_service = BotService(db)
     await bot_service.update_bot(bot.id, BotUpdate(status=BotStatus.PAUSED.value))
+    await publish_bot_event(bot.id, BotStatus.PAUSED)
 
     return MessageResponse(
         message="Bot paused successfully",
@@ -372,6 +394,7 @@ async def stop_bot(
 
     bot_service = BotService(db)
     await bot_service.update_bot(bot.id, BotUpdate(status=BotStatus.STOPPED.value))
+    await publish_bot_event(bot.id, BotStatus.STOPPED)
 
     scheduler = get_scheduler()
     engine_stopped = await scheduler.stop_bot(bot.id)
@@ -503,3 +526,19 @@ async def get_bot_equity(
         initial_capital=initial_capital,
         total_return_pct=total_return_pct,
     )
+
+
+@router.get("/{bot_id}/cycle-profile", response_model=CycleProfileResponse)
+async def get_bot_cycle_profile(
+    bot_id: str,
+    limit: int = 10,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> CycleProfileResponse:
+    bot = await get_bot_with_ownership(bot_id, current_user, db)
+    if config.SCHEDULER_MODE == "worker" or not get_scheduler().is_leader:
+        # Traces live in memory in the process running the bot; read its TRACING_EXPORT_FILE instead
+        return CycleProfileResponse(bot_id=str(bot.id), cycles=[], histograms={}, in_process=False)
+
+    profile = get_cycle_tracer(bot.id).profile(limit=max(1, min(limit, 100)))
+    return CycleProfileResponse(bot_id=str(bot.id), **profile)
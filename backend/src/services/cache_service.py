@@ -6,7 +6,7 @@ from typing import Any, Optional
 from redis.asyncio import Redis
 
 from ..core.logger import get_logger
-from ..core.redis_client import get_redis
+from ..core.redis_client import WORKLOAD_CACHE, get_redis_for
 
 logger = get_logger(__name__)
 
@@ -45,7 +45,7 @@ class CacheService:
     async def _get_redis(self) -> Redis:
         """Get Redis client instance."""
         if self.redis_client is None:
-            self.redis_client = await get_redis()
+            self.redis_client = await get_redis_for(WORKLOAD_CACHE)
         return self.redis_client
 
     async def get_cached(self, key: str) -> Optional[Any]:
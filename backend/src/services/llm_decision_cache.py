@@ -0,0 +1,150 @@
+"""
+LLM Decision Cache - Reuses decisions while the market state is unchanged.
+
+The inputs of a multi-coin prompt are reduced to a quantized fingerprint
+(price buckets, indicator regimes, open position set). Two cycles that map to
+the same fingerprint would send the LLM an equivalent prompt, so the previous
+decisions are returned instead of paying for another call.
+"""
+
+import hashlib
+import json
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..core.config import config
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class CachedDecisions:
+    """Decisions stored for one market-state fingerprint."""
+
+    decisions: Dict[str, Any]
+    created_at: float  # monotonic seconds
+
+
+class LLMDecisionCache:
+    """Per-bot cache of LLM decisions keyed on a quantized market fingerprint."""
+
+    def __init__(
+        self,
+        price_tolerance_pct: Optional[float] = None,
+        max_age_seconds: Optional[float] = None,
+        rsi_bucket: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ) -> None:
+        self.price_tolerance_pct = price_tolerance_pct or config.LLM_DECISION_CACHE_PRICE_TOLERANCE_PCT
+        self.max_age_seconds = max_age_seconds or config.LLM_DECISION_CACHE_MAX_AGE_SECONDS
+        self.rsi_bucket = rsi_bucket or config.LLM_DECISION_CACHE_RSI_BUCKET
+        self.max_entries = max_entries or config.LLM_DECISION_CACHE_MAX_ENTRIES
+        self.enabled = config.LLM_DECISION_CACHE_ENABLED if enabled is None else enabled
+
+        self._entries: "OrderedDict[str, CachedDecisions]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Fingerprinting
+    # ------------------------------------------------------------------
+
+    def fingerprint(self, all_coins_data: Dict[str, Dict[str, Any]], positions: Iterable[Any]) -> str:
+        """Hash the quantized market state that drives the prompt."""
+        state = {
+            "coins": {
+                symbol: self._quantize_coin(data) for symbol, data in sorted(all_coins_data.items())
+            },
+            "positions": self._position_set(positions),
+        }
+        payload = json.dumps(state, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def _price_bucket(self, price: float) -> int:
+        """Log-scale bucket so the tolerance is relative to price."""
+        if price <= 0:
+            return 0
+        return math.floor(math.log(price) / math.log1p(self.price_tolerance_pct))
+
+    def _quantize_coin(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce one coin's data to price bucket and indicator regimes."""
+        regimes = {}
+        for timeframe, indicators in sorted(data.get("technical_indicators", {}).items()):
+            rsi = float(indicators.get("rsi14") or 50)
+            ema_fast = float(indicators.get("ema20") or 0)
+            ema_slow = float(indicators.get("ema50") or 0)
+            regimes[timeframe] = {
+                "rsi": int(rsi // self.rsi_bucket),
+                "ema": "up" if ema_fast > ema_slow else "down" if ema_fast < ema_slow else "flat",
+            }
+
+        return {
+            "price": self._price_bucket(float(data.get("current_price") or 0)),
+            "trend": data.get("trend", ""),
+            "regimes": regimes,
+        }
+
+    def _position_set(self, positions: Iterable[Any]) -> List[Tuple[str, str]]:
+        """Sorted (symbol, side) pairs for open positions (models or dicts)."""
+        result = []
+        for position in positions or []:
+            if isinstance(position, dict):
+                symbol, side = position.get("symbol", ""), position.get("side", "")
+            else:
+                symbol, side = getattr(position, "symbol", ""), getattr(position, "side", "")
+            result.append((str(symbol), str(getattr(side, "value", side) or "")))
+        return sorted(result)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Return cached decisions for a fingerprint if fresh enough."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(fingerprint)
+        if entry is not None and monotonic() - entry.created_at <= self.max_age_seconds:
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            logger.info(
+                f"Decision cache HIT ({fingerprint[:8]}, age {monotonic() - entry.created_at:.0f}s, "
+                f"hit rate {self.hit_rate * 100:.0f}%)"
+            )
+            return entry.decisions
+
+        if entry is not None:
+            del self._entries[fingerprint]
+        self.misses += 1
+        return None
+
+    def put(self, fingerprint: str, decisions: Dict[str, Any]) -> None:
+        """Store decisions for a fingerprint, evicting the oldest beyond max_entries."""
+        if not self.enabled or not decisions:
+            return
+        self._entries[fingerprint] = CachedDecisions(decisions=decisions, created_at=monotonic())
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for reporting."""
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "entries": len(self._entries),
+        }
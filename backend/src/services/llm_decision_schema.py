@@ -0,0 +1,205 @@
+"""
+LLM Decision Schema - One compiled validator for multi-coin decision responses.
+Replaces guess-and-default parsing with explicit errors that can drive a repair request.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from ..core.config import config
+from ..core.llm_client import LLMClient
+from ..core.logger import get_logger
+
+logger = get_logger(__name__)
+
+SIGNAL_ALIASES = {
+    "buy": "buy_to_enter",
+    "long": "buy_to_enter",
+    "sell": "sell_to_enter",
+    "short": "sell_to_enter",
+    "exit": "close",
+    "wait": "hold",
+    "no_trade": "hold",
+}
+
+
+class DecisionModel(BaseModel):
+    """Decision for one symbol, as described in the prompt's RESPONSE FORMAT."""
+
+    model_config = ConfigDict(extra="allow")
+
+    signal: Literal["hold", "buy_to_enter", "sell_to_enter", "close"]
+    confidence: float = Field(ge=0, le=1)
+    justification: str = ""
+    entry_price: Optional[float] = Field(default=None, ge=0)
+    stop_loss: Optional[float] = Field(default=None, ge=0)
+    take_profit: Optional[float] = Field(default=None, ge=0)
+    leverage: Optional[float] = Field(default=None, ge=1)
+    quantity: Optional[float] = Field(default=None, ge=0)
+    invalidation_condition: Optional[str] = None
+
+    @field_validator("signal", mode="before")
+    @classmethod
+    def _normalize_signal(cls, value: Any) -> Any:
+        if isinstance(value, str):
+            value = value.strip().lower()
+            return SIGNAL_ALIASES.get(value, value)
+        return value
+
+    @field_validator("confidence", mode="before")
+    @classmethod
+    def _normalize_confidence(cls, value: Any) -> Any:
+        # Percentages (75) are a common, unambiguous slip
+        if isinstance(value, (int, float)) and 1 < value <= 100:
+            return value / 100
+        return value
+
+
+def extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Outermost JSON object in a response (tolerates code fences and leading prose)."""
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        parsed = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+@dataclass
+class DecisionValidation:
+    """Valid decisions per symbol plus the errors found."""
+
+    decisions: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+    repaired: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    @property
+    def cacheable(self) -> bool:
+        """Only a response that validated as sent may be reused by later cycles."""
+        return self.ok and not self.repaired
+
+
+def validate_decisions(text: str, symbols: List[str]) -> DecisionValidation:
+    """Parse and validate a response; invalid or missing symbols are reported as errors."""
+    result = DecisionValidation()
+    payload = extract_json_object(text)
+    if payload is None:
+        result.errors.append("response is not a JSON object")
+        return result
+
+    if isinstance(payload.get("decisions"), dict):
+        payload = payload["decisions"]
+
+    for symbol in symbols:
+        raw = payload.get(symbol)
+        if raw is None:
+            result.errors.append(f"{symbol}: missing")
+            continue
+        try:
+            result.decisions[symbol] = DecisionModel.model_validate(raw).model_dump(exclude_none=True)
+        except ValidationError as e:
+            for err in e.errors():
+                location = ".".join(str(part) for part in err["loc"]) or "decision"
+                result.errors.append(f"{symbol}.{location}: {err['msg']}")
+    return result
+
+
+def build_repair_prompt(response_text: str, errors: List[str], symbols: List[str]) -> str:
+    """Targeted follow-up asking the model to fix only what failed validation."""
+    return "\n".join([
+        "Your previous trading decision response failed validation.",
+        "",
+        "Errors:",
+        *[f"- {error}" for error in errors[:20]],
+        "",
+        "Previous response:",
+        response_text[-4000:],
+        "",
+        f"Return ONLY a corrected JSON object with one entry for each of: {', '.join(symbols)}.",
+        "Each entry needs `signal` (hold, buy_to_enter, sell_to_enter or close) and",
+        "`confidence` (a decimal between 0 and 1). Keep your original decisions where valid.",
+    ])
+
+
+class DecisionParseMetrics:
+    """Counts responses, validation failures and repair outcomes."""
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.failures = 0
+        self.repairs = 0
+        self.repaired = 0
+
+    def record(self, validation: DecisionValidation, repair: bool = False) -> None:
+        if repair:
+            self.repairs += 1
+            self.repaired += int(validation.ok)
+            return
+        self.responses += 1
+        if not validation.ok:
+            self.failures += 1
+            logger.warning(f"LLM decision validation failed: {'; '.join(validation.errors[:5])}")
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.responses if self.responses else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "responses": self.responses,
+            "failures": self.failures,
+            "failure_rate": round(self.failure_rate, 3),
+            "repairs": self.repairs,
+            "repair_success_rate": round(self.repaired / self.repairs, 3) if self.repairs else 0.0,
+        }
+
+
+_parse_metrics = DecisionParseMetrics()
+
+
+def get_parse_metrics() -> DecisionParseMetrics:
+    """Process-wide decision parse metrics."""
+    return _parse_metrics
+
+
+async def validate_with_repair(
+    llm_client: LLMClient,
+    model: str,
+    response_text: str,
+    symbols: List[str],
+    max_tokens: int = 2048,
+) -> DecisionValidation:
+    """Validate a response; on failure send one repair request and merge its fixes."""
+    validation = validate_decisions(response_text, symbols)
+    _parse_metrics.record(validation)
+    if validation.ok or not config.LLM_REPAIR_ON_INVALID:
+        return validation
+
+    try:
+        repair = await llm_client.analyze_market(
+            model=model,
+            prompt=build_repair_prompt(response_text, validation.errors, symbols),
+            max_tokens=max_tokens,
+            temperature=0.0,
+            json_mode=True,
+        )
+    except Exception as e:
+        logger.warning(f"LLM repair request failed: {e}")
+        return validation
+
+    repaired = validate_decisions(repair.get("response", ""), symbols)
+    _parse_metrics.record(repaired, repair=True)
+    return DecisionValidation(
+        decisions={**validation.decisions, **repaired.decisions},
+        errors=repaired.errors,
+        repaired=True,
+    )
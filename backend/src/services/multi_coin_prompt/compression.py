@@ -0,0 +1,128 @@
+"""
+Prompt Compression - Shape-preserving summaries of price history for prompts.
+"""
+
+import math
+from dataclasses import dataclass
+from statistics import fmean, pstdev
+from typing import List, Optional, Sequence, Tuple
+
+from ...core.config import config
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for budgeting (same heuristic as the rate limiter)."""
+    return math.ceil(len(text) / config.LLM_CHARS_PER_TOKEN)
+
+
+def round_sig(value: float, digits: int) -> float:
+    """Round to a number of significant digits (64213.57 -> 64210 at 4 digits)."""
+    if value == 0 or not math.isfinite(value):
+        return value
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def format_sig(value: float, digits: int) -> str:
+    """Shortest text for a value rounded to significant digits."""
+    rounded = round_sig(value, digits)
+    return f"{rounded:.{digits}g}" if abs(rounded) < 10**digits else f"{rounded:.0f}"
+
+
+def lttb(series: Sequence[float], threshold: int) -> List[Tuple[int, float]]:
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, per bucket, the point forming the largest
+    triangle with its neighbours, so peaks and troughs survive the reduction.
+    """
+    n = len(series)
+    if threshold >= n or threshold < 3:
+        return list(enumerate(series))
+
+    sampled = [(0, series[0])]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        start = int(math.floor(i * bucket_size)) + 1
+        end = min(int(math.floor((i + 1) * bucket_size)) + 1, n - 1)
+
+        next_start = end
+        next_end = min(int(math.floor((i + 2) * bucket_size)) + 1, n)
+        next_points = series[next_start:next_end] or [series[-1]]
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = fmean(next_points)
+
+        ax, ay = a, series[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (series[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append((best, series[best]))
+        a = best
+
+    sampled.append((n - 1, series[-1]))
+    return sampled
+
+
+@dataclass(frozen=True)
+class CompressedSeries:
+    """Prompt lines for one symbol's history and their estimated size."""
+
+    lines: List[str]
+    tokens: int
+
+
+class PromptCompressor:
+    """Turns a raw close-price series into a budgeted summary for the prompt."""
+
+    MIN_POINTS = 6
+
+    def __init__(
+        self,
+        token_budget: Optional[int] = None,
+        significant_digits: Optional[int] = None,
+    ) -> None:
+        self.token_budget = token_budget or config.PROMPT_TOKEN_BUDGET_PER_SYMBOL
+        self.significant_digits = significant_digits or config.PROMPT_SIGNIFICANT_DIGITS
+
+    def compress(self, series: Sequence[float], timeframe: str = "1h") -> Optional[CompressedSeries]:
+        """Summary statistics and an LTTB sketch that fit the per-symbol budget."""
+        if len(series) < 2:
+            return None
+
+        stats_line = self._stats_line(series, timeframe)
+        remaining = self.token_budget - estimate_tokens(stats_line)
+
+        # Shrink the sketch until it fits what the stats line left of the budget
+        points = min(len(series), max(self.MIN_POINTS, remaining))
+        sketch_line = self._sketch_line(series, points, timeframe)
+        while points > self.MIN_POINTS and estimate_tokens(sketch_line) > remaining:
+            points = max(self.MIN_POINTS, int(points * 0.8))
+            sketch_line = self._sketch_line(series, points, timeframe)
+
+        lines = [stats_line, sketch_line]
+        return CompressedSeries(lines=lines, tokens=estimate_tokens("\n".join(lines)))
+
+    def _stats_line(self, series: Sequence[float], timeframe: str) -> str:
+        digits = self.significant_digits
+        returns = [
+            (b - a) / a for a, b in zip(series, series[1:]) if a
+        ]
+        change = (series[-1] - series[0]) / series[0] * 100 if series[0] else 0.0
+        volatility = pstdev(returns) * 100 if len(returns) > 1 else 0.0
+        return (
+            f"- **History** ({len(series)}x{timeframe}): "
+            f"lo {format_sig(min(series), digits)} hi {format_sig(max(series), digits)} "
+            f"mean {format_sig(fmean(series), digits)} chg {change:+.1f}% vol {volatility:.2f}%/bar"
+        )
+
+    def _sketch_line(self, series: Sequence[float], points: int, timeframe: str) -> str:
+        digits = self.significant_digits
+        sampled = lttb(series, points)
+        last = len(series) - 1
+        body = " ".join(
+            f"{format_sig(price, digits)}@-{last - index}" if index != last else format_sig(price, digits)
+            for index, price in sampled
+        )
+        return f"- **Shape** (oldest->now, @-N = {timeframe} bars ago): {body}"
@@ -5,7 +5,12 @@ Market Data Formatter - Formats market data for prompt generation.
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+from ...core.config import config
+from ...core.logger import get_logger
 from ..fvg_detector_service import get_fvg_detector
+from .compression import PromptCompressor, estimate_tokens
+
+logger = get_logger(__name__)
 
 
 class MarketDataFormatter:
@@ -23,10 +28,12 @@ class MarketDataFormatter:
         """Initialize MarketDataFormatter."""
         self.coin_mapping = self.COIN_MAPPING
         self.fvg_detector = get_fvg_detector()
+        self.compressor = PromptCompressor()
 
     def format_market_data(self, symbols: List[str], all_coins_data: dict[str, dict[str, Any]]) -> str:
         """Format all market data into dashboard text."""
         lines = []
+        history_at: set[int] = set()  # Indexes of price-history lines
         for symbol in symbols:
             if symbol not in all_coins_data:
                 continue
@@ -45,10 +52,26 @@ class MarketDataFormatter:
                 f"- **Open Interest**: {oi:,.0f}",
                 f"- **RSI(14)**: {tech_1h.get('rsi14', 50):.1f} | **EMA20**: ${tech_1h.get('ema20', 0):,.2f} | **EMA50**: ${tech_1h.get('ema50', 0):,.2f}",
                 f"- **Vol Ratio**: {self._calc_volume_ratio(data):.2f}x average",
-                "",
             ])
 
-        return "\n".join(lines)
+            if config.PROMPT_COMPRESSION_ENABLED:
+                history = self.compressor.compress(
+                    data.get("price_series", []), data.get("timeframe", "1h")
+                )
+                if history:
+                    history_at.update(range(len(lines), len(lines) + len(history.lines)))
+                    lines.extend(history.lines)
+            lines.append("")
+
+        dashboard = "\n".join(lines)
+        if history_at:
+            # Real dashboard size without and with the sketches (they add context, and tokens)
+            plain = "\n".join(line for i, line in enumerate(lines) if i not in history_at)
+            logger.info(
+                f"Price history sketches: dashboard {estimate_tokens(plain)} -> {estimate_tokens(dashboard)} tokens "
+                f"for {len(symbols)} symbols"
+            )
+        return dashboard
 
     def format_fvg_analysis(self, symbols: List[str], all_coins_data: dict[str, dict[str, Any]]) -> str:
         """Format Fair Value Gap analysis for all symbols."""
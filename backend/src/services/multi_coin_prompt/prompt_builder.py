@@ -1,13 +1,41 @@
 """
 Prompt Builder - Generates multi-coin trading prompts with market context.
+
+Prompts are laid out as a byte-stable static prefix (strategy rules, decision
+framework, response format) followed by the live market data, so providers
+with prompt caching can reuse the prefix across cycles.
 """
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..market_sentiment_service import MarketSentiment
 
 
+@dataclass(frozen=True)
+class PromptParts:
+    """A prompt split into a cacheable static prefix and a per-cycle suffix.
+
+    The suffix is itself split into the market section, which is shared by every
+    bot trading the same symbols, and the bot-specific portfolio section.
+    """
+
+    static_prefix: str
+    market_section: str
+    portfolio_section: str
+
+    @property
+    def dynamic_suffix(self) -> str:
+        """Everything after the static prefix."""
+        return self.market_section + self.portfolio_section
+
+    @property
+    def prompt(self) -> str:
+        """Full prompt text sent to the LLM."""
+        return self.static_prefix + self.dynamic_suffix
+
+
 class PromptBuilder:
     """Builds comprehensive multi-coin trading prompts."""
 
@@ -22,6 +50,7 @@ class PromptBuilder:
     def __init__(self) -> None:
         """Initialize PromptBuilder."""
         self.coin_mapping = self.COIN_MAPPING
+        self._prefix_cache: Dict[Tuple[str, ...], str] = {}
 
     def build_prompt(
         self,
@@ -36,6 +65,74 @@ class PromptBuilder:
         sentiment: Optional[MarketSentiment] = None,
     ) -> str:
         """Build complete prompt from pre-formatted sections."""
+        return self.build_prompt_parts(
+            symbols=symbols,
+            market_data_formatted=market_data_formatted,
+            news_analysis=news_analysis,
+            pain_trades_analysis=pain_trades_analysis,
+            alpha_setups_analysis=alpha_setups_analysis,
+            fvg_analysis=fvg_analysis,
+            portfolio_state=portfolio_state,
+            positions_text=positions_text,
+            sentiment=sentiment,
+        ).prompt
+
+    def build_prompt_parts(
+        self,
+        symbols: List[str],
+        market_data_formatted: str,
+        news_analysis: str,
+        pain_trades_analysis: str,
+        alpha_setups_analysis: str,
+        fvg_analysis: str,
+        portfolio_state: Optional[Dict[str, Any]],
+        positions_text: str,
+        sentiment: Optional[MarketSentiment] = None,
+    ) -> PromptParts:
+        """Build the prompt as a static prefix plus the live market suffix."""
+        return PromptParts(
+            static_prefix=self.build_static_prefix(symbols),
+            market_section=self._build_market_section(
+                market_data_formatted=market_data_formatted,
+                news_analysis=news_analysis,
+                pain_trades_analysis=pain_trades_analysis,
+                alpha_setups_analysis=alpha_setups_analysis,
+                fvg_analysis=fvg_analysis,
+                sentiment=sentiment,
+            ),
+            portfolio_section=self.build_portfolio_section(
+                symbols=symbols,
+                portfolio_state=portfolio_state,
+                positions_text=positions_text,
+            ),
+        )
+
+    def build_static_prefix(self, symbols: List[str]) -> str:
+        """Rules, decision framework and response format; identical every cycle.
+
+        Contains no timestamps or live values so the bytes only change when
+        the symbol list does. Built once per symbol list.
+        """
+        key = tuple(symbols)
+        if key not in self._prefix_cache:
+            lines: List[str] = []
+            lines.extend(self._get_entry_criteria_text())
+            lines.extend(self._get_decision_framework_text())
+            lines.extend(self._get_response_format_text(symbols))
+            lines.extend(["", ""])
+            self._prefix_cache[key] = "\n".join(lines)
+        return self._prefix_cache[key]
+
+    def _build_market_section(
+        self,
+        market_data_formatted: str,
+        news_analysis: str,
+        pain_trades_analysis: str,
+        alpha_setups_analysis: str,
+        fvg_analysis: str,
+        sentiment: Optional[MarketSentiment] = None,
+    ) -> str:
+        """Live market state for this cycle, identical for every bot on these symbols."""
         now = datetime.utcnow()
         lines = [
             "# CURRENT STATE OF MARKETS",
@@ -67,6 +164,20 @@ class PromptBuilder:
         lines.append(fvg_analysis)
         lines.append("")
 
+        # Sentiment-dependent bias
+        lines.extend(self._get_directional_bias_text(sentiment))
+
+        return "\n".join(lines) + "\n"
+
+    def build_portfolio_section(
+        self,
+        symbols: List[str],
+        portfolio_state: Optional[Dict[str, Any]],
+        positions_text: str,
+    ) -> str:
+        """Bot-specific portfolio state and open positions."""
+        lines: List[str] = []
+
         # Section 5: Portfolio State
         lines.extend(["## 5. CURRENT PORTFOLIO STATE", ""])
         if portfolio_state:
@@ -84,16 +195,17 @@ class PromptBuilder:
         lines.append(positions_text)
         lines.append("")
 
-        # Directional Strategy, Decision Framework, Response Format
-        lines.extend(self._get_directional_bias_text(sentiment))
-        lines.extend(self._get_decision_framework_text())
-        lines.extend(self._get_response_format_text(symbols))
+        # Point back at the static rules
+        lines.append(
+            f"Apply the DECISION FRAMEWORK and RESPONSE FORMAT above to ALL "
+            f"{len(symbols)} symbols: {', '.join(symbols)}"
+        )
 
         return "\n".join(lines)
 
     def _get_directional_bias_text(self, sentiment: Optional[MarketSentiment]) -> List[str]:
         """Generate directional trading bias section based on sentiment."""
-        lines = ["## DIRECTIONAL TRADING STRATEGY", ""]
+        lines = ["## CURRENT DIRECTIONAL BIAS", ""]
 
         if sentiment and hasattr(sentiment, "fear_greed_value"):
             fg = sentiment.fear_greed_value
@@ -138,7 +250,13 @@ class PromptBuilder:
         else:
             lines.append("### Directional Bias: NEUTRAL (no sentiment data)")
 
-        lines.extend([
+        lines.append("")
+        return lines
+
+    def _get_entry_criteria_text(self) -> List[str]:
+        """Generate the static long/short entry criteria section."""
+        return [
+            "## DIRECTIONAL TRADING STRATEGY",
             "",
             "### SHORT Entry Criteria (sell_to_enter):",
             "- RSI(14) > 55 on 1H timeframe (lower threshold in Fear)",
@@ -157,8 +275,7 @@ class PromptBuilder:
             "**In Fear markets, SHORT trades are the PROFITABLE ones.**",
             "**Going LONG in a falling market = LOSING MONEY.**",
             "",
-        ])
-        return lines
+        ]
 
     def _get_decision_framework_text(self) -> List[str]:
         """Generate the decision framework section."""
@@ -112,8 +112,8 @@ class MultiCoinPromptService:
         fvg_analysis = self.market_formatter.format_fvg_analysis(symbols, all_coins_data)
         positions_text = self.market_formatter.format_positions(all_positions)
 
-        # Build complete prompt
-        prompt = self.prompt_builder.build_prompt(
+        # Build complete prompt (static prefix + live suffix)
+        prompt_parts = self.prompt_builder.build_prompt_parts(
             symbols=symbols,
             market_data_formatted=market_data_formatted,
             news_analysis=news_analysis,
@@ -126,7 +126,10 @@ class MultiCoinPromptService:
         )
 
         return {
-            "prompt": prompt,
+            "prompt": prompt_parts.prompt,
+            "static_prefix": prompt_parts.static_prefix,
+            "market_section": prompt_parts.market_section,
+            "portfolio_section": prompt_parts.portfolio_section,
             "timestamp": datetime.utcnow().isoformat(),
             "symbols_count": len(symbols),
             "positions_count": len(all_positions),
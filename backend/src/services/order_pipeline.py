@@ -0,0 +1,451 @@
+"""Live order pipeline: idempotent submission and concurrent protection orders.
+
+Every order gets a deterministic client order id derived from the trade intent
+(the position being opened or closed) and the order's role. A retry after a
+timeout therefore reuses the same id. The pipeline looks the order up by that
+id before submitting again, and a duplicate-id rejection (the earlier attempt
+got through but was not visible yet) resolves to the existing order. Nothing
+can double-fill. Entries that have not filled by the deadline are cancelled;
+only what actually filled is protected and recorded.
+
+Stop-loss and take-profit orders are attached to the entry where the exchange
+supports it (OKX ``attachAlgoOrds``, each leg under its own client id), so the
+position is protected as soon as the entry is acknowledged. Otherwise they are submitted together, as soon as
+the entry fills. Orders are tracked in memory through a small state machine
+that is reconciled against what the exchange reports. There is one pipeline
+per exchange client (``get_order_pipeline``), so orders stay tracked across
+database sessions and cycles; the scheduler reconciles them periodically
+(``reconcile_pipelines``). The time from entry submission to protection is
+measured for every entry.
+"""
+
+import asyncio
+import enum
+import uuid
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Dict, List, Optional
+
+from ..core.config import config
+from ..core.exchange_client import ExchangeClient
+from ..core.logger import get_logger
+from ..core.tracing import span
+
+logger = get_logger(__name__)
+
+FILL_POLL_SECONDS = 0.2
+
+
+class OrderRole(str, enum.Enum):
+    ENTRY = "e"
+    STOP_LOSS = "s"
+    TAKE_PROFIT = "t"
+    EXIT = "x"
+
+
+class OrderState(str, enum.Enum):
+    PENDING = "pending"  # Created locally, not acknowledged yet
+    UNKNOWN = "unknown"  # Submission timed out; the exchange may or may not have it
+    OPEN = "open"
+    PARTIALLY_FILLED = "partially_filled"
+    FILLED = "filled"
+    CANCELED = "canceled"
+    REJECTED = "rejected"
+
+
+TERMINAL_STATES = {OrderState.FILLED, OrderState.CANCELED, OrderState.REJECTED}
+
+_TRANSITIONS: Dict[OrderState, set[OrderState]] = {
+    OrderState.PENDING: {OrderState.UNKNOWN, OrderState.OPEN, OrderState.PARTIALLY_FILLED, *TERMINAL_STATES},
+    OrderState.UNKNOWN: {OrderState.PENDING, OrderState.OPEN, OrderState.PARTIALLY_FILLED, *TERMINAL_STATES},
+    OrderState.OPEN: {OrderState.PARTIALLY_FILLED, *TERMINAL_STATES},
+    OrderState.PARTIALLY_FILLED: {OrderState.PARTIALLY_FILLED, OrderState.FILLED, OrderState.CANCELED},
+}
+
+# ccxt unified order status -> state (partial fills are told apart by ``filled``)
+_EXCHANGE_STATUS = {
+    "open": OrderState.OPEN,
+    "closed": OrderState.FILLED,
+    "canceled": OrderState.CANCELED,
+    "cancelled": OrderState.CANCELED,
+    "expired": OrderState.CANCELED,
+    "rejected": OrderState.REJECTED,
+}
+
+
+def client_order_id(intent_id: uuid.UUID, role: OrderRole) -> str:
+    """Deterministic exchange client id for one order of a trade intent (OKX allows 32 alphanumerics)."""
+    return f"{role.value}{intent_id.hex[:31]}"
+
+
+def entry_intent_id(bot_id: uuid.UUID, symbol: str, side: str, candle: float) -> uuid.UUID:
+    """Intent of a bot's entry on one candle: the same decision retried maps to the same orders."""
+    return uuid.uuid5(bot_id, f"entry:{symbol}:{side}:{int(candle)}")
+
+
+def exit_intent_id(position_id: uuid.UUID, quantity: Any) -> uuid.UUID:
+    """Intent of closing what is left of a position: a retry maps to the same order, a remainder to a new one."""
+    return uuid.uuid5(position_id, f"exit:{quantity}")
+
+
+@dataclass
+class TrackedOrder:
+    """Local view of one exchange order."""
+
+    client_order_id: str
+    role: OrderRole
+    symbol: str
+    side: str
+    amount: float
+    trigger_price: Optional[float] = None
+    state: OrderState = OrderState.PENDING
+    exchange_id: Optional[str] = None
+    filled: float = 0.0
+    average: Optional[float] = None
+    fee: float = 0.0
+    attempts: int = 0
+
+    @property
+    def is_trigger(self) -> bool:
+        return self.role in (OrderRole.STOP_LOSS, OrderRole.TAKE_PROFIT)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+    def transition(self, state: OrderState) -> None:
+        if state == self.state:
+            return
+        if state not in _TRANSITIONS.get(self.state, set()):
+            raise ValueError(f"Order {self.client_order_id}: invalid transition {self.state.value} -> {state.value}")
+        self.state = state
+
+    def apply(self, order: Dict[str, Any]) -> None:
+        """Update from an exchange order (ccxt unified format)."""
+        self.exchange_id = order.get("id") or self.exchange_id
+        self.filled = float(order.get("filled") or self.filled)
+        self.average = float(order["average"]) if order.get("average") else self.average
+        self.fee = float((order.get("fee") or {}).get("cost") or self.fee)
+        state = _EXCHANGE_STATUS.get(str(order.get("status", "open")).lower(), OrderState.OPEN)
+        if state == OrderState.OPEN and self.filled > 0:
+            state = OrderState.PARTIALLY_FILLED
+        # Attached and trigger orders are acknowledged as "open" until they fire
+        if not (self.is_terminal and state == OrderState.OPEN):
+            self.transition(state)
+
+
+@dataclass
+class ProtectedEntry:
+    """An entry and its protection orders; ``protected_after`` is None if protection failed."""
+
+    entry: TrackedOrder
+    stop_loss: TrackedOrder
+    take_profit: TrackedOrder
+    attached: bool
+    protected_after: Optional[float] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def is_protected(self) -> bool:
+        return self.protected_after is not None
+
+
+class OrderPipeline:
+    """Submits live orders idempotently and keeps their state current."""
+
+    def __init__(
+        self,
+        exchange: ExchangeClient,
+        attach_protection: Optional[bool] = None,
+        submit_timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> None:
+        self.exchange = exchange
+        self.attach_protection = (
+            config.ORDER_ATTACHED_PROTECTION if attach_protection is None else attach_protection
+        )
+        self.submit_timeout = submit_timeout or config.ORDER_SUBMIT_TIMEOUT_SECONDS
+        self.retries = retries or config.ORDER_SUBMIT_RETRIES
+        self.orders: Dict[str, TrackedOrder] = {}
+
+    def track(
+        self,
+        intent_id: uuid.UUID,
+        role: OrderRole,
+        symbol: str,
+        side: str,
+        amount: float,
+        trigger_price: Optional[float] = None,
+    ) -> TrackedOrder:
+        """The tracked order for this intent and role, created on first use."""
+        cid = client_order_id(intent_id, role)
+        if cid not in self.orders:
+            self.orders[cid] = TrackedOrder(cid, role, symbol, side, amount, trigger_price)
+        return self.orders[cid]
+
+    async def open_protected(
+        self,
+        intent_id: uuid.UUID,
+        symbol: str,
+        side: str,
+        amount: float,
+        stop_loss: float,
+        take_profit: float,
+    ) -> ProtectedEntry:
+        """Market entry with stop-loss and take-profit; entry failures raise, protection failures are reported."""
+        exit_side = "sell" if side == "buy" else "buy"
+        entry = self.track(intent_id, OrderRole.ENTRY, symbol, side, amount)
+        stop = self.track(intent_id, OrderRole.STOP_LOSS, symbol, exit_side, amount, stop_loss)
+        target = self.track(intent_id, OrderRole.TAKE_PROFIT, symbol, exit_side, amount, take_profit)
+        result = ProtectedEntry(entry, stop, target, attached=self.attach_protection)
+
+        start = monotonic()
+        with span("order.entry", symbol=symbol, attached=self.attach_protection) as entry_span:
+            if self.attach_protection:
+                await self.submit(entry, params=self._attached_protection(stop, target))
+            else:
+                await self.submit(entry)
+            await self._await_fill(entry)
+            self._raise_if_rejected(entry)
+            if not entry.is_terminal:
+                # Never leave an unfilled market order working: whatever filled before the cancel is kept
+                await self._cancel_unfilled(entry)
+
+            if entry.filled <= 0:
+                result.errors.append(f"Entry {entry.client_order_id} not filled ({entry.state.value})")
+                # Never submitted: nothing to reconcile
+                for order in (stop, target):
+                    self.orders.pop(order.client_order_id, None)
+            elif self.attach_protection:
+                # Attached orders go live with the fill, under their own client ids
+                for order in (stop, target):
+                    order.amount = entry.filled
+                    order.transition(OrderState.OPEN)
+                result.protected_after = monotonic() - start
+            else:
+                for order in (stop, target):
+                    order.amount = entry.filled
+                outcomes = await asyncio.gather(self.submit(stop), self.submit(target), return_exceptions=True)
+                result.errors = [str(o) for o in outcomes if isinstance(o, Exception)]
+                if not result.errors:
+                    result.protected_after = monotonic() - start
+
+            if entry_span is not None and result.protected_after is not None:
+                entry_span.attributes["entry_to_protected_seconds"] = round(result.protected_after, 4)
+
+        if result.is_protected:
+            logger.info(f"{symbol} entry protected after {result.protected_after * 1000:.0f}ms")
+        elif entry.filled <= 0:
+            logger.warning(f"{symbol} entry not filled: {'; '.join(result.errors)}")
+        else:
+            logger.error(f"{symbol} entry is NOT protected: {'; '.join(result.errors)}")
+        return result
+
+    async def close(
+        self,
+        intent_id: uuid.UUID,
+        symbol: str,
+        side: str,
+        amount: float,
+        entry_intent: Optional[uuid.UUID] = None,
+    ) -> TrackedOrder:
+        """Market exit for a position; ``intent_id`` comes from :func:`exit_intent_id`.
+
+        Waits for the fill like an entry; an exit still working at the deadline
+        is cancelled, and one that filled nothing raises ``ConnectionError`` so
+        the position stays open. With ``entry_intent`` the entry's resting
+        stop-loss and take-profit orders are cancelled once the exit has fully
+        filled; after a partial fill they keep protecting the remainder.
+        """
+        order = self.track(intent_id, OrderRole.EXIT, symbol, side, amount)
+        await self.submit(order)
+        await self._await_fill(order)
+        self._raise_if_rejected(order)
+        if not order.is_terminal:
+            await self._cancel_unfilled(order)
+
+        if order.filled <= 0:
+            # Nothing was sold: forget the attempt so the next close submits again
+            self.orders.pop(order.client_order_id, None)
+            raise ConnectionError(f"Exit {order.client_order_id} not filled ({order.state.value})")
+        if entry_intent is not None and order.state == OrderState.FILLED:
+            await self.cancel_protection(entry_intent, symbol)
+        return order
+
+    async def cancel_protection(self, entry_intent: uuid.UUID, symbol: str) -> None:
+        """Cancel an entry's stop-loss and take-profit trigger orders; ones already gone are skipped."""
+        cids = [client_order_id(entry_intent, role) for role in (OrderRole.STOP_LOSS, OrderRole.TAKE_PROFIT)]
+        outcomes = await asyncio.gather(
+            *(self.exchange.cancel_order_by_client_id(symbol, cid, trigger=True) for cid in cids),
+            return_exceptions=True,
+        )
+        for cid, outcome in zip(cids, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Could not cancel protection order {cid}: {outcome}")
+            elif cid in self.orders and not self.orders[cid].is_terminal:
+                self.orders[cid].transition(OrderState.CANCELED)
+
+    async def submit(self, order: TrackedOrder, params: Optional[Dict[str, Any]] = None) -> TrackedOrder:
+        """Submit ``order`` once, retrying safely after timeouts and network errors."""
+        last_error: Optional[Exception] = None
+        while order.state in (OrderState.PENDING, OrderState.UNKNOWN) and order.attempts < self.retries:
+            if order.state == OrderState.UNKNOWN:
+                # The previous attempt may have reached the exchange: never submit it twice
+                existing = await self._lookup(order)
+                if existing is not None:
+                    order.apply(existing)
+                    break
+                order.transition(OrderState.PENDING)
+
+            order.attempts += 1
+            try:
+                ack = await asyncio.wait_for(self._create(order, params), timeout=self.submit_timeout)
+                order.apply(ack)
+            except Exception as e:
+                if self._is_duplicate(e):
+                    # An earlier attempt got through but was not visible yet: find it, never resubmit it
+                    existing = await self._await_visible(order)
+                    if existing is not None:
+                        order.apply(existing)
+                        break
+                    last_error = e
+                    order.transition(OrderState.UNKNOWN)
+                    break
+                if self._is_rejection(e):
+                    order.transition(OrderState.REJECTED)
+                    raise
+                last_error = e
+                logger.warning(
+                    f"Order {order.client_order_id} attempt {order.attempts} failed ({type(e).__name__}), "
+                    "checking the exchange before retrying"
+                )
+                order.transition(OrderState.UNKNOWN)
+
+        if order.state in (OrderState.PENDING, OrderState.UNKNOWN):
+            raise ConnectionError(
+                f"Order {order.client_order_id} unconfirmed after {order.attempts} attempts: {last_error}"
+            )
+        return order
+
+    async def reconcile(self) -> List[TrackedOrder]:
+        """Refresh every non-terminal order from the exchange; returns those that changed state."""
+        changed = []
+        pending = [o for o in self.orders.values() if not o.is_terminal and o.state != OrderState.PENDING]
+        for order, found in zip(pending, await asyncio.gather(*(self._lookup(o) for o in pending))):
+            if found is None:
+                continue
+            before = order.state
+            order.apply(found)
+            if order.state != before:
+                changed.append(order)
+        return changed
+
+    def forget_terminal(self) -> None:
+        """Drop finished orders from memory."""
+        self.orders = {cid: o for cid, o in self.orders.items() if not o.is_terminal}
+
+    async def _await_fill(self, order: TrackedOrder) -> None:
+        """Poll an acknowledged market order until it fills (exchanges often ack before the fill)."""
+        deadline = monotonic() + self.submit_timeout
+        while order.state in (OrderState.OPEN, OrderState.PARTIALLY_FILLED) and monotonic() < deadline:
+            await asyncio.sleep(FILL_POLL_SECONDS)
+            found = await self._lookup(order)
+            if found is not None:
+                order.apply(found)
+
+    async def _await_visible(self, order: TrackedOrder) -> Optional[Dict[str, Any]]:
+        """Poll for an order the exchange already has under this client id."""
+        deadline = monotonic() + self.submit_timeout
+        while True:
+            found = await self._lookup(order)
+            if found is not None or monotonic() >= deadline:
+                return found
+            await asyncio.sleep(FILL_POLL_SECONDS)
+
+    async def _cancel_unfilled(self, order: TrackedOrder) -> None:
+        try:
+            await self.exchange.cancel_order_by_client_id(order.symbol, order.client_order_id)
+        except Exception as e:
+            logger.error(f"Could not cancel unfilled order {order.client_order_id}: {e}")
+        # The final state tells what filled before the cancel landed
+        found = await self._lookup(order)
+        if found is not None:
+            order.apply(found)
+
+    @staticmethod
+    def _attached_protection(stop: TrackedOrder, target: TrackedOrder) -> Dict[str, Any]:
+        """OKX entry params attaching ``stop`` and ``target`` as market-price algo orders under their client ids."""
+        return {"attachAlgoOrds": [
+            {"attachAlgoClOrdId": stop.client_order_id, "slTriggerPx": str(stop.trigger_price), "slOrdPx": "-1"},
+            {"attachAlgoClOrdId": target.client_order_id, "tpTriggerPx": str(target.trigger_price), "tpOrdPx": "-1"},
+        ]}
+
+    @staticmethod
+    def _raise_if_rejected(order: TrackedOrder) -> None:
+        if order.state == OrderState.REJECTED:
+            raise ValueError(f"Order {order.client_order_id} rejected by the exchange")
+
+    async def _create(self, order: TrackedOrder, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        if order.role == OrderRole.STOP_LOSS:
+            return await self.exchange.create_stop_loss_order(
+                order.symbol, order.side, order.amount, order.trigger_price, client_order_id=order.client_order_id
+            )
+        if order.role == OrderRole.TAKE_PROFIT:
+            return await self.exchange.create_take_profit_order(
+                order.symbol, order.side, order.amount, order.trigger_price, client_order_id=order.client_order_id
+            )
+        return await self.exchange.create_order(
+            symbol=order.symbol,
+            side=order.side,
+            amount=order.amount,
+            order_type="market",
+            client_order_id=order.client_order_id,
+            params=params,
+        )
+
+    async def _lookup(self, order: TrackedOrder) -> Optional[Dict[str, Any]]:
+        try:
+            return await self.exchange.fetch_order_by_client_id(
+                order.symbol, order.client_order_id, trigger=order.is_trigger
+            )
+        except Exception as e:
+            logger.warning(f"Could not look up order {order.client_order_id}: {e}")
+            return None
+
+    @staticmethod
+    def _is_duplicate(error: Exception) -> bool:
+        """The client id is already taken (OKX 51016), i.e. an earlier attempt reached the exchange."""
+        message = str(error).lower()
+        return type(error).__name__ == "DuplicateOrderId" or "51016" in message or "duplicated clordid" in message
+
+    @staticmethod
+    def _is_rejection(error: Exception) -> bool:
+        """Errors that mean the exchange refused the order (retrying cannot help)."""
+        return isinstance(error, ValueError) or type(error).__name__ in (
+            "InsufficientFunds", "InvalidOrder", "BadSymbol", "PermissionDenied", "AuthenticationError",
+        )
+
+
+_pipelines: Dict[int, OrderPipeline] = {}
+
+
+def get_order_pipeline(exchange: ExchangeClient) -> OrderPipeline:
+    """The long-lived pipeline of ``exchange``, created on first use."""
+    pipeline = _pipelines.get(id(exchange))
+    if pipeline is None:
+        pipeline = _pipelines[id(exchange)] = OrderPipeline(exchange)
+    return pipeline
+
+
+async def reconcile_pipelines() -> List[TrackedOrder]:
+    """Refresh the working orders of every pipeline and drop finished ones; returns those that changed."""
+    changed: List[TrackedOrder] = []
+    for pipeline in list(_pipelines.values()):
+        try:
+            changed.extend(await pipeline.reconcile())
+        except Exception as e:
+            logger.error(f"Order reconciliation failed: {e}")
+        pipeline.forget_terminal()
+    for order in changed:
+        logger.info(f"Order {order.client_order_id} ({order.symbol}) is now {order.state.value}")
+    return changed
@@ -2,10 +2,10 @@
 
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, Iterable, Mapping, Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import config
@@ -25,6 +25,7 @@ class PositionOpen:
         take_profit: Optional[Decimal] = None,
         leverage: Decimal = Decimal(str(config.DEFAULT_LEVERAGE)),
         invalidation_condition: Optional[str] = None,
+        exchange_intent_id: Optional[UUID] = None,
     ):
         self.symbol = symbol
         self.side = side
@@ -34,6 +35,7 @@ class PositionOpen:
         self.take_profit = take_profit
         self.leverage = leverage
         self.invalidation_condition = invalidation_condition
+        self.exchange_intent_id = exchange_intent_id
 
 
 class PositionService:
@@ -58,6 +60,7 @@ class PositionService:
             leverage=data.leverage,
             status=PositionStatus.OPEN,
             opened_at=datetime.utcnow(),
+            exchange_intent_id=data.exchange_intent_id,
         )
 
         self.db.add(position)
@@ -114,6 +117,41 @@ class PositionService:
         await self.db.refresh(position)
         return position
 
+    async def bulk_update_prices(self, prices: Mapping[UUID, Decimal], commit: bool = True) -> int:
+        """Mark open positions to market in one executemany UPDATE per batch and one commit.
+
+        Returns the number of positions submitted; closed positions are left untouched.
+        With ``commit=False`` the caller's transaction is left open.
+        """
+        if not prices:
+            return 0
+
+        table = Position.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("position_id"), table.c.status == PositionStatus.OPEN)
+            .values(current_price=bindparam("price"))
+        )
+        rows = [{"position_id": position_id, "price": price} for position_id, price in prices.items()]
+        batch_size = config.DB_BULK_UPDATE_BATCH_SIZE
+        for start in range(0, len(rows), batch_size):
+            await self.db.execute(statement, rows[start : start + batch_size])
+        if commit:
+            await self.db.commit()
+        return len(rows)
+
+    @staticmethod
+    def changed_prices(
+        positions: Iterable[Position], prices: Mapping[str, Decimal]
+    ) -> Dict[UUID, Decimal]:
+        """New price per position id, skipping symbols without a price and unchanged prices."""
+        changes: Dict[UUID, Decimal] = {}
+        for position in positions:
+            price = prices.get(position.symbol)
+            if price is not None and price != position.current_price:
+                changes[position.id] = price
+        return changes
+
     async def get_position(self, position_id: UUID) -> Optional[Position]:
         """Get a position by ID."""
         query = select(Position).where(Position.id == position_id)
@@ -2,6 +2,7 @@
 
 from datetime import datetime
 from decimal import Decimal
+from time import time
 from typing import Any, Optional, Tuple
 from uuid import UUID
 
@@ -14,6 +15,7 @@ from ..core.logger import get_logger
 from ..models.bot import Bot
 from ..models.position import Position, PositionSide, PositionStatus
 from ..models.trade import Trade, TradeSide
+from .order_pipeline import TrackedOrder, entry_intent_id, exit_intent_id, get_order_pipeline
 from .position_service import PositionOpen, PositionService
 from .risk_manager_service import RiskManagerService
 
@@ -27,11 +29,17 @@ class TradeExecutorService:
         self.db = db
         self.exchange = exchange_client or get_exchange_client()
         self.position_service = PositionService(db)
+        self.orders = get_order_pipeline(self.exchange)
 
     async def execute_entry(
-        self, bot: Bot, decision: dict[str, Any], current_price: Decimal
+        self, bot: Bot, decision: dict[str, Any], current_price: Decimal, candle: Optional[float] = None
     ) -> Tuple[Optional[Position], Optional[Trade]]:
-        """Execute an entry order (open new position)."""
+        """Execute an entry order (open new position).
+
+        Live entries are keyed on bot, symbol, side and ``candle`` (default: the
+        current cycle-interval bucket), so retrying the same decision never
+        opens a second position.
+        """
         try:
             symbol = decision.get("symbol", "")
             side = decision.get("side", "long")
@@ -62,9 +70,33 @@ class TradeExecutorService:
                 return None, None
 
             order_side = "buy" if side.lower() == "long" else "sell"
-            actual_price, fees = await self._execute_order(
-                bot, symbol, order_side, quantity, current_price
-            )
+            intent_id: Optional[UUID] = None
+            if bot.paper_trading:
+                actual_price, fees = await self._execute_order(
+                    symbol, order_side, quantity, current_price
+                )
+            else:
+                interval = config.CYCLE_INTERVAL_SECONDS
+                intent_id = entry_intent_id(
+                    bot.id, symbol, side.lower(), candle if candle is not None else time() // interval * interval
+                )
+                existing = await self._get_position_by_intent(intent_id)
+                if existing is not None:
+                    logger.info(f"Entry {intent_id} already recorded as position {existing.id}")
+                    return existing, None
+                if not self._has_free_margin(symbol, current_price * quantity / leverage):
+                    return None, None
+
+                # Entry, stop-loss and take-profit go out together, before anything is recorded
+                protected = await self.orders.open_protected(
+                    intent_id, symbol, order_side, float(quantity),
+                    float(stop_loss_price), float(take_profit_price),
+                )
+                if protected.entry.filled <= 0:
+                    # Cancelled unfilled: nothing is open on the exchange, so nothing is recorded
+                    return None, None
+                actual_price, fees = self._fill_result(protected.entry, current_price)
+                quantity = Decimal(str(protected.entry.filled))
 
             position_data = PositionOpen(
                 symbol=symbol,
@@ -75,6 +107,7 @@ class TradeExecutorService:
                 take_profit=take_profit_price,
                 leverage=leverage,
                 invalidation_condition=decision.get("invalidation_condition"),
+                exchange_intent_id=intent_id,
             )
 
             logger.info(
@@ -104,9 +137,6 @@ class TradeExecutorService:
             await self.db.refresh(trade)
             await self.db.refresh(position)
 
-            if not bot.paper_trading:
-                await self._set_stop_orders(symbol, side, quantity, stop_loss_price, take_profit_price)
-
             logger.info(f"Entry: Position {position.id}, Capital: ${bot.capital:,.2f}")
             return position, trade
 
@@ -130,19 +160,35 @@ class TradeExecutorService:
                 logger.error(f"Bot {position.bot_id} not found")
                 return None
 
-            actual_price, fees = await self._execute_order(
-                bot, position.symbol, order_side, position.quantity, current_price, is_exit=True
-            )
-
-            realized_pnl = position.calculate_realized_pnl(actual_price, position.quantity) - fees
-            await self.position_service.close_position(position.id, actual_price, reason)
+            quantity = position.quantity
+            if bot.paper_trading:
+                actual_price, fees = await self._execute_order(
+                    position.symbol, order_side, quantity, current_price, is_exit=True
+                )
+            else:
+                # Keyed on the position and what is left of it, so a retried close can never sell twice
+                order = await self.orders.close(
+                    exit_intent_id(position.id, position.quantity), position.symbol, order_side,
+                    float(position.quantity), entry_intent=position.exchange_intent_id,
+                )
+                actual_price, fees = self._fill_result(order, current_price)
+                quantity = min(Decimal(str(order.filled)), position.quantity)
+
+            realized_pnl = position.calculate_realized_pnl(actual_price, quantity) - fees
+            if quantity < position.quantity:
+                # Partly filled: only the filled part is closed, the rest stays open for the next exit
+                stored = await self.position_service.get_position(position.id)
+                stored.quantity -= quantity
+                logger.warning(f"Exit of position {position.id} partly filled: {stored.quantity} left open")
+            else:
+                await self.position_service.close_position(position.id, actual_price, reason)
 
             trade = Trade(
                 bot_id=position.bot_id,
                 position_id=position.id,
                 symbol=position.symbol,
                 side=TradeSide.SELL if order_side == "sell" else TradeSide.BUY,
-                quantity=position.quantity,
+                quantity=quantity,
                 price=actual_price,
                 fees=fees,
                 realized_pnl=realized_pnl,
@@ -152,7 +198,7 @@ class TradeExecutorService:
 
             bot = await self._reload_bot(position.bot_id)
             leverage = position.leverage or Decimal(str(config.DEFAULT_LEVERAGE))
-            margin_released = (position.entry_price * position.quantity) / leverage
+            margin_released = (position.entry_price * quantity) / leverage
             bot.capital += margin_released + realized_pnl
 
             await self.db.commit()
@@ -178,60 +224,49 @@ class TradeExecutorService:
 
     async def _execute_order(
         self,
-        bot: Bot,
         symbol: str,
         side: str,
         quantity: Decimal,
         current_price: Decimal,
         is_exit: bool = False,
     ) -> Tuple[Decimal, Decimal]:
-        """Execute market order or simulate for paper trading."""
-        if bot and not bot.paper_trading:
-            try:
-                order = await self.exchange.create_order(
-                    symbol=symbol, side=side, amount=float(quantity), order_type="market"
-                )
-                actual_price = Decimal(str(order.get("price", current_price)))
-                fees = Decimal(str(order.get("fee", {}).get("cost", 0)))
-                action = "Exit" if is_exit else "Entry"
-                logger.info(f"{action} order: {side} {quantity} {symbol} @ {actual_price}")
-                return actual_price, fees
-            except Exception as e:
-                logger.error(f"Order execution error: {e}")
-                return Decimal(str(current_price)), Decimal("0")
-
+        """Simulate a market order for paper trading."""
         actual_price = Decimal(str(current_price))
         fees = actual_price * quantity * Decimal(str(config.PAPER_TRADING_FEE_PCT))
         action = "PAPER EXIT" if is_exit else "PAPER"
         logger.info(f"{action}: {side} {quantity} {symbol} @ {actual_price}")
         return actual_price, fees
 
+    @staticmethod
+    def _has_free_margin(symbol: str, margin: Decimal) -> bool:
+        """Whether the reconciler's cached account view leaves room for ``margin`` (assumed so without a fresh view)."""
+        from ..core.account_reconciler import get_account_view  # The reconciler imports the services package
+
+        view = get_account_view()
+        if view is None or view.age_seconds > 2 * config.ACCOUNT_RECONCILE_INTERVAL_SECONDS:
+            return True
+        if view.free() < margin:
+            logger.warning(f"Skipping {symbol}: ${view.free():,.2f} free on the exchange, ${margin:,.2f} margin needed")
+            return False
+        return True
+
     async def _reload_bot(self, bot_id: UUID) -> Bot:
         """Reload bot from database to get latest capital."""
         query = select(Bot).where(Bot.id == bot_id)
         result = await self.db.execute(query)
         return result.scalar_one()
 
-    async def _set_stop_orders(
-        self,
-        symbol: str,
-        side: str,
-        quantity: Decimal,
-        stop_loss_price: Decimal,
-        take_profit_price: Decimal,
-    ) -> None:
-        """Set stop loss and take profit orders on exchange."""
-        try:
-            stop_side = "sell" if side.lower() == "long" else "buy"
-            await self.exchange.create_stop_loss_order(
-                symbol=symbol, side=stop_side, amount=float(quantity), stop_price=float(stop_loss_price)
-            )
-            await self.exchange.create_take_profit_order(
-                symbol=symbol, side=stop_side, amount=float(quantity), take_profit_price=float(take_profit_price)
-            )
-            logger.info(f"Stop orders: SL={stop_loss_price}, TP={take_profit_price}")
-        except Exception as e:
-            logger.error(f"Error setting stop orders: {e}")
+    @staticmethod
+    def _fill_result(order: TrackedOrder, current_price: Decimal) -> Tuple[Decimal, Decimal]:
+        """Average fill price and fees of a live order."""
+        actual_price = Decimal(str(order.average or current_price))
+        logger.info(f"Order {order.client_order_id}: {order.side} {order.filled} {order.symbol} @ {actual_price}")
+        return actual_price, Decimal(str(order.fee))
+
+    async def _get_position_by_intent(self, intent_id: UUID) -> Optional[Position]:
+        """Position recorded for a live entry intent, if any."""
+        result = await self.db.execute(select(Position).where(Position.exchange_intent_id == intent_id))
+        return result.scalar_one_or_none()
 
     async def _get_bot(self, bot_id: UUID) -> Optional[Bot]:
         """Get bot by ID."""
@@ -13,6 +13,8 @@ from ...core.logger import get_logger
 from ...models.bot import Bot
 from ...models.equity_snapshot import EquitySnapshot
 from ...models.trade import Trade
+from ..llm_decision_cache import LLMDecisionCache
+from ..llm_decision_schema import DecisionValidation, validate_with_repair
 from ..market_data_service import MarketDataService
 from ..market_sentiment_service import MarketSentimentService
 from ..multi_coin_prompt.service import MultiCoinPromptService
@@ -53,6 +55,7 @@ class TradingCycleManager:
         self.prompt_service = prompt_service
         self.news_service = NewsService()
         self.trading_memory = trading_memory
+        self.decision_cache = LLMDecisionCache()
 
         self.trading_symbols = bot.trading_symbols
         self.timeframe = "5m"
@@ -70,6 +73,7 @@ class TradingCycleManager:
             all_positions_dict = [
                 {
                     "symbol": p.symbol,
+                    "side": p.side,
                     "entry_price": float(p.entry_price),
                     "size": float(p.quantity),
                     "pnl_pct": float(p.unrealized_pnl_pct),
@@ -82,40 +86,21 @@ class TradingCycleManager:
                 logger.warning("No market data available")
                 return None, None, None
 
-            portfolio_state, _ = await self._get_portfolio_state()
-            news_data = await self.news_service.get_latest_news(self.trading_symbols)
-            sentiment_data = await self._fetch_sentiment_data()
-
-            prompt_data = self.prompt_service.get_multi_coin_decision(
-                bot=self.bot,
-                all_coins_data=all_coins_data,
-                all_positions=all_positions_dict,
-                news_data=news_data,
-                portfolio_state=portfolio_state,
-                sentiment_data=sentiment_data,
-            )
-
-            logger.info(f"Analyzing {len(all_coins_data)} coins...")
-
-            llm_response = await self.llm_client.analyze_market(
-                model=FORCED_MODEL_DEEPSEEK,
-                prompt=prompt_data["prompt"],
-                max_tokens=6000,
-                temperature=0.7,
-            )
-
-            response_text = llm_response.get("response", "")
-            self._log_llm_decision(prompt_data["prompt"], response_text)
-
-            if not response_text:
-                logger.error("Empty LLM response")
-                return None, None, None
-
-            all_symbols = list(all_coins_data.keys())
-            decisions = self.prompt_service.parse_multi_coin_response(response_text, all_symbols)
+            fingerprint = self.decision_cache.fingerprint(all_coins_data, all_positions_dict)
+            decisions = self.decision_cache.get(fingerprint)
+            if decisions is None:
+                validation = await self._request_decisions(all_coins_data, all_positions_dict)
+                if validation is None:
+                    return None, None, None
+                decisions = validation.decisions
+                if validation.cacheable:
+                    self.decision_cache.put(fingerprint, decisions)
 
             cycle_duration = (datetime.utcnow() - cycle_start).total_seconds()
-            logger.info(f"Cycle completed in {cycle_duration:.1f}s")
+            logger.info(
+                f"Cycle completed in {cycle_duration:.1f}s "
+                f"(decision cache hit rate {self.decision_cache.hit_rate * 100:.0f}%)"
+            )
 
             ActivityLogger.log_cycle_end(
                 bot_name=self.bot.name,
@@ -133,6 +118,53 @@ class TradingCycleManager:
             logger.error(f"Cycle error: {e}", exc_info=True)
             return None, None, None
 
+    async def _request_decisions(
+        self, all_coins_data: Dict[str, Any], all_positions_dict: list[Dict[str, Any]]
+    ) -> Optional[DecisionValidation]:
+        """Build the prompt, call the LLM and parse decisions; None on empty response.
+
+        Symbols without a valid decision are filled in as HOLD.
+        """
+        portfolio_state, _ = await self._get_portfolio_state()
+        news_data = await self.news_service.get_latest_news(self.trading_symbols)
+        sentiment_data = await self._fetch_sentiment_data()
+
+        prompt_data = self.prompt_service.get_multi_coin_decision(
+            bot=self.bot,
+            all_coins_data=all_coins_data,
+            all_positions=all_positions_dict,
+            news_data=news_data,
+            portfolio_state=portfolio_state,
+            sentiment_data=sentiment_data,
+        )
+
+        logger.info(f"Analyzing {len(all_coins_data)} coins...")
+
+        llm_response = await self.llm_client.analyze_market(
+            model=FORCED_MODEL_DEEPSEEK,
+            prompt=prompt_data["prompt"],
+            max_tokens=6000,
+            temperature=0.7,
+            cache_prefix=prompt_data.get("static_prefix"),
+        )
+
+        response_text = llm_response.get("response", "")
+        self._log_llm_decision(prompt_data["prompt"], response_text)
+
+        if not response_text:
+            logger.error("Empty LLM response")
+            return None
+
+        all_symbols = list(all_coins_data.keys())
+        validation = await validate_with_repair(
+            self.llm_client, FORCED_MODEL_DEEPSEEK, response_text, all_symbols, max_tokens=6000
+        )
+        for symbol in all_symbols:
+            validation.decisions.setdefault(
+                symbol, {"signal": "hold", "confidence": 0.5, "justification": "Invalid or missing in response"}
+            )
+        return validation
+
     async def _fetch_sentiment_data(self) -> Any:
         """Fetch market sentiment data with error handling."""
         try:
@@ -0,0 +1,63 @@
+"""Standalone trading worker.
+
+Runs the bot scheduler without the API: ``python -m src.worker``. Start as many
+workers as needed, on one host or several; they share the active bots through
+Redis leases, so each bot runs on exactly one worker and moves to another when
+its worker dies or when new workers join. Run the API with
+SCHEDULER_MODE=worker so it leaves the bots to the workers.
+"""
+
+import asyncio
+import signal
+
+from dotenv import load_dotenv
+
+from .core.bot_leases import BotLeaseManager
+from .core.config import config
+from .core.database import close_db
+from .core.di_container import get_container
+from .core.logger import get_logger
+from .core.logging_config import configure_structured_logging
+from .core.redis_client import close_redis, init_redis
+from .core.scheduler import BotScheduler
+
+logger = get_logger(__name__)
+
+
+async def run_worker() -> None:
+    """Run a lease-based scheduler until SIGINT or SIGTERM."""
+    configure_structured_logging()
+
+    is_valid, errors = config.validate_config()
+    if not is_valid:
+        raise RuntimeError("Configuration validation failed:\n" + "\n".join(errors))
+
+    await init_redis()
+    container = get_container()
+    await container.startup()
+
+    scheduler = BotScheduler(leases=BotLeaseManager())
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await scheduler.start()
+    try:
+        await stopping.wait()
+    finally:
+        # Releases every lease so other workers take over without waiting for the TTL
+        await scheduler.stop()
+        await container.shutdown()
+        await close_db()
+        await close_redis()
+        logger.info("Worker stopped")
+
+
+def main() -> None:
+    load_dotenv()
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
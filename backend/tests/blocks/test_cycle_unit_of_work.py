@@ -0,0 +1,81 @@
+"""
+Test the cycle unit of work's commit: failures keep the buffer, hooks wait for the commit.
+"""
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.blocks.cycle_unit_of_work import CycleUnitOfWork
+from src.models.bot import Bot, BotStatus
+from src.models.position import Position, PositionSide, PositionStatus
+from src.models.trade import Trade, TradeSide
+
+
+async def open_position(db_session, bot) -> Position:
+    bot.status = BotStatus.ACTIVE
+    position = Position(
+        id=uuid.uuid4(), bot_id=bot.id, symbol="BTC/USDT", side=PositionSide.LONG,
+        quantity=Decimal("1"), entry_price=Decimal("100"), current_price=Decimal("100"),
+        leverage=Decimal("5"), status=PositionStatus.OPEN, opened_at=datetime.utcnow(),
+    )
+    db_session.add(position)
+    await db_session.commit()
+    return position
+
+
+def close(uow: CycleUnitOfWork, after_commit=None) -> None:
+    position = uow.positions[0]
+    position.status = PositionStatus.CLOSED
+    position.closed_at = datetime.utcnow()
+    trade = Trade(
+        bot_id=position.bot_id, position_id=position.id, symbol=position.symbol, side=TradeSide.SELL,
+        quantity=position.quantity, price=Decimal("110"), fees=Decimal("0"), realized_pnl=Decimal("10"),
+        executed_at=datetime.utcnow(),
+    )
+    uow.add_close(position, trade, Decimal("30"), after_commit=after_commit)
+
+
+@pytest.mark.asyncio
+class TestCycleCommit:
+    """A transient commit failure is retried on exit instead of dropping the cycle's writes."""
+
+    async def test_failed_commit_keeps_buffer_for_retry(self, test_db_engine, db_session, test_bot):
+        position = await open_position(db_session, test_bot)
+        factory = async_sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+        after_exit = AsyncMock()
+
+        async with CycleUnitOfWork(test_bot.id, session_factory=factory) as uow:
+            close(uow, after_exit)
+            real_commit = uow.db.commit
+            uow.db.commit = AsyncMock(side_effect=ConnectionError("connection reset"))
+            with pytest.raises(ConnectionError):
+                await uow.commit()
+
+            assert uow.has_pending_writes
+            after_exit.assert_not_awaited()  # Nothing was written yet
+            uow.db.commit = real_commit
+
+        async with factory() as db:
+            stored = await db.get(Position, position.id)
+            bot = (await db.execute(select(Bot).where(Bot.id == test_bot.id))).scalar_one()
+            trades = list((await db.execute(select(Trade))).scalars())
+        assert stored.status == PositionStatus.CLOSED and len(trades) == 1
+        assert bot.capital == Decimal("10030.00")
+        after_exit.assert_awaited_once()
+
+    async def test_close_dropped_as_closed_elsewhere_skips_hook(self, test_db_engine, db_session, test_bot):
+        position = await open_position(db_session, test_bot)
+        factory = async_sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+        after_exit = AsyncMock()
+
+        async with CycleUnitOfWork(test_bot.id, session_factory=factory) as uow:
+            close(uow, after_exit)
+            position.version += 1  # The exit monitor closed it first
+            await db_session.commit()
+
+        after_exit.assert_not_awaited()
@@ -0,0 +1,99 @@
+"""
+Test tiered decision pipeline (Trinity screen -> LLM shortlist).
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.blocks.block_tiered_decision import TieredDecisionBlock
+from src.blocks.orchestrator import TradingOrchestrator
+
+SCORES = {"BTC/USDT": 0.9, "ETH/USDT": 0.4, "SOL/USDT": 0.7, "XRP/USDT": 0.1, "BNB/USDT": 0.6}
+
+
+def make_block(shortlist_size=2, min_score=0.35):
+    trinity = MagicMock()
+    trinity._analyze_confluence.side_effect = lambda symbol, snap: SimpleNamespace(
+        confidence=SCORES[symbol]
+    )
+    llm = MagicMock()
+    llm.get_decisions = AsyncMock(return_value={"BTC/USDT": "decision"})
+    return TieredDecisionBlock(trinity, llm, shortlist_size=shortlist_size, min_score=min_score)
+
+
+def snapshot(signals, price=100.0, trend="bullish", supertrend_signal="buy", rsi=50.0):
+    return SimpleNamespace(
+        signals=signals, price=price, trend=trend, supertrend_signal=supertrend_signal,
+        rsi=rsi, sma_200=90.0, ema_20=95.0,
+    )
+
+
+def market():
+    data = {symbol: snapshot({"regime_filter": True}) for symbol in SCORES}
+    data["DOGE/USDT"] = snapshot(None)  # No indicators yet
+    return data
+
+
+class TestTieredScreen:
+    """Only top-K and held symbols reach the LLM."""
+
+    def test_top_k_by_score(self):
+        assert make_block().screen(market(), held=set()) == ["BTC/USDT", "SOL/USDT"]
+
+    def test_held_symbols_always_included(self):
+        shortlist = make_block().screen(market(), held={"XRP/USDT", "DOGE/USDT"})
+
+        assert shortlist == ["BTC/USDT", "SOL/USDT", "XRP/USDT", "DOGE/USDT"]
+
+    def test_bearish_setup_is_shortlisted(self):
+        data = market()
+        # Long confluence 0.1, but below the 200 SMA and EMA zone in a strong downtrend
+        data["XRP/USDT"] = snapshot(
+            {"trend_strength": True, "volume_confirmed": True},
+            price=80.0, trend="bearish", supertrend_signal="sell",
+        )
+
+        assert TieredDecisionBlock.short_score(data["XRP/USDT"]) == pytest.approx(0.95)
+        assert make_block().screen(data, held=set()) == ["BTC/USDT", "XRP/USDT"]
+
+    def test_min_score_filters_weak_symbols(self):
+        block = make_block(shortlist_size=10, min_score=0.5)
+
+        assert block.screen(market(), held=set()) == ["BTC/USDT", "SOL/USDT", "BNB/USDT"]
+
+
+@pytest.mark.asyncio
+class TestTieredDecisions:
+    """The LLM receives the shortlisted snapshots only."""
+
+    async def test_llm_called_with_shortlist(self):
+        block = make_block()
+        data = market()
+
+        result = await block.get_decisions(data, {"positions": []})
+
+        assert result == {"BTC/USDT": "decision"}
+        sent = block.llm.get_decisions.await_args.kwargs["market_data"]
+        assert list(sent) == ["BTC/USDT", "SOL/USDT"]
+        assert sent["BTC/USDT"] is data["BTC/USDT"]
+
+    async def test_no_candidates_skips_llm(self):
+        block = make_block(min_score=0.95)
+
+        assert await block.get_decisions(market(), {"positions": []}) == {}
+        block.llm.get_decisions.assert_not_awaited()
+
+
+class TestSwitchToTiered:
+    """The orchestrator can switch into tiered mode at runtime."""
+
+    def test_switch_requires_llm_client(self):
+        orchestrator = TradingOrchestrator(bot_id=uuid.uuid4(), decision_mode="trinity")
+        assert not orchestrator.switch_decision_mode("tiered")
+
+        orchestrator.llm_decision = MagicMock()
+        assert orchestrator.switch_decision_mode("Tiered")
+        assert isinstance(orchestrator.decision, TieredDecisionBlock)
+        assert orchestrator.get_decision_mode() == "tiered"
@@ -0,0 +1,136 @@
+"""Query-count benchmark for one trading cycle.
+
+Runs the orchestrator's cycle against SQLite with and without the cycle unit of
+work and counts the statements sent to the database (an executemany counts once).
+"""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.blocks.orchestrator import TradingOrchestrator
+from src.core.config import config
+from src.models.bot import Bot, BotStatus
+from src.models.equity_snapshot import EquitySnapshot
+from src.models.position import Position, PositionSide, PositionStatus
+from src.models.trade import Trade
+
+SESSION_MODULES = (
+    "src.blocks.orchestrator",
+    "src.blocks.block_portfolio",
+    "src.blocks.block_execution",
+    "src.blocks.cycle_unit_of_work",
+)
+
+
+async def seed(db_session: AsyncSession, bot: Bot, count: int) -> None:
+    bot.status = BotStatus.ACTIVE
+    for index in range(count):
+        db_session.add(Position(
+            id=uuid.uuid4(),
+            bot_id=bot.id,
+            symbol=f"C{index}/USDT",
+            side=PositionSide.LONG,
+            quantity=Decimal("0.1"),
+            entry_price=Decimal("100"),
+            current_price=Decimal("100"),
+            stop_loss=Decimal("95"),
+            take_profit=Decimal("120"),
+            status=PositionStatus.OPEN,
+            opened_at=datetime.utcnow(),
+        ))
+    await db_session.commit()
+
+
+def cycle_inputs(count: int):
+    # C0 hits its stop loss, the others are marked up, NEW/USDT gets an entry
+    prices = {f"C{i}/USDT": Decimal("90") if i == 0 else Decimal("101") for i in range(count)}
+    prices["NEW/USDT"] = Decimal("100")
+    market_data = {symbol: SimpleNamespace(price=price) for symbol, price in prices.items()}
+    entry = SimpleNamespace(
+        symbol="NEW/USDT",
+        signal_type="buy_to_enter",
+        side="long",
+        size_pct=0.05,
+        stop_loss=Decimal("95"),
+        take_profit=Decimal("110"),
+        confidence=0.8,
+        leverage=1,
+    )
+    return market_data, {"NEW/USDT": entry}
+
+
+async def run_cycle(engine, bot_id, count, unit_of_work: bool) -> int:
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    orchestrator = TradingOrchestrator(bot_id=bot_id, paper_trading=True)
+    market_data, decisions = cycle_inputs(count)
+    orchestrator._fetch_market_data = AsyncMock(return_value=market_data)
+    orchestrator.decision.get_decisions = AsyncMock(return_value=decisions)
+
+    patches = [patch(f"{module}.AsyncSessionLocal", factory) for module in SESSION_MODULES]
+    patches.append(patch.object(config, "CYCLE_UNIT_OF_WORK_ENABLED", unit_of_work))
+    patches.append(patch.object(config, "PIPELINED_CYCLES_ENABLED", False))  # Market data is mocked per stage
+    patches.append(patch("src.blocks.orchestrator.ActivityLogger"))
+    for p in patches:
+        p.start()
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+    try:
+        assert await orchestrator._run_cycle()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+        for p in reversed(patches):
+            p.stop()
+    return len(statements)
+
+
+async def cycle_outcome(engine, bot_id):
+    async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+        capital = (await db.execute(select(Bot.capital).where(Bot.id == bot_id))).scalar_one()
+        positions = (await db.execute(select(Position).where(Position.bot_id == bot_id))).scalars().all()
+        trades = (await db.execute(select(Trade).where(Trade.bot_id == bot_id))).scalars().all()
+        snapshots = (await db.execute(select(EquitySnapshot))).scalars().all()
+    return capital, {p.symbol: (p.status, p.current_price) for p in positions}, len(trades), len(snapshots)
+
+
+@pytest.mark.asyncio
+class TestCycleQueryCount:
+    """The unit of work keeps queries per cycle constant in the number of positions."""
+
+    @pytest.mark.parametrize("count", [2, 10])
+    async def test_cycle_writes_land_in_one_commit(self, test_db_engine, db_session, test_bot, count):
+        await seed(db_session, test_bot, count)
+
+        await run_cycle(test_db_engine, test_bot.id, count, unit_of_work=True)
+        capital, positions, trades, snapshots = await cycle_outcome(test_db_engine, test_bot.id)
+
+        assert positions["C0/USDT"] == (PositionStatus.CLOSED, Decimal("90"))
+        assert positions["C1/USDT"] == (PositionStatus.OPEN, Decimal("101"))
+        assert positions["NEW/USDT"][0] == PositionStatus.OPEN
+        assert trades == 2 and snapshots == 1
+        # 10000 + close (margin 1 at 10x, pnl -1, fees 0.009) - open (5% margin + 0.1% fees)
+        assert capital == Decimal("9499.49")
+
+    async def test_query_count_before_and_after(self, test_db_engine, db_session, test_bot):
+        counts = {}
+        for count in (2, 10):
+            for unit_of_work in (False, True):
+                async with async_sessionmaker(test_db_engine, expire_on_commit=False)() as db:
+                    await db.execute(Position.__table__.delete())
+                    await db.execute(Trade.__table__.delete())
+                    await db.commit()
+                await seed(db_session, test_bot, count)
+                counts[count, unit_of_work] = await run_cycle(test_db_engine, test_bot.id, count, unit_of_work)
+
+        assert counts[2, True] == counts[10, True]
+        assert counts[10, True] < counts[10, False]
@@ -0,0 +1,168 @@
+"""Concurrency stress test for ExecutionBlock capital accounting.
+
+Entries and exits for one bot run concurrently, each in its own session on a
+file-backed SQLite database, with every exit raced by a duplicate (decision
+cycle vs. exit monitor). Capital must end up exactly where the successful
+executions put it, and every position must be closed exactly once.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.blocks import block_execution
+from src.blocks.block_execution import ExecutionBlock
+from src.core.database import Base
+from src.models.bot import Bot, BotStatus, ModelName
+from src.models.position import Position, PositionSide, PositionStatus
+from src.models.trade import Trade
+from src.models.user import User
+
+OPEN_POSITIONS = 20
+NEW_ENTRIES = 20
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path):
+    """One connection per session, so concurrent executions really interleave."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'stress.db'}",
+        connect_args={"timeout": 30},
+        poolclass=NullPool,
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def wal_mode(dbapi_connection, _):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def begin(conn):
+        # Writers queue on the database lock instead of failing on a stale read snapshot
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def seed(factory) -> tuple[uuid.UUID, list[Position]]:
+    async with factory() as db:
+        user = User(id=uuid.uuid4(), email="stress@example.com", password_hash="x")
+        bot = Bot(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            name="stress",
+            model_name=ModelName.CLAUDE_SONNET,
+            initial_capital=Decimal("10000"),
+            capital=Decimal("10000"),
+            trading_symbols=["BTC/USDT"],
+            risk_params={},
+            status=BotStatus.ACTIVE,
+            paper_trading=True,
+        )
+        positions = [
+            Position(
+                id=uuid.uuid4(),
+                bot_id=bot.id,
+                symbol=f"C{i}/USDT",
+                side=PositionSide.LONG,
+                quantity=Decimal("1"),
+                leverage=Decimal("10"),
+                entry_price=Decimal("100"),
+                current_price=Decimal("100"),
+                status=PositionStatus.OPEN,
+                opened_at=datetime.utcnow(),
+            )
+            for i in range(OPEN_POSITIONS)
+        ]
+        db.add_all([user, bot, *positions])
+        await db.commit()
+    return bot.id, positions
+
+
+@pytest.mark.asyncio
+class TestConcurrentExecution:
+    """Concurrent entries and duplicate exits never lose or double-count capital."""
+
+    async def test_capital_is_consistent_under_concurrency(self, file_engine):
+        factory = async_sessionmaker(file_engine, class_=AsyncSession, expire_on_commit=False)
+        bot_id, positions = await seed(factory)
+
+        with patch.object(block_execution, "AsyncSessionLocal", factory), \
+                patch.object(block_execution, "get_exchange_client"), \
+                patch.object(block_execution.MemoryManager, "is_enabled", return_value=False):
+            execution = ExecutionBlock(bot_id)
+            entries = [
+                execution.open_position(
+                    symbol=f"N{i}/USDT", side="long", size_pct=0.02, entry_price=Decimal("50"),
+                    stop_loss=Decimal("45"), take_profit=Decimal("60"), leverage=5,
+                )
+                for i in range(NEW_ENTRIES)
+            ]
+            exits = [
+                execution.close_position(position, Decimal("110"), reason)
+                for position in positions
+                for reason in ("stop_loss", "exit_monitor")
+            ]
+            calls = entries + exits
+            order = sorted(range(len(calls)), key=lambda i: (i * 7919) % len(calls))  # Interleave
+            results = await asyncio.gather(*(calls[i] for i in order))
+            by_call = dict(zip(order, results))
+
+        opened = [by_call[i] for i in range(NEW_ENTRIES) if by_call[i].success]
+        closed = [by_call[i] for i in range(NEW_ENTRIES, len(calls)) if by_call[i].success]
+        debits = sum(r.position.entry_price * r.position.quantity / r.position.leverage + r.trade.fees for r in opened)
+        credits = sum(Decimal("100") * Decimal("1") / Decimal("10") + r.trade.realized_pnl - r.trade.fees for r in closed)
+
+        assert len(opened) == NEW_ENTRIES
+        assert len(closed) == OPEN_POSITIONS  # Each duplicate close lost its race
+
+        async with factory() as db:
+            capital = (await db.execute(select(Bot.capital).where(Bot.id == bot_id))).scalar_one()
+            trades = (await db.execute(select(func.count()).select_from(Trade))).scalar_one()
+            versions = (await db.execute(
+                select(Position.version).where(Position.status == PositionStatus.CLOSED)
+            )).scalars().all()
+
+        assert float(capital) == pytest.approx(float(Decimal("10000") - debits + credits), abs=0.05)
+        assert trades == NEW_ENTRIES + OPEN_POSITIONS
+        assert versions == [1] * OPEN_POSITIONS
+
+    async def test_debit_beyond_capital_is_rejected(self, file_engine):
+        factory = async_sessionmaker(file_engine, class_=AsyncSession, expire_on_commit=False)
+        bot_id, _ = await seed(factory)
+
+        with patch.object(block_execution, "AsyncSessionLocal", factory), \
+                patch.object(block_execution, "get_exchange_client"):
+            execution = ExecutionBlock(bot_id)
+            # Every entry is sized on the same stale read of 10000
+            execution._get_bot = AsyncMock(return_value=SimpleNamespace(capital=Decimal("10000")))
+            results = await asyncio.gather(*(
+                execution.open_position(
+                    symbol=f"N{i}/USDT", side="long", size_pct=0.6, entry_price=Decimal("50"),
+                    stop_loss=Decimal("45"), take_profit=Decimal("60"), leverage=1,
+                )
+                for i in range(3)
+            ))
+
+        # Only one 6006 debit (margin plus fees) fits in 10000
+        assert sum(r.success for r in results) == 1
+        assert {r.error for r in results if not r.success} == {"Insufficient capital"}
+        async with factory() as db:
+            capital = (await db.execute(select(Bot.capital).where(Bot.id == bot_id))).scalar_one()
+            positions = (await db.execute(select(func.count()).select_from(Position))).scalar_one()
+        assert capital == Decimal("3994")
+        assert positions == OPEN_POSITIONS + 1
@@ -0,0 +1,221 @@
+"""Decision latency benchmarks: staged vs. pipelined cycles, with and without prefetch.
+
+One slow symbol holds every other symbol at the fetch barrier in a staged
+cycle; in a pipelined cycle the fast symbols trade as soon as their own data is
+ready. Concurrent entries are sized under the capital lock on current cash.
+With a prefetch ahead of the cycle, the cycle starts with its data in memory.
+"""
+
+import asyncio
+import logging
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.blocks.block_market_data import RawMarketData
+from src.blocks.orchestrator import TradingOrchestrator
+from src.core.config import config
+from src.core.cycle_budget import CycleBudget
+
+LATENCY = {"FAST/USDT": 0.01, "SLOW/USDT": 0.3}
+
+logger = logging.getLogger(__name__)
+
+
+class FakePortfolio:
+    """Portfolio whose cash drops by each entry's margin."""
+
+    def __init__(self, cash=Decimal("1000")):
+        self.cash = cash
+        self.positions = []
+        self.record_snapshot = AsyncMock()
+
+    async def get_state(self):
+        await asyncio.sleep(0)
+        return SimpleNamespace(
+            cash=self.cash, equity=self.cash, return_pct=0.0, open_positions=list(self.positions)
+        )
+
+
+def make_orchestrator(portfolio):
+    orchestrator = TradingOrchestrator(bot_id=uuid.uuid4(), decision_mode="indicator")
+    orchestrator.portfolio = portfolio
+    orchestrator.market_data.symbols = list(LATENCY)
+
+    async def fetch_raw(symbol, tick=None):
+        orchestrator.fetches += 1
+        await asyncio.sleep(LATENCY[symbol])
+        return RawMarketData(symbol=symbol, ticker={"last": 100})
+
+    def build_snapshot(raw):
+        return SimpleNamespace(symbol=raw.symbol, price=Decimal("100"))
+
+    async def fetch_all_raw(into=None, tick=None, symbols=None):
+        async def fetch_into(symbol):
+            into[symbol] = await fetch_raw(symbol)  # Kept as it arrives, like the real fetch
+
+        await asyncio.gather(*(fetch_into(s) for s in symbols or LATENCY))
+        return into
+
+    orchestrator.fetches = 0
+    orchestrator.market_data.fetch_raw = fetch_raw
+    orchestrator.market_data.fetch_all_raw = fetch_all_raw
+    orchestrator.market_data.build_snapshot = build_snapshot
+    orchestrator.market_data.build_snapshots = lambda raw: {s: build_snapshot(r) for s, r in raw.items()}
+
+    async def get_decisions(market_data, portfolio_context):
+        return {
+            symbol: SimpleNamespace(
+                symbol=symbol, signal_type="buy_to_enter", side="long", size_pct=0.5,
+                stop_loss=Decimal("95"), take_profit=Decimal("110"), confidence=0.8, leverage=1,
+            )
+            for symbol in market_data
+        }
+
+    orchestrator.decision.get_decisions = get_decisions
+    orchestrator.risk.validate_entry = MagicMock(return_value=SimpleNamespace(is_valid=True, reason=""))
+
+    async def open_position(symbol, side, size_pct, entry_price, **kwargs):
+        # Sizing read, then a suspension point before the cash is taken
+        margin = portfolio.cash * Decimal(str(size_pct))
+        await asyncio.sleep(0.01)
+        portfolio.cash -= margin
+        position = SimpleNamespace(symbol=symbol, quantity=margin / entry_price)
+        portfolio.positions.append(position)
+        return SimpleNamespace(success=True, position=position, error=None)
+
+    orchestrator.execution.open_position = open_position
+    return orchestrator
+
+
+async def run_cycle(pipelined: bool, prefetch_lead=None, prefetch_tick=None):
+    """Run one cycle; with ``prefetch_lead``, a prefetch starts that many seconds before it."""
+    portfolio = FakePortfolio()
+    orchestrator = make_orchestrator(portfolio)
+    with patch.object(config, "PIPELINED_CYCLES_ENABLED", pipelined), \
+            patch.object(config, "CYCLE_UNIT_OF_WORK_ENABLED", False), \
+            patch("src.blocks.orchestrator.ActivityLogger"):
+        orchestrator._is_bot_active = AsyncMock(return_value=True)
+        if prefetch_lead is not None:
+            orchestrator._schedule_prefetch(0, prefetch_tick)
+            await asyncio.sleep(prefetch_lead)
+        assert await orchestrator._run_cycle()
+    return orchestrator, portfolio
+
+
+@pytest.mark.asyncio
+class TestPipelinedCycle:
+    """Fast symbols trade without waiting for slow ones."""
+
+    async def test_time_to_first_order(self):
+        staged, _ = await run_cycle(pipelined=False)
+        pipelined, _ = await run_cycle(pipelined=True)
+
+        staged_first = staged.last_cycle_report["first_order_seconds"]
+        pipelined_first = pipelined.last_cycle_report["first_order_seconds"]
+        logger.info(f"Time to first order: staged {staged_first:.3f}s, pipelined {pipelined_first:.3f}s")
+
+        assert staged_first >= LATENCY["SLOW/USDT"]
+        assert pipelined_first < LATENCY["SLOW/USDT"] / 2
+
+    async def test_concurrent_entries_are_sized_on_current_cash(self):
+        with patch.dict(LATENCY, {"SLOW/USDT": LATENCY["FAST/USDT"]}):  # Both entries race
+            orchestrator, portfolio = await run_cycle(pipelined=True)
+
+        assert {p.symbol for p in portfolio.positions} == set(LATENCY)
+        # 50% of 1000, then 50% of the remaining 500
+        assert portfolio.cash == Decimal("250")
+        capitals = [c.kwargs["capital"] for c in orchestrator.risk.validate_entry.call_args_list]
+        assert capitals == [Decimal("1000"), Decimal("500")]
+
+    async def test_llm_modes_keep_stage_barriers(self):
+        orchestrator = TradingOrchestrator(bot_id=uuid.uuid4(), decision_mode="indicator")
+        with patch.object(config, "PIPELINED_CYCLES_ENABLED", True):
+            assert orchestrator.pipelined
+            orchestrator.decision_mode = "llm"
+            assert not orchestrator.pipelined
+
+
+@pytest.mark.asyncio
+class TestStreamedDecisions:
+    """The decision deadline cuts off a stalled stream, never an order in flight."""
+
+    async def test_stalled_stream_is_dropped_but_execution_completes(self):
+        orchestrator = make_orchestrator(FakePortfolio())
+        executed, closed = [], []
+
+        async def stream_decisions(market_data, portfolio_context):
+            try:
+                yield SimpleNamespace(symbol="FAST/USDT")
+                await asyncio.sleep(10)  # The model stalls mid-response
+                yield SimpleNamespace(symbol="SLOW/USDT")
+            finally:
+                closed.append(True)
+
+        async def execute_decision(decision, market_data, portfolio_state):
+            await asyncio.sleep(0.2)  # Longer than the whole decision deadline
+            executed.append(decision.symbol)
+
+        orchestrator._execute_decision = execute_decision
+        budget = CycleBudget(total_seconds=0.1, shares={"decision": 1.0})
+
+        await orchestrator._run_streamed_decisions(
+            SimpleNamespace(stream_decisions=stream_decisions), {}, {}, budget
+        )
+
+        assert executed == ["FAST/USDT"] and closed == [True]
+        assert [(s.name, s.timed_out) for s in budget.stages] == [("decision", True)]
+
+
+@pytest.mark.asyncio
+class TestPrefetch:
+    """Cycles start with prefetched data unless it is stale or for another candle."""
+
+    @pytest.mark.parametrize("pipelined", [False, True])
+    async def test_prefetch_cuts_decision_latency(self, pipelined):
+        cold, _ = await run_cycle(pipelined)
+        warm, _ = await run_cycle(pipelined, prefetch_lead=LATENCY["SLOW/USDT"] + 0.1)
+
+        cold_report, warm_report = cold.last_cycle_report, warm.last_cycle_report
+        logger.info(
+            f"Data ready (pipelined={pipelined}): cold {cold_report['data_ready_seconds']:.3f}s, "
+            f"prefetched {warm_report['data_ready_seconds']:.3f}s; first order: "
+            f"cold {cold_report['first_order_seconds']:.3f}s, prefetched {warm_report['first_order_seconds']:.3f}s"
+        )
+
+        assert warm_report["prefetched_symbols"] == len(LATENCY)
+        assert warm_report["data_ready_seconds"] < LATENCY["FAST/USDT"]
+        assert cold_report["data_ready_seconds"] >= LATENCY["SLOW/USDT"]
+        assert warm_report["first_order_seconds"] < cold_report["first_order_seconds"]
+        assert warm.fetches == len(LATENCY)  # Nothing fetched again at cycle start
+
+    async def test_prefetch_in_flight_is_awaited_not_repeated(self):
+        orchestrator, _ = await run_cycle(pipelined=False, prefetch_lead=LATENCY["SLOW/USDT"] / 2)
+
+        assert orchestrator.fetches == len(LATENCY)
+        assert orchestrator.last_cycle_report["prefetched_symbols"] == len(LATENCY)
+
+    async def test_partial_prefetch_fetches_only_missing_symbols(self):
+        # The slow symbol misses the prefetch deadline; the fast one is kept
+        with patch.object(config, "PREFETCH_MAX_AGE_SECONDS", LATENCY["SLOW/USDT"] / 2):
+            orchestrator, portfolio = await run_cycle(pipelined=False, prefetch_lead=LATENCY["SLOW/USDT"] * 0.6)
+
+        assert orchestrator.last_cycle_report["prefetched_symbols"] == 1
+        assert orchestrator.fetches == len(LATENCY) + 1  # Only SLOW/USDT fetched again
+        assert {p.symbol for p in portfolio.positions} == set(LATENCY)
+
+    async def test_stale_prefetch_is_refetched(self):
+        with patch.object(config, "PREFETCH_MAX_AGE_SECONDS", 0.05):
+            orchestrator, _ = await run_cycle(pipelined=False, prefetch_lead=LATENCY["SLOW/USDT"] + 0.2)
+
+        assert orchestrator.last_cycle_report["prefetched_symbols"] == 0
+        assert orchestrator.fetches == 2 * len(LATENCY)
+
+    async def test_prefetch_for_another_candle_is_discarded(self):
+        orchestrator, _ = await run_cycle(pipelined=True, prefetch_lead=0.01, prefetch_tick=60.0)
+
+        assert orchestrator.last_cycle_report["prefetched_symbols"] == 0
+        assert orchestrator._prefetch_task is None
@@ -2,9 +2,13 @@
 
 import pytest
 from decimal import Decimal
+from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 
+from src.core.config import config
+from src.core.tracing import get_cycle_tracer, span
 from src.main import app
+from src.middleware.auth import get_current_user
 
 
 @pytest.fixture
@@ -652,3 +656,52 @@ class TestBotErrorHandling:
         )
 
         assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+class TestCycleProfile:
+    """Tests for the cycle-profile endpoint."""
+
+    @pytest.fixture
+    def as_owner(self, test_user):
+        app.dependency_overrides[get_current_user] = lambda: test_user
+        yield
+        app.dependency_overrides.pop(get_current_user, None)
+
+    @pytest.fixture
+    def leader(self):
+        """This process runs the bots."""
+        with patch.object(config, "SCHEDULER_MODE", "embedded"), \
+                patch("src.routes.bots.get_scheduler", return_value=MagicMock(is_leader=True)):
+            yield
+
+    async def test_get_cycle_profile_empty(self, async_client, test_bot, as_owner, leader):
+        """A bot that has not cycled yet returns no waterfalls."""
+        response = await async_client.get(f"/api/bots/{test_bot.id}/cycle-profile")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["bot_id"] == str(test_bot.id)
+        assert data["cycles"] == []
+        assert data["histograms"] == {}
+        assert data["in_process"] is True
+
+    async def test_recorded_cycle_is_returned(self, async_client, test_bot, as_owner, leader):
+        """Cycles traced in this process show up as waterfalls."""
+        with patch.object(config, "TRACING_ENABLED", True):
+            with get_cycle_tracer(test_bot.id).cycle():
+                with span("decision"):
+                    pass
+            response = await async_client.get(f"/api/bots/{test_bot.id}/cycle-profile")
+
+        data = response.json()
+        assert len(data["cycles"]) == 1
+        assert {"cycle", "decision"} <= set(data["histograms"])
+
+    async def test_worker_mode_reports_profile_elsewhere(self, async_client, test_bot, as_owner):
+        """With the bots in a separate worker, this process has no traces to serve."""
+        with patch.object(config, "SCHEDULER_MODE", "worker"):
+            response = await async_client.get(f"/api/bots/{test_bot.id}/cycle-profile")
+
+        assert response.status_code == 200
+        assert response.json()["in_process"] is False
@@ -0,0 +1,168 @@
+"""Tests for the LLM decision cache."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.blocks.block_llm_decision import LLMDecisionBlock
+from src.core.config import config
+from src.services.llm_decision_cache import LLMDecisionCache
+
+
+def coin(price: float, rsi: float = 55, ema20: float = 101, ema50: float = 100) -> dict:
+    return {
+        "current_price": price,
+        "technical_indicators": {"1h": {"rsi14": rsi, "ema20": ema20, "ema50": ema50}},
+    }
+
+
+class TestFingerprint:
+    """Quantization of market state."""
+
+    def test_small_price_move_within_tolerance_matches(self):
+        cache = LLMDecisionCache(price_tolerance_pct=0.01)
+        a = cache.fingerprint({"BTC/USDT": coin(50_010)}, [])
+        b = cache.fingerprint({"BTC/USDT": coin(50_030)}, [])
+        assert a == b
+
+    def test_large_price_move_changes_fingerprint(self):
+        cache = LLMDecisionCache(price_tolerance_pct=0.01)
+        a = cache.fingerprint({"BTC/USDT": coin(50_000)}, [])
+        b = cache.fingerprint({"BTC/USDT": coin(51_500)}, [])
+        assert a != b
+
+    def test_indicator_regime_change_changes_fingerprint(self):
+        cache = LLMDecisionCache()
+        base = cache.fingerprint({"BTC/USDT": coin(50_000)}, [])
+        assert cache.fingerprint({"BTC/USDT": coin(50_000, rsi=75)}, []) != base
+        assert cache.fingerprint({"BTC/USDT": coin(50_000, ema20=99)}, []) != base
+
+    def test_position_set_changes_fingerprint(self):
+        cache = LLMDecisionCache()
+        data = {"BTC/USDT": coin(50_000)}
+        position = SimpleNamespace(symbol="BTC/USDT", side="long")
+        assert cache.fingerprint(data, []) != cache.fingerprint(data, [position])
+        assert cache.fingerprint(data, [position]) == cache.fingerprint(
+            data, [{"symbol": "BTC/USDT", "side": "long"}]
+        )
+
+
+class TestDecisionCacheLookup:
+    """Hits, expiry and reporting."""
+
+    def test_hit_after_put_and_hit_rate(self):
+        cache = LLMDecisionCache()
+        assert cache.get("fp") is None
+        cache.put("fp", {"BTC/USDT": {"signal": "hold"}})
+
+        assert cache.get("fp") == {"BTC/USDT": {"signal": "hold"}}
+        assert cache.stats() == {
+            "enabled": True, "hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 1
+        }
+
+    def test_expired_entry_is_a_miss(self):
+        cache = LLMDecisionCache(max_age_seconds=60)
+        with patch("src.services.llm_decision_cache.monotonic", return_value=1000):
+            cache.put("fp", {"BTC/USDT": {"signal": "hold"}})
+        with patch("src.services.llm_decision_cache.monotonic", return_value=1061):
+            assert cache.get("fp") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_empty_decisions_not_cached(self):
+        cache = LLMDecisionCache()
+        cache.put("fp", {})
+        assert cache.get("fp") is None
+
+    def test_disabled_cache_never_hits(self):
+        cache = LLMDecisionCache(enabled=False)
+        cache.put("fp", {"BTC/USDT": {"signal": "hold"}})
+        assert cache.get("fp") is None
+
+    def test_oldest_entry_evicted(self):
+        cache = LLMDecisionCache(max_entries=2)
+        for fp in ("a", "b", "c"):
+            cache.put(fp, {"X": {}})
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+
+@pytest.mark.asyncio
+class TestLLMDecisionBlockCaching:
+    """Unchanged market state skips the LLM call."""
+
+    async def test_second_cycle_reuses_decisions(self):
+        llm_client = MagicMock()
+        llm_client.analyze_batched = AsyncMock(
+            return_value={"response": '{"BTC/USDT": {"signal": "hold", "confidence": 0.5}}'}
+        )
+        block = LLMDecisionBlock(llm_client=llm_client)
+        block.prompt_service = MagicMock()
+        block.prompt_service.get_multi_coin_decision.return_value = {
+            "static_prefix": "rules", "market_section": "market", "portfolio_section": "cash",
+        }
+        snapshot = SimpleNamespace(
+            price=50_000, rsi=55, ema_fast=101, ema_slow=100,
+            change_24h=1.0, atr=10, trend="bullish", ohlcv_1h=[],
+        )
+        context = {"positions": []}
+
+        await block.get_decisions({"BTC/USDT": snapshot}, context)
+        await block.get_decisions({"BTC/USDT": snapshot}, context)
+
+        assert llm_client.analyze_batched.await_count == 1
+        assert block.decision_cache.hits == 1
+
+    @pytest.mark.parametrize("repair", ['{"BTC/USDT": {"signal": "hold", "confidence": 0.5}}', "still not json"])
+    async def test_repaired_or_invalid_answers_are_not_reused(self, repair):
+        llm_client = MagicMock()
+        llm_client.analyze_batched = AsyncMock(return_value={"response": "not json"})
+        llm_client.analyze_market = AsyncMock(return_value={"response": repair})
+        block = LLMDecisionBlock(llm_client=llm_client)
+        block.prompt_service = MagicMock()
+        block.prompt_service.get_multi_coin_decision.return_value = {
+            "static_prefix": "rules", "market_section": "market", "portfolio_section": "cash",
+        }
+        snapshot = SimpleNamespace(
+            price=50_000, rsi=55, ema_fast=101, ema_slow=100,
+            change_24h=1.0, atr=10, trend="bullish", ohlcv_1h=[],
+        )
+
+        with patch.object(config, "LLM_REPAIR_ON_INVALID", True):
+            await block.get_decisions({"BTC/USDT": snapshot}, {"positions": []})
+            await block.get_decisions({"BTC/USDT": snapshot}, {"positions": []})
+
+        assert llm_client.analyze_batched.await_count == 2
+        assert block.decision_cache.hits == 0
+
+
+@pytest.mark.asyncio
+class TestLLMDecisionBlockStreaming:
+    """Symbols a failed stream did not deliver come from the dispatched call."""
+
+    async def test_failed_stream_falls_back_for_missing_symbols(self):
+        async def stream(**kwargs):
+            yield "BTC/USDT", {"signal": "close", "confidence": 0.5}
+            raise TimeoutError("stream stalled")
+
+        llm_client = MagicMock()
+        llm_client.stream_decisions = stream
+        llm_client.analyze_market = AsyncMock(return_value={"response": (
+            '{"BTC/USDT": {"signal": "close", "confidence": 0.5},'
+            ' "ETH/USDT": {"signal": "close", "confidence": 0.6}}'
+        )})
+        block = LLMDecisionBlock(llm_client=llm_client)
+        block.prompt_service = MagicMock()
+        block.prompt_service.get_multi_coin_decision.return_value = {"prompt": "p", "static_prefix": "rules"}
+        snapshot = SimpleNamespace(
+            price=50_000, rsi=55, ema_fast=101, ema_slow=100,
+            change_24h=1.0, atr=10, trend="bullish", ohlcv_1h=[],
+        )
+        market = {"BTC/USDT": snapshot, "ETH/USDT": snapshot}
+
+        decisions = [d async for d in block.stream_decisions(market, {"positions": []})]
+
+        assert [d.symbol for d in decisions] == ["BTC/USDT", "ETH/USDT"]
+        llm_client.analyze_market.assert_awaited_once()
+        cached = block.decision_cache.get(block.decision_cache.fingerprint(block._build_coins_data(market), []))
+        assert sorted(cached) == ["BTC/USDT", "ETH/USDT"]
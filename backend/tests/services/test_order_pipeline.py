@@ -0,0 +1,372 @@
+"""Tests for the idempotent live order pipeline."""
+
+import asyncio
+import uuid
+from time import monotonic
+from unittest.mock import AsyncMock
+
+import ccxt.async_support as ccxt
+import pytest
+
+from src.core.exchange_client import ExchangeClient
+from src.services import order_pipeline
+from src.services.order_pipeline import (
+    OrderPipeline,
+    OrderRole,
+    OrderState,
+    TrackedOrder,
+    client_order_id,
+    get_order_pipeline,
+    reconcile_pipelines,
+)
+
+ROUND_TRIP = 0.05
+
+
+class FakeExchange:
+    """Exchange keyed by client order id; can drop the first acknowledgement of an order.
+
+    ``hidden_lookups`` lookups miss an order right after it is placed, like OKX
+    answering 51603 (order does not exist) before a new order is queryable.
+    """
+
+    def __init__(self, lose_first_ack: bool = False, hidden_lookups: int = 0) -> None:
+        self.orders: dict = {}
+        self.submissions: list = []
+        self.cancelled: list = []
+        self.lose_first_ack = lose_first_ack
+        self.hidden_lookups = hidden_lookups
+
+    async def _place(self, cid, symbol, side, amount, status, params=None):
+        await asyncio.sleep(ROUND_TRIP)
+        self.submissions.append(cid)
+        if cid in self.orders:
+            raise ccxt.InvalidOrder('okx {"code":"1","data":[{"sCode":"51016","sMsg":"Duplicated clOrdId"}]}')
+        order = {"id": f"x{len(self.orders)}", "clientOrderId": cid, "symbol": symbol, "side": side,
+                 "amount": amount, "status": status, "params": params,
+                 "filled": amount if status == "closed" else 0, "average": 100.0 if status == "closed" else None,
+                 "fee": {"cost": 0.1 if status == "closed" else 0}}
+        self.orders[cid] = order
+        for algo in (params or {}).get("attachAlgoOrds", []):
+            # Attached protection rests under its own client id from the moment the entry is placed
+            algo_cid = algo["attachAlgoClOrdId"]
+            self.orders[algo_cid] = {"id": f"a{len(self.orders)}", "clientOrderId": algo_cid, "symbol": symbol,
+                                     "status": "open", "params": algo, "filled": 0}
+        if self.lose_first_ack:
+            self.lose_first_ack = False
+            await asyncio.sleep(10)  # Reached the exchange, but the response never arrives
+        return dict(order)
+
+    async def create_order(self, symbol, side, amount, order_type="market", client_order_id=None, params=None):
+        return await self._place(client_order_id, symbol, side, amount, "closed", params)
+
+    async def create_stop_loss_order(self, symbol, side, amount, stop_price, client_order_id=None):
+        return await self._place(client_order_id, symbol, side, amount, "open")
+
+    async def create_take_profit_order(self, symbol, side, amount, take_profit_price, client_order_id=None):
+        return await self._place(client_order_id, symbol, side, amount, "open")
+
+    async def fetch_order_by_client_id(self, symbol, cid, trigger=False):
+        await asyncio.sleep(ROUND_TRIP)
+        if self.hidden_lookups:
+            self.hidden_lookups -= 1
+            return None
+        order = self.orders.get(cid)
+        return dict(order) if order else None
+
+    async def cancel_order_by_client_id(self, symbol, cid, trigger=False):
+        order = self.orders.get(cid)
+        if order is None or order["status"] != "open":
+            return None
+        self.cancelled.append(cid)
+        order["status"] = "canceled"
+        return dict(order)
+
+
+class TestOrderState:
+    """Client ids are deterministic and state only moves forward."""
+
+    def test_client_ids_are_stable_per_intent_and_role(self):
+        intent = uuid.uuid4()
+
+        assert client_order_id(intent, OrderRole.ENTRY) == client_order_id(intent, OrderRole.ENTRY)
+        assert client_order_id(intent, OrderRole.ENTRY) != client_order_id(intent, OrderRole.STOP_LOSS)
+        assert len(client_order_id(intent, OrderRole.TAKE_PROFIT)) == 32
+        assert client_order_id(intent, OrderRole.EXIT).isalnum()
+
+    def test_apply_maps_exchange_status_and_partial_fills(self):
+        order = TrackedOrder("e1", OrderRole.ENTRY, "BTC/USDT", "buy", 2.0)
+
+        order.apply({"id": "1", "status": "open", "filled": 0.5})
+        assert order.state == OrderState.PARTIALLY_FILLED
+        order.apply({"id": "1", "status": "closed", "filled": 2.0, "average": 101.5})
+        assert (order.state, order.filled, order.average) == (OrderState.FILLED, 2.0, 101.5)
+
+    def test_terminal_orders_cannot_reopen(self):
+        order = TrackedOrder("e1", OrderRole.ENTRY, "BTC/USDT", "buy", 1.0, state=OrderState.FILLED)
+
+        order.apply({"status": "open"})  # Stale report
+        assert order.state == OrderState.FILLED
+        with pytest.raises(ValueError):
+            order.transition(OrderState.PENDING)
+
+
+@pytest.mark.asyncio
+class TestSubmission:
+    """Retries reuse the client id and never place an order twice."""
+
+    async def test_timed_out_order_is_found_instead_of_resubmitted(self):
+        exchange = FakeExchange(lose_first_ack=True)
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=0.2, retries=3)
+
+        order = await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0)
+
+        assert order.state == OrderState.FILLED and order.filled == 1.0
+        assert len(exchange.submissions) == 1
+        assert order.attempts == 1
+
+    async def test_duplicate_rejection_resolves_to_existing_order(self):
+        exchange = FakeExchange()
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+        intent = uuid.uuid4()
+        # A previous process already placed this exit
+        await exchange.create_order("BTC/USDT", "sell", 1.0, client_order_id=client_order_id(intent, OrderRole.EXIT))
+
+        order = await pipeline.close(intent, "BTC/USDT", "sell", 1.0)
+
+        assert order.state == OrderState.FILLED
+        assert len(exchange.orders) == 1 and order.attempts == 1
+
+    async def test_resubmission_of_invisible_order_resolves_duplicate_rejection(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange(lose_first_ack=True, hidden_lookups=1)
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=0.2, retries=3)
+
+        order = await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0)
+
+        # Timed out, not visible yet, resubmitted, rejected as a duplicate, then found
+        assert order.state == OrderState.FILLED and order.filled == 1.0
+        assert len(exchange.submissions) == 2 and len(exchange.orders) == 1
+
+    async def test_unconfirmed_order_raises_and_is_reconciled_later(self):
+        exchange = FakeExchange(lose_first_ack=True)
+        exchange.fetch_order_by_client_id = AsyncMock(side_effect=ConnectionError("down"))
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=0.2, retries=1)
+
+        with pytest.raises(ConnectionError):
+            await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0)
+
+        exchange.fetch_order_by_client_id = FakeExchange.fetch_order_by_client_id.__get__(exchange)
+        changed = await pipeline.reconcile()
+        assert [o.state for o in changed] == [OrderState.FILLED]
+        pipeline.forget_terminal()
+        assert not pipeline.orders
+
+    async def test_rejection_is_not_retried(self):
+        exchange = FakeExchange()
+        exchange.create_order = AsyncMock(side_effect=ValueError("insufficient margin"))
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+
+        with pytest.raises(ValueError):
+            await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0)
+        assert exchange.create_order.await_count == 1
+
+
+@pytest.mark.asyncio
+class TestProtectedEntry:
+    """Entries are protected with one round trip after the fill, or attached to the entry."""
+
+    async def test_stop_and_target_are_submitted_concurrently(self):
+        exchange = FakeExchange()
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+
+        start = monotonic()
+        result = await pipeline.open_protected(uuid.uuid4(), "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+        elapsed = monotonic() - start
+
+        assert result.is_protected and not result.errors
+        assert result.stop_loss.state == result.take_profit.state == OrderState.OPEN
+        assert (result.stop_loss.side, result.stop_loss.amount) == ("sell", 1.0)
+        assert elapsed < 3 * ROUND_TRIP  # Sequential would take three round trips
+        assert result.protected_after <= elapsed
+
+    async def test_attached_protection_is_one_order(self):
+        exchange = FakeExchange()
+        pipeline = OrderPipeline(exchange, attach_protection=True, submit_timeout=1, retries=3)
+
+        result = await pipeline.open_protected(uuid.uuid4(), "BTC/USDT", "sell", 1.0, 105.0, 90.0)
+
+        assert len(exchange.submissions) == 1
+        assert exchange.orders[result.entry.client_order_id]["params"] == {"attachAlgoOrds": [
+            {"attachAlgoClOrdId": result.stop_loss.client_order_id, "slTriggerPx": "105.0", "slOrdPx": "-1"},
+            {"attachAlgoClOrdId": result.take_profit.client_order_id, "tpTriggerPx": "90.0", "tpOrdPx": "-1"},
+        ]}
+        assert result.is_protected and result.attached
+
+    async def test_exit_cancels_attached_protection_by_its_client_ids(self):
+        exchange = FakeExchange()
+        pipeline = OrderPipeline(exchange, attach_protection=True, submit_timeout=1, retries=3)
+        intent = uuid.uuid4()
+        entry = await pipeline.open_protected(intent, "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+
+        await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0, entry_intent=intent)
+
+        assert sorted(exchange.cancelled) == sorted([entry.stop_loss.client_order_id, entry.take_profit.client_order_id])
+        assert all(exchange.orders[cid]["status"] == "canceled" for cid in exchange.cancelled)
+        assert entry.stop_loss.state == entry.take_profit.state == OrderState.CANCELED
+
+    async def test_failed_protection_is_reported_not_raised(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange()
+        exchange.create_take_profit_order = AsyncMock(side_effect=ValueError("bad trigger"))
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+
+        result = await pipeline.open_protected(uuid.uuid4(), "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+
+        assert result.entry.state == OrderState.FILLED
+        assert not result.is_protected and result.errors == ["bad trigger"]
+        assert result.take_profit.state == OrderState.REJECTED
+
+    async def test_unfilled_entry_is_cancelled_and_left_unprotected(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange()
+        exchange.create_order = lambda symbol, side, amount, **kw: exchange._place(
+            kw["client_order_id"], symbol, side, amount, "open"
+        )
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=0.2, retries=3)
+
+        result = await pipeline.open_protected(uuid.uuid4(), "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+
+        assert exchange.cancelled == [result.entry.client_order_id]
+        assert result.entry.state == OrderState.CANCELED and result.entry.filled == 0
+        assert not result.is_protected
+        assert result.stop_loss.state == OrderState.PENDING  # Never submitted
+
+    async def test_exit_cancels_resting_protection(self):
+        exchange = FakeExchange()
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+        intent = uuid.uuid4()
+        entry = await pipeline.open_protected(intent, "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+
+        await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0, entry_intent=intent)
+
+        assert sorted(exchange.cancelled) == sorted([entry.stop_loss.client_order_id, entry.take_profit.client_order_id])
+        assert entry.stop_loss.state == entry.take_profit.state == OrderState.CANCELED
+
+    async def test_exit_acknowledged_before_fill_waits_for_the_fill(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange()
+        exchange.create_order = AsyncMock(return_value={"id": "1", "status": "open", "filled": 0})
+        fill = {"id": "1", "status": "closed", "filled": 1.0, "average": 98.5, "fee": {"cost": 0.2}}
+        exchange.fetch_order_by_client_id = AsyncMock(side_effect=[{"id": "1", "status": "open"}, fill])
+        exchange.cancel_order_by_client_id = AsyncMock(return_value=None)
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+
+        order = await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0, entry_intent=uuid.uuid4())
+
+        assert (order.state, order.filled, order.average, order.fee) == (OrderState.FILLED, 1.0, 98.5, 0.2)
+        # Protection is only cancelled once the exit has filled
+        assert exchange.cancel_order_by_client_id.await_count == 2
+
+    async def test_unfilled_exit_raises_and_keeps_protection(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange()
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=0.2, retries=3)
+        intent = uuid.uuid4()
+        entry = await pipeline.open_protected(intent, "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+        exchange.create_order = lambda symbol, side, amount, **kw: exchange._place(
+            kw["client_order_id"], symbol, side, amount, "open"
+        )
+        exit_intent = uuid.uuid4()
+
+        with pytest.raises(ConnectionError):
+            await pipeline.close(exit_intent, "BTC/USDT", "sell", 1.0, entry_intent=intent)
+
+        assert exchange.cancelled == [client_order_id(exit_intent, OrderRole.EXIT)]
+        assert entry.stop_loss.state == entry.take_profit.state == OrderState.OPEN
+        assert client_order_id(exit_intent, OrderRole.EXIT) not in pipeline.orders
+
+    async def test_entry_acknowledged_before_fill_is_polled(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange()
+        ack = AsyncMock(return_value={"id": "1", "status": "open", "filled": 0})
+        fill = {"id": "1", "status": "closed", "filled": 0.4, "average": 99.0}
+        exchange.create_order = ack
+        exchange.fetch_order_by_client_id = AsyncMock(side_effect=[{"id": "1", "status": "open"}, fill])
+        exchange.create_stop_loss_order = AsyncMock(return_value={"id": "2", "status": "open"})
+        exchange.create_take_profit_order = AsyncMock(return_value={"id": "3", "status": "open"})
+        pipeline = OrderPipeline(exchange, attach_protection=False, submit_timeout=1, retries=3)
+
+        result = await pipeline.open_protected(uuid.uuid4(), "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+
+        assert result.is_protected
+        assert result.stop_loss.amount == result.take_profit.amount == 0.4
+
+
+@pytest.mark.asyncio
+class TestTriggerCancel:
+    """Algo orders are cancelled by the exchange id their client id resolves to."""
+
+    async def test_trigger_order_is_cancelled_by_algo_id(self):
+        client = ExchangeClient()
+        client.exchange = AsyncMock()
+        client.exchange.fetch_order.return_value = {"id": "777", "status": "open"}
+        client.exchange.cancel_order.return_value = {"id": "777", "status": "canceled"}
+
+        await client.cancel_order_by_client_id("BTC/USDT", "s123", trigger=True)
+
+        client.exchange.fetch_order.assert_awaited_once_with(
+            None, "BTC/USDT", params={"clientOrderId": "s123", "trigger": True}
+        )
+        client.exchange.cancel_order.assert_awaited_once_with("777", "BTC/USDT", params={"trigger": True})
+
+    async def test_trigger_order_already_gone_is_not_cancelled(self):
+        client = ExchangeClient()
+        client.exchange = AsyncMock()
+        client.exchange.fetch_order.return_value = {"id": "777", "status": "closed"}
+
+        assert await client.cancel_order_by_client_id("BTC/USDT", "s123", trigger=True) is None
+        client.exchange.cancel_order.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestPipelineRegistry:
+    """One pipeline per exchange client outlives the sessions that use it and is reconciled in the background."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_registry(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "_pipelines", {})
+
+    async def test_one_pipeline_per_exchange(self):
+        exchange = FakeExchange()
+
+        assert get_order_pipeline(exchange) is get_order_pipeline(exchange)
+        assert get_order_pipeline(FakeExchange()) is not get_order_pipeline(exchange)
+
+    async def test_unconfirmed_order_is_reconciled_then_forgotten(self):
+        exchange = FakeExchange(lose_first_ack=True)
+        exchange.fetch_order_by_client_id = AsyncMock(side_effect=ConnectionError("down"))
+        pipeline = get_order_pipeline(exchange)
+        pipeline.submit_timeout, pipeline.retries = 0.2, 1
+        with pytest.raises(ConnectionError):
+            await pipeline.close(uuid.uuid4(), "BTC/USDT", "sell", 1.0)
+        exchange.fetch_order_by_client_id = FakeExchange.fetch_order_by_client_id.__get__(exchange)
+
+        changed = await reconcile_pipelines()
+
+        assert [o.state for o in changed] == [OrderState.FILLED]
+        assert not pipeline.orders
+
+    async def test_unfilled_entry_leaves_nothing_to_reconcile(self, monkeypatch):
+        monkeypatch.setattr(order_pipeline, "FILL_POLL_SECONDS", 0)
+        exchange = FakeExchange()
+        exchange.create_order = lambda symbol, side, amount, **kw: exchange._place(
+            kw["client_order_id"], symbol, side, amount, "open"
+        )
+        pipeline = get_order_pipeline(exchange)
+        pipeline.submit_timeout = 0.2
+
+        await pipeline.open_protected(uuid.uuid4(), "BTC/USDT", "buy", 1.0, 95.0, 110.0)
+        await reconcile_pipelines()
+
+        assert not pipeline.orders
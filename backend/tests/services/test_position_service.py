@@ -334,6 +334,53 @@ class TestUpdateCurrentPrice:
             await service.update_current_price(test_position.id, Decimal("-100"))
 
 
+class TestBulkUpdatePrices:
+    """Tests for bulk mark-to-market."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_prices_updates_open_positions(self, db_session, test_bot):
+        """Test all positions are updated in one call, skipping closed ones."""
+        service = PositionService(db_session)
+        btc = await service.open_position(
+            test_bot.id, PositionOpen(symbol="BTC/USDT", side="long", quantity=Decimal("0.5"), entry_price=Decimal("45000"))
+        )
+        eth = await service.open_position(
+            test_bot.id, PositionOpen(symbol="ETH/USDT", side="short", quantity=Decimal("2"), entry_price=Decimal("3000"))
+        )
+        closed = await service.open_position(
+            test_bot.id, PositionOpen(symbol="SOL/USDT", side="long", quantity=Decimal("10"), entry_price=Decimal("100"))
+        )
+        await service.close_position(closed.id, Decimal("110"))
+
+        count = await service.bulk_update_prices(
+            {btc.id: Decimal("46000"), eth.id: Decimal("2900"), closed.id: Decimal("120")}
+        )
+
+        assert count == 3
+        for position in (btc, eth, closed):
+            await db_session.refresh(position)
+        assert btc.current_price == Decimal("46000")
+        assert eth.current_price == Decimal("2900")
+        assert closed.current_price == Decimal("110")
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_prices_empty(self, db_session):
+        """Test nothing is executed without prices."""
+        assert await PositionService(db_session).bulk_update_prices({}) == 0
+
+    @pytest.mark.asyncio
+    async def test_changed_prices_coalesces_unchanged(self, db_session, test_position):
+        """Test unchanged and missing prices are skipped."""
+        changes = PositionService.changed_prices(
+            [test_position], {test_position.symbol: test_position.current_price}
+        )
+        assert changes == {}
+
+        changes = PositionService.changed_prices([test_position], {test_position.symbol: Decimal("1")})
+        assert changes == {test_position.id: Decimal("1")}
+        assert PositionService.changed_prices([test_position], {}) == {}
+
+
 class TestGetPosition:
     """Tests for get_position method."""
 
@@ -10,7 +10,7 @@ Tests cover:
 
 import uuid
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
 import pytest
@@ -18,7 +18,10 @@ import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from src.core import account_reconciler
+from src.core.account_reconciler import AccountView
 from src.services.trade_executor_service import TradeExecutorService
+from src.services.order_pipeline import OrderRole, ProtectedEntry, TrackedOrder
 from src.services.position_service import PositionService, PositionOpen
 from src.models.position import Position, PositionSide, PositionStatus
 from src.models.trade import Trade, TradeSide
@@ -548,3 +551,128 @@ async def test_exit_trade_has_realized_pnl(db_session: AsyncSession, test_bot: B
     # Should have profit (1500 from price difference, minus fees)
     assert exit_trade is not None
     assert exit_trade.realized_pnl > 0
+
+
+# ==============================================================================
+# LIVE ENTRY TESTS
+# ==============================================================================
+
+
+def live_entry(filled: float):
+    entry = TrackedOrder("e1", OrderRole.ENTRY, "BTC/USDT", "buy", 0.1, filled=filled, average=45000.0)
+    return ProtectedEntry(entry, entry, entry, attached=True)
+
+
+LIVE_DECISION = {"symbol": "BTC/USDT", "side": "long", "stop_loss": 43650.0, "take_profit": 47700.0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_live_entry_retry_returns_recorded_position(db_session: AsyncSession, test_bot: Bot):
+    """Retrying a live entry for the same candle does not place a second order."""
+    executor = TradeExecutorService(db_session, exchange_client=MagicMock())
+    executor.orders.open_protected = AsyncMock(return_value=live_entry(filled=0.1))
+    test_bot.paper_trading = False
+
+    first, trade = await executor.execute_entry(test_bot, LIVE_DECISION, Decimal("45000.00"), candle=1_700_000_000)
+    again, no_trade = await executor.execute_entry(test_bot, LIVE_DECISION, Decimal("45000.00"), candle=1_700_000_000)
+
+    assert first is not None and trade is not None
+    assert again.id == first.id and no_trade is None
+    assert executor.orders.open_protected.await_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_unfilled_live_entry_is_not_recorded(db_session: AsyncSession, test_bot: Bot):
+    """An entry cancelled unfilled leaves no position and no capital change."""
+    executor = TradeExecutorService(db_session, exchange_client=MagicMock())
+    executor.orders.open_protected = AsyncMock(return_value=live_entry(filled=0))
+    test_bot.paper_trading = False
+    initial_capital = test_bot.capital
+
+    position, trade = await executor.execute_entry(test_bot, LIVE_DECISION, Decimal("45000.00"))
+
+    assert position is None and trade is None
+    assert (await db_session.execute(select(Position))).scalars().first() is None
+    assert (await db_session.get(Bot, test_bot.id)).capital == initial_capital
+
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_live_entry_without_free_margin_is_skipped(db_session: AsyncSession, test_bot: Bot):
+    """The reconciler's cached account view stops entries the exchange would reject."""
+    executor = TradeExecutorService(db_session, exchange_client=MagicMock())
+    executor.orders.open_protected = AsyncMock(return_value=live_entry(filled=0.1))
+    test_bot.paper_trading = False
+    view = AccountView()
+    view.apply_positions([], snapshot=True)
+    view.balance = {"free": {"USDT": 1}}
+
+    with patch.object(account_reconciler, "_current", MagicMock(view=view)):
+        position, trade = await executor.execute_entry(test_bot, LIVE_DECISION, Decimal("45000.00"))
+
+    assert position is None and trade is None
+    executor.orders.open_protected.assert_not_awaited()
+
+# ==============================================================================
+# LIVE EXIT TESTS
+# ==============================================================================
+
+
+async def open_live_position(db_session: AsyncSession, bot: Bot) -> Position:
+    bot.paper_trading = False
+    return await PositionService(db_session).open_position(bot.id, PositionOpen(
+        symbol="BTC/USDT", side="long", quantity=Decimal("0.1"), entry_price=Decimal("45000.00"),
+        stop_loss=Decimal("43650.00"), take_profit=Decimal("47700.00"), leverage=Decimal("10"),
+    ))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_live_exit_records_the_fill(db_session: AsyncSession, test_bot: Bot):
+    """A live exit is recorded at the exchange's average price and fee, not the quoted price."""
+    position = await open_live_position(db_session, test_bot)
+    executor = TradeExecutorService(db_session, exchange_client=MagicMock())
+    executor.orders.close = AsyncMock(return_value=TrackedOrder(
+        "x1", OrderRole.EXIT, "BTC/USDT", "sell", 0.1, filled=0.1, average=46000.0, fee=1.5,
+    ))
+
+    trade = await executor.execute_exit(position, Decimal("47000.00"))
+
+    assert (trade.quantity, trade.price, trade.fees) == (Decimal("0.1"), Decimal("46000.0"), Decimal("1.5"))
+    assert trade.realized_pnl == Decimal("98.5")
+    assert (await db_session.get(Position, position.id)).status == PositionStatus.CLOSED
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_partly_filled_live_exit_keeps_the_rest_open(db_session: AsyncSession, test_bot: Bot):
+    """Only the filled part of a live exit is closed."""
+    position = await open_live_position(db_session, test_bot)
+    executor = TradeExecutorService(db_session, exchange_client=MagicMock())
+    executor.orders.close = AsyncMock(return_value=TrackedOrder(
+        "x1", OrderRole.EXIT, "BTC/USDT", "sell", 0.1, filled=0.04, average=46000.0,
+    ))
+
+    trade = await executor.execute_exit(position, Decimal("46000.00"))
+
+    assert trade.quantity == Decimal("0.04")
+    stored = await db_session.get(Position, position.id)
+    assert stored.status == PositionStatus.OPEN and stored.quantity == Decimal("0.06")
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+async def test_unfilled_live_exit_leaves_position_open(db_session: AsyncSession, test_bot: Bot):
+    """An exit that filled nothing raises and records nothing."""
+    position = await open_live_position(db_session, test_bot)
+    executor = TradeExecutorService(db_session, exchange_client=MagicMock())
+    executor.orders.close = AsyncMock(side_effect=ConnectionError("Exit x1 not filled (canceled)"))
+
+    with pytest.raises(ConnectionError):
+        await executor.execute_exit(position, Decimal("46000.00"))
+
+    assert (await db_session.get(Position, position.id)).status == PositionStatus.OPEN
+    assert (await db_session.execute(select(Trade))).scalars().first() is None
@@ -0,0 +1,244 @@
+"""Tests for the cached exchange account reconciler."""
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core import account_reconciler, scheduler as scheduler_module
+from src.core.account_reconciler import AccountReconciler, AccountView, diff_positions, get_account_view
+from src.core.leader_election import StaleFencingTokenError
+from src.core.scheduler import BotScheduler
+from src.models.bot import Bot, BotStatus
+from src.models.position import Position, PositionSide, PositionStatus
+from src.models.trade import Trade
+
+AN_HOUR_AGO = datetime.utcnow() - timedelta(hours=1)
+
+
+def position(bot_id, symbol="BTC/USDT", side=PositionSide.LONG, quantity="0.5", price="100", opened_at=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        bot_id=bot_id,
+        symbol=symbol,
+        side=side,
+        quantity=Decimal(quantity),
+        current_price=Decimal(price),
+        opened_at=opened_at or AN_HOUR_AGO,
+    )
+
+
+def exchange_position(symbol="BTC/USDT:USDT", side="long", contracts=50, mark=100):
+    return {"symbol": symbol, "side": side, "contracts": contracts, "contractSize": 0.01, "markPrice": mark}
+
+
+def view(*positions):
+    v = AccountView()
+    v.apply_positions(positions, snapshot=True)
+    return v
+
+
+class TestDiffPositions:
+    """The database is corrected to whatever the exchange holds."""
+
+    def test_positions_gone_from_exchange_are_closed(self):
+        bot = uuid.uuid4()
+        btc, eth = position(bot), position(bot, symbol="ETH/USDT")
+
+        corrections = diff_positions([btc, eth], view(exchange_position()))
+
+        assert corrections.closed == [eth]
+        assert not corrections.resized and not corrections.prices
+
+    def test_size_drift_resizes_and_mark_price_updates(self):
+        btc = position(uuid.uuid4())
+
+        corrections = diff_positions([btc], view(exchange_position(contracts=30, mark=101)), tolerance=0.01)
+
+        assert corrections.resized == {btc.id: Decimal("0.30")}
+        assert corrections.prices == {btc.id: Decimal("101")}
+
+    def test_positions_opened_after_the_snapshot_are_left_alone(self):
+        fresh = position(uuid.uuid4(), opened_at=datetime.utcnow() + timedelta(seconds=1))
+
+        assert not diff_positions([fresh], view())
+
+    def test_shared_exchange_position_is_not_split(self):
+        rows = [position(uuid.uuid4()), position(uuid.uuid4())]
+
+        corrections = diff_positions(rows, view(exchange_position(contracts=80)), tolerance=0.01)
+
+        assert not corrections.resized and not corrections.closed
+
+    def test_untracked_exchange_positions_are_reported(self):
+        corrections = diff_positions([], view(exchange_position(side="short")))
+
+        assert corrections.untracked == [("BTC/USDT", "short")]
+
+    def test_streamed_zero_size_update_removes_position(self):
+        v = view(exchange_position(), exchange_position(symbol="ETH/USDT:USDT"))
+
+        v.apply_positions([exchange_position(contracts=0)])
+
+        assert list(v.positions) == [("ETH/USDT", "long")]
+
+
+def stored_position(bot_id, symbol, current_price="100"):
+    return Position(
+        bot_id=bot_id, symbol=symbol, side=PositionSide.LONG, quantity=Decimal("1"),
+        entry_price=Decimal("100"), current_price=Decimal(current_price), leverage=Decimal("5"),
+        status=PositionStatus.OPEN, opened_at=AN_HOUR_AGO,
+    )
+
+
+def live_exchange(positions, balance=None):
+    exchange = MagicMock(supports_account_stream=False)
+    exchange.fetch_positions = AsyncMock(return_value=positions)
+    exchange.fetch_balance = AsyncMock(return_value=balance or {"free": {"USDT": 900}})
+    return exchange
+
+
+@pytest.mark.asyncio
+class TestReconcileOnce:
+    """One account fetch per pass covers every running bot."""
+
+    async def test_single_fetch_for_all_running_bots(self):
+        bot_a, bot_b = uuid.uuid4(), uuid.uuid4()
+        exchange = live_exchange([exchange_position()])
+        reconciler = AccountReconciler(lambda: {bot_a, bot_b}, exchange=exchange, interval_seconds=30)
+        reconciler._load_open_positions = AsyncMock(return_value=[position(bot_a, quantity="0.5", price="100")])
+        reconciler._apply = AsyncMock()
+
+        await reconciler.reconcile_once()
+        await reconciler.reconcile_once()  # View still fresh: no second fetch
+
+        exchange.fetch_positions.assert_awaited_once()
+        exchange.fetch_balance.assert_awaited_once()
+        assert sorted(reconciler._load_open_positions.await_args.args[0]) == sorted([bot_a, bot_b])
+        reconciler._apply.assert_not_awaited()  # Already in sync
+        assert reconciler.view.free() == Decimal("900")
+
+    async def test_without_live_bots_the_exchange_is_never_called(self):
+        exchange = live_exchange([])
+        reconciler = AccountReconciler(lambda: set(), exchange=exchange)
+        reconciler._load_open_positions = AsyncMock(return_value=[])
+
+        assert not await reconciler.reconcile_once()
+        exchange.fetch_positions.assert_not_awaited()
+        reconciler._load_open_positions.assert_not_awaited()
+
+    async def test_view_is_kept_current_for_live_bots_without_positions(self):
+        exchange = live_exchange([])
+        reconciler = AccountReconciler(lambda: {uuid.uuid4()}, exchange=exchange)
+        reconciler._load_open_positions = AsyncMock(return_value=[])
+
+        assert not await reconciler.reconcile_once()
+        assert reconciler.view.free() == Decimal("900")
+
+    async def test_view_is_shared_while_running(self):
+        reconciler = AccountReconciler(lambda: set(), interval_seconds=30)
+
+        await reconciler.start()
+        assert get_account_view() is reconciler.view
+        await reconciler.stop()
+        assert get_account_view() is None
+
+
+@pytest.mark.asyncio
+class TestApplyCorrections:
+    """Corrections are written in one transaction."""
+
+    async def test_closed_on_exchange_credits_capital_once(self, test_db_engine, db_session, test_bot):
+        gone = stored_position(test_bot.id, "ETH/USDT", current_price="110")
+        drifted = stored_position(test_bot.id, "BTC/USDT")
+        drifted.quantity = Decimal("0.5")
+        db_session.add_all([gone, drifted])
+        await db_session.commit()
+
+        exchange = live_exchange([exchange_position(contracts=30, mark=102)])
+        reconciler = AccountReconciler(
+            lambda: {test_bot.id}, exchange=exchange, interval_seconds=30, fencing_token=lambda: 3
+        )
+        factory = async_sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+
+        with patch.object(account_reconciler, "AsyncSessionLocal", factory):
+            first = await reconciler.reconcile_once()
+            second = await reconciler.reconcile_once()
+
+        assert [p.id for p in first.closed] == [gone.id] and not second
+        async with factory() as db:
+            bot = (await db.execute(select(Bot).where(Bot.id == test_bot.id))).scalar_one()
+            rows = {p.symbol: p for p in (await db.execute(select(Position))).scalars()}
+            trades = list((await db.execute(select(Trade))).scalars())
+
+        # Margin 100 * 1 / 5 = 20 plus PnL 10 at the last marked price
+        assert bot.capital == Decimal("10030.00")
+        assert rows["ETH/USDT"].status == PositionStatus.CLOSED and rows["ETH/USDT"].version == 1
+        assert rows["BTC/USDT"].quantity == Decimal("0.3") and rows["BTC/USDT"].current_price == Decimal("102")
+        assert len(trades) == 1 and trades[0].realized_pnl == Decimal("10")
+        assert bot.fencing_token == 3
+
+    async def test_stale_leader_closes_nothing(self, test_db_engine, db_session, test_bot):
+        test_bot.fencing_token = 5
+        db_session.add(stored_position(test_bot.id, "ETH/USDT"))
+        await db_session.commit()
+
+        reconciler = AccountReconciler(lambda: {test_bot.id}, exchange=live_exchange([]), fencing_token=lambda: 4)
+        factory = async_sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+
+        with patch.object(account_reconciler, "AsyncSessionLocal", factory):
+            with pytest.raises(StaleFencingTokenError):
+                await reconciler.reconcile_once()
+
+        async with factory() as db:
+            assert (await db.execute(select(Position))).scalar_one().status == PositionStatus.OPEN
+            assert not list((await db.execute(select(Trade))).scalars())
+
+
+@pytest.mark.asyncio
+class TestScheduledReconciliation:
+    """The scheduler feeds the reconciler its live bots, whichever engine runs them."""
+
+    @pytest.mark.parametrize("use_blocks", [True, False])
+    async def test_live_bot_is_reconciled_and_paper_bot_is_not(
+        self, use_blocks, test_db_engine, db_session, test_bot
+    ):
+        paper_bot = Bot(
+            id=uuid.uuid4(), user_id=test_bot.user_id, name="paper_bot", model_name=test_bot.model_name,
+            initial_capital=Decimal("10000.00"), capital=Decimal("10000.00"), trading_symbols=["ETH/USDT"],
+            risk_params={}, status=BotStatus.ACTIVE, paper_trading=True,
+            created_at=datetime.utcnow(), updated_at=datetime.utcnow(),
+        )
+        test_bot.status, test_bot.paper_trading = BotStatus.ACTIVE, False
+        live = stored_position(test_bot.id, "ETH/USDT")
+        simulated = stored_position(paper_bot.id, "ETH/USDT")
+        db_session.add_all([paper_bot, live, simulated])
+        await db_session.commit()
+
+        scheduler = BotScheduler()
+        engine = MagicMock(start=AsyncMock(), stop=AsyncMock(), execution=None)
+        with patch.object(scheduler_module, "USE_BLOCKS", use_blocks), \
+                patch.object(scheduler_module, "get_llm_client", MagicMock()), \
+                patch.object(scheduler_module, "TradingOrchestrator", MagicMock(return_value=engine), create=True), \
+                patch.object(scheduler_module, "TradingEngine", MagicMock(return_value=engine), create=True):
+            assert await scheduler.start_bot(test_bot.id, db_session)
+            assert await scheduler.start_bot(paper_bot.id, db_session)
+
+        scheduler.account.exchange = live_exchange([])
+        factory = async_sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+        with patch.object(account_reconciler, "AsyncSessionLocal", factory):
+            corrections = await scheduler.account.reconcile_once()
+
+        # The live position is gone on the exchange; the paper one was never there
+        assert [p.id for p in corrections.closed] == [live.id]
+        async with factory() as db:
+            assert (await db.get(Position, simulated.id)).status == PositionStatus.OPEN
+
+        await scheduler.stop_bot(test_bot.id)
+        assert not scheduler.live_bots
+        await scheduler.stop_bot(paper_bot.id)
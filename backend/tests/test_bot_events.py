@@ -0,0 +1,137 @@
+"""Tests for bot lifecycle events and the scheduler's reaction to them."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core import bot_events
+from src.core.bot_events import BotEvent, BotEventListener, publish_bot_event
+from src.core.scheduler import BotScheduler
+from src.models.bot import BotStatus
+
+
+class FakePubSub:
+    """Pub/sub stand-in that replays queued messages."""
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.subscribed = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        if self.messages:
+            return self.messages.pop(0)
+        await asyncio.sleep(0.01)
+        return None
+
+    async def aclose(self):
+        self.closed = True
+
+
+def fake_redis(pubsub=None):
+    redis = MagicMock()
+    redis.publish = AsyncMock(return_value=1)
+    redis.pubsub = MagicMock(return_value=pubsub or FakePubSub([]))
+    return redis
+
+
+@pytest.mark.asyncio
+class TestBotEvents:
+    """Status changes travel as JSON over one channel."""
+
+    async def test_publish_serializes_status(self):
+        redis = fake_redis()
+        bot_id = uuid.uuid4()
+        with patch.object(bot_events, "get_redis_for", AsyncMock(return_value=redis)):
+            assert await publish_bot_event(bot_id, BotStatus.PAUSED)
+
+        channel, payload = redis.publish.await_args.args
+        assert BotEvent.from_json(payload) == BotEvent(bot_id=str(bot_id), status="paused")
+
+    async def test_publish_failure_is_not_raised(self):
+        with patch.object(bot_events, "get_redis_for", AsyncMock(side_effect=ConnectionError("down"))):
+            assert await publish_bot_event(uuid.uuid4(), "active") is False
+
+    async def test_malformed_event_ignored(self):
+        assert BotEvent.from_json("not json") is None
+        assert BotEvent.from_json('{"bot_id": "x"}') is None
+
+    async def test_listener_dispatches_messages_and_signals_connect(self):
+        event = BotEvent(bot_id="b1", status="active")
+        pubsub = FakePubSub([
+            {"type": "message", "data": "garbage"},
+            {"type": "message", "data": event.to_json()},
+        ])
+        received = []
+        connected = MagicMock()
+
+        async def on_event(e):
+            received.append(e)
+
+        listener = BotEventListener(on_event, on_connect=connected)
+        with patch.object(bot_events, "get_redis_for", AsyncMock(return_value=fake_redis(pubsub))):
+            await listener.start()
+            for _ in range(50):
+                if received:
+                    break
+                await asyncio.sleep(0.01)
+            assert listener.connected
+            await listener.stop()
+
+        assert received == [event]
+        connected.assert_called_once()
+        assert pubsub.closed and not listener.connected
+
+
+@pytest.mark.asyncio
+class TestSchedulerEvents:
+    """The scheduler starts and stops engines on events, not on the next sweep."""
+
+    async def test_active_event_starts_engine(self):
+        scheduler = BotScheduler()
+        scheduler.start_bot = AsyncMock(return_value=True)
+        bot_id = uuid.uuid4()
+
+        await scheduler._on_bot_event(BotEvent(bot_id=str(bot_id), status="active"))
+
+        scheduler.start_bot.assert_awaited_once_with(bot_id)
+
+    async def test_active_event_for_running_engine_is_noop(self):
+        scheduler = BotScheduler()
+        bot_id = uuid.uuid4()
+        scheduler.active_engines[bot_id] = MagicMock()
+        scheduler.start_bot = AsyncMock()
+
+        await scheduler._on_bot_event(BotEvent(bot_id=str(bot_id), status="active"))
+
+        scheduler.start_bot.assert_not_awaited()
+
+    async def test_pause_event_stops_engine(self):
+        scheduler = BotScheduler()
+        bot_id = uuid.uuid4()
+        scheduler.active_engines[bot_id] = MagicMock()
+        scheduler.stop_bot = AsyncMock(return_value=True)
+
+        await scheduler._on_bot_event(BotEvent(bot_id=str(bot_id), status="paused"))
+
+        scheduler.stop_bot.assert_awaited_once_with(bot_id)
+
+    async def test_sweep_interval_slows_while_subscribed(self):
+        scheduler = BotScheduler()
+        assert scheduler.sweep_interval == 30
+
+        scheduler.events.connected = True
+        assert scheduler.sweep_interval == 300
+
+    async def test_requested_sweep_wakes_monitor(self):
+        scheduler = BotScheduler()
+        scheduler.request_sweep()
+
+        await asyncio.wait_for(scheduler._wait_for_sweep(), timeout=1)
+
+        assert not scheduler._sweep_requested.is_set()
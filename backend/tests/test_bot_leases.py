@@ -0,0 +1,240 @@
+"""Tests for lease-based bot sharding across workers."""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core import bot_leases
+from src.core.bot_events import BotEvent
+from src.core.bot_leases import BotLeaseManager, fair_share
+from src.core.config import config
+from src.core.scheduler import BotScheduler
+
+
+class FakeRedis:
+    """Shared in-memory Redis with a manual clock, emulating the lease scripts."""
+
+    def __init__(self):
+        self.now_ms = 0
+        self.values = {}  # key -> (value, expires_at_ms)
+        self.zsets = {}
+
+    def advance(self, seconds):
+        self.now_ms += int(seconds * 1000)
+
+    def _get(self, key):
+        value, expires_at = self.values.get(key, (None, 0))
+        return value if expires_at > self.now_ms else None
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and self._get(key) is not None:
+            return None
+        self.values[key] = (value, self.now_ms + px)
+        return True
+
+    async def get(self, key):
+        return self._get(key)
+
+    async def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    def register_script(self, script):
+        async def run(keys, args):
+            if script == bot_leases.RENEW_LEASES_SCRIPT:
+                renewed = []
+                for index, key in enumerate(keys, start=1):
+                    if self._get(key) == args[0]:
+                        self.values[key] = (args[0], self.now_ms + args[1])
+                        renewed.append(index)
+                return renewed
+            if script == bot_leases.RELEASE_LEASE_SCRIPT:
+                if self._get(keys[0]) == args[0]:
+                    del self.values[keys[0]]
+                    return 1
+                return 0
+            # Heartbeat, on the fake clock rather than wall time
+            workers = self.zsets.setdefault(keys[0], {})
+            workers[args[0]] = self.now_ms
+            for member, seen in list(workers.items()):
+                if seen <= self.now_ms - args[1]:
+                    del workers[member]
+            return len(workers)
+        return run
+
+
+def worker(redis, name):
+    return BotLeaseManager(worker_id=name, ttl_seconds=30, redis=redis)
+
+
+def bots(count):
+    return [SimpleNamespace(id=uuid.uuid4(), name=f"bot-{i}") for i in range(count)]
+
+
+def scheduler_for(redis, name):
+    scheduler = BotScheduler(leases=worker(redis, name))
+
+    async def launch(bot_id, db=None):
+        scheduler.active_engines[bot_id] = MagicMock(stop=AsyncMock())
+        return True
+
+    scheduler._launch_engine = launch
+    return scheduler
+
+
+@pytest.mark.asyncio
+class TestBotLeaseManager:
+    """A lease is held by one worker at a time and lapses if not renewed."""
+
+    async def test_acquire_is_exclusive(self):
+        redis = FakeRedis()
+        a, b = worker(redis, "a"), worker(redis, "b")
+        bot_id = uuid.uuid4()
+
+        assert await a.acquire(bot_id)
+        assert not await b.acquire(bot_id)
+        assert await a.acquire(bot_id)  # Re-acquiring our own lease succeeds
+        assert await b.owner(bot_id) == "a"
+
+    async def test_expired_lease_moves_and_stale_owner_cannot_renew(self):
+        redis = FakeRedis()
+        a, b = worker(redis, "a"), worker(redis, "b")
+        kept, lost = uuid.uuid4(), uuid.uuid4()
+        await a.acquire(kept)
+        await a.acquire(lost)
+
+        redis.advance(20)
+        assert await a.renew([kept]) == {kept}
+        redis.advance(20)
+
+        assert await b.acquire(lost)
+        assert not await b.acquire(kept)
+        assert await a.renew([kept, lost]) == {kept}
+
+    async def test_release_only_by_owner(self):
+        redis = FakeRedis()
+        a, b = worker(redis, "a"), worker(redis, "b")
+        bot_id = uuid.uuid4()
+        await a.acquire(bot_id)
+
+        assert not await b.release(bot_id)
+        assert await a.release(bot_id)
+        assert await b.acquire(bot_id)
+
+    async def test_heartbeat_counts_live_workers(self):
+        redis = FakeRedis()
+        a, b = worker(redis, "a"), worker(redis, "b")
+
+        assert await a.heartbeat() == 1
+        assert await b.heartbeat() == 2
+        redis.advance(31)
+        assert await a.heartbeat() == 1
+
+    async def test_heartbeat_script_runs_on_server_clock(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        redis = fakeredis.FakeAsyncRedis()
+        a, b = worker(redis, "a"), worker(redis, "b")
+
+        assert await a.heartbeat() == 1
+        assert await b.heartbeat() == 2
+        # Scores come from Redis TIME, not from either worker's clock
+        (_, score), = await redis.zrange(config.WORKER_HEARTBEAT_KEY, 0, 0, withscores=True)
+        seconds, microseconds = await redis.time()
+        assert abs(seconds * 1000 + microseconds // 1000 - score) < 5_000
+
+    async def test_fair_share(self):
+        assert fair_share(10, 3) == 4
+        assert fair_share(2, 3) == 1
+        assert fair_share(5, 0) == 5
+
+
+@pytest.mark.asyncio
+class TestSchedulerSharding:
+    """Workers split the active bots, never run one twice and take over dead workers' bots."""
+
+    async def test_workers_split_bots_without_overlap(self):
+        redis = FakeRedis()
+        active = bots(5)
+        a, b = scheduler_for(redis, "a"), scheduler_for(redis, "b")
+        await a.leases.heartbeat()
+        await b.leases.heartbeat()
+
+        with patch("src.core.scheduler.publish_bot_event", AsyncMock()):
+            await a._rebalance(active, db=None)
+            await b._rebalance(active, db=None)
+
+        assert len(a.active_engines) == 3 and len(b.active_engines) == 2
+        assert set(a.active_engines).isdisjoint(b.active_engines)
+        assert set(a.active_engines) | set(b.active_engines) == {bot.id for bot in active}
+
+    async def test_joining_worker_gets_bots_handed_over(self):
+        redis = FakeRedis()
+        active = bots(4)
+        a, b = scheduler_for(redis, "a"), scheduler_for(redis, "b")
+        published = AsyncMock()
+
+        with patch("src.core.scheduler.publish_bot_event", published):
+            await a._rebalance(active, db=None)
+            assert len(a.active_engines) == 4
+
+            await b.leases.heartbeat()
+            await a._rebalance(active, db=None)
+            await b._rebalance(active, db=None)
+
+        assert len(a.active_engines) == 2 and len(b.active_engines) == 2
+        assert set(a.active_engines).isdisjoint(b.active_engines)
+        assert published.await_count == 2
+
+    async def test_dead_workers_bots_are_reclaimed(self):
+        redis = FakeRedis()
+        active = bots(2)
+        a, b = scheduler_for(redis, "a"), scheduler_for(redis, "b")
+        await a.leases.heartbeat()
+        await b.leases.heartbeat()
+        with patch("src.core.scheduler.publish_bot_event", AsyncMock()):
+            await a._rebalance(active, db=None)
+            await b._rebalance(active, db=None)
+
+            # a stops renewing; after the TTL b is the only live worker
+            redis.advance(31)
+            await b.renew_leases()
+            await b._rebalance(active, db=None)
+
+        assert set(b.active_engines) == {bot.id for bot in active}
+
+    async def test_lost_lease_stops_engine(self):
+        redis = FakeRedis()
+        scheduler = scheduler_for(redis, "a")
+        bot_id = uuid.uuid4()
+        assert await scheduler.start_bot(bot_id)
+
+        redis.advance(31)
+        await worker(redis, "b").acquire(bot_id)
+        await scheduler.renew_leases()
+
+        assert bot_id not in scheduler.active_engines
+        assert await scheduler.leases.owner(bot_id) == "b"
+
+    async def test_unreachable_redis_stops_bots_before_lease_expires(self):
+        scheduler = scheduler_for(FakeRedis(), "a")
+        bot_id = uuid.uuid4()
+        assert await scheduler.start_bot(bot_id)
+        scheduler.leases.heartbeat = AsyncMock(side_effect=ConnectionError("down"))
+
+        await scheduler.renew_leases()
+        assert bot_id in scheduler.active_engines
+
+        scheduler._lease_renewed_at[bot_id] -= 25
+        await scheduler.renew_leases()
+        assert bot_id not in scheduler.active_engines
+
+    async def test_active_event_defers_to_sweep(self):
+        scheduler = scheduler_for(FakeRedis(), "a")
+        scheduler.start_bot = AsyncMock()
+
+        await scheduler._on_bot_event(BotEvent(bot_id=str(uuid.uuid4()), status="active"))
+
+        scheduler.start_bot.assert_not_awaited()
+        assert scheduler._sweep_requested.is_set()
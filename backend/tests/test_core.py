@@ -4,12 +4,15 @@ Tests critical components: config, risk manager, rate limiter.
 """
 
 import os
+import subprocess
 import sys
 
 import pytest
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 # Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, BACKEND_DIR)
 
 
 class TestConfig:
@@ -44,6 +47,37 @@ class TestConfig:
         assert 0 < config.DEFAULT_TAKE_PROFIT_PCT < 1
         assert config.DEFAULT_LEVERAGE >= 1
 
+    def test_paper_matching_env_overrides(self):
+        """Paper matching settings honour their environment overrides."""
+        env = {
+            **os.environ,
+            "PAPER_MATCHING_ENABLED": "false",
+            "PAPER_ORDER_LATENCY_MS": "0",
+            "PAPER_MAX_PARTICIPATION": "0.5",
+        }
+        script = (
+            "from src.core.config import config; "
+            "print(config.PAPER_MATCHING_ENABLED, config.PAPER_ORDER_LATENCY_MS, config.PAPER_MAX_PARTICIPATION)"
+        )
+
+        # Class attributes are read at import, so check them in a fresh interpreter
+        result = subprocess.run(
+            [sys.executable, "-c", script], env=env, cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.split() == ["False", "0.0", "0.5"]
+
+    def test_order_pipeline_env_overrides(self):
+        """Live order pipeline settings honour their environment overrides."""
+        env = {**os.environ, "ORDER_ATTACHED_PROTECTION": "false", "ORDER_SUBMIT_TIMEOUT_SECONDS": "3"}
+        script = "from src.core.config import config; print(config.ORDER_ATTACHED_PROTECTION, config.ORDER_SUBMIT_TIMEOUT_SECONDS)"
+
+        result = subprocess.run(
+            [sys.executable, "-c", script], env=env, cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        )
+
+        assert result.stdout.split() == ["False", "3.0"]
+
     def test_allowed_symbols_not_empty(self):
         """ALLOWED_SYMBOLS should contain valid trading pairs."""
         from src.core.config import config
@@ -0,0 +1,49 @@
+"""Tests for per-stage cycle deadlines."""
+
+import asyncio
+
+import pytest
+
+from src.core.cycle_budget import CycleBudget
+
+
+def budget(total=1.0):
+    return CycleBudget(total_seconds=total, shares={"fetch": 0.1, "decision": 0.5})
+
+
+@pytest.mark.asyncio
+class TestCycleBudget:
+    """Stages get a share of the budget and fall back on timeout."""
+
+    async def test_stage_within_deadline_returns_result(self):
+        b = budget()
+
+        assert await b.run("fetch", asyncio.sleep(0, result="data")) == "data"
+        assert not b.timed_out("fetch")
+        assert b.report()["stages"]["fetch"]["deadline"] == pytest.approx(0.1, abs=0.01)
+
+    async def test_timeout_returns_fallback_and_reports_overrun(self):
+        b = budget()
+
+        result = await b.run("fetch", asyncio.sleep(1, result="late"), fallback="stale")
+
+        assert result == "stale"
+        assert b.timed_out("fetch")
+        assert b.report()["overruns"] == ["fetch"]
+
+    async def test_deadline_capped_by_remaining_budget(self):
+        b = budget(total=0.2)
+        await asyncio.sleep(0.15)
+
+        assert b.deadline_for("decision") <= 0.05 + 1e-3
+
+    async def test_unlisted_stage_gets_remaining_budget(self):
+        b = budget(total=0.5)
+
+        assert b.deadline_for("other") == pytest.approx(0.5, abs=0.01)
+
+    async def test_recorded_stage(self):
+        b = budget()
+        b.record("execution", 2.0, 1.0, timed_out=True)
+
+        assert b.overruns == ["execution"]
@@ -0,0 +1,169 @@
+"""Tests for the candle-aligned cycle clock and shared per-tick fetches."""
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.blocks import block_market_data
+from src.blocks.block_market_data import MarketDataBlock, RawMarketData
+from src.core import cycle_clock
+from src.core.cycle_clock import CycleClock, TimingWheel
+
+
+class TestTimingWheel:
+    """Entries fire on the first tick at or after their time, once."""
+
+    def test_fires_due_entries_only(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=8, now=100.0)
+        wheel.schedule("a", 102.0)
+        wheel.schedule("b", 105.5)
+
+        assert wheel.advance(101.9) == []
+        assert wheel.advance(102.0) == ["a"]
+        assert wheel.advance(105.9) == []
+        assert wheel.advance(106.0) == ["b"]
+        assert len(wheel) == 0
+
+    def test_entries_beyond_one_rotation_wait_their_turn(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=8, now=0.0)
+        wheel.schedule("near", 3.0)
+        wheel.schedule("far", 11.0)  # Same slot as "near", one rotation later
+
+        assert wheel.advance(3.0) == ["near"]
+        assert wheel.advance(10.0) == []
+        assert wheel.advance(11.0) == ["far"]
+
+    def test_long_stall_fires_everything_overdue(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=8, now=0.0)
+        for i in range(20):
+            wheel.schedule(i, float(i + 1))
+
+        assert sorted(wheel.advance(15.0)) == list(range(15))
+        assert len(wheel) == 5
+
+    def test_reschedule_and_cancel(self):
+        wheel = TimingWheel(tick_seconds=1.0, slots=8, now=0.0)
+        wheel.schedule("a", 2.0)
+        wheel.schedule("a", 4.0)
+        wheel.schedule("b", 3.0)
+        wheel.cancel("b")
+
+        assert wheel.advance(3.0) == []
+        assert wheel.advance(4.0) == ["a"]
+
+
+class TestCycleClockSlots:
+    """Cycles fire after candle close plus a stable per-bot jitter."""
+
+    def test_fire_time_is_candle_close_plus_offset_and_jitter(self):
+        clock = CycleClock(tick_seconds=0.5, close_offset_seconds=2, jitter_window_seconds=20)
+        bot_id = uuid.uuid4()
+        jitter = clock.jitter(bot_id, 180)
+
+        fire_at, candle_close = clock.next_fire(bot_id, 180, now=1_000_000.0)
+
+        assert candle_close % 180 == 0
+        assert fire_at == candle_close + 2 + jitter
+        assert 0 <= jitter < 20
+        assert fire_at > 1_000_000.0 and fire_at - 180 <= 1_000_000.0
+
+    def test_jitter_spreads_bots_across_window(self):
+        clock = CycleClock(tick_seconds=0.5, close_offset_seconds=2, jitter_window_seconds=20)
+        jitters = [clock.jitter(uuid.uuid4(), 180) for _ in range(200)]
+
+        assert max(jitters) - min(jitters) > 15
+        assert sum(j < 10 for j in jitters) > 60 and sum(j >= 10 for j in jitters) > 60
+
+    def test_jitter_window_fits_inside_short_intervals(self):
+        clock = CycleClock(tick_seconds=0.5, close_offset_seconds=2, jitter_window_seconds=20)
+        bot_id = uuid.UUID(int=9_999)
+
+        assert clock.jitter(bot_id, 10) < 10 - 2
+
+
+@pytest.mark.asyncio
+class TestCycleClockWaiting:
+    """Waiting bots are released by the wheel with the candle they fire for."""
+
+    async def test_wait_returns_candle_close_when_slot_passes(self):
+        clock = CycleClock(tick_seconds=0.5, close_offset_seconds=2, jitter_window_seconds=0)
+        bot_id = uuid.uuid4()
+
+        with patch.object(cycle_clock, "time", return_value=1_000_000.0):
+            clock.wheel = TimingWheel(0.5, now=1_000_000.0)
+            waiter = asyncio.create_task(clock.wait(bot_id, 60))
+            await asyncio.sleep(0)
+
+        assert clock.fire_due(1_000_000.0 + 10) == 0
+        assert clock.fire_due(1_000_062.0) == 1
+        assert await waiter == 1_000_020.0  # First minute close after 1_000_000
+        assert not clock._waiters and len(clock.wheel) == 0
+
+    async def test_cancelled_wait_leaves_nothing_scheduled(self):
+        clock = CycleClock(tick_seconds=0.5, close_offset_seconds=2, jitter_window_seconds=0)
+        waiter = asyncio.create_task(clock.wait(uuid.uuid4(), 60))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert not clock._waiters and len(clock.wheel) == 0
+
+
+@pytest.mark.asyncio
+class TestSharedTickFetch:
+    """Bots cycling on the same candle share one fetch per symbol."""
+
+    @pytest.fixture(autouse=True)
+    def clear_fetches(self):
+        block_market_data._tick_fetches.clear()
+        yield
+        block_market_data._tick_fetches.clear()
+
+    def make_block(self, fetch):
+        with patch.object(block_market_data, "get_exchange_client"), \
+                patch.object(block_market_data, "MarketDataService"):
+            block = MarketDataBlock(paper_trading=True)
+        block.symbols = ["BTC/USDT", "ETH/USDT"]
+        block._fetch_raw = fetch
+        return block
+
+    async def test_one_fetch_per_symbol_per_tick(self):
+        calls = []
+
+        async def fetch(symbol):
+            calls.append(symbol)
+            await asyncio.sleep(0.01)
+            return RawMarketData(symbol=symbol, ticker={"last": 1})
+
+        blocks = [self.make_block(fetch) for _ in range(5)]
+        results = await asyncio.gather(*(b.fetch_all_raw(tick=1_000_080.0) for b in blocks))
+
+        assert sorted(calls) == ["BTC/USDT", "ETH/USDT"]
+        assert all(set(r) == {"BTC/USDT", "ETH/USDT"} for r in results)
+
+        await blocks[0].fetch_all_raw(tick=1_000_260.0)
+        assert len(calls) == 4
+        assert all(key[2] == 1_000_260.0 for key in block_market_data._tick_fetches)
+
+    async def test_failed_fetch_is_retried_by_next_bot(self):
+        fetch = AsyncMock(side_effect=[ConnectionError("down"), None, RawMarketData("BTC/USDT", {}), None])
+        block = self.make_block(fetch)
+        block.symbols = ["BTC/USDT"]
+
+        assert await block.fetch_all_raw(tick=1.0) == {}
+        await asyncio.sleep(0)
+        assert set(await block.fetch_all_raw(tick=1.0)) == set()
+        await asyncio.sleep(0)
+        assert set(await block.fetch_all_raw(tick=1.0)) == {"BTC/USDT"}
+
+    async def test_without_tick_every_bot_fetches(self):
+        fetch = AsyncMock(return_value=RawMarketData("BTC/USDT", {}))
+        block = self.make_block(fetch)
+
+        await block.fetch_all_raw()
+        await block.fetch_all_raw()
+
+        assert fetch.await_count == 4
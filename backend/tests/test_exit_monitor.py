@@ -0,0 +1,106 @@
+"""Tests for the process-wide exit monitor."""
+
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.blocks.block_execution import ExecutionResult
+from src.core.exit_monitor import ExitMonitor
+from src.models.position import PositionSide
+
+
+def position(bot_id, symbol="BTC/USDT", side=PositionSide.LONG, stop_loss="95", take_profit="110"):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        bot_id=bot_id,
+        symbol=symbol,
+        side=side,
+        stop_loss=Decimal(stop_loss),
+        take_profit=Decimal(take_profit),
+        current_price=Decimal("100"),
+    )
+
+
+def execution(result=None):
+    block = MagicMock()
+    block.close_position = AsyncMock(return_value=result or ExecutionResult(success=True))
+    return block
+
+
+def monitor(executions, positions, tickers):
+    exchange = MagicMock()
+    exchange.fetch_tickers = AsyncMock(return_value=tickers)
+    m = ExitMonitor(lambda: executions, exchange=exchange, interval_seconds=1)
+    m._load_open_positions = AsyncMock(return_value=positions)
+    m._mark_to_market = AsyncMock()
+    return m
+
+
+@pytest.mark.asyncio
+class TestExitMonitor:
+    """One shared price fetch drives exit checks for every bot."""
+
+    async def test_single_fetch_for_all_bots_and_symbols(self):
+        bot_a, bot_b = uuid.uuid4(), uuid.uuid4()
+        positions = [position(bot_a), position(bot_b), position(bot_b, symbol="ETH/USDT")]
+        m = monitor(
+            {bot_a: execution(), bot_b: execution()},
+            positions,
+            {"BTC/USDT": {"last": 100}, "ETH/USDT": {"last": 100}},
+        )
+
+        assert await m.check_once() == 0
+        m.exchange.fetch_tickers.assert_awaited_once()
+        assert sorted(m.exchange.fetch_tickers.await_args.args[0]) == ["BTC/USDT", "ETH/USDT"]
+        m._load_open_positions.assert_awaited_once()
+        m._mark_to_market.assert_not_awaited()  # Prices unchanged
+
+    async def test_open_positions_marked_to_market_in_one_call(self):
+        bot = uuid.uuid4()
+        btc, eth = position(bot), position(bot, symbol="ETH/USDT")
+        m = monitor({bot: execution()}, [btc, eth], {"BTC/USDT": {"last": 101}, "ETH/USDT": {"last": 100}})
+
+        await m.check_once()
+
+        m._mark_to_market.assert_awaited_once_with({btc.id: Decimal("101")})
+        assert btc.current_price == Decimal("101")
+
+    async def test_triggered_positions_close_through_owning_bot(self):
+        bot_a, bot_b = uuid.uuid4(), uuid.uuid4()
+        exec_a, exec_b = execution(), execution()
+        long_a = position(bot_a)
+        short_b = position(bot_b, side=PositionSide.SHORT, stop_loss="120", take_profit="95")
+        m = monitor({bot_a: exec_a, bot_b: exec_b}, [long_a, short_b], {"BTC/USDT": {"last": 94}})
+
+        assert await m.check_once() == 2
+        exec_a.close_position.assert_awaited_once_with(long_a, Decimal("94"), "stop_loss")
+        exec_b.close_position.assert_awaited_once_with(short_b, Decimal("94"), "take_profit")
+        assert m.positions["BTC/USDT"] == []
+
+    async def test_streamed_tick_checks_cached_positions(self):
+        bot = uuid.uuid4()
+        exec_block = execution()
+        m = monitor({bot: exec_block}, [position(bot)], {"BTC/USDT": {"last": 100}})
+        await m.check_once()
+
+        assert await m.on_tick("BTC/USDT", 111) == 1
+        assert exec_block.close_position.await_args.args[2] == "take_profit"
+        assert await m.on_tick("BTC/USDT", 120) == 0
+
+    async def test_position_closed_by_cycle_is_dropped(self):
+        bot = uuid.uuid4()
+        exec_block = execution(ExecutionResult(success=False, error="Position already closed"))
+        m = monitor({bot: exec_block}, [position(bot)], {"BTC/USDT": {"last": 90}})
+
+        assert await m.check_once() == 0
+        assert m.positions["BTC/USDT"] == []
+
+    async def test_no_running_bots_skips_queries(self):
+        m = monitor({}, [], {})
+
+        assert await m.check_once() == 0
+        m._load_open_positions.assert_not_awaited()
+        m.exchange.fetch_tickers.assert_not_awaited()
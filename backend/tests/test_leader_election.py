@@ -0,0 +1,213 @@
+"""Tests for scheduler leader election and fencing tokens."""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.blocks import block_execution
+from src.blocks.block_execution import ExecutionBlock
+from src.blocks.orchestrator import TradingOrchestrator
+from src.core import leader_election
+from src.core.leader_election import LeaderElection, StaleFencingTokenError, claim_fence
+from src.core.scheduler import BotScheduler
+from src.models.bot import Bot
+from src.models.position import Position, PositionSide, PositionStatus
+
+
+class FakeRedis:
+    """In-memory Redis with a manual clock, emulating the election scripts."""
+
+    def __init__(self):
+        self.now_ms = 0
+        self.values = {}  # key -> (value, expires_at_ms)
+        self.counters = {}
+
+    def advance(self, seconds):
+        self.now_ms += int(seconds * 1000)
+
+    def _get(self, key):
+        value, expires_at = self.values.get(key, (None, 0))
+        return value if expires_at > self.now_ms else None
+
+    def register_script(self, script):
+        async def run(keys, args):
+            current = self._get(keys[0])
+            if script == leader_election.RESIGN_SCRIPT:
+                if current == args[0]:
+                    del self.values[keys[0]]
+                    return 1
+                return 0
+            if current:
+                holder, token = current.rsplit("|", 1)
+                if holder == args[0]:
+                    self.values[keys[0]] = (current, self.now_ms + args[1])
+                    return int(token)
+                return 0
+            token = self.counters[keys[1]] = self.counters.get(keys[1], 0) + 1
+            self.values[keys[0]] = (f"{args[0]}|{token}", self.now_ms + args[1])
+            return token
+        return run
+
+
+def candidate(redis, name):
+    events = MagicMock()
+    election = LeaderElection(
+        on_elected=AsyncMock(side_effect=lambda token: events.elected(token)),
+        on_demoted=AsyncMock(side_effect=lambda: events.demoted()),
+        holder_id=name,
+        redis=redis,
+    )
+    return election, events
+
+
+@pytest.mark.asyncio
+class TestLeaderElection:
+    """One leader at a time, with a new, higher fencing token every term."""
+
+    async def test_single_leader_and_renewal(self):
+        redis = FakeRedis()
+        a, a_events = candidate(redis, "a")
+        b, b_events = candidate(redis, "b")
+
+        await a.campaign()
+        await b.campaign()
+        redis.advance(5)
+        await a.campaign()
+
+        assert a.token == 1 and not b.is_leader
+        a_events.elected.assert_called_once_with(1)
+        b_events.elected.assert_not_called()
+
+    async def test_takeover_after_leader_dies_and_old_leader_steps_down(self):
+        redis = FakeRedis()
+        a, a_events = candidate(redis, "a")
+        b, b_events = candidate(redis, "b")
+        await a.campaign()
+
+        redis.advance(11)  # a stopped renewing
+        await b.campaign()
+        await a.campaign()
+
+        assert b.token == 2
+        b_events.elected.assert_called_once_with(2)
+        a_events.demoted.assert_called_once()
+        assert not a.is_leader
+
+    async def test_resign_hands_over_immediately(self):
+        redis = FakeRedis()
+        a, _ = candidate(redis, "a")
+        b, _ = candidate(redis, "b")
+        await a.campaign()
+
+        await a.stop()
+        await b.campaign()
+
+        assert b.token == 2 and not a.is_leader
+
+    async def test_leader_steps_down_before_term_can_lapse_when_redis_unreachable(self):
+        a, a_events = candidate(FakeRedis(), "a")
+        await a.campaign()
+        a._redis = MagicMock(register_script=MagicMock(side_effect=ConnectionError("down")))
+        a._campaign_script = None
+
+        await a.campaign()
+        assert a.is_leader
+
+        a._renewed_at -= 9
+        await a.campaign()
+        assert not a.is_leader
+        a_events.demoted.assert_called_once()
+
+    async def test_failed_takeover_hands_the_role_back(self):
+        redis = FakeRedis()
+        a, a_events = candidate(redis, "a")
+        a._on_elected = AsyncMock(side_effect=RuntimeError("database down"))
+        b, _ = candidate(redis, "b")
+
+        await a.campaign()
+        await b.campaign()
+
+        assert not a.is_leader and b.token == 2
+        a_events.demoted.assert_called_once()  # Undoes whatever the takeover started
+
+
+@pytest.mark.asyncio
+class TestFencing:
+    """Writes under an older token are rejected once a newer one has written."""
+
+    async def test_claim_fence_rejects_stale_token(self, db_session, test_bot):
+        bot_id = test_bot.id
+        await claim_fence(db_session, bot_id, 2)
+        await db_session.commit()
+
+        with pytest.raises(StaleFencingTokenError):
+            await claim_fence(db_session, bot_id, 1)
+        await db_session.rollback()
+
+        await claim_fence(db_session, bot_id, 2)
+        await db_session.commit()
+        token = (await db_session.execute(select(Bot.fencing_token).where(Bot.id == bot_id))).scalar_one()
+        assert token == 2
+
+    async def test_stale_close_stops_the_cycle(self, test_db_engine, db_session, test_bot):
+        test_bot.fencing_token = 2
+        position = Position(
+            bot_id=test_bot.id, symbol="BTC/USDT", side=PositionSide.LONG, quantity=Decimal("1"),
+            entry_price=Decimal("100"), current_price=Decimal("100"), leverage=Decimal("5"),
+            status=PositionStatus.OPEN, opened_at=datetime.utcnow(),
+        )
+        db_session.add(position)
+        await db_session.commit()
+        factory = async_sessionmaker(test_db_engine, class_=AsyncSession, expire_on_commit=False)
+        execution = ExecutionBlock(test_bot.id, fencing_token=1)
+
+        with patch.object(block_execution, "AsyncSessionLocal", factory):
+            with pytest.raises(StaleFencingTokenError):
+                await execution.close_position(position, Decimal("110"))
+
+        async with factory() as db:
+            assert (await db.get(Position, position.id)).status == PositionStatus.OPEN
+
+    async def test_stale_cycle_commit_is_raised(self):
+        uow = MagicMock(commit=AsyncMock(side_effect=StaleFencingTokenError("stale")))
+        orchestrator = SimpleNamespace(_uow=uow)
+        budget = MagicMock(deadline_for=MagicMock(return_value=5.0))
+
+        with pytest.raises(StaleFencingTokenError):
+            await TradingOrchestrator._record_snapshot(orchestrator, budget)
+
+
+@pytest.mark.asyncio
+class TestSchedulerLeadership:
+    """Only the elected replica runs bots."""
+
+    async def test_follower_does_not_start_bots(self):
+        scheduler = BotScheduler(elect=True)
+
+        assert not scheduler.is_leader
+        assert not await scheduler.start_bot(uuid.uuid4())
+        assert not scheduler.active_engines
+
+    async def test_elected_activates_and_demoted_stops_engines(self):
+        scheduler = BotScheduler(elect=True)
+        scheduler._monitor_bots = AsyncMock()
+        scheduler.is_running = True
+        engine = MagicMock(stop=AsyncMock())
+
+        with patch.object(scheduler.events, "start", AsyncMock()), \
+                patch.object(scheduler.exit_monitor, "start", AsyncMock()), \
+                patch.object(scheduler.account, "start", AsyncMock()):
+            await scheduler._on_elected(7)
+        scheduler.active_engines[uuid.uuid4()] = engine
+
+        assert scheduler.fencing_token == 7 and scheduler.monitor_task is not None
+        await scheduler._on_demoted()
+
+        assert not scheduler.active_engines and scheduler.fencing_token is None
+        engine.stop.assert_awaited_once()
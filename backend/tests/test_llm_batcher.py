@@ -0,0 +1,104 @@
+"""Tests for cross-bot LLM request batching."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.core.llm_batcher import LLMBatcher
+
+
+def merged_result(parsed):
+    return {
+        "response": json.dumps(parsed),
+        "parsed_decisions": parsed,
+        "tokens_used": 3000,
+        "cached_tokens": 1000,
+        "cost": 0.03,
+    }
+
+
+@pytest.mark.asyncio
+class TestLLMBatcher:
+    """Concurrent bots sharing a prefix get one call, split back per bot."""
+
+    async def test_concurrent_members_share_one_call(self):
+        call = AsyncMock(return_value=merged_result({
+            "P1": {"BTC/USDT": {"signal": "buy_to_enter"}},
+            "P2": {"BTC/USDT": {"signal": "hold"}},
+        }))
+        batcher = LLMBatcher(call, window_seconds=0.05, max_members=8, max_tokens=5000)
+
+        first, second = await asyncio.gather(
+            batcher.submit("deepseek-chat", "RULES|", "market|", "cash 100", "bot-a", 2048),
+            batcher.submit("deepseek-chat", "RULES|", "market|", "cash 900", "bot-b", 2048),
+        )
+
+        call.assert_awaited_once()
+        model, prompt, max_tokens, _, cache_prefix = call.await_args.args
+        assert prompt.startswith("RULES|market|")
+        assert prompt.count("market|") == 1
+        assert "=== PORTFOLIO P1 ===\ncash 100" in prompt
+        assert "=== PORTFOLIO P2 ===\ncash 900" in prompt
+        assert max_tokens == 4096
+        assert cache_prefix == "RULES|"
+
+        assert first["parsed_decisions"] == {"BTC/USDT": {"signal": "buy_to_enter"}}
+        assert json.loads(second["response"]) == {"BTC/USDT": {"signal": "hold"}}
+        assert first["cost"] == pytest.approx(0.015)
+        assert first["tokens_used"] == 1500
+        assert first["batch_size"] == 2
+        assert batcher.stats()["calls_saved"] == 1
+
+    async def test_single_member_sends_plain_prompt(self):
+        call = AsyncMock(return_value={"response": "{}", "parsed_decisions": {}})
+        batcher = LLMBatcher(call, window_seconds=0.01)
+
+        await batcher.submit("deepseek-chat", "RULES|", "market|", "cash", "bot-a", 1024, 0.7)
+
+        call.assert_awaited_once_with("deepseek-chat", "RULES|market|cash", 1024, 0.7, "RULES|")
+
+    async def test_missing_member_falls_back_to_own_call(self):
+        call = AsyncMock(side_effect=[
+            merged_result({"P1": {"ETH/USDT": {"signal": "hold"}}}),
+            {"response": "{}", "parsed_decisions": {}},
+        ])
+        batcher = LLMBatcher(call, window_seconds=0.05)
+
+        _, second = await asyncio.gather(
+            batcher.submit("m", "R|", "M|", "a", "bot-a"),
+            batcher.submit("m", "R|", "M|", "b", "bot-b"),
+        )
+
+        assert call.await_count == 2
+        assert call.await_args.args[1] == "R|M|b"
+        assert "batch_size" not in second
+
+    async def test_call_failure_propagates_to_every_member(self):
+        call = AsyncMock(side_effect=RuntimeError("provider down"))
+        batcher = LLMBatcher(call, window_seconds=0.05)
+
+        results = await asyncio.gather(
+            batcher.submit("m", "R|", "M|", "a", "bot-a"),
+            batcher.submit("m", "R|", "M|", "b", "bot-b"),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_members_with_different_market_data_are_not_merged(self):
+        call = AsyncMock(return_value=merged_result({"P1": {}, "P2": {}}))
+        batcher = LLMBatcher(call, window_seconds=0.05)
+
+        await asyncio.gather(
+            batcher.submit("m", "R|", "It is 2024-01-01 12:00 UTC.\nBTC 100|", "a", "bot-a"),
+            batcher.submit("m", "R|", "It is 2024-01-01 12:01 UTC.\nBTC 100|", "b", "bot-b"),
+            batcher.submit("m", "R|", "It is 2024-01-01 12:01 UTC.\nBTC 101|", "c", "bot-c"),
+        )
+
+        # The clock line differs between a and b but their market data matches
+        prompts = sorted(args.args[1] for args in call.await_args_list)
+        assert call.await_count == 2
+        assert prompts[0].startswith("R|It is 2024-01-01 12:00 UTC.\nBTC 100|") and "PORTFOLIO P2" in prompts[0]
+        assert prompts[1] == "R|It is 2024-01-01 12:01 UTC.\nBTC 101|c"
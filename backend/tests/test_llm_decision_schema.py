@@ -0,0 +1,95 @@
+"""Tests for decision schema validation, repair requests and parse metrics."""
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.llm_decision_schema import (
+    DecisionParseMetrics,
+    validate_decisions,
+    validate_with_repair,
+)
+
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+VALID = {
+    "BTC/USDT": {"signal": "hold", "confidence": 0.6, "justification": "range"},
+    "ETH/USDT": {"signal": "buy_to_enter", "confidence": 0.8, "stop_loss": 3000, "take_profit": 3400},
+}
+
+
+class TestValidateDecisions:
+    """Schema errors are explicit instead of silent HOLDs."""
+
+    def test_valid_response_in_code_fence(self):
+        result = validate_decisions(f"Reasoning...\n```json\n{json.dumps(VALID)}\n```", SYMBOLS)
+
+        assert result.ok
+        assert result.decisions["ETH/USDT"]["stop_loss"] == 3000
+
+    def test_aliases_and_percent_confidence_normalized(self):
+        text = json.dumps({"decisions": {
+            "BTC/USDT": {"signal": "WAIT", "confidence": 55},
+            "ETH/USDT": {"signal": "short", "confidence": "0.7"},
+        }})
+
+        result = validate_decisions(text, SYMBOLS)
+
+        assert result.ok
+        assert result.decisions["BTC/USDT"] == {"signal": "hold", "confidence": 0.55, "justification": ""}
+        assert result.decisions["ETH/USDT"]["signal"] == "sell_to_enter"
+
+    def test_invalid_and_missing_symbols_reported(self):
+        text = json.dumps({"BTC/USDT": {"signal": "moon", "confidence": 0.6}})
+
+        result = validate_decisions(text, SYMBOLS)
+
+        assert result.decisions == {}
+        assert any(e.startswith("BTC/USDT.signal") for e in result.errors)
+        assert "ETH/USDT: missing" in result.errors
+
+    def test_non_json_response(self):
+        assert validate_decisions("I cannot decide", SYMBOLS).errors == ["response is not a JSON object"]
+
+
+@pytest.mark.asyncio
+class TestRepair:
+    """One targeted repair request, merged with what was already valid."""
+
+    async def test_repair_fills_invalid_symbol(self, monkeypatch):
+        metrics = DecisionParseMetrics()
+        monkeypatch.setattr("src.services.llm_decision_schema._parse_metrics", metrics)
+        llm_client = MagicMock()
+        llm_client.analyze_market = AsyncMock(return_value={"response": json.dumps(VALID)})
+        broken = json.dumps({"BTC/USDT": VALID["BTC/USDT"], "ETH/USDT": {"signal": "buy_to_enter"}})
+
+        result = await validate_with_repair(llm_client, "deepseek-chat", broken, SYMBOLS)
+
+        assert result.ok
+        assert set(result.decisions) == set(SYMBOLS)
+        kwargs = llm_client.analyze_market.await_args.kwargs
+        assert kwargs["json_mode"] is True
+        assert "ETH/USDT.confidence" in kwargs["prompt"]
+        assert metrics.stats() == {
+            "responses": 1, "failures": 1, "failure_rate": 1.0, "repairs": 1, "repair_success_rate": 1.0,
+        }
+
+    async def test_valid_response_makes_no_repair_call(self):
+        llm_client = MagicMock()
+        llm_client.analyze_market = AsyncMock()
+
+        result = await validate_with_repair(llm_client, "m", json.dumps(VALID), SYMBOLS)
+
+        assert result.ok
+        llm_client.analyze_market.assert_not_awaited()
+
+    async def test_failed_repair_keeps_valid_part(self):
+        llm_client = MagicMock()
+        llm_client.analyze_market = AsyncMock(side_effect=RuntimeError("down"))
+
+        result = await validate_with_repair(
+            llm_client, "m", json.dumps({"BTC/USDT": VALID["BTC/USDT"]}), SYMBOLS
+        )
+
+        assert list(result.decisions) == ["BTC/USDT"]
+        assert result.errors == ["ETH/USDT: missing"]
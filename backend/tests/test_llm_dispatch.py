@@ -0,0 +1,124 @@
+"""Tests for LLM call dispatch: deadlines, retries, hedging and circuit breakers."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.core.llm_dispatch import CircuitBreaker, LLMDispatcher, ProviderUnavailableError
+
+
+def make_dispatcher(**kwargs) -> LLMDispatcher:
+    defaults = dict(fallback_providers=["qwen"], call_timeout=0.2, total_deadline=1.0, max_retries=2)
+    defaults.update(kwargs)
+    return LLMDispatcher(**defaults)
+
+
+class TestCircuitBreaker:
+    """Breaker opens after consecutive failures and probes after cool-down."""
+
+    def test_opens_after_threshold_and_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+        with patch("src.core.llm_dispatch.monotonic", return_value=100):
+            breaker.record_failure()
+            assert breaker.allow()
+            breaker.record_failure()
+            assert breaker.state == "open"
+            assert not breaker.allow()
+        with patch("src.core.llm_dispatch.monotonic", return_value=131):
+            assert breaker.state == "half_open"
+            breaker.record_failure()  # Failed probe re-opens immediately
+        with patch("src.core.llm_dispatch.monotonic", return_value=140):
+            assert breaker.state == "open"
+
+    def test_success_closes(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+        breaker.record_failure()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+class TestLLMDispatcher:
+    """Dispatch behaviour."""
+
+    async def test_retries_fail_over_to_fallback(self):
+        dispatcher = make_dispatcher(hedge_enabled=False)
+        calls = []
+
+        async def call(provider):
+            calls.append(provider)
+            if provider == "deepseek":
+                raise ConnectionError("down")
+            return {"response": "{}"}
+
+        with patch("src.core.llm_dispatch.asyncio.sleep", new=AsyncMock()):
+            result = await dispatcher.dispatch("deepseek", call)
+
+        assert calls == ["deepseek", "qwen"]
+        assert result["provider"] == "qwen"
+
+    async def test_hung_call_bounded_by_deadline(self):
+        dispatcher = make_dispatcher(
+            fallback_providers=[], call_timeout=0.05, total_deadline=0.2, hedge_enabled=False
+        )
+
+        async def call(provider):
+            await asyncio.sleep(10)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(ProviderUnavailableError):
+            await dispatcher.dispatch("deepseek", call)
+        assert loop.time() - start < 1.0
+
+    async def test_open_circuit_skips_provider(self):
+        dispatcher = make_dispatcher(hedge_enabled=False)
+        dispatcher.breaker("deepseek").opened_at = 10**12  # Far future: stays open
+        call = AsyncMock(return_value={"response": "{}"})
+
+        await dispatcher.dispatch("deepseek", call)
+
+        call.assert_awaited_once_with("qwen")
+
+    async def test_value_error_not_retried(self):
+        dispatcher = make_dispatcher()
+        call = AsyncMock(side_effect=ValueError("bad model"))
+
+        with pytest.raises(ValueError):
+            await dispatcher.dispatch("deepseek", call)
+        assert call.await_count == 1
+
+    async def test_hedge_fires_after_p95_and_fast_provider_wins(self):
+        dispatcher = make_dispatcher(call_timeout=1.0, hedge_enabled=True)
+        for _ in range(30):
+            dispatcher.latency("deepseek").record(0.01)
+
+        async def call(provider):
+            if provider == "deepseek":
+                await asyncio.sleep(5)
+            return {"response": provider}
+
+        result = await dispatcher.dispatch("deepseek", call)
+
+        assert result["provider"] == "qwen"
+        assert dispatcher.stats()["deepseek"]["samples"] == 30
+
+    async def test_reservation_wait_is_not_provider_latency(self):
+        dispatcher = make_dispatcher(fallback_providers=[], call_timeout=0.1, total_deadline=0.2)
+        reserved = []
+
+        async def reserve(provider):
+            await asyncio.sleep(0.3)  # Queued behind the rate limit, longer than both deadlines
+            reserved.append(provider)
+
+        async def call(provider):
+            await asyncio.sleep(0.05)
+            return {"response": "{}"}
+
+        result = await dispatcher.dispatch("deepseek", call, reserve)
+
+        assert result["provider"] == "deepseek"
+        assert reserved == ["deepseek"]
+        assert dispatcher.breaker("deepseek").failures == 0
+        assert max(dispatcher.latency("deepseek").samples) < 0.1
@@ -0,0 +1,201 @@
+"""Tests for the vectorized paper-trading matching engine."""
+
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.blocks import block_execution
+from src.blocks.block_execution import ExecutionBlock
+from src.core.paper_matching import (
+    BUY, LIMIT, MARKET, SELL, STOP, Candles, MatchingParams, OrderBatch, PaperExchange, PaperMatchingEngine,
+)
+from src.models.position import PositionSide
+
+PARAMS = MatchingParams(
+    taker_fee=0.001, maker_fee=0.0005, base_slippage_bps=2.0, range_slippage=0.05,
+    impact_coef=1.0, max_slippage_bps=100.0, latency_seconds=5.0, max_participation=0.1,
+)
+
+
+def candles(*rows):
+    """Hourly candles from (open, high, low, close, volume) rows, starting at t=0."""
+    return Candles.from_ohlcv([[i * 3_600_000, *row] for i, row in enumerate(rows)])
+
+
+class TestFillNow:
+    """Immediate fills for the live paper bot."""
+
+    def test_slippage_is_adverse_and_grows_with_size_and_range(self):
+        engine = PaperMatchingEngine(PARAMS)
+        calm = candles((100, 100.5, 99.5, 100, 1_000))
+        wild = candles((100, 105, 95, 100, 1_000))
+        orders = OrderBatch.build(side=[BUY, SELL, BUY], quantity=[1, 1, 50])
+
+        fills = engine.fill_now(orders, np.array(100.0), calm)
+        wild_fills = engine.fill_now(orders, np.array(100.0), wild)
+
+        assert fills.price[0] > 100 > fills.price[1]
+        assert fills.slippage_bps[2] > fills.slippage_bps[0]
+        assert wild_fills.slippage_bps[0] > fills.slippage_bps[0]
+        assert fills.fees[0] == pytest.approx(fills.price[0] * 0.001)
+
+    def test_partial_fill_capped_by_candle_volume(self):
+        engine = PaperMatchingEngine(PARAMS)
+        fills = engine.fill_now(OrderBatch.build(side=[BUY], quantity=[500]), np.array(100.0), candles((100, 101, 99, 100, 1_000)))
+
+        assert fills.filled[0] == 100  # 10% of 1_000
+
+    def test_forming_candle_does_not_size_the_fill(self):
+        engine = PaperMatchingEngine(PARAMS)
+        # Two closed candles averaging 1_000, then a candle a minute old
+        data = candles((100, 101, 99, 100, 800), (100, 101, 99, 100, 1_200), (100, 100.1, 99.9, 100, 10))
+
+        fills = engine.fill_now(OrderBatch.build(side=[BUY], quantity=[500]), np.array(100.0), data)
+        closed = engine.fill_now(OrderBatch.build(side=[BUY], quantity=[500]), np.array(100.0), candles((100, 101, 99, 100, 1_000)))
+
+        assert fills.filled[0] == 100  # 10% of the trailing average, not of 10
+        assert fills.slippage_bps[0] == pytest.approx(closed.slippage_bps[0])
+        assert fills.candle[0] == 2
+
+    def test_triggered_stop_and_take_profit(self):
+        engine = PaperMatchingEngine(PARAMS)
+        orders = OrderBatch.build(side=[SELL, SELL], quantity=[1, 1], kind=[STOP, LIMIT], trigger=[95, 110])
+
+        fills = engine.fill_now(orders, np.array([93.0, 111.0]), candles((100, 112, 92, 100, 1_000)), allow_partial=False)
+
+        assert fills.price[0] < 93  # Worse of trigger and quote, plus slippage
+        assert fills.price[1] == 110 and fills.slippage_bps[1] == 0
+        assert fills.fees[1] == pytest.approx(110 * 0.0005)
+
+
+class TestReplay:
+    """Replaying orders against recorded candles."""
+
+    def test_latency_pushes_fill_to_next_candle_open(self):
+        engine = PaperMatchingEngine(PARAMS)
+        data = candles((100, 101, 99, 100, 1_000), (102, 103, 101, 102, 1_000), (104, 105, 103, 104, 1_000))
+        # Active at -5s, 3_599s and 3_603s: the last one misses the 3_600s open by its latency
+        orders = OrderBatch.build(side=[BUY, BUY, BUY], quantity=[1, 1, 1], submitted_at=[-10.0, 3_594.0, 3_598.0])
+
+        fills = engine.match(orders, data)
+
+        assert list(fills.candle) == [0, 1, 2]
+        assert fills.price[0] == pytest.approx(100 * (1 + fills.slippage_bps[0] / 1e4))
+        assert 102 < fills.price[1] < 104 < fills.price[2]
+
+    def test_trigger_orders_fill_on_first_touch_with_gaps(self):
+        engine = PaperMatchingEngine(PARAMS)
+        data = candles(
+            (100, 101, 99, 100, 1_000),
+            (100, 100, 96, 97, 1_000),
+            (90, 91, 88, 89, 1_000),   # Gaps down through the sell stop
+            (112, 115, 111, 114, 1_000),  # Gaps up through the sell limit
+        )
+        orders = OrderBatch.build(
+            side=[SELL, SELL, BUY, SELL],
+            quantity=[1, 1, 1, 1],
+            kind=[STOP, LIMIT, LIMIT, STOP],
+            trigger=[95, 110, 50, 80],
+            submitted_at=[-10.0] * 4,
+        )
+
+        fills = engine.match(orders, data)
+
+        assert list(fills.candle) == [2, 3, -1, -1]
+        assert fills.price[0] < 90  # Filled at the gap open, not the trigger
+        assert fills.price[1] == 112  # Limit filled at the better open
+        assert np.isnan(fills.price[2]) and fills.filled[2] == 0
+
+    def test_throughput(self):
+        engine = PaperMatchingEngine(PARAMS)
+        rng = np.random.default_rng(7)
+        closes = 100 + np.cumsum(rng.normal(0, 0.5, 500))
+        data = Candles(
+            ts=np.arange(500) * 3600.0, open=closes, high=closes + 1, low=closes - 1,
+            close=closes, volume=np.full(500, 1_000.0),
+        )
+        n = 10_000
+        orders = OrderBatch.build(
+            side=rng.choice([BUY, SELL], n),
+            quantity=rng.uniform(0.1, 5, n),
+            kind=rng.choice([MARKET, STOP, LIMIT], n),
+            trigger=closes[0] + rng.normal(0, 5, n),
+            submitted_at=rng.uniform(0, 400 * 3600, n),
+        )
+
+        start = time.perf_counter()
+        fills = engine.match(orders, data)
+        elapsed = time.perf_counter() - start
+        print(f"\nMatched {n} orders against 500 candles in {elapsed * 1000:.0f}ms")
+
+        assert elapsed < 2.0
+        assert (~fills.unfilled).sum() > n / 2
+
+
+@pytest.mark.asyncio
+class TestPaperExchange:
+    """Exchange stand-in: immediate market fills, resting protective orders."""
+
+    async def test_entry_then_stop_and_target(self):
+        exchange = PaperExchange(PaperMatchingEngine(PARAMS))
+        exchange.add_candle("BTC/USDT", [0, 100, 101, 99, 100, 1_000])
+
+        entry = await exchange.create_order("BTC/USDT", "buy", 2)
+        stop = await exchange.create_stop_loss_order("BTC/USDT", "sell", 2, 95)
+        target = await exchange.create_take_profit_order("BTC/USDT", "sell", 2, 110)
+
+        assert entry["status"] == "closed" and entry["average"] > 100
+        assert len(await exchange.fetch_open_orders("BTC/USDT")) == 2
+
+        assert exchange.add_candle("BTC/USDT", [3_600_000, 100, 104, 97, 103, 1_000]) == []
+        filled = exchange.add_candle("BTC/USDT", [7_200_000, 103, 111, 102, 109, 1_000])
+
+        assert [o["id"] for o in filled] == [target["id"]]
+        assert exchange.orders[target["id"]]["average"] == 110
+        await exchange.cancel_order(stop["id"])
+        assert await exchange.fetch_open_orders() == []
+
+
+class TestExecutionBlockPaperFills:
+    """Paper entries and exits go through the engine when candles are available."""
+
+    def make_block(self):
+        with patch.object(block_execution, "get_exchange_client"), \
+                patch.object(block_execution, "PaperMatchingEngine", lambda: PaperMatchingEngine(PARAMS)):
+            return ExecutionBlock(uuid.uuid4(), paper_trading=True)
+
+    def test_entry_is_partially_filled_with_slippage(self):
+        block = self.make_block()
+        rows = [[0, 100, 101, 99, 100, 5]]  # Only 0.5 fillable
+
+        position, trade, debit = block._build_entry(
+            Decimal("1000"), "BTC/USDT", "long", 0.5, Decimal("100"), Decimal("95"), Decimal("110"), 2, rows
+        )
+
+        assert position.quantity == Decimal("0.5")
+        assert position.entry_price > Decimal("100")
+        assert debit == position.quantity * position.entry_price / 2 + trade.fees
+
+    def test_take_profit_exit_fills_at_limit_with_maker_fee(self):
+        block = self.make_block()
+        position = SimpleNamespace(
+            id=uuid.uuid4(), symbol="BTC/USDT", side=PositionSide.LONG, quantity=Decimal("1"),
+            entry_price=Decimal("100"), leverage=Decimal("1"), stop_loss=Decimal("95"), take_profit=Decimal("110"),
+        )
+
+        trade, pnl, _ = block._build_exit(position, Decimal("111"), "take_profit", [[0, 105, 112, 104, 111, 1_000]])
+
+        assert trade.price == Decimal("110") and pnl == Decimal("10")
+        assert trade.fees == Decimal("0.055")
+
+    def test_without_candles_fills_at_quote(self):
+        block = self.make_block()
+        position, _, _ = block._build_entry(
+            Decimal("1000"), "BTC/USDT", "long", 0.5, Decimal("100"), Decimal("95"), Decimal("110"), 2
+        )
+        assert position.entry_price == Decimal("100") and position.quantity == Decimal("10")
@@ -0,0 +1,141 @@
+"""Tests for the stable-prefix prompt layout and provider prompt caching."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.llm_client import LLMClient
+from src.services.multi_coin_prompt.prompt_builder import PromptBuilder
+
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+
+
+def build_parts(builder: PromptBuilder, cash: float, fear_greed: int):
+    return builder.build_prompt_parts(
+        symbols=SYMBOLS,
+        market_data_formatted=f"BTC {cash}",
+        news_analysis="news",
+        pain_trades_analysis="pain",
+        alpha_setups_analysis="alpha",
+        fvg_analysis="fvg",
+        portfolio_state={"cash": cash, "total_value": cash, "unrealized_pnl": 0},
+        positions_text="none",
+        sentiment=SimpleNamespace(fear_greed_value=fear_greed),
+    )
+
+
+class TestStablePrefix:
+    """The static prefix must not change between cycles."""
+
+    def test_prefix_identical_across_cycles(self):
+        builder = PromptBuilder()
+        first = build_parts(builder, cash=1000, fear_greed=20)
+        with patch("src.services.multi_coin_prompt.prompt_builder.datetime") as mock_dt:
+            mock_dt.utcnow.return_value.strftime.return_value = "later"
+            second = build_parts(builder, cash=2500, fear_greed=80)
+
+        assert first.static_prefix == second.static_prefix
+        assert first.dynamic_suffix != second.dynamic_suffix
+
+    def test_prefix_has_rules_and_suffix_has_live_data(self):
+        parts = build_parts(PromptBuilder(), cash=1000, fear_greed=20)
+
+        assert "## DECISION FRAMEWORK" in parts.static_prefix
+        assert "## RESPONSE FORMAT" in parts.static_prefix
+        assert "UTC" not in parts.static_prefix
+        assert "MANDATORY SHORT BIAS" in parts.dynamic_suffix
+        assert "$1,000.00" in parts.dynamic_suffix
+        assert parts.prompt.startswith(parts.static_prefix)
+
+
+@pytest.mark.asyncio
+class TestProviderPromptCaching:
+    """LLMClient marks the prefix for caching and records cached tokens."""
+
+    async def test_claude_marks_prefix_and_records_cache_reads(self):
+        client = LLMClient()
+        client._acquire_rate_limit = AsyncMock(return_value=None)
+        response = SimpleNamespace(
+            content=[SimpleNamespace(text="{}")],
+            usage=SimpleNamespace(
+                input_tokens=200,
+                output_tokens=100,
+                cache_read_input_tokens=3000,
+                cache_creation_input_tokens=0,
+            ),
+        )
+        anthropic = MagicMock()
+        anthropic.messages.create = AsyncMock(return_value=response)
+        client._anthropic_client = anthropic
+
+        result = await client.analyze_market(
+            "claude-4.5-sonnet", "STATIC|live", cache_prefix="STATIC|"
+        )
+
+        content = anthropic.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert content[0] == {
+            "type": "text", "text": "STATIC|", "cache_control": {"type": "ephemeral"}
+        }
+        assert content[1]["text"] == "live"
+        assert result["cached_tokens"] == 3000
+        assert result["tokens_used"] == 3300
+        # 200 * $3 + 3000 * $0.30 + 100 * $15 per 1M tokens
+        assert result["cost"] == pytest.approx(0.0006 + 0.0009 + 0.0015)
+
+    async def test_deepseek_cache_hit_tokens_recorded(self):
+        client = LLMClient()
+        client._acquire_rate_limit = AsyncMock(return_value=None)
+        usage = SimpleNamespace(
+            prompt_tokens=1000, completion_tokens=10, prompt_cache_hit_tokens=800,
+            prompt_tokens_details=None,
+        )
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))], usage=usage
+        )
+        deepseek = MagicMock()
+        deepseek.chat.completions.create = AsyncMock(return_value=response)
+        client._deepseek_client = deepseek
+
+        result = await client.analyze_market("deepseek-chat", "prompt", cache_prefix="pro")
+
+        assert result["cached_tokens"] == 800
+        assert result["tokens_used"] == 1010
+
+
+@pytest.mark.asyncio
+class TestStructuredOutput:
+    """json_mode requests a bare JSON object from each provider."""
+
+    async def test_openai_compatible_uses_json_object_format(self):
+        client = LLMClient()
+        client._acquire_rate_limit = AsyncMock(return_value=None)
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, prompt_tokens_details=None)
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))], usage=usage
+        )
+        deepseek = MagicMock()
+        deepseek.chat.completions.create = AsyncMock(return_value=response)
+        client._deepseek_client = deepseek
+
+        await client.analyze_market("deepseek-chat", "json please", json_mode=True)
+
+        kwargs = deepseek.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] == {"type": "json_object"}
+
+    async def test_claude_prefills_brace(self):
+        client = LLMClient()
+        client._acquire_rate_limit = AsyncMock(return_value=None)
+        response = SimpleNamespace(
+            content=[SimpleNamespace(text='"BTC/USDT": {}}')],
+            usage=SimpleNamespace(input_tokens=10, output_tokens=5),
+        )
+        anthropic = MagicMock()
+        anthropic.messages.create = AsyncMock(return_value=response)
+        client._anthropic_client = anthropic
+
+        result = await client.analyze_market("claude-4.5-sonnet", "prompt", json_mode=True)
+
+        messages = anthropic.messages.create.call_args.kwargs["messages"]
+        assert messages[-1] == {"role": "assistant", "content": "{"}
+        assert result["response"] == '{"BTC/USDT": {}}'
@@ -0,0 +1,74 @@
+"""Tests for price-history compression in prompts."""
+
+import math
+from unittest.mock import patch
+
+from src.services.multi_coin_prompt import market_formatter
+from src.services.multi_coin_prompt.compression import (
+    PromptCompressor,
+    estimate_tokens,
+    format_sig,
+    lttb,
+    round_sig,
+)
+
+SERIES = [100 + 10 * math.sin(i / 8) + (40 if i == 137 else 0) for i in range(250)]
+
+
+class TestHelpers:
+    """Rounding and downsampling primitives."""
+
+    def test_round_sig(self):
+        assert round_sig(64213.57, 4) == 64210
+        assert round_sig(0.0123456, 3) == 0.0123
+        assert format_sig(64213.57, 5) == "64214"
+        assert format_sig(0.51234567, 4) == "0.5123"
+
+    def test_lttb_keeps_endpoints_and_spike(self):
+        sampled = lttb(SERIES, 20)
+
+        assert len(sampled) == 20
+        assert sampled[0] == (0, SERIES[0])
+        assert sampled[-1] == (249, SERIES[-1])
+        assert (137, SERIES[137]) in sampled
+
+    def test_lttb_short_series_unchanged(self):
+        assert lttb([1.0, 2.0], 10) == [(0, 1.0), (1, 2.0)]
+
+
+class TestPromptCompressor:
+    """Compressed history stays within the per-symbol token budget."""
+
+    def test_fits_budget(self):
+        history = PromptCompressor(token_budget=80, significant_digits=4).compress(SERIES)
+
+        assert history is not None
+        assert history.tokens <= 80
+        assert history.tokens == estimate_tokens("\n".join(history.lines))
+        assert "250x1h" in history.lines[0]
+
+    def test_too_short_series_skipped(self):
+        assert PromptCompressor().compress([100.0]) is None
+
+
+class TestMarketDashboard:
+    """Sketches are opt-in, and the log reports the dashboard's real size."""
+
+    DATA = {"BTC/USDT": {"current_price": 100.0, "price_series": SERIES}}
+
+    def test_disabled_by_default(self):
+        formatter = market_formatter.MarketDataFormatter()
+
+        assert "**History**" not in formatter.format_market_data(["BTC/USDT"], self.DATA)
+
+    def test_logs_dashboard_size_without_and_with_history(self):
+        formatter = market_formatter.MarketDataFormatter()
+
+        with patch.object(market_formatter.config, "PROMPT_COMPRESSION_ENABLED", True), \
+                patch.object(market_formatter, "logger") as logger:
+            dashboard = formatter.format_market_data(["BTC/USDT"], self.DATA)
+
+        plain = "\n".join(line for line in dashboard.split("\n") if not line.startswith(("- **History**", "- **Shape**")))
+        message = logger.info.call_args.args[0]
+        assert f"dashboard {estimate_tokens(plain)} -> {estimate_tokens(dashboard)} tokens" in message
+        assert estimate_tokens(plain) < estimate_tokens(dashboard)
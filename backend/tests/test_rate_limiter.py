@@ -0,0 +1,153 @@
+"""Tests for the shared Redis sliding-window LLM rate limiter."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.core.llm_client import LLMClient
+from src.core.rate_limiter import RateLimiter, RateLimitReservation
+
+
+def make_limiter(*script_results):
+    """Rate limiter whose Lua script returns the given results in order."""
+    script = AsyncMock(side_effect=list(script_results))
+    redis = MagicMock()
+    redis.register_script = MagicMock(return_value=script)
+    limiter = RateLimiter(redis_client=redis, window_seconds=60)
+    limiter.provider_limits = {"deepseek": {"rpm": 2, "tpm": 1000}}
+    return limiter, script
+
+
+@pytest.mark.asyncio
+class TestSlidingWindowLimiter:
+    """Atomic acquire / wait-until behaviour."""
+
+    async def test_try_acquire_allowed(self):
+        limiter, script = make_limiter([1, 0, 1, 300])
+
+        decision = await limiter.try_acquire("deepseek", "deepseek-chat", tokens=300)
+
+        assert decision.allowed is True
+        assert decision.wait_seconds == 0
+        assert decision.tokens_in_window == 300
+        args = script.call_args.kwargs["args"]
+        assert args[1:4] == [2, 1000, 300]  # rpm, tpm, tokens
+        assert script.call_args.kwargs["keys"] == [
+            "rate_limit:deepseek:deepseek-chat:requests",
+            "rate_limit:deepseek:deepseek-chat:tokens",
+        ]
+
+    async def test_try_acquire_denied_returns_wait_until(self):
+        limiter, _ = make_limiter([0, 12500, 2, 900])
+
+        decision = await limiter.try_acquire("deepseek", "deepseek-chat", tokens=300)
+
+        assert decision.allowed is False
+        assert decision.wait_seconds == 12.5
+        assert decision.retry_at > decision.wait_seconds
+
+    async def test_acquire_sleeps_exact_wait_then_retries(self):
+        limiter, script = make_limiter([0, 1500, 2, 0], [1, 0, 2, 0])
+
+        with patch("src.core.rate_limiter.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            reservation = await limiter.acquire("deepseek", "deepseek-chat", tokens=10)
+
+        mock_sleep.assert_awaited_once_with(1.5)
+        assert reservation.tokens == 10
+        # Same request id across retries so a reservation is never double counted
+        first_id = script.call_args_list[0].kwargs["args"][4]
+        second_id = script.call_args_list[1].kwargs["args"][4]
+        assert first_id == second_id == reservation.request_id
+
+    async def test_acquire_respects_max_wait(self):
+        limiter, _ = make_limiter([0, 30000, 2, 0])
+
+        with pytest.raises(TimeoutError):
+            await limiter.acquire("deepseek", "deepseek-chat", max_wait=5)
+
+    async def test_reconcile_replaces_estimate(self):
+        limiter, script = make_limiter([1])
+        reservation = RateLimitReservation("deepseek", "deepseek-chat", "abc", 800)
+
+        await limiter.reconcile_tokens(reservation, 250)
+
+        assert script.call_args.kwargs["args"] == ["abc", 800, 250]
+        assert reservation.tokens == 250
+
+    def test_unknown_provider_falls_back_to_model_rpm(self):
+        limiter, _ = make_limiter()
+        assert limiter.get_limits("gemini", "gemini-2.5-pro") == {"rpm": 50, "tpm": 0}
+
+
+@pytest.mark.asyncio
+class TestSlidingWindowScript:
+    """The Lua scripts run against an in-process Redis with a Lua interpreter."""
+
+    @pytest.fixture
+    def limiter(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        limiter = RateLimiter(redis_client=fakeredis.FakeAsyncRedis(), window_seconds=60)
+        limiter.provider_limits = {"deepseek": {"rpm": 2, "tpm": 1000}}
+        return limiter
+
+    async def test_request_budget_is_enforced_on_server_time(self, limiter):
+        first = await limiter.try_acquire("deepseek", "deepseek-chat")
+        second = await limiter.try_acquire("deepseek", "deepseek-chat")
+        with patch("src.core.rate_limiter.time", return_value=0):  # A skewed client clock changes nothing
+            denied = await limiter.try_acquire("deepseek", "deepseek-chat")
+
+        assert first.allowed and second.allowed and not denied.allowed
+        assert denied.requests_in_window == 2
+        assert 59 < denied.wait_seconds <= 60
+
+    async def test_token_budget_and_reconciliation(self, limiter):
+        reservation = await limiter.acquire("deepseek", "deepseek-chat", tokens=800)
+        assert not (await limiter.try_acquire("deepseek", "deepseek-chat", tokens=300)).allowed
+
+        await limiter.reconcile_tokens(reservation, 200)
+        decision = await limiter.try_acquire("deepseek", "deepseek-chat", tokens=300)
+
+        assert decision.allowed and decision.tokens_in_window == 500
+
+    async def test_check_rate_limit_reserves_a_slot(self, limiter):
+        assert await limiter.check_rate_limit("deepseek-chat", provider="deepseek")
+
+        stats = await limiter.get_usage_stats("deepseek-chat", provider="deepseek")
+
+        assert stats["current_rpm"] == 1
+
+
+@pytest.mark.asyncio
+class TestLLMClientRateLimiting:
+    """LLMClient shares the distributed budget and degrades to local limiting."""
+
+    async def test_analyze_market_reserves_and_reconciles(self):
+        client = LLMClient()
+        reservation = RateLimitReservation("deepseek", "deepseek-chat", "id", 1100)
+        client._shared_rate_limiter = MagicMock()
+        client._shared_rate_limiter.acquire = AsyncMock(return_value=reservation)
+        client._shared_rate_limiter.reconcile_tokens = AsyncMock()
+        client._call_openai = AsyncMock(return_value={"response": "{}", "tokens_used": 420})
+
+        await client.analyze_market("deepseek-chat", "x" * 400, max_tokens=1000)
+
+        client._shared_rate_limiter.acquire.assert_awaited_once_with(
+            "deepseek", "deepseek-chat", tokens=1100
+        )
+        client._shared_rate_limiter.reconcile_tokens.assert_awaited_once_with(reservation, 420)
+
+    async def test_falls_back_to_local_limiter_when_redis_down(self):
+        client = LLMClient()
+        client._shared_rate_limiter = MagicMock()
+        client._shared_rate_limiter.acquire = AsyncMock(side_effect=ConnectionError("down"))
+        client._rate_limiter.acquire = AsyncMock()
+        client._call_claude = AsyncMock(return_value={"response": "{}", "tokens_used": 5})
+
+        await client.analyze_market("claude-4.5-sonnet", "prompt")
+
+        client._rate_limiter.acquire.assert_awaited_once()
+
+    async def test_unsupported_model_raises(self):
+        with pytest.raises(ValueError):
+            await LLMClient().analyze_market("llama", "prompt")
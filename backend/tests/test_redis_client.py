@@ -0,0 +1,117 @@
+"""Tests for the instrumented Redis connection pool."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.core import redis_client
+from src.core.redis_client import InstrumentedConnectionPool, RedisClient
+
+
+class StubConnection:
+    """Connection stand-in that never touches the network."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.pid = 0
+
+    async def connect(self):
+        return None
+
+    async def can_read_destructive(self):
+        return False
+
+    async def disconnect(self, nowait: bool = False):
+        return None
+
+    def is_ready_for_command(self):
+        return True
+
+    def get_protocol(self):
+        return 2
+
+
+def make_pool(max_connections: int = 2, timeout: float = 0.05) -> InstrumentedConnectionPool:
+    return InstrumentedConnectionPool(
+        name="test",
+        max_connections=max_connections,
+        timeout=timeout,
+        connection_class=StubConnection,
+    )
+
+
+@pytest.mark.asyncio
+class TestInstrumentedConnectionPool:
+    """Pool metrics and blocking behaviour."""
+
+    async def test_acquisition_tracks_in_use(self):
+        pool = make_pool()
+
+        conn = await pool.get_connection("GET")
+        snapshot = pool.snapshot()
+
+        assert snapshot["in_use"] == 1
+        assert snapshot["acquisitions"] == 1
+        assert snapshot["utilization"] == 0.5
+
+        await pool.release(conn)
+        assert pool.snapshot()["in_use"] == 0
+        assert pool.snapshot()["available"] == 1
+
+    async def test_exhausted_pool_times_out_and_counts(self):
+        pool = make_pool(max_connections=1, timeout=0.01)
+        await pool.get_connection("GET")
+
+        with pytest.raises(RedisConnectionError):
+            await pool.get_connection("GET")
+
+        assert pool.stats.timeouts == 1
+        assert pool.snapshot()["peak_in_use"] == 1
+
+    async def test_waiter_gets_released_connection(self):
+        pool = make_pool(max_connections=1, timeout=1)
+        first = await pool.get_connection("GET")
+
+        async def release_later():
+            await asyncio.sleep(0.02)
+            await pool.release(first)
+
+        release_task = asyncio.create_task(release_later())
+        second = await pool.get_connection("GET")
+        await release_task
+
+        assert second is first
+        assert pool.stats.waits == 1
+        assert pool.stats.max_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+class TestWorkloadPools:
+    """Per-workload pool selection."""
+
+    async def test_shared_pool_when_separate_pools_disabled(self):
+        with patch.object(redis_client.config, "REDIS_SEPARATE_POOLS", False), \
+                patch.object(redis_client, "get_redis") as mock_get_redis:
+            mock_get_redis.return_value = "shared"
+            assert await redis_client.get_redis_for("cache") == "shared"
+
+    async def test_separate_pool_sized_per_workload(self):
+        with patch.object(redis_client.config, "REDIS_SEPARATE_POOLS", True), \
+                patch.object(redis_client.config, "REDIS_WORKLOAD_MAX_CONNECTIONS", {"locks": 3}), \
+                patch.object(redis_client, "_workload_clients", {}):
+            client = await redis_client.get_redis_for("locks")
+            stats = redis_client.get_redis_pool_stats()
+
+            assert client.connection_pool.max_connections == 3
+            assert any(s["pool"] == "locks" for s in stats)
+            await redis_client._workload_clients["locks"].disconnect()
+
+
+class TestRedisClient:
+    """RedisClient pool reporting."""
+
+    def test_pool_stats_before_connect(self):
+        client = RedisClient(workload="cache")
+        assert client.pool_stats() == {"pool": "cache", "connected": False}
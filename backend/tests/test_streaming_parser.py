@@ -0,0 +1,123 @@
+"""Tests for incremental streamed decision parsing."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.core.llm_client import LLMClient
+from src.core.streaming_parser import IncrementalDecisionParser
+
+RESPONSE = (
+    "```json\n"
+    '{"BTC/USDT": {"signal": "buy_to_enter", "confidence": 0.8, '
+    '"reasoning": "breakout {above} \\"range\\""}, '
+    '"ETH/USDT": {"signal": "hold", "confidence": 0.5, "levels": [1, {"a": 2}]}}\n'
+    "```"
+)
+
+
+def chunked(text: str, size: int) -> list[str]:
+    return [text[i : i + size] for i in range(0, len(text), size)]
+
+
+class TestIncrementalDecisionParser:
+    """Decisions are emitted as soon as each object closes."""
+
+    @pytest.mark.parametrize("size", [1, 7, 64, len(RESPONSE)])
+    def test_emits_each_symbol_once_any_chunking(self, size):
+        parser = IncrementalDecisionParser()
+        emitted = []
+        for chunk in chunked(RESPONSE, size):
+            emitted.extend(parser.feed(chunk))
+
+        assert [s for s, _ in emitted] == ["BTC/USDT", "ETH/USDT"]
+        assert emitted[0][1]["reasoning"] == 'breakout {above} "range"'
+        assert emitted[1][1]["levels"] == [1, {"a": 2}]
+
+    def test_first_symbol_emitted_before_second_arrives(self):
+        parser = IncrementalDecisionParser()
+        split = RESPONSE.index('"ETH/USDT"')
+
+        first = parser.feed(RESPONSE[:split])
+        assert [s for s, _ in first] == ["BTC/USDT"]
+        assert [s for s, _ in parser.feed(RESPONSE[split:])] == ["ETH/USDT"]
+
+    def test_wrapped_decisions_and_symbol_filter(self):
+        parser = IncrementalDecisionParser(symbols=["SOL/USDT"])
+        text = json.dumps({"decisions": {"SOL/USDT": {"signal": "close"}, "XRP/USDT": {}}})
+
+        assert parser.feed(text) == [("SOL/USDT", {"signal": "close"})]
+
+
+@pytest.mark.asyncio
+class TestLLMClientStreaming:
+    """stream_decisions yields per-symbol decisions and settles usage."""
+
+    async def test_openai_stream_yields_decisions_and_reconciles(self):
+        client = LLMClient()
+        client._acquire_rate_limit = AsyncMock(return_value="reservation")
+        client._reconcile_rate_limit = AsyncMock()
+
+        chunks = [
+            SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=c))])
+            for c in chunked(RESPONSE, 10)
+        ]
+        chunks.append(SimpleNamespace(
+            usage=SimpleNamespace(prompt_tokens=100, completion_tokens=50), choices=[]
+        ))
+
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        fake_client = MagicMock()
+        fake_client.chat.completions.create = AsyncMock(return_value=stream())
+        client._deepseek_client = fake_client
+
+        results = [s async for s, _ in client.stream_decisions("deepseek-chat", "prompt")]
+
+        assert results == ["BTC/USDT", "ETH/USDT"]
+        assert fake_client.chat.completions.create.call_args.kwargs["stream"] is True
+        client._reconcile_rate_limit.assert_awaited_once_with("reservation", 150)
+
+    async def test_stalled_stream_trips_breaker(self):
+        client = LLMClient()
+        client._dispatcher.call_timeout = 0.05
+        client._acquire_rate_limit = AsyncMock(return_value=None)
+
+        async def stream():
+            yield SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=RESPONSE[:RESPONSE.index('"ETH')]))])
+            await asyncio.sleep(10)
+
+        fake_client = MagicMock()
+        fake_client.chat.completions.create = AsyncMock(return_value=stream())
+        client._deepseek_client = fake_client
+
+        results = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for symbol, _ in client.stream_decisions("deepseek-chat", "prompt"):
+                results.append(symbol)
+
+        assert results == ["BTC/USDT"]
+        assert client._dispatcher.breaker("deepseek").failures == 1
+
+    async def test_open_circuit_streams_from_fallback(self):
+        client = LLMClient()
+        client._dispatcher.fallback_providers = ["qwen"]
+        client._dispatcher.breaker("deepseek").opened_at = 10**12
+        client._acquire_rate_limit = AsyncMock(return_value=None)
+
+        async def stream():
+            yield SimpleNamespace(usage=None, choices=[SimpleNamespace(delta=SimpleNamespace(content=RESPONSE))])
+
+        fake_client = MagicMock()
+        fake_client.chat.completions.create = AsyncMock(return_value=stream())
+        client._qwen_client = fake_client
+
+        results = [s async for s, _ in client.stream_decisions("deepseek-chat", "prompt")]
+
+        assert results == ["BTC/USDT", "ETH/USDT"]
+        client._acquire_rate_limit.assert_awaited_once_with("qwen", "prompt", 1024)
@@ -0,0 +1,79 @@
+"""Tests for per-cycle tracing spans, histograms and OTLP export."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.core.tracing import CycleTracer, StageHistogram, span, to_otlp
+
+
+def compute_indicators():
+    with span("indicators.compute"):
+        pass
+
+
+@pytest.mark.asyncio
+class TestCycleTracer:
+    """Spans nest under the cycle and feed histograms and waterfalls."""
+
+    async def test_nested_spans_build_waterfall(self):
+        tracer = CycleTracer("bot-1")
+
+        with tracer.cycle(decision_mode="llm"):
+            with span("fetch"):
+                for symbol in ("BTC/USDT", "ETH/USDT"):
+                    with span("market.fetch", symbol=symbol):
+                        await asyncio.sleep(0)
+            await asyncio.to_thread(compute_indicators)
+
+        profile = tracer.profile()
+        waterfall = profile["cycles"][0]
+        names = [(row["name"], row["depth"]) for row in waterfall["spans"]]
+        assert names == [
+            ("cycle", 0), ("fetch", 1), ("market.fetch", 2), ("market.fetch", 2), ("indicators.compute", 1),
+        ]
+        assert waterfall["attributes"]["decision_mode"] == "llm"
+        assert waterfall["spans"][2]["attributes"] == {"symbol": "BTC/USDT"}
+        assert profile["histograms"]["market.fetch"]["count"] == 2
+
+    async def test_error_recorded_and_reraised(self):
+        tracer = CycleTracer("bot-2")
+
+        with pytest.raises(RuntimeError):
+            with tracer.cycle():
+                with span("decision"):
+                    raise RuntimeError("llm down")
+
+        rows = tracer.profile()["cycles"][0]["spans"]
+        assert "llm down" in rows[1]["error"]
+
+    async def test_span_outside_cycle_is_noop(self):
+        with span("orphan") as current:
+            assert current is None
+
+    async def test_otlp_export_shape(self):
+        tracer = CycleTracer("bot-3")
+        with tracer.cycle():
+            with span("snapshot", rows=1):
+                pass
+
+        payload = to_otlp(tracer.recent[-1])
+        spans = payload["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["name"] for s in spans] == ["cycle", "snapshot"]
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+        assert spans[1]["attributes"] == [{"key": "rows", "value": {"intValue": "1"}}]
+        json.dumps(payload)
+
+
+class TestStageHistogram:
+    """Bucketed latencies give approximate percentiles."""
+
+    def test_percentiles(self):
+        histogram = StageHistogram([0.1, 1, 10])
+        for seconds in (0.05, 0.5, 0.5, 5, 50):
+            histogram.observe(seconds)
+
+        assert histogram.percentile(0.5) == 1
+        assert histogram.percentile(1.0) == float("inf")
+        assert histogram.to_dict()["buckets"] == {"0.1": 1, "1": 2, "10": 1, "+inf": 1}